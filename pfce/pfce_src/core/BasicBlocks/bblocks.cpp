@@ -29,10 +29,13 @@
 #pragma warning(pop)
 #endif
 
+#include <algorithm>
 #include <iostream>
 #include <fstream>
+#include <map>
 #include <sstream>
 #include <string>
+#include <vector>
 
 #include "uthash.h"
 #include "compat.h"
@@ -256,6 +259,14 @@ public:
 		}
 	}
 
+	void WriteBytes(const void* data, size_t len)
+	{
+		if (m_pFile)
+		{
+			fwrite(data, 1, len, m_pFile);
+		}
+	}
+
 	void Write(const char* fmt, ...)
 	{
 		va_list args;
@@ -309,6 +320,11 @@ INT pid = 0;
 KNOB<std::string> KnobOutput(KNOB_MODE_WRITEONCE,  "pintool", "o", "bblocks", "specify base file name for output");
 KNOB<BOOL> KnobDebug(KNOB_MODE_WRITEONCE, "pintool", "debug", "0", "Enable debug logging.");
 KNOB<BOOL> KnobCpuKill(KNOB_MODE_WRITEONCE, "pintool", "cpukill", "0", "Kill process when cpu becomes idle.");
+KNOB<BOOL> KnobBinary(KNOB_MODE_WRITEONCE, "pintool", "binary", "0", "Write the trace in the binary format.");
+
+// Binary trace format, see Peach.Core.Analysis.TraceFile
+const UINT32 TraceMagic = 0x54424250; // 'PBBT'
+const UINT32 TraceVersion = 1;
 
 // Full path to the output file base
 std::string OutFileBase;
@@ -440,6 +456,9 @@ VOID Fini(INT32 code, VOID *v)
 	File fileOut;
 	fileOut.Open(OutFileBase + ".out", "wb");
 
+	// Executed block offsets for each image, only used for binary traces
+	std::map<const ImageRec*, std::vector<UINT64> > executed;
+
 	size_t total = 0, unresolved = 0, inavlid = 0, run = 0;
 
 	for (const BlockRec* it = blocks.next; it != NULL; it = it->next)
@@ -457,7 +476,38 @@ VOID Fini(INT32 code, VOID *v)
 			else
 				++run;
 
-			fileOut.Write(XFMT " %s\n", it->address - it->image->loadOffset, it->image->fullName.c_str());
+			if (KnobBinary)
+				executed[it->image].push_back(it->address - it->image->loadOffset);
+			else
+				fileOut.Write(XFMT " %s\n", it->address - it->image->loadOffset, it->image->fullName.c_str());
+		}
+	}
+
+	// Nothing is written if no blocks ran, same as the text format
+	if (KnobBinary && !executed.empty())
+	{
+		UINT32 count = (UINT32)executed.size();
+
+		fileOut.WriteBytes(&TraceMagic, sizeof(TraceMagic));
+		fileOut.WriteBytes(&TraceVersion, sizeof(TraceVersion));
+		fileOut.WriteBytes(&count, sizeof(count));
+
+		for (std::map<const ImageRec*, std::vector<UINT64> >::iterator it = executed.begin(); it != executed.end(); ++it)
+		{
+			std::vector<UINT64>& offsets = it->second;
+
+			// Pin can have more than one block at the same address
+			std::sort(offsets.begin(), offsets.end());
+			offsets.erase(std::unique(offsets.begin(), offsets.end()), offsets.end());
+
+			const std::string& name = it->first->fullName;
+			UINT32 nameLen = (UINT32)name.size();
+			UINT32 blockCount = (UINT32)offsets.size();
+
+			fileOut.WriteBytes(&nameLen, sizeof(nameLen));
+			fileOut.WriteBytes(name.c_str(), nameLen);
+			fileOut.WriteBytes(&blockCount, sizeof(blockCount));
+			fileOut.WriteBytes(&offsets[0], offsets.size() * sizeof(UINT64));
 		}
 	}
 
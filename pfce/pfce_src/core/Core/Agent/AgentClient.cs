@@ -51,6 +51,13 @@ namespace Peach.Core.Agent
 		/// </summary>
 		public string Password { get; private set; }
 
+		/// <summary>
+		/// Sends the calls other agents have deferred.  Set by the AgentManager.
+		/// Clients that defer calls must invoke it before queueing or sending
+		/// anything so calls reach all the agents in the order they were made.
+		/// </summary>
+		public Action FlushOtherAgents { get; set; }
+
 		/// <summary>
 		/// Connect to agent
 		/// </summary>
@@ -122,6 +129,13 @@ namespace Peach.Core.Agent
 		/// </summary>
 		/// <param name="msg">Message</param>
 		public abstract void Message(string msg);
+
+		/// <summary>
+		/// Send any calls that have been deferred.
+		/// </summary>
+		public virtual void Flush()
+		{
+		}
 	}
 
 	[AttributeUsage(AttributeTargets.Class, AllowMultiple = false, Inherited = false)]
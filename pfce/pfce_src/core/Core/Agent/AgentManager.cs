@@ -45,6 +45,9 @@ namespace Peach.Core.Agent
 
 				agent = (AgentClient)Activator.CreateInstance(type, agentDef.Name, agentDef.location, agentDef.password);
 
+				var self = agent;
+				agent.FlushOtherAgents = () => Flush(self);
+
 				Agents.Add(agent);
 			}
 
@@ -99,8 +102,26 @@ namespace Peach.Core.Agent
 			return agent.CreatePublisher(name, cls, args);
 		}
 
+		/// <summary>
+		/// Send the calls every agent has deferred.
+		/// </summary>
+		public void Flush()
+		{
+			Flush(null);
+		}
+
 		public void Dispose()
 		{
+			try
+			{
+				Flush();
+			}
+			catch (Exception ex)
+			{
+				// Always shut down the agents, even if a deferred call failed
+				Logger.Warn("Ignoring {0} sending deferred agent calls: {1}", ex.GetType().Name, ex.Message);
+			}
+
 			foreach (var agent in Agents.Reverse())
 			{
 				Logger.Trace("SessionFinished: {0}", agent.Name);
@@ -134,6 +155,8 @@ namespace Peach.Core.Agent
 				LastWasFault = lastWasFault
 			};
 
+			Flush();
+
 			foreach (var agent in Agents)
 			{
 				Logger.Trace("IterationStarting: {0} {1} {2}", agent.Name, args.IsReproduction, args.LastWasFault);
@@ -144,7 +167,6 @@ namespace Peach.Core.Agent
 
 		public void IterationFinished()
 		{
-
 			foreach (var agent in Agents.Reverse())
 			{
 				Logger.Trace("IterationFinished: {0}", agent.Name);
@@ -163,6 +185,15 @@ namespace Peach.Core.Agent
 			}
 		}
 
+		private void Flush(AgentClient except)
+		{
+			foreach (var agent in Agents)
+			{
+				if (agent != except)
+					Guard(agent, "Flush", a => a.Flush());
+			}
+		}
+
 		private bool DetectedFault()
 		{
 			var ret = false;
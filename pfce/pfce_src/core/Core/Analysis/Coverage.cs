@@ -13,6 +13,7 @@ using System.IO;
 using SysProcess = System.Diagnostics.Process;
 using NLog;
 using System.Collections;
+using System.Security.Cryptography;
 using System.Threading;
 
 namespace Peach.Core.Analysis
@@ -43,7 +44,11 @@ namespace Peach.Core.Analysis
 		}
 
 		private readonly ProcessStartInfo StartInfo;
+		private readonly string Executable;
+		private readonly string TargetArguments;
 		private readonly bool NeedsKilling;
+		private string[] PinFiles;
+		private string fingerprint;
 
 		public Coverage(string executable, string arguments, bool needsKilling)
 		{
@@ -51,6 +56,7 @@ namespace Peach.Core.Analysis
 
 			// Set 1st since it is used by Setup functions
 			NeedsKilling = needsKilling;
+			Executable = executable;
 
 			if (!arguments.Contains("%s"))
 				throw new ArgumentException("Error, arguments must contain a '%s'.");
@@ -77,7 +83,77 @@ namespace Peach.Core.Analysis
 			StartInfo.UseShellExecute = false;
 			StartInfo.CreateNoWindow = true;
 
-			Logger.Debug("Using: {0} {1}", StartInfo.FileName, StartInfo.Arguments);
+			TargetArguments = "-- {0} {1}".Fmt(Quote(executable), arguments);
+
+			Logger.Debug("Using: {0} {1} {2}", StartInfo.FileName, StartInfo.Arguments, TargetArguments);
+		}
+
+		/// <summary>
+		/// Run startInfo in place of pin, used by the unit tests.
+		/// </summary>
+		/// <param name="startInfo">Program and arguments to run in place of pin.</param>
+		/// <param name="executable">Executable to run.</param>
+		/// <param name="arguments">Executable arguments.  Must contain a "%s" placeholder for the sampe filename.</param>
+		/// <param name="pinFiles">Files that make up the pin tool.</param>
+		internal Coverage(ProcessStartInfo startInfo, string executable, string arguments, params string[] pinFiles)
+		{
+			StartInfo = startInfo;
+			StartInfo.RedirectStandardError = true;
+			StartInfo.RedirectStandardOutput = true;
+			StartInfo.UseShellExecute = false;
+			StartInfo.CreateNoWindow = true;
+
+			Executable = executable;
+			TargetArguments = "-- {0} {1}".Fmt(Quote(executable), arguments);
+			PinFiles = pinFiles;
+		}
+
+		/// <summary>
+		/// Identifies everything besides the sample file that a trace
+		/// depends on.  This is the target executable, its arguments and
+		/// the pin binaries and tool.
+		/// </summary>
+		/// <remarks>
+		/// The contents of the files are hashed, so rebuilding the target
+		/// or updating pin changes the fingerprint.
+		/// </remarks>
+		public string Fingerprint
+		{
+			get
+			{
+				if (fingerprint == null)
+				{
+					var parts = new[] { TargetArguments, NeedsKilling.ToString() }
+						.Concat(new[] { Executable }.Concat(PinFiles).Select(f => "{0} {1}".Fmt(f, HashFile(f))));
+
+					using (var sha1 = SHA1.Create())
+					{
+						var bytes = System.Text.Encoding.UTF8.GetBytes(string.Join("\n", parts));
+						fingerprint = ToHex(sha1.ComputeHash(bytes));
+					}
+				}
+
+				return fingerprint;
+			}
+		}
+
+		/// <summary>
+		/// Computes the SHA-1 of the contents of a file.
+		/// </summary>
+		/// <param name="fileName">File to hash.</param>
+		/// <returns>The hash as a hex string.</returns>
+		internal static string HashFile(string fileName)
+		{
+			using (var sha1 = SHA1.Create())
+			using (var stream = File.OpenRead(fileName))
+			{
+				return ToHex(sha1.ComputeHash(stream));
+			}
+		}
+
+		private static string ToHex(byte[] hash)
+		{
+			return BitConverter.ToString(hash).Replace("-", "");
 		}
 
 		#region Platform Setup Functions
@@ -108,15 +184,15 @@ namespace Peach.Core.Analysis
 			pinTool = Path.Combine(pwd, pinTool);
 			VerifyExists(pinTool, "pin tool");
 
+			PinFiles = new[] { pinPath, pinTool };
+
 			var psi = new ProcessStartInfo
 			{
 				FileName = pinPath,
-				Arguments = "-t {0} -cpukill {1} -debug {2} -- {3} {4}".Fmt(
+				Arguments = "-t {0} -cpukill {1} -debug {2} -binary 1".Fmt(
 					Quote(pinTool),
 					NeedsKilling ? "1" : "0",
-					Logger.IsDebugEnabled ? "1" : "0",
-					Quote(executable),
-					arguments)
+					Logger.IsDebugEnabled ? "1" : "0")
 			};
 
 			return psi;
@@ -148,15 +224,15 @@ namespace Peach.Core.Analysis
 			pinTool = Path.Combine(pwd, pinTool);
 			VerifyExists(pinTool, "pin tool");
 
+			PinFiles = new[] { pinPath, pinTool };
+
 			var psi = new ProcessStartInfo
 			{
 				FileName = pinPath,
-				Arguments = "-t {0} -cpukill {1} -debug {2} -- {3} {4}".Fmt(
+				Arguments = "-t {0} -cpukill {1} -debug {2} -binary 1".Fmt(
 					Quote(pinTool),
 					NeedsKilling ? "1" : "0",
-					Logger.IsDebugEnabled ? "1" : "0",
-					Quote(executable),
-					arguments)
+					Logger.IsDebugEnabled ? "1" : "0")
 			};
 
 			foreach (DictionaryEntry de in Environment.GetEnvironmentVariables())
@@ -189,16 +265,16 @@ namespace Peach.Core.Analysis
 			var pinTool = Path.Combine(pwd, "bblocks.dylib");
 			VerifyExists(pinTool, "pin tool");
 
+			PinFiles = new[] { pin32, pin64, pinTool };
+
 			var psi = new ProcessStartInfo
 			{
 				FileName = pin32,
-				Arguments = "-p64 {0} -t {1} -cpukill {2} -debug {3} -- {4} {5}".Fmt(
+				Arguments = "-p64 {0} -t {1} -cpukill {2} -debug {3} -binary 1".Fmt(
 					Quote(pin64),
 					Quote(pinTool),
 					NeedsKilling ? "1" : "0",
-					Logger.IsDebugEnabled ? "1" : "0",
-					Quote(executable),
-					arguments)
+					Logger.IsDebugEnabled ? "1" : "0")
 			};
 
 			foreach (DictionaryEntry de in Environment.GetEnvironmentVariables())
@@ -217,12 +293,32 @@ namespace Peach.Core.Analysis
 		/// <param name="traceFile">Name of result trace file to generate.</param>
 		public void Run(string sampleFile, string traceFile)
 		{
-			const string outFile = "bblocks.out";
-			const string pidFile = "bblocks.pid";
+			Run(sampleFile, traceFile, null, null);
+		}
+
+		/// <summary>
+		/// Runs code coverage of sample file and saves results in a trace file.
+		/// Throws a PeachException on failure.
+		/// </summary>
+		/// <remarks>
+		/// Concurrent runs must use different working folders.
+		/// </remarks>
+		/// <param name="sampleFile">Name of sample file to use for instrumentation.</param>
+		/// <param name="traceFile">Name of result trace file to generate.</param>
+		/// <param name="workDir">Folder for the pin tool output, the current directory if null.</param>
+		/// <param name="timeout">How long the target can run before it is killed, forever if null.</param>
+		public void Run(string sampleFile, string traceFile, string workDir, TimeSpan? timeout)
+		{
+			var outBase = Path.Combine(workDir ?? "", "bblocks");
+			var outFile = outBase + ".out";
+			var pidFile = outBase + ".pid";
 
 			var psi = new ProcessStartInfo
 			{
-				Arguments = StartInfo.Arguments.Replace("%s", Quote(sampleFile)),
+				Arguments = "{0} -o {1} {2}".Fmt(
+					StartInfo.Arguments,
+					Quote(outBase),
+					TargetArguments.Replace("%s", Quote(sampleFile))),
 				FileName = StartInfo.FileName,
 				RedirectStandardError = StartInfo.RedirectStandardError,
 				RedirectStandardOutput = StartInfo.RedirectStandardOutput,
@@ -274,15 +370,36 @@ namespace Peach.Core.Analysis
 				proc.BeginErrorReadLine();
 				proc.BeginOutputReadLine();
 
-				while (!File.Exists(pidFile) && !proc.HasExited)
+				var sw = Stopwatch.StartNew();
+				Func<int> remaining = () => timeout.HasValue
+					? (int)Math.Max(0, (timeout.Value - sw.Elapsed).TotalMilliseconds)
+					: Timeout.Infinite;
+
+				while (!File.Exists(pidFile) && !proc.HasExited && remaining() != 0)
 					Thread.Sleep(250);
 
-				if (proc.HasExited)
+				if (proc.HasExited && !File.Exists(pidFile))
 					throw new PeachException("Pin exited without starting the target process.");
 
 				Logger.Debug("Waiting for pin process to exit.");
 
-				proc.WaitForExit();
+				if (!proc.WaitForExit(remaining()))
+				{
+					Logger.Debug("Timed out after {0}, killing pin process.", timeout);
+
+					try
+					{
+						proc.Kill();
+					}
+					catch (InvalidOperationException)
+					{
+						// Already exited
+					}
+
+					proc.WaitForExit();
+
+					throw new PeachException("Pin did not exit within {0}.".Fmt(timeout));
+				}
 
 				Logger.Debug("Pin process exited.");
 			}
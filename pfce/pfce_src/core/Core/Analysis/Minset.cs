@@ -11,6 +11,7 @@ using System.IO;
 using System.Collections.Generic;
 using System.Diagnostics;
 using System.Linq;
+using System.Threading;
 using NLog;
 using System.Collections;
 
@@ -31,6 +32,7 @@ namespace Peach.Core.Analysis
 		public event TraceEventHandler TraceStarting;
 		public event TraceEventHandler TraceCompleted;
 		public event TraceEventHandler TraceFailed;
+		public event TraceEventHandler TraceSkipped;
 		public event TraceEventMessage TraceMessage;
 		public event TraceLoadedHandler TraceLoaded;
 
@@ -52,6 +54,27 @@ namespace Peach.Core.Analysis
 				TraceFailed(this, fileName, count, totalCount);
 		}
 
+		protected void OnTraceSkipped(string fileName, int count, int totalCount)
+		{
+			if (TraceSkipped != null)
+				TraceSkipped(this, fileName, count, totalCount);
+		}
+
+		public Minset()
+		{
+			Jobs = 1;
+		}
+
+		/// <summary>
+		/// How many samples to trace at the same time.
+		/// </summary>
+		public int Jobs { get; set; }
+
+		/// <summary>
+		/// How long to let the target run with each sample, forever if null.
+		/// </summary>
+		public TimeSpan? TraceTimeout { get; set; }
+
 		private void ValidateTraces(List<string> samples, List<string> traces)
 		{
 			samples.Sort(string.CompareOrdinal);
@@ -95,22 +118,81 @@ namespace Peach.Core.Analysis
 			}
 		}
 
-		class BasicBlock
+		struct BasicBlock
+		{
+			public string Module;
+			public ulong Address;
+		}
+
+		/// <summary>
+		/// A trace that has not been kept yet, ordered by how many
+		/// uncovered blocks it could add.
+		/// </summary>
+		class Candidate
 		{
-			public ushort Module { get; set; }
-			public ulong Address { get; set; }
+			public int Index;
+			public int Gain;
+			public int Round;
+		}
 
-			public override bool Equals(object obj)
+		class CandidateComparer : IComparer<Candidate>
+		{
+			public int Compare(Candidate x, Candidate y)
 			{
-				var rhs = obj as BasicBlock;
-				if (rhs == null)
-					return false;
-				return Module == rhs.Module && Address == rhs.Address;
+				// Largest gain first, ties go to the first trace
+				var ret = y.Gain.CompareTo(x.Gain);
+				return ret != 0 ? ret : x.Index.CompareTo(y.Index);
 			}
+		}
 
-			public override int GetHashCode()
+		/// <summary>
+		/// Gives every distinct basic block a consecutive id.
+		/// </summary>
+		class BlockTable
+		{
+			readonly Dictionary<string, Dictionary<ulong, int>> _modules = new Dictionary<string, Dictionary<ulong, int>>();
+
+			public readonly List<BasicBlock> Blocks = new List<BasicBlock>();
+
+			/// <summary>
+			/// Load the sorted ids of the blocks hit by a trace,
+			/// leaving out any block already covered by the index.
+			/// </summary>
+			public int[] Load(string trace, MinsetIndex index)
 			{
-				return Module.GetHashCode() ^ Address.GetHashCode();
+				var hit = new List<int>();
+
+				foreach (var item in TraceFile.Read(trace))
+				{
+					Dictionary<ulong, int> ids;
+					if (!_modules.TryGetValue(item.Name, out ids))
+					{
+						ids = new Dictionary<ulong, int>();
+						_modules.Add(item.Name, ids);
+					}
+
+					foreach (var address in item.Blocks)
+					{
+						int id;
+						if (!ids.TryGetValue(address, out id))
+						{
+							if (index != null && index.IsCovered(item.Name, address))
+								continue;
+
+							id = Blocks.Count;
+							ids.Add(address, id);
+							Blocks.Add(new BasicBlock { Module = item.Name, Address = address });
+						}
+
+						hit.Add(id);
+					}
+				}
+
+				var sorted = hit.ToArray();
+				Array.Sort(sorted);
+				Array.Resize(ref sorted, TraceFile.Unique(sorted));
+
+				return sorted;
 			}
 		}
 
@@ -119,6 +201,14 @@ namespace Peach.Core.Analysis
 		/// </summary>
 		/// <remarks>
 		/// Note: The sample and trace collections must have matching indexes.
+		///
+		/// Every distinct basic block is given an id and each trace is
+		/// stored as a sorted array of the ids it hit.  The minimum set
+		/// is picked greedily, always keeping the trace that adds the most
+		/// uncovered blocks.  Since the number of blocks a trace adds can
+		/// only shrink as more traces are kept, only the trace at the front
+		/// of the queue needs its count refreshed each round, and refreshing
+		/// drops the blocks that have since been covered from its array.
 		/// </remarks>
 		/// <param name="sampleFiles">Collection of sample files</param>
 		/// <param name="traceFiles">Collection of trace files for sample files</param>
@@ -133,9 +223,76 @@ namespace Peach.Core.Analysis
 
 			Debug.Assert(samples.Count == traces.Count);
 
-			var modules = new List<string>();
-			var coverage = new Dictionary<int, long>(traces.Count);
-			var db = new Dictionary<BasicBlock, BitArray>();
+			var table = new BlockTable();
+			var coverage = LoadTraces(traces, table, null);
+			var keep = Cover(coverage, table);
+
+			return keep.Select(i => samples[i]).ToArray();
+		}
+
+		/// <summary>
+		/// Add new samples to a saved minimum set.
+		/// </summary>
+		/// <remarks>
+		/// Note: The sample and trace collections must have matching indexes.
+		///
+		/// Only the traces of samples the index has not seen are loaded, and
+		/// only the blocks they hit that the index does not already cover are
+		/// considered.  The fewest samples that cover all of the new blocks
+		/// are added to the index.  Samples are never removed from the index,
+		/// running with an empty index recomputes the minimum set from scratch.
+		/// </remarks>
+		/// <param name="index">Minimum set to add to</param>
+		/// <param name="sampleFiles">Collection of sample files</param>
+		/// <param name="traceFiles">Collection of trace files for sample files</param>
+		/// <returns>Returns the sample files that were added to the minimum set.</returns>
+		public string[] RunIncremental(MinsetIndex index, string[] sampleFiles, string[] traceFiles)
+		{
+			var allSamples = sampleFiles.ToList();
+			var allTraces = traceFiles.ToList();
+
+			// Expect samples and traces to correlate 1 <-> 1
+			ValidateTraces(allSamples, allTraces);
+
+			Debug.Assert(allSamples.Count == allTraces.Count);
+
+			var samples = new List<string>();
+			var traces = new List<string>();
+
+			for (var i = 0; i < allSamples.Count; ++i)
+			{
+				if (index.HasSeen(allSamples[i]))
+					continue;
+
+				samples.Add(allSamples[i]);
+				traces.Add(allTraces[i]);
+			}
+
+			Logger.Debug("Skipping {0} samples already in the index", allSamples.Count - samples.Count);
+
+			var table = new BlockTable();
+			var coverage = LoadTraces(traces, table, index);
+			var keep = Cover(coverage, table);
+
+			// The kept samples cover every block that was new to the index
+			foreach (var block in table.Blocks)
+				index.AddBlock(block.Module, block.Address);
+
+			foreach (var i in keep)
+				index.AddSample(samples[i], true);
+
+			foreach (var sample in samples)
+			{
+				if (!index.HasSeen(sample))
+					index.AddSample(sample, false);
+			}
+
+			return keep.Select(i => samples[i]).ToArray();
+		}
+
+		private int[][] LoadTraces(List<string> traces, BlockTable table, MinsetIndex index)
+		{
+			var coverage = new int[traces.Count][];
 
 			if (TraceMessage != null)
 				TraceMessage(this, "Loading {0} trace files...".Fmt(traces.Count));
@@ -146,118 +303,109 @@ namespace Peach.Core.Analysis
 
 				Logger.Debug("Loading '{0}'", trace);
 
-				using (var rdr = new StreamReader(trace))
-				{
-					long count = 0;
-
-					string line;
-					while ((line = rdr.ReadLine()) != null)
-					{
-						var delimiter = line.IndexOf(' ');
-						var strAddress = line.Substring(0, delimiter);
-						var strModule = line.Substring(delimiter + 1);
-
-						var module = modules.IndexOf(strModule);
-						if (module == -1)
-						{
-							module = modules.Count;
-							modules.Add(strModule);
-						}
-
-						var block = new BasicBlock
-						{
-							Module = (ushort)module,
-							Address = Convert.ToUInt64(strAddress, 16)
-						};
-
-						BitArray bits;
-						if (!db.TryGetValue(block, out bits))
-						{
-							bits = new BitArray(traces.Count);
-							db.Add(block, bits);
-						}
-						bits.Set(i, true);
-						count++;
-					}
-				
-					coverage[i] = count;
-				}
+				coverage[i] = table.Load(trace, index);
 
-				GC.Collect();
 				if (TraceLoaded != null)
 					TraceLoaded(this, i);
 			}
 
+			return coverage;
+		}
+
+		/// <summary>
+		/// Pick the traces that cover every block.
+		/// </summary>
+		/// <returns>Indexes of the kept traces, in the order they were picked</returns>
+		private List<int> Cover(int[][] coverage, BlockTable table)
+		{
 			if (TraceMessage != null)
-				TraceMessage(this, "Computing minimum set coverage...".Fmt(traces.Count));
+				TraceMessage(this, "Computing minimum set coverage...");
 
-			Logger.Debug("Loaded {0} files, starting minset computation", traces.Count);
+			Logger.Debug("Loaded {0} files, starting minset computation", coverage.Length);
 
-			var total = db.Count;
-			var ret = new List<string>();
-			var isFirst = true;
+			var blocks = table.Blocks;
+			var total = blocks.Count;
+			var covered = new BitArray(total);
+			var queue = new SortedSet<Candidate>(new CandidateComparer());
+			var ret = new List<int>();
+			var round = 0;
 
-			while (coverage.Count > 0)
+			for (var i = 0; i < coverage.Length; ++i)
 			{
-				// Find trace with greatest coverage
-				if (isFirst)
-				{
-					isFirst = false;
-				}
-				else
+				if (coverage[i].Length > 0)
+					queue.Add(new Candidate { Index = i, Gain = coverage[i].Length, Round = round });
+			}
+
+			while (queue.Count > 0)
+			{
+				var next = queue.Min;
+				queue.Remove(next);
+
+				if (next.Round != round)
 				{
-					foreach (var kv in db)
+					// Gain is stale, only keep the blocks that are still uncovered
+					var remaining = coverage[next.Index];
+					var count = 0;
+
+					foreach (var id in remaining)
 					{
-						for (var i = 0; i < kv.Value.Length; i++)
-						{
-							if (kv.Value[i])
-								coverage[i] += 1;
-						}
+						if (!covered[id])
+							remaining[count++] = id;
 					}
-				}
 
-				var max = coverage.Max(kv => kv.Value);
-				var keep = coverage.First(kv => kv.Value == max).Key;
+					Array.Resize(ref remaining, count);
 
-				if (max == 0)
-					break;
+					coverage[next.Index] = remaining;
+					next.Gain = count;
+					next.Round = round;
 
-				Logger.Debug("Keeping '{0}' with coverage {1}/{2}", keep, max, total);
+					if (next.Gain > 0)
+						queue.Add(next);
 
-				if (max < 10)
-				{
-					foreach (var x in db.Where(kv => kv.Value.Get(keep)))
-						Logger.Debug(x.Key);
+					continue;
 				}
 
-				ret.Add(samples[keep]);
+				var keep = next.Index;
+
+				Logger.Debug("Keeping '{0}' with coverage {1}/{2}", keep, next.Gain, total);
+
+				if (next.Gain < 10)
+				{
+					foreach (var id in coverage[keep].Where(id => !covered[id]))
+						Logger.Debug("0x{0:X} {1}", blocks[id].Address, blocks[id].Module);
+				}
 
-				// Don't track selected trace anymore
-				coverage.Remove(keep);
+				ret.Add(keep);
 
-				// Reset coverage counts to 0
-				foreach (var k in coverage.Keys.ToList())
-					coverage[k] = 0;
+				foreach (var id in coverage[keep])
+					covered[id] = true;
 
-				// Select all rows that are now covered
-				var prune = db
-					.Where(kv => kv.Value.Get(keep))
-					.Select(kv => kv.Key)
-					.ToList();
+				// Don't need the trace anymore
+				coverage[keep] = null;
 
-				// Remove all covered rows
-				foreach (var p in prune)
-					db.Remove(p);
+				++round;
 			}
 
-			Logger.Debug("Removing {0} sample files", coverage.Count);
+			Logger.Debug("Removing {0} sample files", coverage.Length - ret.Count);
 
-			foreach (var kv in coverage)
-				Logger.Debug(" - {0}", kv.Key);
+			for (var i = 0; i < coverage.Length; ++i)
+			{
+				if (coverage[i] != null)
+					Logger.Debug(" - {0}", i);
+			}
 
 			Logger.Debug("Done");
 
-			return ret.ToArray();
+			return ret;
+		}
+
+		enum TraceState
+		{
+			Pending,
+			Running,
+			Skipped,
+			Completed,
+			Failed,
 		}
 
 		/// <summary>
@@ -266,6 +414,16 @@ namespace Peach.Core.Analysis
 		/// <remarks>
 		/// This method will use the TraceStarting and TraceCompleted events
 		/// to report progress.
+		///
+		/// Up to Jobs samples are traced at the same time, each worker using
+		/// its own folder for the pin tool output.  Events are raised in the
+		/// order of the sample files no matter which worker finishes first.
+		///
+		/// The hash of each sample is saved next to its trace along with the
+		/// Coverage.Fingerprint of the executable, its arguments and the pin
+		/// tool.  Samples whose trace was made from the same contents with the
+		/// same fingerprint are not traced again, otherwise the old trace is
+		/// deleted before the sample is traced.
 		/// </remarks>
 		/// <param name="executable">Executable to run.</param>
 		/// <param name="arguments">Executable arguments.  Must contain a "%s" placeholder for the sampe filename.</param>
@@ -275,42 +433,155 @@ namespace Peach.Core.Analysis
 		/// <returns>Returns a collection of trace files</returns>
 		public string[] RunTraces(string executable, string arguments, string tracesFolder, string[] sampleFiles, bool needsKilling = false)
 		{
+			Coverage cov;
+
 			try
 			{
-				var cov = new Coverage(executable, arguments, needsKilling);
-				var ret = new List<string>();
+				cov = new Coverage(executable, arguments, needsKilling);
+			}
+			catch (Exception ex)
+			{
+				Logger.Debug(ex, "Failed to create coverage.");
 
-				for (var i = 0; i < sampleFiles.Length; ++i)
-				{
-					var sampleFile = sampleFiles[i];
-					var traceFile = Path.Combine(tracesFolder, Path.GetFileName(sampleFile) + ".trace");
+				throw new PeachException(ex.Message, ex);
+			}
 
-					Logger.Debug("Starting trace [{0}:{1}] {2}", i + 1, sampleFiles.Length, sampleFile);
+			return RunTraces(cov, tracesFolder, sampleFiles);
+		}
 
-					OnTraceStarting(sampleFile, i + 1, sampleFiles.Length);
+		internal string[] RunTraces(Coverage cov, string tracesFolder, string[] sampleFiles)
+		{
+			var workDirs = new List<TempDirectory>();
 
-					try
+			try
+			{
+				// Hash the executable and pin tool once for all the samples
+				var fingerprint = cov.Fingerprint;
+				var states = new TraceState[sampleFiles.Length];
+				var traceFiles = new string[sampleFiles.Length];
+				var sync = new object();
+				var reported = 0;
+				var started = -1;
+				var next = -1;
+
+				// Raise events for every sample that is done, in order, and
+				// the starting event for the next one once it is running
+				Action<int, TraceState> update = (i, state) =>
+				{
+					lock (sync)
 					{
-						cov.Run(sampleFile, traceFile);
-						ret.Add(traceFile);
-						Logger.Debug("Successfully created trace {0}", traceFile);
-						OnTraceCompleted(sampleFile, i + 1, sampleFiles.Length);
+						states[i] = state;
+
+						while (reported < states.Length && states[reported] != TraceState.Pending)
+						{
+							var sampleFile = sampleFiles[reported];
+
+							if (started < reported)
+							{
+								started = reported;
+								OnTraceStarting(sampleFile, reported + 1, sampleFiles.Length);
+							}
+
+							if (states[reported] == TraceState.Running)
+								break;
+
+							if (states[reported] == TraceState.Skipped)
+								OnTraceSkipped(sampleFile, reported + 1, sampleFiles.Length);
+							else if (states[reported] == TraceState.Completed)
+								OnTraceCompleted(sampleFile, reported + 1, sampleFiles.Length);
+							else
+								OnTraceFaled(sampleFile, reported + 1, sampleFiles.Length);
+
+							++reported;
+						}
 					}
-					catch (Exception ex)
+				};
+
+				Action<string> worker = workDir =>
+				{
+					int i;
+
+					while ((i = Interlocked.Increment(ref next)) < sampleFiles.Length)
 					{
-						Logger.Debug("Failed to generate trace.\n{0}", ex.Message);
-						OnTraceFaled(sampleFile, i + 1, sampleFiles.Length);
+						update(i, TraceState.Running);
+
+						var traceFile = Path.Combine(tracesFolder, Path.GetFileName(sampleFiles[i]) + ".trace");
+						var state = RunTrace(cov, fingerprint, sampleFiles[i], traceFile, workDir, i, sampleFiles.Length);
+
+						if (state != TraceState.Failed)
+							traceFiles[i] = traceFile;
+
+						update(i, state);
 					}
+				};
+
+				var jobs = Math.Max(1, Math.Min(Jobs, sampleFiles.Length));
+
+				if (jobs == 1)
+				{
+					// Keep the pin tool output in the current directory
+					worker(null);
+				}
+				else
+				{
+					for (var i = 0; i < jobs; ++i)
+						workDirs.Add(new TempDirectory());
+
+					var threads = workDirs.Select(d => new Thread(() => worker(d.Path))).ToList();
+
+					threads.ForEach(t => t.Start());
+					threads.ForEach(t => t.Join());
 				}
 
-				return ret.ToArray();
+				return traceFiles.Where(f => f != null).ToArray();
 			}
 			catch (Exception ex)
 			{
-				Logger.Debug(ex, "Failed to create coverage.");
+				Logger.Debug(ex, "Failed to collect traces.");
 
 				throw new PeachException(ex.Message, ex);
 			}
+			finally
+			{
+				foreach (var dir in workDirs)
+					dir.Dispose();
+			}
+		}
+
+		private TraceState RunTrace(Coverage cov, string fingerprint, string sampleFile, string traceFile, string workDir, int index, int total)
+		{
+			var hashFile = traceFile + ".sha1";
+
+			try
+			{
+				var hash = "{0} {1}".Fmt(fingerprint, Coverage.HashFile(sampleFile));
+
+				if (File.Exists(traceFile) && File.Exists(hashFile) && File.ReadAllText(hashFile) == hash)
+				{
+					Logger.Debug("Trace [{0}:{1}] {2} is up to date", index + 1, total, traceFile);
+					return TraceState.Skipped;
+				}
+
+				// Remove the hash first so a trace is never left looking up to date
+				// if tracing fails, and the stale trace so it is never returned
+				File.Delete(hashFile);
+				File.Delete(traceFile);
+
+				Logger.Debug("Starting trace [{0}:{1}] {2}", index + 1, total, sampleFile);
+
+				cov.Run(sampleFile, traceFile, workDir, TraceTimeout);
+				File.WriteAllText(hashFile, hash);
+
+				Logger.Debug("Successfully created trace {0}", traceFile);
+
+				return TraceState.Completed;
+			}
+			catch (Exception ex)
+			{
+				Logger.Debug("Failed to generate trace.\n{0}", ex.Message);
+
+				return TraceState.Failed;
+			}
 		}
 	}
 }
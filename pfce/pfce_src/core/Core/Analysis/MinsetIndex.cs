@@ -0,0 +1,200 @@
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+
+namespace Peach.Core.Analysis
+{
+	/// <summary>
+	/// The coverage and samples of a minimum set, saved between runs
+	/// so new samples can be added without recomputing the whole set.
+	/// </summary>
+	/// <remarks>
+	/// The index is saved in a little endian binary file:
+	///
+	///   uint32 magic          'PMSI'
+	///   uint32 version        1
+	///   int32  kept count
+	///   string kept[]         sample file names in the minimum set
+	///   int32  seen count
+	///   string seen[]         every sample file name that was checked
+	///   int32  module count
+	///   for each module:
+	///     string name
+	///     int32  block count
+	///     uint64 offsets[]    sorted
+	///
+	/// Strings are written by BinaryWriter.  Samples are identified
+	/// by file name, the same name they have in the minset folder.
+	/// </remarks>
+	public class MinsetIndex
+	{
+		public const uint Magic = 0x49534D50;
+		public const uint Version = 1;
+
+		readonly List<string> _kept = new List<string>();
+		readonly HashSet<string> _seen = new HashSet<string>();
+		readonly Dictionary<string, HashSet<ulong>> _covered = new Dictionary<string, HashSet<ulong>>();
+
+		/// <summary>
+		/// File names of the samples in the minimum set, in the order they were added.
+		/// </summary>
+		public IList<string> Samples
+		{
+			get { return _kept.AsReadOnly(); }
+		}
+
+		/// <summary>
+		/// Number of basic blocks covered by the minimum set.
+		/// </summary>
+		public long BlockCount
+		{
+			get { return _covered.Values.Sum(m => (long)m.Count); }
+		}
+
+		/// <summary>
+		/// Has the sample already been checked against the index.
+		/// </summary>
+		public bool HasSeen(string sampleFile)
+		{
+			return _seen.Contains(Path.GetFileName(sampleFile));
+		}
+
+		/// <summary>
+		/// Record that a sample was checked against the index.
+		/// </summary>
+		/// <param name="sampleFile">The sample file</param>
+		/// <param name="keep">Is the sample part of the minimum set</param>
+		public void AddSample(string sampleFile, bool keep)
+		{
+			var name = Path.GetFileName(sampleFile);
+
+			_seen.Add(name);
+
+			if (keep)
+				_kept.Add(name);
+		}
+
+		/// <summary>
+		/// Is the basic block covered by the minimum set.
+		/// </summary>
+		public bool IsCovered(string module, ulong address)
+		{
+			HashSet<ulong> blocks;
+			return _covered.TryGetValue(module, out blocks) && blocks.Contains(address);
+		}
+
+		/// <summary>
+		/// Mark a basic block as covered by the minimum set.
+		/// </summary>
+		/// <returns>False if the block was already covered</returns>
+		public bool AddBlock(string module, ulong address)
+		{
+			HashSet<ulong> blocks;
+			if (!_covered.TryGetValue(module, out blocks))
+			{
+				blocks = new HashSet<ulong>();
+				_covered.Add(module, blocks);
+			}
+
+			return blocks.Add(address);
+		}
+
+		/// <summary>
+		/// Load a saved index.
+		/// </summary>
+		/// <param name="path">File to load</param>
+		/// <returns>The saved index, or an empty one if the file does not exist</returns>
+		public static MinsetIndex Load(string path)
+		{
+			var ret = new MinsetIndex();
+
+			if (!File.Exists(path))
+				return ret;
+
+			try
+			{
+				using (var reader = new BinaryReader(File.OpenRead(path)))
+				{
+					if (reader.ReadUInt32() != Magic)
+						throw new PeachException("Error, '{0}' is not a minset index.".Fmt(path));
+
+					var version = reader.ReadUInt32();
+					if (version != Version)
+						throw new PeachException("Error, minset index '{0}' has unsupported version {1}.".Fmt(path, version));
+
+					var kept = reader.ReadInt32();
+					for (var i = 0; i < kept; ++i)
+						ret._kept.Add(reader.ReadString());
+
+					var seen = reader.ReadInt32();
+					for (var i = 0; i < seen; ++i)
+						ret._seen.Add(reader.ReadString());
+
+					var modules = reader.ReadInt32();
+					for (var i = 0; i < modules; ++i)
+					{
+						var name = reader.ReadString();
+						var count = reader.ReadInt32();
+						var blocks = new HashSet<ulong>();
+
+						for (var j = 0; j < count; ++j)
+							blocks.Add(reader.ReadUInt64());
+
+						ret._covered.Add(name, blocks);
+					}
+				}
+			}
+			catch (EndOfStreamException ex)
+			{
+				throw new PeachException("Error, minset index '{0}' is truncated.".Fmt(path), ex);
+			}
+
+			return ret;
+		}
+
+		/// <summary>
+		/// Save the index.
+		/// </summary>
+		/// <remarks>
+		/// The index is written to a temporary file first so an
+		/// interrupted save never loses the previous index.
+		/// </remarks>
+		/// <param name="path">File to save to</param>
+		public void Save(string path)
+		{
+			var tmp = path + ".tmp";
+
+			using (var writer = new BinaryWriter(File.Create(tmp)))
+			{
+				writer.Write(Magic);
+				writer.Write(Version);
+
+				writer.Write(_kept.Count);
+				foreach (var name in _kept)
+					writer.Write(name);
+
+				writer.Write(_seen.Count);
+				foreach (var name in _seen.OrderBy(n => n, StringComparer.Ordinal))
+					writer.Write(name);
+
+				writer.Write(_covered.Count);
+				foreach (var kv in _covered.OrderBy(kv => kv.Key, StringComparer.Ordinal))
+				{
+					var blocks = kv.Value.ToArray();
+					Array.Sort(blocks);
+
+					writer.Write(kv.Key);
+					writer.Write(blocks.Length);
+					foreach (var block in blocks)
+						writer.Write(block);
+				}
+			}
+
+			if (File.Exists(path))
+				File.Replace(tmp, path, null);
+			else
+				File.Move(tmp, path);
+		}
+	}
+}
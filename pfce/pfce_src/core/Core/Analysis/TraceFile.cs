@@ -0,0 +1,216 @@
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.IO.MemoryMappedFiles;
+using System.Text;
+
+namespace Peach.Core.Analysis
+{
+	/// <summary>
+	/// The basic blocks a trace hit in a single module.
+	/// </summary>
+	public class TraceModule
+	{
+		/// <summary>
+		/// Full path of the module.
+		/// </summary>
+		public string Name { get; set; }
+
+		/// <summary>
+		/// Offsets of the basic blocks from the module load address.
+		/// </summary>
+		public ulong[] Blocks { get; set; }
+	}
+
+	/// <summary>
+	/// Reads and writes the trace files created by the bblocks pin tool.
+	/// </summary>
+	/// <remarks>
+	/// Two formats are supported.  The text format has one "offset module"
+	/// line per basic block.  The binary format is little endian:
+	///
+	///   uint32 magic          'PBBT'
+	///   uint32 version        1
+	///   uint32 module count
+	///   for each module:
+	///     uint32 name length
+	///     byte[] name         UTF-8
+	///     uint32 block count
+	///     uint64 offsets[]    sorted, unique
+	///
+	/// Binary traces are memory mapped when read.
+	/// </remarks>
+	public static class TraceFile
+	{
+		public const uint Magic = 0x54424250;
+		public const uint Version = 1;
+
+		/// <summary>
+		/// Read a trace file in either format.
+		/// </summary>
+		/// <param name="path">Trace file to read</param>
+		/// <returns>The blocks hit in each module</returns>
+		public static List<TraceModule> Read(string path)
+		{
+			if (IsBinary(path))
+				return ReadBinary(path);
+
+			return ReadText(path);
+		}
+
+		/// <summary>
+		/// Write a trace file in the binary format.
+		/// </summary>
+		/// <param name="path">Trace file to write</param>
+		/// <param name="modules">The blocks hit in each module</param>
+		public static void Write(string path, IEnumerable<TraceModule> modules)
+		{
+			var list = new List<TraceModule>(modules);
+
+			using (var writer = new BinaryWriter(File.Create(path)))
+			{
+				writer.Write(Magic);
+				writer.Write(Version);
+				writer.Write((uint)list.Count);
+
+				foreach (var module in list)
+				{
+					var name = Encoding.UTF8.GetBytes(module.Name);
+					var blocks = (ulong[])module.Blocks.Clone();
+
+					Array.Sort(blocks);
+
+					var count = Unique(blocks);
+
+					writer.Write((uint)name.Length);
+					writer.Write(name);
+					writer.Write((uint)count);
+
+					for (var i = 0; i < count; ++i)
+						writer.Write(blocks[i]);
+				}
+			}
+		}
+
+		static bool IsBinary(string path)
+		{
+			using (var stream = new FileStream(path, FileMode.Open, FileAccess.Read, FileShare.Read))
+			{
+				var buf = new byte[4];
+
+				if (stream.Read(buf, 0, buf.Length) != buf.Length)
+					return false;
+
+				return BitConverter.ToUInt32(buf, 0) == Magic;
+			}
+		}
+
+		static List<TraceModule> ReadBinary(string path)
+		{
+			var ret = new List<TraceModule>();
+
+			// The capacity of the view is rounded up to the page size
+			var length = new FileInfo(path).Length;
+
+			using (var mmf = MemoryMappedFile.CreateFromFile(path, FileMode.Open, null, 0, MemoryMappedFileAccess.Read))
+			using (var view = mmf.CreateViewAccessor(0, 0, MemoryMappedFileAccess.Read))
+			{
+				long pos = 4;
+
+				Func<long, long> take = size =>
+				{
+					if (size < 0 || length - pos < size)
+						throw new PeachException("Error, trace file '{0}' is truncated.".Fmt(path));
+
+					var at = pos;
+					pos += size;
+					return at;
+				};
+
+				var version = view.ReadUInt32(take(4));
+				if (version != Version)
+					throw new PeachException("Error, trace file '{0}' has unsupported version {1}.".Fmt(path, version));
+
+				var moduleCount = view.ReadUInt32(take(4));
+
+				for (var i = 0; i < moduleCount; ++i)
+				{
+					var nameLength = view.ReadUInt32(take(4));
+					var name = new byte[nameLength];
+					var namePos = take(nameLength);
+					if (name.Length > 0)
+						view.ReadArray(namePos, name, 0, name.Length);
+
+					var blockCount = view.ReadUInt32(take(4));
+					var blocks = new ulong[blockCount];
+					var blocksPos = take(8L * blockCount);
+					if (blocks.Length > 0)
+						view.ReadArray(blocksPos, blocks, 0, blocks.Length);
+
+					ret.Add(new TraceModule
+					{
+						Name = Encoding.UTF8.GetString(name),
+						Blocks = blocks,
+					});
+				}
+			}
+
+			return ret;
+		}
+
+		static List<TraceModule> ReadText(string path)
+		{
+			var modules = new Dictionary<string, List<ulong>>();
+
+			using (var rdr = new StreamReader(path))
+			{
+				string line;
+				while ((line = rdr.ReadLine()) != null)
+				{
+					var delimiter = line.IndexOf(' ');
+					if (delimiter == -1)
+						continue;
+
+					var strAddress = line.Substring(0, delimiter);
+					var strModule = line.Substring(delimiter + 1);
+
+					List<ulong> blocks;
+					if (!modules.TryGetValue(strModule, out blocks))
+					{
+						blocks = new List<ulong>();
+						modules.Add(strModule, blocks);
+					}
+
+					blocks.Add(Convert.ToUInt64(strAddress, 16));
+				}
+			}
+
+			var ret = new List<TraceModule>(modules.Count);
+
+			foreach (var kv in modules)
+				ret.Add(new TraceModule { Name = kv.Key, Blocks = kv.Value.ToArray() });
+
+			return ret;
+		}
+
+		/// <summary>
+		/// Remove duplicates from a sorted array.
+		/// </summary>
+		/// <returns>The number of unique items at the start of the array</returns>
+		internal static int Unique<T>(T[] sorted) where T : IEquatable<T>
+		{
+			if (sorted.Length == 0)
+				return 0;
+
+			var count = 1;
+
+			for (var i = 1; i < sorted.Length; ++i)
+			{
+				if (!sorted[i].Equals(sorted[count - 1]))
+					sorted[count++] = sorted[i];
+			}
+
+			return count;
+		}
+	}
+}
@@ -455,6 +455,10 @@ namespace Peach.Core.Analyzers
 					foreach (var item in dm.EnumerateAllElements())
 						foreach (var rel in item.relations.From<Binding>())
 							rel.Resolve();
+
+					// Order the relations and fixups for evaluation
+					dm.ResetDependencies();
+					logger.Trace("DataModel '{0}' has {1} relations and fixups.", dm.Name, dm.Dependencies.Order.Count);
 				}
 			}
 
@@ -1462,6 +1466,9 @@ namespace Peach.Core.Analyzers
 
 			handleActionData(node, action.data, "", false);
 
+			if (node.hasAttr("stream"))
+				action.stream = node.getAttrBool("stream");
+
 			handleActionAttr(node, action, "ref", "method", "property", "setXpath", "valueXpath");
 		}
 
@@ -0,0 +1,426 @@
+using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using System.Numerics;
+
+namespace Peach.Core
+{
+	/// <summary>
+	/// Integer arithmetic expressions, like "size * 8" or "count + 1",
+	/// that are evaluated without going through the script engine.
+	/// </summary>
+	/// <remarks>
+	/// Integer literals, variables, parentheses, unary + and - and the
+	/// +, -, *, /, // and % operators are supported with the semantics
+	/// of python 2.  The result has the same type the python engine
+	/// would return.  Anything else, or a variable that is not an integer,
+	/// falls back to the script engine.
+	///
+	/// Parsed expressions do not depend on a script engine, so they are
+	/// shared by every Scripting instance in the process.
+	/// </remarks>
+	internal class ArithmeticExpression
+	{
+		/// <summary>
+		/// How the python engine represents an integer.
+		/// </summary>
+		enum Rank
+		{
+			Int,
+			Long,
+			Big,
+		}
+
+		struct Operand
+		{
+			public BigInteger Value;
+			public Rank Rank;
+		}
+
+		delegate bool Evaluator(Dictionary<string, object> scope, out Operand result);
+
+		static readonly ConcurrentDictionary<string, ArithmeticExpression> Cache =
+			new ConcurrentDictionary<string, ArithmeticExpression>();
+
+		static readonly ArithmeticExpression NotArithmetic = new ArithmeticExpression(null, null);
+
+		readonly string _code;
+		readonly Evaluator _eval;
+
+		ArithmeticExpression(string code, Evaluator eval)
+		{
+			_code = code;
+			_eval = eval;
+		}
+
+		/// <summary>
+		/// Get the compiled form of an expression.
+		/// </summary>
+		/// <param name="code">Expression to compile</param>
+		/// <returns>The compiled expression or null if it is not simple arithmetic</returns>
+		public static ArithmeticExpression Get(string code)
+		{
+			var ret = Cache.GetOrAdd(code, Compile);
+			return ret == NotArithmetic ? null : ret;
+		}
+
+		/// <summary>
+		/// Evaluate the expression.
+		/// </summary>
+		/// <param name="scope">Variables for the expression</param>
+		/// <param name="result">Result of the expression</param>
+		/// <returns>False if a variable is missing or not an integer</returns>
+		public bool TryEvaluate(Dictionary<string, object> scope, out object result)
+		{
+			Operand op;
+
+			try
+			{
+				if (!_eval(scope, out op))
+				{
+					result = null;
+					return false;
+				}
+			}
+			catch (DivideByZeroException ex)
+			{
+				throw new SoftException("Failed to evaluate expression [{0}], {1}.".Fmt(_code, ex.Message), ex);
+			}
+
+			switch (op.Rank)
+			{
+				case Rank.Int:
+					result = (int)op.Value;
+					break;
+				case Rank.Long:
+					result = (long)op.Value;
+					break;
+				default:
+					try
+					{
+						if (op.Value.Sign < 0)
+							result = (long)op.Value;
+						else
+							result = (ulong)op.Value;
+					}
+					catch (OverflowException ex)
+					{
+						throw new SoftException(ex);
+					}
+					break;
+			}
+
+			return true;
+		}
+
+		#region Evaluation
+
+		static bool TryGetOperand(object value, out Operand result)
+		{
+			result = new Operand();
+
+			if (value is int || value is short || value is ushort || value is byte || value is sbyte)
+			{
+				result.Value = Convert.ToInt32(value);
+				result.Rank = Rank.Int;
+			}
+			else if (value is long || value is uint)
+			{
+				result.Value = Convert.ToInt64(value);
+				result.Rank = Rank.Long;
+			}
+			else if (value is ulong)
+			{
+				result.Value = (ulong)value;
+				result.Rank = Rank.Big;
+			}
+			else if (value is BigInteger)
+			{
+				result.Value = (BigInteger)value;
+				result.Rank = Rank.Big;
+			}
+			else
+			{
+				return false;
+			}
+
+			return true;
+		}
+
+		static Operand MakeOperand(BigInteger value, Rank rank)
+		{
+			// Python promotes to a long integer on overflow
+			if (rank == Rank.Int && (value < int.MinValue || value > int.MaxValue))
+				rank = Rank.Big;
+			else if (rank == Rank.Long && (value < long.MinValue || value > long.MaxValue))
+				rank = Rank.Big;
+
+			return new Operand { Value = value, Rank = rank };
+		}
+
+		static BigInteger FloorDivide(BigInteger lhs, BigInteger rhs)
+		{
+			BigInteger rem;
+			var ret = BigInteger.DivRem(lhs, rhs, out rem);
+
+			if (!rem.IsZero && rem.Sign != rhs.Sign)
+				--ret;
+
+			return ret;
+		}
+
+		static BigInteger Modulo(BigInteger lhs, BigInteger rhs)
+		{
+			var ret = BigInteger.Remainder(lhs, rhs);
+
+			if (!ret.IsZero && ret.Sign != rhs.Sign)
+				ret += rhs;
+
+			return ret;
+		}
+
+		static Operand Apply(string op, Operand lhs, Operand rhs)
+		{
+			var rank = lhs.Rank > rhs.Rank ? lhs.Rank : rhs.Rank;
+
+			switch (op)
+			{
+				case "+":
+					return MakeOperand(lhs.Value + rhs.Value, rank);
+				case "-":
+					return MakeOperand(lhs.Value - rhs.Value, rank);
+				case "*":
+					return MakeOperand(lhs.Value * rhs.Value, rank);
+				case "%":
+					return MakeOperand(Modulo(lhs.Value, rhs.Value), rank);
+				default:
+					// Both '/' and '//' are floor division on integers
+					return MakeOperand(FloorDivide(lhs.Value, rhs.Value), rank);
+			}
+		}
+
+		#endregion
+
+		#region Compile
+
+		class Parser
+		{
+			readonly string _code;
+			int _pos;
+
+			public Parser(string code)
+			{
+				_code = code;
+			}
+
+			public Evaluator Parse()
+			{
+				var ret = ParseSum();
+
+				if (ret == null || Peek() != null)
+					return null;
+
+				return ret;
+			}
+
+			// sum := product (('+' | '-') product)*
+			Evaluator ParseSum()
+			{
+				var lhs = ParseProduct();
+
+				for (var op = Peek(); lhs != null && (op == "+" || op == "-"); op = Peek())
+				{
+					Next();
+					lhs = Binary(op, lhs, ParseProduct());
+				}
+
+				return lhs;
+			}
+
+			// product := unary (('*' | '/' | '//' | '%') unary)*
+			Evaluator ParseProduct()
+			{
+				var lhs = ParseUnary();
+
+				for (var op = Peek(); lhs != null && (op == "*" || op == "/" || op == "//" || op == "%"); op = Peek())
+				{
+					Next();
+					lhs = Binary(op, lhs, ParseUnary());
+				}
+
+				return lhs;
+			}
+
+			// unary := ('+' | '-') unary | atom
+			Evaluator ParseUnary()
+			{
+				var op = Peek();
+
+				if (op == "+" || op == "-")
+				{
+					Next();
+
+					var operand = ParseUnary();
+					if (operand == null)
+						return null;
+
+					if (op == "+")
+						return operand;
+
+					return (Dictionary<string, object> scope, out Operand result) =>
+					{
+						if (!operand(scope, out result))
+							return false;
+
+						result = MakeOperand(-result.Value, result.Rank);
+						return true;
+					};
+				}
+
+				return ParseAtom();
+			}
+
+			// atom := integer | name | '(' sum ')'
+			Evaluator ParseAtom()
+			{
+				var tok = Next();
+
+				if (tok == null)
+					return null;
+
+				if (tok == "(")
+				{
+					var ret = ParseSum();
+					return Next() == ")" ? ret : null;
+				}
+
+				if (char.IsDigit(tok[0]))
+				{
+					BigInteger value;
+					if (!TryParseInteger(tok, out value))
+						return null;
+
+					var literal = MakeOperand(value, Rank.Int);
+
+					return (Dictionary<string, object> scope, out Operand result) =>
+					{
+						result = literal;
+						return true;
+					};
+				}
+
+				if (tok[0] == '_' || char.IsLetter(tok[0]))
+				{
+					return (Dictionary<string, object> scope, out Operand result) =>
+					{
+						object value;
+
+						if (scope.TryGetValue(tok, out value))
+							return TryGetOperand(value, out result);
+
+						result = new Operand();
+						return false;
+					};
+				}
+
+				return null;
+			}
+
+			static Evaluator Binary(string op, Evaluator lhs, Evaluator rhs)
+			{
+				if (rhs == null)
+					return null;
+
+				return (Dictionary<string, object> scope, out Operand result) =>
+				{
+					Operand a, b;
+
+					if (!lhs(scope, out a) || !rhs(scope, out b))
+					{
+						result = new Operand();
+						return false;
+					}
+
+					result = Apply(op, a, b);
+					return true;
+				};
+			}
+
+			static bool TryParseInteger(string tok, out BigInteger value)
+			{
+				value = BigInteger.Zero;
+
+				if (tok.Length > 2 && tok[0] == '0' && (tok[1] == 'x' || tok[1] == 'X'))
+				{
+					for (var i = 2; i < tok.Length; ++i)
+					{
+						var digit = Uri.IsHexDigit(tok[i]) ? Uri.FromHex(tok[i]) : -1;
+						if (digit == -1)
+							return false;
+
+						value = value * 16 + digit;
+					}
+
+					return true;
+				}
+
+				// Leading zeros are octal literals
+				if (tok.Length > 1 && tok[0] == '0')
+					return false;
+
+				foreach (var ch in tok)
+				{
+					if (ch < '0' || ch > '9')
+						return false;
+
+					value = value * 10 + (ch - '0');
+				}
+
+				return true;
+			}
+
+			string Peek()
+			{
+				var pos = _pos;
+				var ret = Next();
+				_pos = pos;
+				return ret;
+			}
+
+			string Next()
+			{
+				while (_pos < _code.Length && (_code[_pos] == ' ' || _code[_pos] == '\t'))
+					++_pos;
+
+				if (_pos == _code.Length)
+					return null;
+
+				var start = _pos;
+				var ch = _code[_pos++];
+
+				if (char.IsLetterOrDigit(ch) || ch == '_')
+				{
+					// Names, and literals with a suffix, are consumed whole
+					// so anything unsupported fails to parse.
+					while (_pos < _code.Length && (char.IsLetterOrDigit(_code[_pos]) || _code[_pos] == '_' || _code[_pos] == '.'))
+						++_pos;
+				}
+				else if ((ch == '/' || ch == '*') && _pos < _code.Length && _code[_pos] == ch)
+				{
+					++_pos;
+				}
+
+				return _code.Substring(start, _pos - start);
+			}
+		}
+
+		static ArithmeticExpression Compile(string code)
+		{
+			var eval = new Parser(code).Parse();
+
+			return eval == null ? NotArithmetic : new ArithmeticExpression(code, eval);
+		}
+
+		#endregion
+	}
+}
@@ -0,0 +1,102 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Peach.Core.Dom;
+
+using Array = Peach.Core.Dom.Array;
+
+namespace Peach.Core.Cracker
+{
+	/// <summary>
+	/// Information about a data model that does not change between cracks.
+	/// </summary>
+	/// <remarks>
+	/// The plan is computed once on an uncracked data model by
+	/// DataCracker.OptimizeDataModel() and is shared by every clone
+	/// of the model.  Any change to the structure of the model drops
+	/// the plan, so it always describes the model as it was defined
+	/// in the pit.
+	/// </remarks>
+	public class CrackPlan
+	{
+		private readonly Dictionary<string, long> _fixedSizes = new Dictionary<string, long>();
+
+		public CrackPlan(DataModel model)
+		{
+			RootName = model.Name;
+
+			Compute(model);
+		}
+
+		/// <summary>
+		/// Name of the data model the plan was computed for.
+		/// </summary>
+		public string RootName { get; private set; }
+
+		/// <summary>
+		/// Number of elements with a fixed size.
+		/// </summary>
+		public int Count
+		{
+			get { return _fixedSizes.Count; }
+		}
+
+		/// <summary>
+		/// Get the size in bits of an element whose size, and the size
+		/// of all its children, does not depend on the data being cracked.
+		/// </summary>
+		/// <remarks>
+		/// An element has a fixed size if it is not a token, is not placed,
+		/// is not sized by a size or offset relation, and either has a length
+		/// or is a block where every child has a fixed size.
+		/// </remarks>
+		public bool TryGetFixedSize(DataElement elem, out long size)
+		{
+			return _fixedSizes.TryGetValue(elem.fullName, out size);
+		}
+
+		private long? Compute(DataElement elem)
+		{
+			var cont = elem as DataElementContainer;
+			long? size = null;
+
+			if (cont != null)
+			{
+				// Compute every child so nested blocks are in the plan
+				// even when this container is not fixed
+				var children = cont.Children().Select(Compute).ToList();
+
+				if (cont is Choice || cont is Array)
+					return null;
+
+				if (!cont.hasLength && cont.transformer == null && children.All(s => s.HasValue))
+					size = children.Sum(s => s.Value);
+			}
+
+			if (elem.isToken || elem.placement != null || elem is Padding)
+				return null;
+
+			if (elem.relations.HasOf<SizeRelation>() || elem.relations.HasOf<OffsetRelation>())
+				return null;
+
+			if (!size.HasValue)
+			{
+				if (!elem.hasLength)
+					return null;
+
+				try
+				{
+					size = elem.lengthAsBits;
+				}
+				catch (NotSupportedException)
+				{
+					return null;
+				}
+			}
+
+			_fixedSizes[elem.fullName] = size.Value;
+
+			return size;
+		}
+	}
+}
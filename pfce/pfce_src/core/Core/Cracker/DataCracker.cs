@@ -118,6 +118,21 @@ namespace Peach.Core.Cracker
 		/// </summary>
 		DataElement _root;
 
+		/// <summary>
+		/// Sizes that were computed ahead of time for the model being cracked.
+		/// </summary>
+		CrackPlan _plan;
+
+		/// <summary>
+		/// The stream that cracked data is released from when streaming.
+		/// </summary>
+		BitStream _release;
+
+		/// <summary>
+		/// Number of bytes to wait for at a time when skipping data.
+		/// </summary>
+		const long SkipChunk = 0x10000;
+
 		/// <summary>
 		/// The string to prefix log messages with.
 		/// </summary>
@@ -184,6 +199,21 @@ namespace Peach.Core.Cracker
 			_logPrefix = new StringBuilder();
 		}
 
+		/// <summary>
+		/// Release data back to the publisher as soon as it has been cracked.
+		/// </summary>
+		/// <remarks>
+		/// Only data that can not be read again is released.  Choices and
+		/// array entries that are still being cracked keep everything from
+		/// where they started since they rewind on failure.  Data models
+		/// with placements or offset relations seek back to earlier data,
+		/// so they are always cracked from a fully buffered stream.
+		/// Sized containers don't wait for all of their data before
+		/// cracking their children, so the data they contain is released
+		/// as it is cracked too.
+		/// </remarks>
+		public bool Streaming { get; set; }
+
 		/// <summary>
 		/// Returns a new DataCracker with the log prefix maintained.
 		/// </summary>
@@ -255,6 +285,61 @@ namespace Peach.Core.Cracker
 			return _sizedElements.ContainsKey(rel.From);
 		}
 
+		/// <summary>
+		/// Move past data without reading it.
+		/// </summary>
+		/// <remarks>
+		/// Used by elements that don't keep their value.  The data is
+		/// waited for a chunk at a time and, when streaming, released
+		/// as it is passed over so the publisher never has to buffer
+		/// all of it.
+		/// </remarks>
+		/// <param name="elem">Element being cracked</param>
+		/// <param name="data">Data stream to skip data in</param>
+		/// <param name="lengthBits">Number of bits to skip</param>
+		public void Skip(DataElement elem, BitStream data, long lengthBits)
+		{
+			for (long read = 0; read < lengthBits; )
+			{
+				var count = Math.Min(lengthBits - read, SkipChunk * 8);
+
+				data.WantBytes((count + 7) / 8);
+
+				var remain = data.LengthBits - data.PositionBits;
+
+				if (count > remain)
+				{
+					if (read == 0)
+						throw new CrackingFailure("Length is {0} bits but buffer only has {1} bits left."
+							.Fmt(lengthBits, remain), elem, data);
+
+					throw new CrackingFailure("Read {0} of {1} bits but buffer only has {2} bits left."
+						.Fmt(read, lengthBits, remain), elem, data);
+				}
+
+				data.SeekBits(count, System.IO.SeekOrigin.Current);
+				read += count;
+
+				releaseData(elem, data, data.PositionBits + getDataOffset());
+			}
+		}
+
+		/// <summary>
+		/// Can data be cracked from a window that waits for data
+		/// as it is read and is released as it is cracked.
+		/// </summary>
+		/// <param name="data">Data stream being cracked</param>
+		/// <returns>True if data reads from the publisher being streamed</returns>
+		public bool CanStream(BitStream data)
+		{
+			if (_release == null)
+				return false;
+
+			var pub = _release.BasePublisher;
+
+			return pub != null && data.BasePublisher == pub;
+		}
+
 		/// <summary>
 		/// Perform optimizations of data model for cracking
 		/// </summary>
@@ -266,13 +351,9 @@ namespace Peach.Core.Cracker
 		/// <param name="model">DataModel to optimize</param>
 		public void OptimizeDataModel(DataModel model)
 		{
-			foreach (var element in model.EnumerateElementsUpTree())
-			{
-				if (element is Choice)
-				{
-					// TODO - Fast CACHE IT!
-				}
-			}
+			model.CrackPlan = new CrackPlan(model);
+
+			logger.Trace("OptimizeDataModel: {0} has {1} fixed size elements", model.debugName, model.CrackPlan.Count);
 		}
 
 		/// <summary>
@@ -424,6 +505,22 @@ namespace Peach.Core.Cracker
 			_absolutePlacement = new SortedDictionary<long, DataElement>();
 			_root = element;
 
+			// The model drops its plan if the structure is changed,
+			// so keep our own reference for the duration of the crack.
+			var model = element.root as DataModel;
+			if (model != null && model.CrackPlan != null && model.CrackPlan.RootName == model.Name)
+				_plan = model.CrackPlan;
+			else
+				_plan = null;
+
+			if (Streaming && CanRelease(element))
+				_release = data;
+			else
+				_release = null;
+
+			if (Streaming && _release == null)
+				logger.Debug("Not streaming {0}, it has placements or offset relations.", element.debugName);
+
 			// We want at least 1 byte before we begin
 			data.WantBytes(1);
 
@@ -530,38 +627,41 @@ namespace Peach.Core.Cracker
 				logger.Trace("------------------------------------");
 				logger.Trace("{0} {1}", elem.debugName, data.Progress);
 
-				var pos = handleNodeBegin(elem, data);
-
-				if (elem.transformer != null)
+				using (Profiler.Measure(ProfileKind.Crack, elem.fullName))
 				{
-					long startPos = data.PositionBits;
-					var sizedData = elem.ReadSizedData(data, pos.size);
-					var decodedData = elem.transformer.decode(sizedData);
+					var pos = handleNodeBegin(elem, data);
 
-					// Make a new stack of data for the decoded data
-					oldStack = _dataStack;
-					_dataStack = new List<BitStream>();
-					_dataStack.Add(decodedData);
+					if (elem.transformer != null)
+					{
+						long startPos = data.PositionBits;
+						var sizedData = elem.ReadSizedData(data, pos.size);
+						var decodedData = elem.transformer.decode(sizedData);
 
-					// Use the size of the transformed data as the new size of the element
-					handleCrack(elem, decodedData, decodedData.LengthBits);
+						// Make a new stack of data for the decoded data
+						oldStack = _dataStack;
+						_dataStack = new List<BitStream>();
+						_dataStack.Add(decodedData);
 
-					// Make sure the non-decoded data is at the right place
-					if (data == decodedData)
-						data.SeekBits(startPos + decodedData.LengthBits, System.IO.SeekOrigin.Begin);
-				}
-				else
-				{
-					handleCrack(elem, data, pos.size);
-				}
+						// Use the size of the transformed data as the new size of the element
+						handleCrack(elem, decodedData, decodedData.LengthBits);
+
+						// Make sure the non-decoded data is at the right place
+						if (data == decodedData)
+							data.SeekBits(startPos + decodedData.LengthBits, System.IO.SeekOrigin.Begin);
+					}
+					else
+					{
+						handleCrack(elem, data, pos.size);
+					}
 
-				if (elem.constraint != null)
-					handleConstraint(elem, data);
+					if (elem.constraint != null)
+						handleConstraint(elem, data);
 
-				if (elem.analyzer != null)
-					_elementsWithAnalyzer.Add(elem);
+					if (elem.analyzer != null)
+						_elementsWithAnalyzer.Add(elem);
 
-				handleNodeEnd(elem, data, pos);
+					handleNodeEnd(elem, data, pos);
+				}
 			}
 			catch (Exception e)
 			{
@@ -666,6 +766,9 @@ namespace Peach.Core.Cracker
 			var oldParent = element.parent;
 			var next = element.nextSibling();
 
+			// Placement changes the size of the containers involved
+			_plan = null;
+
 
 			if (after)
 			{
@@ -928,6 +1031,48 @@ namespace Peach.Core.Cracker
 				if (elem is DataElementContainer)
 					Logger.Debug("{0} /", _logPrefix);
 			}
+
+			releaseData(elem, data, pos.end);
+		}
+
+		/// <summary>
+		/// Release the data before position back to the publisher, keeping
+		/// anything choices and arrays being cracked might rewind to.
+		/// </summary>
+		void releaseData(DataElement elem, BitStream data, long position)
+		{
+			// Only release when cracking from the publisher or windows
+			// of it, data decoded by transformers is still needed.
+			if (!CanStream(data) || !_dataStack.TrueForAll(CanStream))
+				return;
+
+			for (DataElement child = elem, parent = elem.parent; parent != null; child = parent, parent = parent.parent)
+			{
+				SizedPosition pos;
+
+				if (parent is Choice && _sizedElements.TryGetValue(parent, out pos))
+					position = Math.Min(position, pos.begin);
+				else if (parent is Array && _sizedElements.TryGetValue(child, out pos))
+					position = Math.Min(position, pos.begin);
+			}
+
+			_release.Release(position / 8);
+		}
+
+		static bool CanRelease(DataElement elem)
+		{
+			if (elem.placement != null || elem.relations.HasOf<OffsetRelation>())
+				return false;
+
+			var cont = elem as DataElementContainer;
+			if (cont == null)
+				return true;
+
+			var choice = cont as Choice;
+			if (choice != null)
+				return choice.choiceElements.All(CanRelease);
+
+			return cont.Children().All(CanRelease);
 		}
 
 		void handleCrack(DataElement elem, BitStream data, long? size)
@@ -1155,6 +1300,16 @@ namespace Peach.Core.Cracker
 		/// True if all elements are sized.</returns>
 		bool? scan(DataElement elem, ref long pos, List<Mark> tokens, Mark end, Until until)
 		{
+			// Elements in the plan have no tokens, offset relations or
+			// size relations, so the walk below would only add up lengths.
+			long fixedSize;
+			if (until == Until.FirstUnsized && _plan != null && _plan.TryGetFixedSize(elem, out fixedSize))
+			{
+				pos += fixedSize;
+				logger.Trace("scan: {0} -> Pos: {1}, Fixed size: {2}", elem.debugName, pos, fixedSize);
+				return true;
+			}
+
 			if (elem.isToken)
 			{
 				tokens.Add(new Mark() { Element = elem, Position = pos, Priority = 0 });
@@ -371,6 +371,11 @@ namespace Peach.Core.Dom
 				try
 				{
 					OnRun(publisher, context);
+
+					// Remote publishers can defer calls to their agent,
+					// make sure they are sent before the next action runs
+					if (context.agentManager != null)
+						context.agentManager.Flush();
 				}
 				finally
 				{
@@ -75,6 +75,20 @@ namespace Peach.Core.Dom
 		/// </summary>
 		public DataModel originalDataModel { get; private set; }
 
+		/// <summary>
+		/// The data model most recently restored from originalDataModel.
+		/// As long as nothing has invalidated it, it is still identical
+		/// to originalDataModel and can be reused instead of cloned.
+		/// </summary>
+		[NonSerialized]
+		private DataModel _restoredModel;
+
+		[NonSerialized]
+		private bool _restoredModified;
+
+		[NonSerialized]
+		private bool _restoredReusable;
+
 		/// <summary>
 		/// Is this action data part of an input/getProperty/call-result action
 		/// </summary>
@@ -160,6 +174,7 @@ namespace Peach.Core.Dom
 					// been cracked (eg: Placement won't work).
 					dataModel.actionData = null;
 					sourceDataModel = dataModel;
+					new DataCracker().OptimizeDataModel(sourceDataModel);
 					Apply(option);
 				}
 				else
@@ -169,14 +184,72 @@ namespace Peach.Core.Dom
 					var val = dataModel.Value;
 					System.Diagnostics.Debug.Assert(val != null);
 
+					// Clones share the plan for cracking input into
+					new DataCracker().OptimizeDataModel(dataModel);
+
 					originalDataModel = dataModel.Clone() as DataModel;
+
+					TrackModifications(dataModel);
 				}
 			}
+			else if (dataModel == _restoredModel && _restoredReusable && !_restoredModified)
+			{
+				// Nothing touched the model last iteration so it is
+				// still the same as originalDataModel, skip the clone.
+				dataModel.actionData = this;
+			}
 			else
 			{
 				dataModel = originalDataModel.Clone() as DataModel;
 				dataModel.actionData = this;
+
+				TrackModifications(dataModel);
 			}
+
+			// Count relation and fixup evaluations per iteration
+			dataModel.ResetEvaluationCounts();
+		}
+
+		/// <summary>
+		/// Start watching model for changes.  Any change to an element
+		/// invalidates its ancestors, so watching the root is enough to know
+		/// if the model still matches originalDataModel.
+		/// </summary>
+		private void TrackModifications(DataModel model)
+		{
+			if (_restoredModel != null)
+				_restoredModel.Invalidated -= OnRestoredModelInvalidated;
+
+			_restoredModel = model;
+			_restoredModified = false;
+			_restoredReusable = IsDeterministic(model);
+			_restoredModel.Invalidated += OnRestoredModelInvalidated;
+		}
+
+		/// <summary>
+		/// Can the model be reused without running its fixups and
+		/// transformers again.
+		/// </summary>
+		private static bool IsDeterministic(DataModel model)
+		{
+			foreach (var elem in model.PreOrderTraverse())
+			{
+				if (elem.fixup != null && !elem.fixup.IsDeterministic)
+					return false;
+
+				for (var t = elem.transformer; t != null; t = t.anotherTransformer)
+				{
+					if (!t.IsDeterministic)
+						return false;
+				}
+			}
+
+			return true;
+		}
+
+		private void OnRestoredModelInvalidated(object sender, EventArgs e)
+		{
+			_restoredModified = true;
 		}
 
 		/// <summary>
@@ -202,6 +275,7 @@ namespace Peach.Core.Dom
 				// been cracked (eg: Placement won't work).
 				dataModel.actionData = null;
 				sourceDataModel = dataModel;
+				new DataCracker().OptimizeDataModel(sourceDataModel);
 			}
 
 			// Work in a clean copy of the original
@@ -216,6 +290,9 @@ namespace Peach.Core.Dom
 			originalDataModel = copy;
 			selectedData = option;
 
+			// The current model came from the previous original
+			_restoredModified = true;
+
 			UpdateToOriginalDataModel();
 		}
 
@@ -6,6 +6,8 @@ using Peach.Core.IO;
 using System.Collections.Generic;
 using System.Linq;
 using System.Xml;
+using System.Xml.Serialization;
+using System.ComponentModel;
 using NLog;
 
 namespace Peach.Core.Dom.Actions
@@ -20,6 +22,13 @@ namespace Peach.Core.Dom.Actions
 
 		public ActionData data { get; set; }
 
+		/// <summary>
+		/// Release input data back to the publisher as it is cracked
+		/// </summary>
+		[XmlAttribute]
+		[DefaultValue(false)]
+		public bool stream { get; set; }
+
 		public override IEnumerable<ActionData> allData
 		{
 			get
@@ -50,7 +59,7 @@ namespace Peach.Core.Dom.Actions
 
 			try
 			{
-				var cracker = new DataCracker();
+				var cracker = new DataCracker { Streaming = stream };
 				cracker.CrackData(data.dataModel, new BitStream(pub));
 
 				endPos = pub.Position;
@@ -73,8 +82,9 @@ namespace Peach.Core.Dom.Actions
 				// since other actions can potentially close/stop the
 				// publisher before inputData is enumerated.
 				// For example, logging with a fault on a control iteration.
+				// When streaming, the data has already been released.
 
-				if (startPos < endPos)
+				if (startPos < endPos && !stream)
 				{
 					pub.Seek(startPos, SeekOrigin.Begin);
 
@@ -155,7 +155,7 @@ namespace Peach.Core.Dom
 		public override void Crack(DataCracker context, BitStream data, long? size)
 		{
 			long startPos = data.PositionBits;
-			BitStream sizedData = ReadSizedData(data, size);
+			BitStream sizedData = ReadSizedData(context, data, size);
 
 			if (OriginalElement == null)
 				throw new CrackingFailure("No original element was found.", this, data);
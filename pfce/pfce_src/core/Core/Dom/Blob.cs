@@ -11,6 +11,7 @@ using System.IO;
 using System.Xml;
 
 using Peach.Core.Analyzers;
+using Peach.Core.Cracker;
 using Peach.Core.IO;
 
 namespace Peach.Core.Dom
@@ -29,6 +30,7 @@ namespace Peach.Core.Dom
 	[Parameter("valueType", typeof(ValueType), "Format of value attribute", "string")]
 	[Parameter("token", typeof(bool), "Is element a token", "false")]
 	[Parameter("mutable", typeof(bool), "Is element mutable", "true")]
+	[Parameter("retain", typeof(bool), "Keep the cracked value of the element", "true")]
 	[Parameter("constraint", typeof(string), "Scripting expression that evaluates to true or false", "")]
 	[Parameter("minOccurs", typeof(int), "Minimum occurances", "1")]
 	[Parameter("maxOccurs", typeof(int), "Maximum occurances", "1")]
@@ -36,6 +38,8 @@ namespace Peach.Core.Dom
 	[Serializable]
 	public class Blob : DataElement
 	{
+		protected bool _retain = true;
+
 		public Blob()
 		{
 			_defaultValue = new Variant(new BitStream());
@@ -58,6 +62,12 @@ namespace Peach.Core.Dom
 			context.handleCommonDataElementChildren(node, blob);
 			context.handleCommonDataElementValue(node, blob);
 
+			if (node.hasAttr("retain"))
+				blob.retain = node.getAttrBool("retain");
+
+			if (!blob.retain && blob.isToken)
+				throw new PeachException("Error, " + blob.debugName + " can not be a token when retain is false.");
+
 			if (blob.DefaultValue == null)
 				blob.DefaultValue = new Variant(new BitStream());
 
@@ -89,6 +99,39 @@ namespace Peach.Core.Dom
 			return blob;
 		}
 
+		/// <summary>
+		/// Keep the value of the blob when cracking.
+		/// </summary>
+		/// <remarks>
+		/// When false, the cracker skips over the data and leaves the
+		/// blob empty.  This allows large payloads to be cracked
+		/// without holding them in memory.
+		/// </remarks>
+		public bool retain
+		{
+			get { return _retain; }
+			set { _retain = value; }
+		}
+
+		public override void Crack(DataCracker context, BitStream data, long? size)
+		{
+			if (retain)
+			{
+				base.Crack(context, data, size);
+				return;
+			}
+
+			if (!size.HasValue)
+				throw new CrackingFailure("Element is unsized.", this, data);
+
+			context.Skip(this, data, size.Value);
+
+			DefaultValue = new Variant(new BitStream());
+
+			if (context.IsLogEnabled)
+				context.Log("Skipped: {0} bits", size.Value);
+		}
+
 		public override Variant DefaultValue
 		{
 			get
@@ -127,6 +170,10 @@ namespace Peach.Core.Dom
 		public override void WritePit(XmlWriter pit)
 		{
 			pit.WriteStartElement("Blob");
+
+			if (!retain)
+				pit.WriteAttributeString("retain", "false");
+
 			WritePitCommonAttributes(pit);
 			WritePitCommonValue(pit);
 			WritePitCommonChildren(pit);
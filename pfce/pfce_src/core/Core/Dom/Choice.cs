@@ -185,7 +185,7 @@ namespace Peach.Core.Dom
 
 		public override void Crack(DataCracker context, BitStream data, long? size)
 		{
-			BitStream sizedData = ReadSizedData(data, size);
+			BitStream sizedData = ReadSizedData(context, data, size);
 			long startPosition = sizedData.PositionBits;
 			string isTryAfterFailure = null;
 
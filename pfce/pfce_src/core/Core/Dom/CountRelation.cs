@@ -104,6 +104,8 @@ namespace Peach.Core.Dom
 			{
 				_isRecursing = true;
 
+				CountEvaluation();
+
 				var OfArray = Of as Sequence;
 
 				if (OfArray == null)
@@ -1522,9 +1522,17 @@ namespace Peach.Core.Dom
 				{
 					if (_value == null || _invalidated || !_readValueCache)
 					{
+						// Give the root a chance to evaluate relations and fixups
+						// before any of its children start generating values
+						if (parent == null && _recursionDepth == 0 && _rootRecursion == 0 && _readValueCache && _writeValueCache)
+							EvaluateDependencies();
+
 						_recursionDepth++;
 
-						var value = GenerateValue();
+						BitwiseStream value;
+						using (Profiler.Measure(ProfileKind.Generate, fullName))
+							value = GenerateValue();
+
 						_invalidated = false;
 
 						if (CacheValue)
@@ -1554,6 +1562,22 @@ namespace Peach.Core.Dom
 			}
 		}
 
+		/// <summary>
+		/// Is the final value of this element cached and still valid?
+		/// </summary>
+		/// <remarks>
+		/// Any change to this element or one of its children clears the
+		/// cache, so a cached value is only ever held by elements that
+		/// are outside of the region invalidated since the last generation.
+		/// </remarks>
+		public bool HasCachedValue
+		{
+			get
+			{
+				return _value != null && !_invalidated && _readValueCache;
+			}
+		}
+
 		public virtual bool CacheValue
 		{
 			get
@@ -1573,6 +1597,8 @@ namespace Peach.Core.Dom
 						// If elem is in our parent heirarchy, we are invalid any
 						// element in the heirarchy has a _recustionDepth > 1
 						// Otherwise, we are invalid if the _recursionDepth > 0
+						// or elem is still computing its internal value, since
+						// its relations will have returned a placeholder
 
 						if (isChildOf(elem))
 						{
@@ -1587,7 +1613,7 @@ namespace Peach.Core.Dom
 							}
 							while (p != elem);
 						}
-						else if (elem._recursionDepth > 0)
+						else if (elem._recursionDepth > 0 || elem._intRecursionDepth > 0)
 						{
 							return false;
 						}
@@ -1619,6 +1645,14 @@ namespace Peach.Core.Dom
 			return DefaultValue;
 		}
 
+		/// <summary>
+		/// Called on the root element before it generates a new value
+		/// when it is not being generated as part of a relation or fixup.
+		/// </summary>
+		protected virtual void EvaluateDependencies()
+		{
+		}
+
 		/// <summary>
 		/// Generate the internal value of this data element
 		/// </summary>
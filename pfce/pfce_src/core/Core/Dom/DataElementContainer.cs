@@ -43,6 +43,7 @@ namespace Peach.Core.Dom
 		{
 			item.parent = this;
 
+			InvalidateDependencies();
 			Invalidate();
 		}
 
@@ -68,6 +69,7 @@ namespace Peach.Core.Dom
 				}
 			}
 
+			InvalidateDependencies();
 			Invalidate();
 		}
 
@@ -84,12 +86,28 @@ namespace Peach.Core.Dom
 
 			newItem.parent = this;
 
+			InvalidateDependencies();
 			Invalidate();
 		}
 
+		/// <summary>
+		/// The relations and fixups of the model need to be ordered
+		/// again and the crack plan no longer applies when elements
+		/// are added or removed.
+		/// </summary>
+		private void InvalidateDependencies()
+		{
+			var dm = root as DataModel;
+			if (dm != null)
+			{
+				dm.ResetDependencies();
+				dm.CrackPlan = null;
+			}
+		}
+
 		public override void Crack(DataCracker context, BitStream data, long? size)
 		{
-			BitStream sizedData = ReadSizedData(data, size);
+			BitStream sizedData = ReadSizedData(context, data, size);
 			long startPosition = data.PositionBits;
 			var prevCount = Count;
 
@@ -108,7 +126,7 @@ namespace Peach.Core.Dom
 					if (size.HasValue)
 					{
 						long read = data.PositionBits - startPosition;
-						sizedData = ReadSizedData(data, size, read);
+						sizedData = ReadSizedData(context, data, size, read);
 					}
 				}
 
@@ -157,6 +175,46 @@ namespace Peach.Core.Dom
 			return ret;
 		}
 
+		/// <summary>
+		/// Returns the data to crack the children from.
+		/// </summary>
+		/// <remarks>
+		/// When streaming, the children are cracked from a window that only
+		/// waits for data as it is read.  This way the data they have cracked
+		/// can be released before the whole container has been received.
+		/// </remarks>
+		/// <param name="context">Cracker cracking the container</param>
+		/// <param name="data">Data stream the container is cracked from</param>
+		/// <param name="size">Size of the container in bits, if known</param>
+		/// <param name="read">Number of bits already read</param>
+		/// <returns>The data to crack the children from</returns>
+		protected BitStream ReadSizedData(DataCracker context, BitStream data, long? size, long read = 0)
+		{
+			if (!size.HasValue || !context.CanStream(data))
+				return ReadSizedData(data, size, read);
+
+			if (size.Value < read)
+			{
+				throw new CrackingFailure("Length is {0} bits but already read {1} bits."
+					.Fmt(size.Value, read), this, data);
+			}
+
+			long needed = size.Value - read;
+
+			// Windows have a fixed length that the data has to fit in,
+			// the publisher itself can still receive more data
+			if (data.BasePublisher != data.BaseStream)
+			{
+				long remain = data.LengthBits - data.PositionBits;
+
+				if (needed > remain)
+					throw new CrackingFailure("Length is {0} bits but buffer only has {1} bits left."
+						.Fmt(size.Value, remain), this, data);
+			}
+
+			return data.SliceWindow(needed);
+		}
+
 		public override BitStream  ReadSizedData(BitStream data, long? size, long read = 0)
 		{
 			if (!size.HasValue)
@@ -198,7 +256,10 @@ namespace Peach.Core.Dom
 				if (!base.CacheValue)
 					return false;
 
-				return this.All(elem => elem.CacheValue);
+				// Children still holding a cached value were not touched
+				// since they were last generated, so only the invalidated
+				// path needs to be walked instead of the whole subtree.
+				return this.All(elem => elem.HasCachedValue || elem.CacheValue);
 			}
 		}
 
@@ -445,6 +506,7 @@ namespace Peach.Core.Dom
 			_childrenList.Clear();
 			_childrenDict.Clear();
 
+			InvalidateDependencies();
 			Invalidate();
 		}
 
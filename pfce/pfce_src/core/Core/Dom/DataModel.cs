@@ -81,6 +81,98 @@ namespace Peach.Core.Dom
 				actionRunEvent(context);
 		}
 
+		[NonSerialized]
+		private DependencyGraph _dependencies;
+
+		[NonSerialized]
+		private uint _relationEvaluations;
+
+		[NonSerialized]
+		private uint _fixupEvaluations;
+
+		/// <summary>
+		/// Evaluation order of the relations and fixups in this model.
+		/// </summary>
+		/// <remarks>
+		/// Built when the pit is loaded and rebuilt after elements
+		/// are added to or removed from the model.
+		/// </remarks>
+		public DependencyGraph Dependencies
+		{
+			get
+			{
+				if (_dependencies == null)
+					_dependencies = new DependencyGraph(this);
+
+				return _dependencies;
+			}
+		}
+
+		/// <summary>
+		/// Number of times a relation has computed its value
+		/// since the last call to ResetEvaluationCounts()
+		/// </summary>
+		public uint RelationEvaluations
+		{
+			get { return _relationEvaluations; }
+		}
+
+		/// <summary>
+		/// Number of times a fixup has computed its value
+		/// since the last call to ResetEvaluationCounts()
+		/// </summary>
+		public uint FixupEvaluations
+		{
+			get { return _fixupEvaluations; }
+		}
+
+		public void ResetEvaluationCounts()
+		{
+			_relationEvaluations = 0;
+			_fixupEvaluations = 0;
+		}
+
+		internal void CountEvaluation(bool fixup)
+		{
+			if (fixup)
+				++_fixupEvaluations;
+			else
+				++_relationEvaluations;
+		}
+
+		internal void ResetDependencies()
+		{
+			_dependencies = null;
+		}
+
+		[NonSerialized]
+		private CrackPlan _crackPlan;
+
+		/// <summary>
+		/// Sizes computed ahead of time by DataCracker.OptimizeDataModel()
+		/// </summary>
+		/// <remarks>
+		/// The plan is shared with every clone of this model and is
+		/// dropped when elements are added to or removed from the model.
+		/// </remarks>
+		public CrackPlan CrackPlan
+		{
+			get { return _crackPlan; }
+			set { _crackPlan = value; }
+		}
+
+		[OnCloned]
+		private void OnCloned(DataModel original, object context)
+		{
+			// The plan never changes, so clones can share it
+			_crackPlan = original._crackPlan;
+		}
+
+		protected override void EvaluateDependencies()
+		{
+			Dependencies.Evaluate(this);
+		}
+
 		public static DataModel PitParser(PitParser context, XmlNode node, Dom dom)
 		{
 			string name = node.getAttr("name", null);
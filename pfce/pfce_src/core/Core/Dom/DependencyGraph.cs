@@ -0,0 +1,178 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+
+namespace Peach.Core.Dom
+{
+	/// <summary>
+	/// Order in which the relations and fixups of a data model are evaluated.
+	/// </summary>
+	/// <remarks>
+	/// An element with a relation or a fixup depends on every other such
+	/// element contained in the elements it references, so those are
+	/// ordered first.  Cycles, like a checksum over a block that contains
+	/// the checksum, are broken by evaluating fixups before relations and
+	/// then by document order.  Relations only depend on the size, count or
+	/// offset of what they reference, so the relations computed while a
+	/// fixup generates its input are already correct and get cached.
+	/// Evaluating a relation first would run the fixup with a placeholder
+	/// for the relation and then run it again.
+	/// </remarks>
+	[Serializable]
+	public class DependencyGraph
+	{
+		private readonly List<DataElement> _order = new List<DataElement>();
+		private readonly List<DataElement[]> _inputs = new List<DataElement[]>();
+
+		public DependencyGraph(DataElement root)
+		{
+			var nodes = new List<DataElement>();
+			var inputs = new List<DataElement[]>();
+			var readers = new Dictionary<DataElement, List<int>>();
+
+			foreach (var elem in root.PreOrderTraverse())
+			{
+				var refs = GetInputs(elem).Distinct().ToArray();
+				if (refs.Length == 0)
+					continue;
+
+				foreach (var input in refs)
+				{
+					List<int> list;
+					if (!readers.TryGetValue(input, out list))
+						readers.Add(input, list = new List<int>());
+					list.Add(nodes.Count);
+				}
+
+				nodes.Add(elem);
+				inputs.Add(refs);
+			}
+
+			// pending[i] is the number of nodes that have to be
+			// evaluated before nodes[i], users[i] are the nodes
+			// waiting on nodes[i].
+			var pending = new int[nodes.Count];
+			var users = new List<int>[nodes.Count];
+
+			for (var i = 0; i < nodes.Count; ++i)
+			{
+				var dependents = new HashSet<int>();
+
+				for (var elem = nodes[i]; elem != null; elem = elem.parent)
+				{
+					List<int> list;
+					if (readers.TryGetValue(elem, out list))
+						dependents.UnionWith(list);
+				}
+
+				dependents.Remove(i);
+
+				foreach (var j in dependents)
+					++pending[j];
+
+				users[i] = dependents.ToList();
+			}
+
+			var done = new bool[nodes.Count];
+
+			while (_order.Count < nodes.Count)
+			{
+				var next = Next(nodes, done, i => pending[i] == 0);
+
+				if (next == -1)
+					next = Next(nodes, done, i => nodes[i].fixup != null);
+
+				if (next == -1)
+					next = Next(nodes, done, i => true);
+
+				done[next] = true;
+
+				_order.Add(nodes[next]);
+				_inputs.Add(inputs[next]);
+
+				foreach (var j in users[next])
+					--pending[j];
+			}
+		}
+
+		/// <summary>
+		/// Elements with a relation or a fixup, in the order they are evaluated.
+		/// </summary>
+		public IList<DataElement> Order
+		{
+			get { return _order.AsReadOnly(); }
+		}
+
+		/// <summary>
+		/// Elements read by the relations and fixup of an element in the graph.
+		/// </summary>
+		public IEnumerable<DataElement> Inputs(DataElement elem)
+		{
+			var idx = _order.IndexOf(elem);
+			return idx == -1 ? new DataElement[0] : _inputs[idx];
+		}
+
+		/// <summary>
+		/// Compute the internal value of every element in the graph that
+		/// is still part of the data model rooted at root.
+		/// </summary>
+		/// <remarks>
+		/// Values computed outside of the generation of an ancestor can
+		/// be cached, so each relation and fixup is evaluated once
+		/// instead of every time an ancestor that contains it recurses.
+		/// </remarks>
+		public void Evaluate(DataElement root)
+		{
+			foreach (var elem in _order)
+			{
+				// Mutations and cracking can remove elements or
+				// select a different choice.
+				if (elem.root != root || !elem.InScope())
+					continue;
+
+				// Only read for its side effect, computing the
+				// internal value caches it on the element.
+				var unused = elem.InternalValue;
+			}
+		}
+
+		private static int Next(List<DataElement> nodes, bool[] done, Func<int, bool> predicate)
+		{
+			for (var i = 0; i < nodes.Count; ++i)
+			{
+				if (!done[i] && predicate(i))
+					return i;
+			}
+
+			return -1;
+		}
+
+		private static IEnumerable<DataElement> GetInputs(DataElement elem)
+		{
+			foreach (var rel in elem.relations.From<Relation>())
+			{
+				if (rel.Of != null)
+					yield return rel.Of;
+			}
+
+			if (elem.fixup == null)
+				yield break;
+
+			var dependents = elem.fixup.dependents.ToList();
+			if (dependents.Count > 0)
+			{
+				foreach (var item in dependents)
+					yield return item;
+
+				yield break;
+			}
+
+			foreach (var item in elem.fixup.references)
+			{
+				var input = elem.find(item.Item2);
+				if (input != null)
+					yield return input;
+			}
+		}
+	}
+}
@@ -191,6 +191,8 @@ namespace Peach.Core.Dom
 
 			_isRecursing = true;
 
+			CountEvaluation();
+
 			try
 			{
 				// calculateOffset can throw PeachException during mutations
@@ -89,6 +89,17 @@ namespace Peach.Core.Dom
 		/// <returns></returns>
 		public abstract Variant CalculateFromValue();
 
+		/// <summary>
+		/// Called by CalculateFromValue() when the value is computed
+		/// and not short circuited because the relation is recursing.
+		/// </summary>
+		protected void CountEvaluation()
+		{
+			var dm = From != null ? From.root as DataModel : null;
+			if (dm != null)
+				dm.CountEvaluation(false);
+		}
+
 		/// <summary>
 		/// Get value from our "from" side.
 		/// </summary>
@@ -133,6 +133,8 @@ namespace Peach.Core.Dom
 			{
 				_isRecursing = true;
 
+				CountEvaluation();
+
 				var size = Of.Value.LengthBits;
 
 				if (lengthType == LengthType.Bytes)
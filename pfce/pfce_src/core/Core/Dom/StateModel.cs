@@ -226,6 +226,11 @@ namespace Peach.Core.Dom
 					foreach (var publisher in context.test.publishers)
 						publisher.close();
 
+					// Send any deferred closes so errors are
+					// handled along with the rest of the iteration
+					if (context.agentManager != null)
+						context.agentManager.Flush();
+
 					context.OnStateModelFinished(this);
 				}
 			}
@@ -41,6 +41,12 @@ namespace Peach.Core
 		private readonly Timer _timer;
 		private int _timerCount;
 
+		private IterationScheduler _scheduler;
+		private readonly bool _isWorker;
+		private readonly List<Thread> _workerThreads = new List<Thread>();
+		private readonly List<Engine> _workerEngines = new List<Engine>();
+		private WorkerFault _workerFault;
+
 		private object _timerSync = new object();
 		private object _canAbortSync = new object();
 		private object _hasAbortedSync = new object();
@@ -48,6 +54,19 @@ namespace Peach.Core
 		//public Dom.Dom dom { get { return runContext.dom; } }
 		//public Test test  { get { return runContext.test; } }
 
+		/// <summary>
+		/// The number of iterations finished by the worker engines
+		/// started by this engine.
+		/// </summary>
+		/// <remarks>
+		/// Workers don't have loggers or watchers, so anything reporting
+		/// progress needs to add these to the iterations of this engine.
+		/// </remarks>
+		public uint WorkerIterations
+		{
+			get { return _context.WorkerIterations; }
+		}
+
 		#region Events
 
 		public delegate void TestStartingEventHandler(RunContext context);
@@ -206,6 +225,22 @@ namespace Peach.Core
 			_timerCount = 0;
 		}
 
+		/// <summary>
+		/// Create a worker engine that runs iterations handed out by
+		/// the scheduler of the primary engine.
+		/// </summary>
+		/// <remarks>
+		/// Workers don't reproduce faults, they hand them back to the
+		/// primary engine so they are logged along with everything else.
+		/// </remarks>
+		private Engine(IterationScheduler scheduler)
+			: this((Watcher)null)
+		{
+			_scheduler = scheduler;
+			_isWorker = true;
+			_context.disableReproduction = true;
+		}
+
 		/// <summary>
 		/// Run the default fuzzing run in the specified dom.
 		/// </summary>
@@ -360,6 +395,8 @@ namespace Peach.Core
 
 		protected void EndTest()
 		{
+			StopWorkers();
+
 			try
 			{
 				foreach (var pub in _context.test.publishers)
@@ -425,8 +462,14 @@ namespace Peach.Core
 
 			if (!mutationStrategy.IsDeterministic)
 			{
-				if (context.config.parallel)
+				// Strategies that seed their random number generator from the
+				// seed and iteration can be split between parallel nodes.
+				// Every node fuzzes a disjoint slice of the iteration space,
+				// so the same seed is all it takes to reproduce any node's fault.
+				if (context.config.parallel && !mutationStrategy.UsesRandomSeed)
 					throw new PeachException("parallel is not supported when a non-deterministic mutation strategy is used");
+				if (context.config.parallel && !context.config.userDefinedSeed)
+					throw new PeachException("parallel requires every machine to use the same seed when a non-deterministic mutation strategy is used");
 				if (context.config.countOnly)
 					throw new PeachException("count is not supported when a non-deterministic mutation strategy is used");
 			}
@@ -482,7 +525,8 @@ namespace Peach.Core
 
 			StartAgents();
 
-			while ((firstRun || iterationCount <= iterationStop) && context.continueFuzzing)
+			while (context.continueFuzzing && (firstRun || iterationCount <= iterationStop ||
+				TakeIterations(ref iterationCount, ref iterationStop, ref lastReproFault)))
 			{
 				var isFirst = firstRun;
 
@@ -618,6 +662,9 @@ namespace Peach.Core
 						context.agentManager.IterationFinished();
 
 						OnIterationFinished(iterationCount);
+
+						if (_isWorker && !context.controlIteration)
+							_scheduler.IterationFinished();
 					}
 
 					CollectControlFaults();
@@ -645,6 +692,20 @@ namespace Peach.Core
 					// Ensure engine faults are prioritized second to agent faults
 					context.faults = context.faults.Skip(engineFaults).Concat(context.faults.Take(engineFaults)).ToList();
 
+					// Use the data collected by the worker if the fault doesn't happen
+					// again right away, so it is still logged if it doesn't reproduce
+					if (_workerFault != null && !context.reproducingFault && !context.controlIteration &&
+						iterationCount == _workerFault.Iteration)
+					{
+						if (context.faults.Count == 0)
+						{
+							logger.Debug("runTest: Using fault detected by worker engine on iteration {0}", iterationCount);
+							context.faults.AddRange(_workerFault.Faults);
+						}
+
+						_workerFault = null;
+					}
+
 					if (context.faults.Count > 0)
 					{
 						logger.Debug("runTest: detected fault on iteration {0}", iterationCount);
@@ -670,6 +731,17 @@ namespace Peach.Core
 
 						if (context.reproducingFault || context.disableReproduction)
 						{
+							// Hand the fault to the primary engine to reproduce
+							if (_isWorker && !context.controlIteration)
+							{
+								_scheduler.ReportFault(new WorkerFault
+								{
+									Iteration = iterationCount,
+									SearchStart = lastReproFault + 1,
+									Faults = context.faults.ToArray()
+								});
+							}
+
 							// Notify loggers first
 							OnFault(iterationCount, test.stateModel, context.faults.ToArray());
 
@@ -937,6 +1009,13 @@ namespace Peach.Core
 
 							iterationCount = iterationStart;
 						}
+
+						if (context.config.workers > 1 && !_isWorker && !context.config.singleIteration)
+							StartWorkers(iterationCount, iterationStop);
+
+						// Run the first range of iterations handed out by the scheduler
+						if (_scheduler != null && !TakeIterations(ref iterationCount, ref iterationStop, ref lastReproFault))
+							break;
 					}
 
 					// Don't increment the iteration count if we are on a 
@@ -972,6 +1051,203 @@ namespace Peach.Core
 			}
 		}
 
+		/// <summary>
+		/// Start the additional engines requested by config.workers.
+		/// Iterations from start to stop are shared between this engine
+		/// and the workers.
+		/// </summary>
+		private void StartWorkers(uint start, uint stop)
+		{
+			var config = _context.config;
+
+			if (config.createDom == null)
+				throw new PeachException("Error, running {0} workers requires a way to parse the pit for each worker.".Fmt(config.workers));
+
+			var scheduler = new IterationScheduler(start, stop);
+
+			_scheduler = scheduler;
+			_context.scheduler = scheduler;
+
+			logger.Debug("runTest: Starting {0} worker engines for iterations {1} to {2}",
+				config.workers - 1, start, stop);
+
+			for (var i = 1u; i < config.workers; ++i)
+			{
+				var workerId = i;
+				var thread = new Thread(() => RunWorker(config, scheduler, workerId))
+				{
+					Name = "Peach Worker {0}".Fmt(i),
+					IsBackground = true
+				};
+
+				scheduler.AddWorker();
+				_workerThreads.Add(thread);
+				thread.Start();
+			}
+		}
+
+		private void RunWorker(RunConfiguration config, IterationScheduler scheduler, uint workerId)
+		{
+			Exception error = null;
+
+			try
+			{
+				var dom = config.createDom(workerId);
+
+				Test test;
+				if (!dom.tests.TryGetValue(config.runName, out test))
+					throw new PeachException("Unable to locate test named '" + config.runName + "'.");
+
+				// Only the primary engine logs
+				test.loggers.Clear();
+
+				if (scheduler.IsStopped)
+					return;
+
+				var engine = new Engine(scheduler);
+
+				lock (_workerEngines)
+					_workerEngines.Add(engine);
+
+				engine.startFuzzing(dom, test, config);
+			}
+			catch (Exception ex)
+			{
+				if (ex.GetBaseException() is ThreadAbortException)
+				{
+					Thread.ResetAbort();
+				}
+				else
+				{
+					logger.Debug("Worker engine failed: {0}", ex.Message);
+					error = ex;
+				}
+			}
+			finally
+			{
+				scheduler.RemoveWorker(error);
+			}
+		}
+
+		/// <summary>
+		/// Stop all worker engines, aborting any that don't
+		/// finish their current iteration in time.
+		/// </summary>
+		private void StopWorkers()
+		{
+			if (_isWorker || _scheduler == null)
+				return;
+
+			_scheduler.Stop();
+
+			List<Engine> engines;
+
+			lock (_workerEngines)
+				engines = _workerEngines.ToList();
+
+			foreach (var engine in engines)
+				engine._context.continueFuzzing = false;
+
+			var timeout = DateTime.Now + _context.config.AbortTimeout;
+
+			foreach (var thread in _workerThreads)
+			{
+				var remain = timeout - DateTime.Now;
+
+				if (thread.Join(remain > TimeSpan.Zero ? remain : TimeSpan.Zero))
+					continue;
+
+				logger.Debug("Failed to gracefully stop worker engines after {0} seconds, aborting them",
+					_context.config.AbortTimeout.TotalSeconds);
+
+				lock (_workerEngines)
+					engines = _workerEngines.ToList();
+
+				foreach (var engine in engines)
+				{
+					if (engine._currentThread.IsAlive)
+						engine.Abort();
+				}
+
+				break;
+			}
+
+			_workerThreads.Clear();
+		}
+
+		/// <summary>
+		/// Get the next range of iterations to run from the scheduler.
+		/// The primary engine runs iterations that faulted on a worker
+		/// before running any more iterations of its own.
+		/// </summary>
+		private bool TakeIterations(ref uint start, ref uint stop, ref uint lastReproFault)
+		{
+			if (_scheduler == null)
+				return false;
+
+			uint first, last;
+			WorkerFault fault;
+
+			_workerFault = null;
+
+			if (!_isWorker)
+			{
+				CheckWorkers();
+
+				if (_scheduler.TryTakeFault(out fault))
+				{
+					RunWorkerFault(fault, ref start, ref stop, ref lastReproFault);
+					return true;
+				}
+			}
+
+			if (_scheduler.TryTake(out first, out last))
+			{
+				start = first;
+				stop = last;
+
+				// Never search back into iterations run by another engine
+				lastReproFault = first - 1;
+
+				return true;
+			}
+
+			if (_isWorker)
+				return false;
+
+			// Out of iterations, wait for the workers to finish
+			// so any faults they find still get reproduced
+			if (_scheduler.TryTakeFault(out fault, true))
+			{
+				RunWorkerFault(fault, ref start, ref stop, ref lastReproFault);
+				return true;
+			}
+
+			CheckWorkers();
+
+			return false;
+		}
+
+		private void CheckWorkers()
+		{
+			var ex = _scheduler.Error;
+
+			if (ex != null)
+				throw new PeachException("Worker engine failed: " + ex.Message, ex);
+		}
+
+		private void RunWorkerFault(WorkerFault fault, ref uint start, ref uint stop, ref uint lastReproFault)
+		{
+			logger.Debug("runTest: Running iteration {0} which faulted on a worker engine", fault.Iteration);
+
+			// The normal fault handling reproduces the fault, searching
+			// back no further than the iterations the worker ran
+			start = stop = fault.Iteration;
+			lastReproFault = fault.SearchStart - 1;
+
+			_workerFault = fault;
+		}
+
 		/// <summary>
 		/// Start up the agents required for the current test
 		/// </summary>
@@ -80,6 +80,17 @@ namespace Peach.Core
 			}
 		}
 
+		/// <summary>
+		/// False when the fixup can produce a different value even though
+		/// the elements it references have not changed, for example by reading
+		/// a file or running a script.  Data models containing such a fixup
+		/// are recreated every iteration so the fixup runs again.
+		/// </summary>
+		public virtual bool IsDeterministic
+		{
+			get { return true; }
+		}
+
 		public IEnumerable<DataElement> dependents
 		{
 			get
@@ -144,7 +155,13 @@ namespace Peach.Core
 			try
 			{
 				isRecursing = true;
-				return doFixupImpl(obj);
+
+				var dm = obj.root as DataModel;
+				if (dm != null)
+					dm.CountEvaluation(true);
+
+				using (Profiler.Measure(ProfileKind.Fixup, obj.fullName))
+					return doFixupImpl(obj);
 			}
 			finally
 			{
@@ -145,20 +145,71 @@ namespace Peach.Core.IO
 			}
 		}
 
+		/// <summary>
+		/// The publisher this stream reads from, or null if the
+		/// stream is not reading from a publisher.
+		/// </summary>
+		public Publisher BasePublisher
+		{
+			get
+			{
+				var window = _stream as PublisherWindow;
+				if (window != null)
+					return window.Publisher;
+
+				return _stream as Publisher;
+			}
+		}
+
 		public void WantBytes(long bytes)
 		{
+			if (bytes <= 0)
+				return;
+
+			// Slices share the publisher, so make sure it is
+			// positioned where this stream is reading from
+			var window = _stream as PublisherWindow;
+			if (window != null)
+			{
+				_stream.Seek((_position + _offset) / 8, SeekOrigin.Begin);
+
+				// Our length is fixed, but if the data never arrives
+				// only what was received can be read
+				if (!window.Want(bytes))
+					_length = Math.Max(_position, Math.Min(_length, window.Length * 8 - _offset));
+
+				return;
+			}
+
 			// If we are a slice, out length is fixed and can't change
-			if (bytes <= 0 || !_canWrite)
+			if (!_canWrite)
 				return;
 
 			Publisher pub = _stream as Publisher;
 			if (pub != null)
 			{
+				_stream.Seek(_position / 8, SeekOrigin.Begin);
 				pub.WantBytes(bytes);
 				_length = pub.Length * 8;
 			}
 		}
 
+		/// <summary>
+		/// Tell the publisher this stream reads from that data
+		/// before position will not be read again.
+		/// </summary>
+		/// <param name="position">Byte position to release data before</param>
+		public void Release(long position)
+		{
+			// Slices share the stream with their parent
+			if (position <= 0 || !_canWrite)
+				return;
+
+			Publisher pub = _stream as Publisher;
+			if (pub != null)
+				pub.Release(position);
+		}
+
 		public override BitwiseStream SliceBits(long length)
 		{
 			if (length < 0 || (_position + length) > _length)
@@ -171,6 +222,136 @@ namespace Peach.Core.IO
 			return ret;
 		}
 
+		/// <summary>
+		/// Slice length bits from the current position without
+		/// waiting for the publisher to receive them.
+		/// </summary>
+		/// <remarks>
+		/// The slice has a fixed length but only waits for data as it is
+		/// read, so the data already read from it can be released
+		/// before the end of the slice has been received.  Streams that
+		/// don't read from a publisher return a normal slice.
+		/// </remarks>
+		/// <param name="length">Length of the slice in bits</param>
+		/// <returns>The slice</returns>
+		public BitStream SliceWindow(long length)
+		{
+			var pub = BasePublisher;
+			if (pub == null)
+				return (BitStream)SliceBits(length);
+
+			if (length < 0 || (!_canWrite && (_position + length) > _length))
+				throw new ArgumentOutOfRangeException("length");
+
+			var offset = _position + _offset;
+			var window = new PublisherWindow(pub, (offset + length + 7) / 8);
+			var ret = new BitStream(window, 0, length, offset, false);
+
+			SeekBits(length, SeekOrigin.Current);
+
+			return ret;
+		}
+
+		#endregion
+
+		#region PublisherWindow
+
+		/// <summary>
+		/// Reads from a publisher, waiting for data up to the end
+		/// of a window before it is read.
+		/// </summary>
+		/// <remarks>
+		/// Disposing the window leaves the publisher open.
+		/// </remarks>
+		[Serializable]
+		private sealed class PublisherWindow : Stream
+		{
+			private readonly Publisher _publisher;
+			private readonly long _end;
+
+			public PublisherWindow(Publisher publisher, long end)
+			{
+				_publisher = publisher;
+				_end = end;
+			}
+
+			public Publisher Publisher
+			{
+				get { return _publisher; }
+			}
+
+			/// <summary>
+			/// Wait for count bytes after the current position of
+			/// the publisher, up to the end of the window.
+			/// </summary>
+			/// <returns>True if the bytes are available</returns>
+			public bool Want(long count)
+			{
+				var pos = _publisher.Position;
+
+				count = Math.Min(count, _end - pos);
+				if (count <= 0)
+					return true;
+
+				if (_publisher.Length - pos < count)
+					_publisher.WantBytes(count);
+
+				return _publisher.Length - pos >= count;
+			}
+
+			public override bool CanRead
+			{
+				get { return _publisher.CanRead; }
+			}
+
+			public override bool CanSeek
+			{
+				get { return _publisher.CanSeek; }
+			}
+
+			public override bool CanWrite
+			{
+				get { return false; }
+			}
+
+			public override long Length
+			{
+				get { return _publisher.Length; }
+			}
+
+			public override long Position
+			{
+				get { return _publisher.Position; }
+				set { _publisher.Position = value; }
+			}
+
+			public override void Flush()
+			{
+			}
+
+			public override int Read(byte[] buffer, int offset, int count)
+			{
+				Want(count);
+
+				return _publisher.Read(buffer, offset, count);
+			}
+
+			public override long Seek(long offset, SeekOrigin origin)
+			{
+				return _publisher.Seek(offset, origin);
+			}
+
+			public override void SetLength(long value)
+			{
+				throw new NotSupportedException();
+			}
+
+			public override void Write(byte[] buffer, int offset, int count)
+			{
+				throw new NotSupportedException();
+			}
+		}
+
 		#endregion
 
 		#region Stream Interface
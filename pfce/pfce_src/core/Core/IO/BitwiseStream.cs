@@ -143,6 +143,60 @@ namespace Peach.Core.IO
 
 		#region Helpers
 
+		/// <summary>
+		/// Reads the entire contents of the stream into a single byte array.
+		/// Any trailing partial byte is padded on the right with '0' bits.
+		/// The position of the stream is not changed.
+		/// </summary>
+		/// <remarks>
+		/// This is intended for callers such as scripting languages where
+		/// crossing the CLR boundary is expensive and reading the stream
+		/// one byte at a time is prohibitive.
+		/// </remarks>
+		/// <returns>Contents of the stream</returns>
+		public byte[] ToByteArray()
+		{
+			var lengthBits = LengthBits;
+			var longCount = (lengthBits + 7) / 8;
+			if (longCount > int.MaxValue)
+				throw new NotSupportedException("Stream is too large to convert to a byte array.");
+
+			var buffer = new byte[(int)longCount];
+			var pos = PositionBits;
+
+			try
+			{
+				SeekBits(0, SeekOrigin.Begin);
+
+				var offset = 0;
+				var count = buffer.Length;
+				int len;
+
+				while (count > 0 && (len = Read(buffer, offset, count)) != 0)
+				{
+					offset += len;
+					count -= len;
+				}
+
+				if (count != 0)
+				{
+					ulong bits;
+					len = ReadBits(out bits, 7);
+
+					System.Diagnostics.Debug.Assert(count == 1);
+					System.Diagnostics.Debug.Assert(len > 0);
+
+					buffer[offset] = (byte)(bits << (8 - len));
+				}
+			}
+			finally
+			{
+				SeekBits(pos, SeekOrigin.Begin);
+			}
+
+			return buffer;
+		}
+
 		/// <summary>
 		/// Ensures that the data stream length is in full bytes
 		/// by returning a new stream padded with up to 7 bits of '0'
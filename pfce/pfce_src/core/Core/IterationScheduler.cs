@@ -0,0 +1,210 @@
+using System;
+using System.Collections.Generic;
+using System.Threading;
+
+namespace Peach.Core
+{
+	/// <summary>
+	/// A fault detected by a worker engine.
+	/// </summary>
+	public class WorkerFault
+	{
+		/// <summary>
+		/// The iteration the fault was detected on.
+		/// </summary>
+		public uint Iteration { get; set; }
+
+		/// <summary>
+		/// The first iteration the worker ran after its previous fault
+		/// in the same range of iterations.  Reproducing the fault never
+		/// searches back past this iteration.
+		/// </summary>
+		public uint SearchStart { get; set; }
+
+		/// <summary>
+		/// The faults and the data collected by the worker's agents.
+		/// </summary>
+		public Fault[] Faults { get; set; }
+	}
+
+	/// <summary>
+	/// Hands out iterations to the engines fuzzing a test in the same process.
+	/// </summary>
+	/// <remarks>
+	/// Iterations are given out in chunks so engines don't contend on the
+	/// scheduler every iteration.  Faults found by worker engines are queued
+	/// so the primary engine, which owns the loggers, can reproduce them.
+	/// </remarks>
+	public class IterationScheduler
+	{
+		/// <summary>
+		/// Number of iterations given to an engine at a time.
+		/// </summary>
+		public const uint DefaultChunkSize = 100;
+
+		private readonly object _sync = new object();
+		private readonly Queue<WorkerFault> _faults = new Queue<WorkerFault>();
+		private readonly uint _stop;
+		private readonly uint _chunkSize;
+		private uint _next;
+		private bool _exhausted;
+		private bool _stopped;
+		private int _workers;
+		private long _workerIterations;
+
+		public IterationScheduler(uint start, uint stop, uint chunkSize = DefaultChunkSize)
+		{
+			if (start > stop)
+				throw new ArgumentOutOfRangeException("start");
+			if (chunkSize == 0)
+				throw new ArgumentOutOfRangeException("chunkSize");
+
+			_next = start;
+			_stop = stop;
+			_chunkSize = chunkSize;
+		}
+
+		/// <summary>
+		/// The first error reported by a worker engine, if any.
+		/// </summary>
+		public Exception Error { get; private set; }
+
+		/// <summary>
+		/// The number of iterations finished by worker engines.
+		/// </summary>
+		public uint WorkerIterations
+		{
+			get { return (uint)Interlocked.Read(ref _workerIterations); }
+		}
+
+		/// <summary>
+		/// True once Stop() has been called or a worker has failed.
+		/// </summary>
+		public bool IsStopped
+		{
+			get
+			{
+				lock (_sync)
+				{
+					return _stopped;
+				}
+			}
+		}
+
+		/// <summary>
+		/// Take the next range of iterations to run.
+		/// </summary>
+		/// <param name="start">First iteration of the range.</param>
+		/// <param name="stop">Last iteration of the range.</param>
+		/// <returns>False if there are no iterations left to run.</returns>
+		public bool TryTake(out uint start, out uint stop)
+		{
+			lock (_sync)
+			{
+				start = stop = 0;
+
+				if (_stopped || _exhausted)
+					return false;
+
+				start = _next;
+				stop = _stop - start < _chunkSize ? _stop : start + _chunkSize - 1;
+
+				if (stop == _stop)
+					_exhausted = true;
+				else
+					_next = stop + 1;
+
+				return true;
+			}
+		}
+
+		/// <summary>
+		/// Called by a worker engine each time it finishes
+		/// an iteration that is not a control iteration.
+		/// </summary>
+		public void IterationFinished()
+		{
+			Interlocked.Increment(ref _workerIterations);
+		}
+
+		/// <summary>
+		/// Queue a fault detected by a worker engine.
+		/// </summary>
+		public void ReportFault(WorkerFault fault)
+		{
+			lock (_sync)
+			{
+				_faults.Enqueue(fault);
+				Monitor.PulseAll(_sync);
+			}
+		}
+
+		/// <summary>
+		/// Take the next fault detected by a worker engine.
+		/// </summary>
+		/// <param name="fault">The fault detected by the worker.</param>
+		/// <param name="wait">
+		/// Wait for a fault while any worker engines are still running.
+		/// </param>
+		/// <returns>False if there are no faults to reproduce.</returns>
+		public bool TryTakeFault(out WorkerFault fault, bool wait = false)
+		{
+			lock (_sync)
+			{
+				while (_faults.Count == 0 && wait && _workers > 0 && !_stopped)
+					Monitor.Wait(_sync);
+
+				fault = null;
+
+				if (_stopped || _faults.Count == 0)
+					return false;
+
+				fault = _faults.Dequeue();
+				return true;
+			}
+		}
+
+		/// <summary>
+		/// Called when a worker engine starts.
+		/// </summary>
+		public void AddWorker()
+		{
+			lock (_sync)
+			{
+				++_workers;
+			}
+		}
+
+		/// <summary>
+		/// Called when a worker engine finishes.
+		/// </summary>
+		/// <param name="error">The exception the worker failed with, if any.</param>
+		public void RemoveWorker(Exception error)
+		{
+			lock (_sync)
+			{
+				--_workers;
+
+				if (error != null && Error == null)
+				{
+					Error = error;
+					_stopped = true;
+				}
+
+				Monitor.PulseAll(_sync);
+			}
+		}
+
+		/// <summary>
+		/// Stop handing out iterations.
+		/// </summary>
+		public void Stop()
+		{
+			lock (_sync)
+			{
+				_stopped = true;
+				Monitor.PulseAll(_sync);
+			}
+		}
+	}
+}
@@ -0,0 +1,363 @@
+using System;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.IO;
+using System.Linq;
+using System.Threading;
+
+namespace Peach.Core
+{
+	/// <summary>
+	/// What the time of a profile entry was spent on.
+	/// </summary>
+	public enum ProfileKind
+	{
+		Generate,
+		Fixup,
+		Transformer,
+		Crack,
+		Mutator,
+	}
+
+	/// <summary>
+	/// Time spent on one element, fixup, transformer or mutator.
+	/// </summary>
+	public class ProfileEntry
+	{
+		public ProfileKind Kind { get; set; }
+
+		/// <summary>
+		/// Full name of the element, or the name of the mutator.
+		/// </summary>
+		public string Name { get; set; }
+
+		/// <summary>
+		/// Number of times the entry was measured.
+		/// </summary>
+		public long Count { get; set; }
+
+		/// <summary>
+		/// Time spent including everything measured inside of the entry.
+		/// </summary>
+		public TimeSpan TotalTime { get; set; }
+
+		/// <summary>
+		/// Time spent excluding everything measured inside of the entry.
+		/// </summary>
+		public TimeSpan SelfTime { get; set; }
+	}
+
+	/// <summary>
+	/// Opt-in instrumentation of where iteration time goes.
+	/// </summary>
+	/// <remarks>
+	/// Generating element values, fixups, transformers, cracking and
+	/// mutators are measured when the profiler is enabled.  Measurements
+	/// nest, so the time of a block includes its children while its
+	/// self time does not.  When disabled, a measurement is a single
+	/// flag check.
+	///
+	/// Each thread records into its own profile, so worker engines
+	/// don't contend with each other.  Snapshots merge all of them.
+	/// The profiles of threads that have exited are folded into a
+	/// single profile so they don't accumulate.
+	/// </remarks>
+	public static class Profiler
+	{
+		internal class Frame
+		{
+			public ProfileKind Kind;
+			public string Name;
+			public string Stack;
+			public long Start;
+			public long Children;
+		}
+
+		internal class Totals
+		{
+			public long Count;
+			public long Total;
+			public long Self;
+		}
+
+		internal class ThreadProfile
+		{
+			public readonly Stack<Frame> Frames = new Stack<Frame>();
+			public readonly Dictionary<Tuple<ProfileKind, string>, Totals> Totals = new Dictionary<Tuple<ProfileKind, string>, Totals>();
+			public readonly Dictionary<string, long> Stacks = new Dictionary<string, long>();
+
+			/// <summary>
+			/// The thread recording into the profile, or null
+			/// for the profile of threads that have exited.
+			/// </summary>
+			public readonly Thread Owner;
+
+			public ThreadProfile(Thread owner)
+			{
+				Owner = owner;
+			}
+
+			public void Add(ThreadProfile other)
+			{
+				foreach (var item in other.Totals)
+				{
+					Totals totals;
+					if (!Totals.TryGetValue(item.Key, out totals))
+						Totals.Add(item.Key, totals = new Totals());
+
+					totals.Count += item.Value.Count;
+					totals.Total += item.Value.Total;
+					totals.Self += item.Value.Self;
+				}
+
+				foreach (var item in other.Stacks)
+				{
+					long self;
+					Stacks.TryGetValue(item.Key, out self);
+					Stacks[item.Key] = self + item.Value;
+				}
+			}
+		}
+
+		/// <summary>
+		/// A measurement that ends when disposed.
+		/// </summary>
+		public struct Measurement : IDisposable
+		{
+			readonly ThreadProfile _profile;
+			readonly Frame _frame;
+
+			internal Measurement(ThreadProfile profile, Frame frame)
+			{
+				_profile = profile;
+				_frame = frame;
+			}
+
+			public void Dispose()
+			{
+				if (_frame != null)
+					Exit(_profile, _frame);
+			}
+		}
+
+		static readonly object Sync = new object();
+		static readonly List<ThreadProfile> Profiles = new List<ThreadProfile>();
+		static volatile bool _enabled;
+
+		[ThreadStatic]
+		static ThreadProfile _current;
+
+		/// <summary>
+		/// Turns measurements on or off.
+		/// </summary>
+		public static bool Enabled
+		{
+			get { return _enabled; }
+			set { _enabled = value; }
+		}
+
+		/// <summary>
+		/// Start measuring time spent on name.
+		/// </summary>
+		/// <example>
+		/// using (Profiler.Measure(ProfileKind.Generate, fullName))
+		/// {
+		///     ...
+		/// }
+		/// </example>
+		public static Measurement Measure(ProfileKind kind, string name)
+		{
+			if (!_enabled)
+				return new Measurement();
+
+			var profile = _current;
+
+			if (profile == null)
+			{
+				profile = _current = new ThreadProfile(Thread.CurrentThread);
+
+				lock (Sync)
+				{
+					RemoveExited();
+					Profiles.Add(profile);
+				}
+			}
+
+			var parent = profile.Frames.Count > 0 ? profile.Frames.Peek() : null;
+			var frame = new Frame
+			{
+				Kind = kind,
+				Name = name,
+				Stack = "{0}{1}:{2}".Fmt(parent != null ? parent.Stack + ";" : "", kind, name.Replace(';', ':')),
+				Start = Stopwatch.GetTimestamp(),
+			};
+
+			profile.Frames.Push(frame);
+
+			return new Measurement(profile, frame);
+		}
+
+		/// <summary>
+		/// Start measuring time spent on source, only
+		/// computing its name when the profiler is enabled.
+		/// </summary>
+		/// <example>
+		/// using (Profiler.Measure(ProfileKind.Transformer, this, t => t.ProfileName))
+		/// {
+		///     ...
+		/// }
+		/// </example>
+		public static Measurement Measure<T>(ProfileKind kind, T source, Func<T, string> name)
+		{
+			if (!_enabled)
+				return new Measurement();
+
+			return Measure(kind, name(source));
+		}
+
+		/// <summary>
+		/// Number of profiles being kept, after folding the
+		/// profiles of threads that have exited.
+		/// </summary>
+		internal static int ProfileCount
+		{
+			get
+			{
+				lock (Sync)
+				{
+					RemoveExited();
+					return Profiles.Count;
+				}
+			}
+		}
+
+		/// <summary>
+		/// Discard everything measured so far.
+		/// </summary>
+		public static void Reset()
+		{
+			ForEachProfile(profile =>
+			{
+				profile.Totals.Clear();
+				profile.Stacks.Clear();
+			});
+		}
+
+		/// <summary>
+		/// Totals of everything measured so far, hottest first.
+		/// </summary>
+		public static List<ProfileEntry> Snapshot()
+		{
+			var merged = new ThreadProfile(null);
+
+			ForEachProfile(merged.Add);
+
+			return merged.Totals
+				.Select(item => new ProfileEntry
+				{
+					Kind = item.Key.Item1,
+					Name = item.Key.Item2,
+					Count = item.Value.Count,
+					TotalTime = ToTimeSpan(item.Value.Total),
+					SelfTime = ToTimeSpan(item.Value.Self),
+				})
+				.OrderByDescending(e => e.SelfTime)
+				.ToList();
+		}
+
+		/// <summary>
+		/// Write the self time of every measured stack in the folded
+		/// format used by flamegraph tools, in microseconds.
+		/// </summary>
+		public static void WriteFolded(TextWriter writer)
+		{
+			var merged = new ThreadProfile(null);
+
+			ForEachProfile(merged.Add);
+
+			foreach (var item in merged.Stacks.OrderBy(i => i.Key, StringComparer.Ordinal))
+			{
+				var us = ToTimeSpan(item.Value).Ticks / (TimeSpan.TicksPerMillisecond / 1000);
+				if (us > 0)
+					writer.WriteLine("{0} {1}", item.Key, us);
+			}
+		}
+
+		static void ForEachProfile(Action<ThreadProfile> action)
+		{
+			lock (Sync)
+			{
+				RemoveExited();
+
+				foreach (var profile in Profiles)
+				{
+					lock (profile)
+					{
+						action(profile);
+					}
+				}
+			}
+		}
+
+		/// <summary>
+		/// Fold the profiles of threads that have exited into one,
+		/// so worker threads that come and go don't leak profiles.
+		/// Must be called with Sync held.
+		/// </summary>
+		static void RemoveExited()
+		{
+			var exited = Profiles.Where(p => p.Owner != null && !p.Owner.IsAlive).ToList();
+			if (exited.Count == 0)
+				return;
+
+			var retired = Profiles.FirstOrDefault(p => p.Owner == null);
+			if (retired == null)
+				Profiles.Add(retired = new ThreadProfile(null));
+
+			foreach (var profile in exited)
+			{
+				lock (profile)
+				{
+					retired.Add(profile);
+				}
+
+				Profiles.Remove(profile);
+			}
+		}
+
+		static void Exit(ThreadProfile profile, Frame frame)
+		{
+			var elapsed = Stopwatch.GetTimestamp() - frame.Start;
+
+			// Measurements are always disposed in reverse order
+			Debug.Assert(profile.Frames.Peek() == frame);
+			profile.Frames.Pop();
+
+			if (profile.Frames.Count > 0)
+				profile.Frames.Peek().Children += elapsed;
+
+			lock (profile)
+			{
+				var key = Tuple.Create(frame.Kind, frame.Name);
+				Totals totals;
+				if (!profile.Totals.TryGetValue(key, out totals))
+					profile.Totals.Add(key, totals = new Totals());
+
+				var self = elapsed - frame.Children;
+
+				totals.Count += 1;
+				totals.Total += elapsed;
+				totals.Self += self;
+
+				long stack;
+				profile.Stacks.TryGetValue(frame.Stack, out stack);
+				profile.Stacks[frame.Stack] = stack + self;
+			}
+		}
+
+		static TimeSpan ToTimeSpan(long timestamp)
+		{
+			return TimeSpan.FromTicks((long)(timestamp * ((double)TimeSpan.TicksPerSecond / Stopwatch.Frequency)));
+		}
+	}
+}
@@ -563,6 +563,23 @@ namespace Peach.Core
 		{
 		}
 
+		/// <summary>
+		/// Called by the cracker when streaming input to indicate
+		/// that data before position will not be read again.
+		/// </summary>
+		/// <remarks>
+		/// This method can be overriden by custom Publishers.
+		/// 
+		/// Publishers that buffer everything they receive can free the
+		/// released data so that large inputs only use a bounded amount
+		/// of memory.  Length and Position must not change as a result
+		/// of releasing data.
+		/// </remarks>
+		/// <param name="position">Byte position that all prior data can be released from</param>
+		public virtual void Release(long position)
+		{
+		}
+
 		/// <summary>
 		/// Send data model
 		/// </summary>
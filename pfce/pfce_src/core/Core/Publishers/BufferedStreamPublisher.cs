@@ -45,8 +45,15 @@ namespace Peach.Core.Publishers
 		protected ManualResetEvent _event = null;
 		protected Stream _client = null;
 		protected MemoryStream _buffer = null;
+		protected long _released = 0;
 		protected bool _timeout = false;
 
+		/// <summary>
+		/// Released data is only removed from the front of the
+		/// buffer once at least this many bytes can be freed.
+		/// </summary>
+		const long ReleaseThreshold = 0x100000;
+
 		protected BufferedStreamPublisher(Dictionary<string, Variant> args)
 			: base(args)
 		{
@@ -116,7 +123,7 @@ namespace Peach.Core.Publishers
 							_timeout = false;
 
 							if (Logger.IsDebugEnabled)
-								Logger.Debug("\n\n" + Utilities.HexDump(_recvBuf, 0, len, startAddress: prevLen));
+								Logger.Debug("\n\n" + Utilities.HexDump(_recvBuf, 0, len, startAddress: _released + prevLen));
 
 							HandleReadCompleted();
 						}
@@ -148,6 +155,7 @@ namespace Peach.Core.Publishers
 			System.Diagnostics.Debug.Assert(_buffer == null);
 
 			_buffer = new MemoryStream();
+			_released = 0;
 			_event.Reset();
 			ScheduleRead();
 		}
@@ -403,6 +411,33 @@ namespace Peach.Core.Publishers
 			}
 		}
 
+		public override void Release(long position)
+		{
+			lock (_bufferLock)
+			{
+				if (_buffer == null)
+					return;
+
+				// Moving the remaining data to the front of the buffer
+				// is a copy, so only do it once there is enough to free.
+				var count = Math.Min(position - _released, Math.Min(_buffer.Position, _buffer.Length));
+				if (count < ReleaseThreshold)
+					return;
+
+				var remain = _buffer.Length - count;
+				var pos = _buffer.Position - count;
+				var buf = _buffer.GetBuffer();
+
+				Buffer.BlockCopy(buf, (int)count, buf, 0, (int)remain);
+
+				_buffer.SetLength(remain);
+				_buffer.Position = pos;
+				_released += count;
+
+				Logger.Debug("Released {0} bytes, {1} bytes buffered", _released, remain);
+			}
+		}
+
 		/// <summary>
 		/// Continue reading data until no data is received for 150 ms
 		/// </summary>
@@ -481,7 +516,7 @@ namespace Peach.Core.Publishers
 			{
 				lock (_bufferLock)
 				{
-					return _buffer.Length;
+					return _released + _buffer.Length;
 				}
 			}
 		}
@@ -492,14 +527,14 @@ namespace Peach.Core.Publishers
 			{
 				lock (_bufferLock)
 				{
-					return _buffer.Position;
+					return _released + _buffer.Position;
 				}
 			}
 			set
 			{
 				lock (_bufferLock)
 				{
-					_buffer.Position = value;
+					_buffer.Position = value - _released;
 				}
 			}
 		}
@@ -516,7 +551,10 @@ namespace Peach.Core.Publishers
 		{
 			lock (_bufferLock)
 			{
-				return _buffer.Seek(offset, origin);
+				if (origin == SeekOrigin.Begin)
+					offset -= _released;
+
+				return _released + _buffer.Seek(offset, origin);
 			}
 		}
 
@@ -524,7 +562,7 @@ namespace Peach.Core.Publishers
 		{
 			lock (_bufferLock)
 			{
-				_buffer.SetLength(value);
+				_buffer.SetLength(value - _released);
 			}
 		}
 
@@ -55,6 +55,38 @@ namespace Peach.Core
 		public uint parallelNum = 0;
 		public uint parallelTotal = 0;
 
+		/// <summary>
+		/// Number of engines fuzzing the test in this process.
+		/// </summary>
+		/// <remarks>
+		/// Every engine after the first parses its own copy of the
+		/// pit using createDom and runs against its own publishers
+		/// and agents.
+		/// </remarks>
+		public uint workers = 1;
+
+		/// <summary>
+		/// Record where the time of each iteration is spent.
+		/// </summary>
+		/// <remarks>
+		/// See Profiler for what is measured.
+		/// </remarks>
+		public bool profile = false;
+
+		/// <summary>
+		/// Function that returns a newly parsed dom
+		/// </summary>
+		/// <param name="workerId">
+		/// Number of the worker engine the dom is for, starting at 1.
+		/// The primary engine is 0.
+		/// </param>
+		public delegate Dom.Dom CreateDomHandler(uint workerId);
+
+		/// <summary>
+		/// Called by each additional worker engine to get its own dom
+		/// </summary>
+		public CreateDomHandler createDom = null;
+
 		/// <summary>
 		/// Skip to a specific iteration
 		/// </summary>
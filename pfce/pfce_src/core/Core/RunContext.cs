@@ -294,6 +294,27 @@ namespace Peach.Core
 		[NonSerialized]
 		public AgentManager agentManager = null;
 
+		/// <summary>
+		/// Scheduler sharing iterations with the worker engines, if any.
+		/// </summary>
+		/// <remarks>
+		/// Currently the Engine code sets this when it starts workers.
+		/// </remarks>
+		[NonSerialized]
+		internal IterationScheduler scheduler = null;
+
+		/// <summary>
+		/// The number of iterations finished by the worker engines.
+		/// </summary>
+		/// <remarks>
+		/// Workers don't have loggers or watchers, so anything reporting
+		/// progress needs to add these to the iterations of this run.
+		/// </remarks>
+		public uint WorkerIterations
+		{
+			get { return scheduler == null ? 0 : scheduler.WorkerIterations; }
+		}
+
 		/// <summary>
 		/// An object store that will last entire run.  For use
 		/// by Peach code to store some state.
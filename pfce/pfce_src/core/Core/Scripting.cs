@@ -211,12 +211,25 @@ namespace Peach.Core
 		/// <summary>
 		/// Evaluate an expression. Pre-compiled expressions are cached by default.
 		/// </summary>
+		/// <remarks>
+		/// Cached expressions that are simple integer arithmetic over
+		/// variables in localScope are evaluated without the script engine.
+		/// </remarks>
 		/// <param name="code">Expression to evaluate</param>
 		/// <param name="localScope">Local scope for expression</param>
 		/// <param name="cache">Cache compiled script for re-use (defaults to true)</param>
 		/// <returns>Result from expression</returns>
 		public object Eval(string code, Dictionary<string, object> localScope, bool cache = true)
 		{
+			if (cache)
+			{
+				var arithmetic = ArithmeticExpression.Get(code);
+				object result;
+
+				if (arithmetic != null && arithmetic.TryEvaluate(localScope, out result))
+					return result;
+			}
+
 			var scope = CreateScope(localScope);
 			var compiled = CompileCode(scope, code, SourceCodeKind.Expression, cache);
 
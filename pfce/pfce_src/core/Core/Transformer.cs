@@ -26,6 +26,16 @@ namespace Peach.Core
 
 		public Transformer anotherTransformer;
 
+		/// <summary>
+		/// False when encoding the same data can produce a different result.
+		/// Data models containing such a transformer are recreated every
+		/// iteration so the transformer runs again.
+		/// </summary>
+		public virtual bool IsDeterministic
+		{
+			get { return true; }
+		}
+
 		public Transformer(DataElement parent, Dictionary<string, Variant> args)
 		{
 			this.parent = parent;
@@ -72,7 +82,8 @@ namespace Peach.Core
 		{
 			data.Seek(0, System.IO.SeekOrigin.Begin);
 
-			data = internalEncode(data);
+			using (Profiler.Measure(ProfileKind.Transformer, this, t => t.ProfileName))
+				data = internalEncode(data);
 
 			if (anotherTransformer != null)
 				return anotherTransformer.encode(data);
@@ -92,7 +103,21 @@ namespace Peach.Core
 
 			data.Seek(0, System.IO.SeekOrigin.Begin);
 
-			return internalDecode(data);
+			using (Profiler.Measure(ProfileKind.Transformer, this, t => t.ProfileName))
+				return internalDecode(data);
+		}
+
+		/// <summary>
+		/// Name of the transformer in the profile, only
+		/// computed when the profiler is enabled.
+		/// </summary>
+		private string ProfileName
+		{
+			get
+			{
+				var name = GetType().Name;
+				return parent != null ? "{0}.{1}".Fmt(parent.fullName, name) : name;
+			}
 		}
 
 		/// <summary>
@@ -7,6 +7,7 @@
 // $Id$
 
 using System;
+using System.Collections.Generic;
 using System.Diagnostics;
 using System.IO;
 using System.Linq;
@@ -56,10 +57,14 @@ namespace PeachMinset
 			Console.WriteLine("] {0}\n", Assembly.GetExecutingAssembly().GetCopyright());
 
 			var kill = false;
+			var rebuild = false;
 			var verbose = 0;
+			var jobs = 1;
+			uint? timeout = null;
 			string samples = null;
 			string traces = null;
 			string minset = null;
+			string index = null;
 
 			var p = new OptionSet()
 				{
@@ -68,7 +73,11 @@ namespace PeachMinset
 					{ "v", v => verbose = 1 },
 					{ "s|samples=", v => samples = v },
 					{ "t|traces=", v => traces = v},
-					{ "m|minset=", v => minset = v }
+					{ "m|minset=", v => minset = v },
+					{ "i|index=", v => index = v },
+					{ "rebuild", v => rebuild = true },
+					{ "j|jobs=", (int v) => jobs = v },
+					{ "timeout=", (uint v) => timeout = v }
 				};
 
 			var extra = p.Parse(args);
@@ -90,9 +99,18 @@ namespace PeachMinset
 			if (executable != null && !arguments.Contains("%s"))
 				throw new SyntaxException("Error, command argument missing '%s'.");
 
+			if (index != null && minset == null)
+				throw new SyntaxException("Error, 'index' argument requires 'minset' argument.");
+
+			if (rebuild && index == null)
+				throw new SyntaxException("Error, 'rebuild' argument requires 'index' argument.");
+
+			if (jobs < 1)
+				throw new SyntaxException("Error, 'jobs' must be at least 1.");
+
 			Utilities.ConfigureLogging(verbose);
 
-			var sampleFiles = GetFiles(samples, "sample");
+			var sampleFiles = GetFiles(samples, "sample", "*");
 
 			// If we are generating traces, ensure we can write to the traces folder
 			if (executable != null)
@@ -102,7 +120,11 @@ namespace PeachMinset
 			if (minset != null)
 				VerifyDirectory(minset);
 
-			var ms = new Minset();
+			var ms = new Minset
+			{
+				Jobs = jobs,
+				TraceTimeout = timeout.HasValue ? TimeSpan.FromSeconds(timeout.Value) : (TimeSpan?)null,
+			};
 
 			sw.Reset();
 			sw.Start();
@@ -112,6 +134,7 @@ namespace PeachMinset
 				ms.TraceCompleted += ms_TraceCompleted;
 				ms.TraceStarting += ms_TraceStarting;
 				ms.TraceFailed += ms_TraceFailed;
+				ms.TraceSkipped += ms_TraceSkipped;
 				ms.TraceMessage += ms_TraceMessage;
 			}
 
@@ -130,13 +153,20 @@ namespace PeachMinset
 			if (minset == null)
 				return 0;
 
-			var traceFiles = GetFiles(traces, "trace");
+			var traceFiles = GetFiles(traces, "trace", "*.trace");
 
-			Console.WriteLine("[*] Running coverage analysis...");
+			string[] minsetFiles;
 
-			var minsetFiles = ms.RunCoverage(sampleFiles, traceFiles);
+			if (index != null)
+				minsetFiles = RunIncremental(ms, index, rebuild, minset, sampleFiles, traceFiles);
+			else
+			{
+				Console.WriteLine("[*] Running coverage analysis...");
 
-			Console.WriteLine("[-]   {0} files were selected from a total of {1}.", minsetFiles.Length, sampleFiles.Length);
+				minsetFiles = ms.RunCoverage(sampleFiles, traceFiles);
+
+				Console.WriteLine("[-]   {0} files were selected from a total of {1}.", minsetFiles.Length, sampleFiles.Length);
+			}
 
 			if (minsetFiles.Length > 0)
 				Console.WriteLine("[*] Copying over selected files...");
@@ -167,6 +197,54 @@ namespace PeachMinset
 			return 0;
 		}
 
+		private static string[] RunIncremental(Minset ms, string index, bool rebuild, string minset, string[] sampleFiles, string[] traceFiles)
+		{
+			var previous = MinsetIndex.Load(index);
+
+			// Rebuilding starts over with an empty index, which
+			// computes the minimum set of all the samples
+			var current = rebuild ? new MinsetIndex() : previous;
+
+			Console.WriteLine(rebuild
+				? "[*] Rebuilding minimum set index..."
+				: "[*] Running incremental coverage analysis...");
+
+			var minsetFiles = ms.RunIncremental(current, sampleFiles, traceFiles);
+
+			current.Save(index);
+
+			Console.WriteLine("[-]   {0} files were added, the minimum set has {1} files covering {2} blocks.",
+				minsetFiles.Length, current.Samples.Count, current.BlockCount);
+
+			if (rebuild)
+			{
+				var kept = new HashSet<string>(current.Samples);
+
+				// Only remove files the previous index put in the minset folder
+				foreach (var name in previous.Samples.Where(n => !kept.Contains(n)))
+				{
+					var dst = Path.Combine(minset, name);
+
+					if (!File.Exists(dst))
+						continue;
+
+					Console.Write("[-]   Removing {0}", dst);
+
+					try
+					{
+						File.Delete(dst);
+						Console.WriteLine();
+					}
+					catch (Exception ex)
+					{
+						Console.WriteLine(" failed: {0}", ex.Message);
+					}
+				}
+			}
+
+			return minsetFiles;
+		}
+
 		private void ms_TraceStarting(object sender, string fileName, int count, int totalCount)
 		{
 			Console.Write("[{0}] ({1}:{2}) Coverage trace of {3}...", 
@@ -183,12 +261,17 @@ namespace PeachMinset
 			Console.WriteLine(" Failed");
 		}
 
+		private static void ms_TraceSkipped(object sender, string fileName, int count, int totalCount)
+		{
+			Console.WriteLine(" Up to date");
+		}
+
 		private static void ms_TraceMessage(object sender, string message)
 		{
 			Console.WriteLine("[-] {0}", message);
 		}
 
-		private static string[] GetFiles(string path, string what)
+		private static string[] GetFiles(string path, string what, string pattern)
 		{
 			string[] fileNames;
 
@@ -196,7 +279,7 @@ namespace PeachMinset
 			{
 				fileNames = path.Contains("*")
 					? Directory.GetFiles(Path.GetDirectoryName(path) ?? Environment.CurrentDirectory, Path.GetFileName(path))
-					: Directory.GetFiles(path);
+					: Directory.GetFiles(path, pattern);
 			}
 			catch (IOException ex)
 			{
@@ -255,13 +338,18 @@ Perform code coverage using all files in the 'samples' folder.  Collect
 the .trace files in the 'traces' folder for later analysis.
 
 Syntax:
-  PeachMinset [-k -v] -s samples -t traces command.exe args %s
-  PeachMinset [-k -v] -s samples -t traces -- command.exe --flags args %s
+  PeachMinset [-k -v -j N --timeout S] -s samples -t traces command.exe args %s
+  PeachMinset [-k -v -j N --timeout S] -s samples -t traces -- command.exe --flags args %s
 
 Note:
   %s will be replaced by sample filename.
   -k will terminate command.exe when CPU becomes idle.
   -v will enable debug log messages.
+  -j will trace N samples at the same time.
+  --timeout will kill command.exe if it runs longer than S seconds.
+
+Samples whose trace was created from the same file contents are not
+traced again, so adding samples and re-running only traces the new ones.
 
 
 Compute Minimum Set
@@ -275,19 +363,41 @@ Syntax:
   PeachMinset -s samples -t traces -m minset
 
 
+Incremental Minimum Set
+-----------------------
+
+Keeps the coverage of the minimum set in an index file so new samples
+can be added without computing the minimum set again.  Only samples
+that are not in the index are checked, and they are only copied to the
+'minset' folder when they cover blocks the minimum set does not.
+Samples are identified by file name.
+
+Syntax:
+  PeachMinset -s samples -t traces -m minset -i minset.idx
+  PeachMinset -s samples -t traces -m minset -i minset.idx --rebuild
+
+Note:
+  --rebuild will compute the minimum set of all the samples again and
+  remove the files that are no longer in the minimum set from the
+  'minset' folder.  Run it every so often, since adding samples never
+  removes ones that have become redundant.
+
+
 All-In-One
 ----------
 
 Both tracing and computing can be performed in a single step.
 
 Syntax:
-  PeachMinset [-k -v] -s samples -t traces -m minset command.exe %s
-  PeachMinset [-k -v] -s samples -t traces -m minset -- command.exe --flags args %s
+  PeachMinset [-k -v -j N --timeout S] -s samples -t traces -m minset command.exe %s
+  PeachMinset [-k -v -j N --timeout S] -s samples -t traces -m minset -- command.exe --flags args %s
 
 Note:
   %s will be replaced by sample filename.
   -k will terminate command.exe when CPU becomes idle.
   -v will enable debug log messages.
+  -j will trace N samples at the same time.
+  --timeout will kill command.exe if it runs longer than S seconds.
 
 
 Distributing Minset
@@ -821,5 +821,28 @@ namespace Peach.Core.Test
 			Assert.AreEqual(idx, 8);
 		}
 
+		[Test]
+		public void TestToByteArray()
+		{
+			var bs = new BitStream();
+			bs.Write(new byte[] { 0x11, 0x22, 0x33 }, 0, 3);
+			bs.WriteBits(0x5, 3);
+			bs.PositionBits = 9;
+
+			var buf = bs.ToByteArray();
+
+			Assert.AreEqual(new byte[] { 0x11, 0x22, 0x33, 0xa0 }, buf);
+			Assert.AreEqual(9, bs.PositionBits);
+
+			var lst = new BitStreamList();
+			lst.Add(new BitStream(new byte[] { 0x01, 0x02 }));
+			lst.Add(new BitStream(new byte[] { 0x03 }));
+
+			Assert.AreEqual(new byte[] { 0x01, 0x02, 0x03 }, lst.ToByteArray());
+			Assert.AreEqual(0, lst.PositionBits);
+
+			Assert.AreEqual(new byte[0], new BitStream().ToByteArray());
+		}
+
 	}
 }
\ No newline at end of file
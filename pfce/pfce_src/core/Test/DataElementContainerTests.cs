@@ -1,4 +1,5 @@
-﻿using NUnit.Framework;
+﻿using System.Text;
+using NUnit.Framework;
 using Peach.Core.Dom;
 
 namespace Peach.Core.Test
@@ -75,5 +76,49 @@ namespace Peach.Core.Test
 			Assert.AreEqual("Item3", dom.dataModels[0][2].Name);
 			Assert.AreEqual("Item4", dom.dataModels[0][3].Name);
 		}
+
+		[Test]
+		[Category("Peach")]
+		public void RegenerateChangedPath()
+		{
+			var pit = @"<?xml version='1.0' encoding='utf-8'?>
+<Peach>
+	<DataModel name='Example1'>
+		<Block name='Block1'>
+			<Number name='Len' size='8'>
+				<Relation type='size' of='Data'/>
+			</Number>
+			<String name='Data' value='Hello'/>
+		</Block>
+		<Block name='Block2'>
+			<String name='Str1' value='A'/>
+			<String name='Str2' value='B'/>
+		</Block>
+	</DataModel>
+</Peach>
+";
+			var dom = ParsePit(pit);
+			var dm = dom.dataModels[0];
+
+			Assert.AreEqual(Encoding.ASCII.GetBytes("\x05HelloAB"), dm.Value.ToArray());
+			Assert.True(dm.HasCachedValue);
+
+			var block2 = dm.find("Block2");
+			var str1 = dm.find("Str1");
+			var count = block2.GenerateCount;
+
+			dm.find("Data").DefaultValue = new Variant("Hi");
+
+			Assert.False(dm.HasCachedValue);
+			Assert.True(block2.HasCachedValue);
+			Assert.AreEqual(Encoding.ASCII.GetBytes("\x02HiAB"), dm.Value.ToArray());
+			Assert.True(dm.HasCachedValue);
+			Assert.AreEqual(count, block2.GenerateCount);
+
+			str1.DefaultValue = new Variant("C");
+
+			Assert.AreEqual(Encoding.ASCII.GetBytes("\x02HiCB"), dm.Value.ToArray());
+			Assert.AreEqual(count + 1, block2.GenerateCount);
+		}
 	}
 }
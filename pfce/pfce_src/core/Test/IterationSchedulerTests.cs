@@ -0,0 +1,165 @@
+using System;
+using System.Collections.Generic;
+using System.Threading;
+using NUnit.Framework;
+
+namespace Peach.Core.Test
+{
+	[TestFixture]
+	[Peach]
+	[Quick]
+	class IterationSchedulerTests
+	{
+		[Test]
+		public void TestChunks()
+		{
+			var scheduler = new IterationScheduler(5, 29, 10);
+			var ranges = new List<Tuple<uint, uint>>();
+
+			uint start, stop;
+
+			while (scheduler.TryTake(out start, out stop))
+				ranges.Add(new Tuple<uint, uint>(start, stop));
+
+			Assert.AreEqual(new[]
+			{
+				new Tuple<uint, uint>(5, 14),
+				new Tuple<uint, uint>(15, 24),
+				new Tuple<uint, uint>(25, 29),
+			}, ranges);
+		}
+
+		[Test]
+		public void TestMaxIterations()
+		{
+			var scheduler = new IterationScheduler(uint.MaxValue - 14, uint.MaxValue, 10);
+
+			uint start, stop;
+
+			Assert.True(scheduler.TryTake(out start, out stop));
+			Assert.AreEqual(uint.MaxValue - 14, start);
+			Assert.AreEqual(uint.MaxValue - 5, stop);
+
+			Assert.True(scheduler.TryTake(out start, out stop));
+			Assert.AreEqual(uint.MaxValue - 4, start);
+			Assert.AreEqual(uint.MaxValue, stop);
+
+			Assert.False(scheduler.TryTake(out start, out stop));
+		}
+
+		[Test]
+		public void TestStop()
+		{
+			var scheduler = new IterationScheduler(1, 100, 10);
+
+			uint start, stop;
+
+			Assert.True(scheduler.TryTake(out start, out stop));
+
+			scheduler.ReportFault(new WorkerFault { Iteration = 5, SearchStart = 1 });
+			scheduler.Stop();
+
+			Assert.True(scheduler.IsStopped);
+			Assert.False(scheduler.TryTake(out start, out stop));
+
+			WorkerFault fault;
+			Assert.False(scheduler.TryTakeFault(out fault));
+		}
+
+		[Test]
+		public void TestFaults()
+		{
+			var scheduler = new IterationScheduler(1, 100, 10);
+
+			var faults = new[] { new Fault { title = "Crash" } };
+
+			WorkerFault fault;
+
+			Assert.False(scheduler.TryTakeFault(out fault));
+
+			scheduler.ReportFault(new WorkerFault { Iteration = 7, SearchStart = 1, Faults = faults });
+			scheduler.ReportFault(new WorkerFault { Iteration = 3, SearchStart = 1 });
+
+			Assert.True(scheduler.TryTakeFault(out fault));
+			Assert.AreEqual(7, fault.Iteration);
+			Assert.AreEqual(1, fault.SearchStart);
+			Assert.AreSame(faults, fault.Faults);
+			Assert.True(scheduler.TryTakeFault(out fault));
+			Assert.AreEqual(3, fault.Iteration);
+			Assert.False(scheduler.TryTakeFault(out fault));
+		}
+
+		[Test]
+		public void TestWaitForWorkers()
+		{
+			var scheduler = new IterationScheduler(1, 100, 10);
+
+			scheduler.AddWorker();
+
+			var thread = new Thread(() =>
+			{
+				Thread.Sleep(100);
+				scheduler.ReportFault(new WorkerFault { Iteration = 42, SearchStart = 1 });
+				Thread.Sleep(100);
+				scheduler.RemoveWorker(null);
+			});
+
+			thread.Start();
+
+			WorkerFault fault;
+
+			Assert.True(scheduler.TryTakeFault(out fault, true));
+			Assert.AreEqual(42, fault.Iteration);
+
+			// Returns once the last worker is done
+			Assert.False(scheduler.TryTakeFault(out fault, true));
+			Assert.Null(scheduler.Error);
+
+			thread.Join();
+		}
+
+		[Test]
+		public void TestWorkerError()
+		{
+			var scheduler = new IterationScheduler(1, 100, 10);
+			var error = new PeachException("boom");
+
+			scheduler.AddWorker();
+			scheduler.AddWorker();
+			scheduler.RemoveWorker(error);
+
+			WorkerFault fault;
+
+			Assert.True(scheduler.IsStopped);
+			Assert.AreEqual(error, scheduler.Error);
+			Assert.False(scheduler.TryTakeFault(out fault, true));
+		}
+
+		[Test]
+		public void TestWorkerIterations()
+		{
+			var scheduler = new IterationScheduler(1, 100, 10);
+
+			Assert.AreEqual(0, scheduler.WorkerIterations);
+
+			var threads = new List<Thread>();
+
+			for (var i = 0; i < 4; ++i)
+			{
+				var thread = new Thread(() =>
+				{
+					for (var j = 0; j < 250; ++j)
+						scheduler.IterationFinished();
+				});
+
+				threads.Add(thread);
+				thread.Start();
+			}
+
+			foreach (var thread in threads)
+				thread.Join();
+
+			Assert.AreEqual(1000, scheduler.WorkerIterations);
+		}
+	}
+}
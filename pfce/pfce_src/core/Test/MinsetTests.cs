@@ -1,5 +1,6 @@
 ﻿using System;
 using System.Collections.Generic;
+using System.Diagnostics;
 using System.IO;
 using System.Linq;
 using NUnit.Framework;
@@ -49,6 +50,126 @@ namespace Peach.Core.Test
 			}
 		}
 
+		[Test]
+		public void TestBinaryTrace()
+		{
+			using (var tmpDir = new TempDirectory())
+			{
+				var path = Path.Combine(tmpDir.Path, "sample.bin.trace");
+
+				TraceFile.Write(path, new[]
+				{
+					new TraceModule { Name = "/usr/lib/system/libsystem_c.dylib", Blocks = new ulong[] { 3, 1, 2, 1 } },
+					new TraceModule { Name = "/usr/lib/system/libsystem_kernel.dylib", Blocks = new ulong[] { 0xffffffff00000000 } },
+				});
+
+				var actual = TraceFile.Read(path);
+
+				Assert.AreEqual(2, actual.Count);
+				Assert.AreEqual("/usr/lib/system/libsystem_c.dylib", actual[0].Name);
+				Assert.AreEqual(new ulong[] { 1, 2, 3 }, actual[0].Blocks);
+				Assert.AreEqual("/usr/lib/system/libsystem_kernel.dylib", actual[1].Name);
+				Assert.AreEqual(new ulong[] { 0xffffffff00000000 }, actual[1].Blocks);
+
+				// Truncated traces are an error
+				var bytes = File.ReadAllBytes(path);
+				File.WriteAllBytes(path, bytes.Take(bytes.Length - 1).ToArray());
+				Assert.Throws<PeachException>(() => TraceFile.Read(path));
+			}
+		}
+
+		[Test]
+		public void TestBinaryCoverage()
+		{
+			using (var tmpDir = new TempDirectory())
+			{
+				var sampleFiles = new[] {
+					Path.Combine(tmpDir.Path, "sample1.bin"),
+					Path.Combine(tmpDir.Path, "sample2.bin"),
+					Path.Combine(tmpDir.Path, "sample3.bin"),
+					Path.Combine(tmpDir.Path, "sample4.bin"),
+				};
+
+				var kernel = "/usr/lib/system/libsystem_kernel.dylib";
+				var libc = "/usr/lib/system/libsystem_c.dylib";
+
+				// Text and binary traces can be mixed
+				var traceFiles = new[] {
+					MakeTraceFile(tmpDir.Path, "sample1.bin.trace", new[] {
+						"0x0000000000000001 " + kernel,
+						"0x0000000000000002 " + libc,
+					}),
+					MakeBinaryTraceFile(tmpDir.Path, "sample2.bin.trace",
+						new TraceModule { Name = kernel, Blocks = new ulong[] { 1, 2, 3 } },
+						new TraceModule { Name = libc, Blocks = new ulong[] { 2 } }),
+					MakeBinaryTraceFile(tmpDir.Path, "sample3.bin.trace",
+						new TraceModule { Name = libc, Blocks = new ulong[] { 2, 3 } }),
+					MakeBinaryTraceFile(tmpDir.Path, "sample4.bin.trace",
+						new TraceModule { Name = kernel, Blocks = new ulong[] { 3 } }),
+				};
+
+				var minset = new Minset();
+				var actual = minset.RunCoverage(sampleFiles, traceFiles);
+				var expected = new[] {
+					Path.Combine(tmpDir.Path, "sample2.bin"),
+					Path.Combine(tmpDir.Path, "sample3.bin"),
+				};
+				CollectionAssert.AreEqual(expected, actual);
+			}
+		}
+
+		[Test]
+		public void TestIncremental()
+		{
+			using (var tmpDir = new TempDirectory())
+			{
+				var lib = "/usr/lib/libfoo.so";
+				var indexFile = Path.Combine(tmpDir.Path, "minset.idx");
+
+				Func<string, ulong[], string> make = (name, blocks) =>
+				{
+					MakeBinaryTraceFile(tmpDir.Path, name + ".trace",
+						new TraceModule { Name = lib, Blocks = blocks });
+					return Path.Combine(tmpDir.Path, name);
+				};
+
+				var sample1 = make("sample1.bin", new ulong[] { 1, 2, 3 });
+				var sample2 = make("sample2.bin", new ulong[] { 3, 4 });
+
+				var minset = new Minset();
+				var index = MinsetIndex.Load(indexFile);
+				var added = minset.RunIncremental(index, new[] { sample1, sample2 }, new[] { sample1 + ".trace", sample2 + ".trace" });
+				CollectionAssert.AreEqual(new[] { sample1, sample2 }, added);
+				index.Save(indexFile);
+
+				// sample3 adds nothing, sample4 adds block 5 and sample1
+				// has already been seen so its new trace is ignored
+				var sample3 = make("sample3.bin", new ulong[] { 2, 4 });
+				var sample4 = make("sample4.bin", new ulong[] { 1, 5 });
+				make("sample1.bin", new ulong[] { 6 });
+
+				var samples = new[] { sample1, sample2, sample3, sample4 };
+				var traces = samples.Select(s => s + ".trace").ToArray();
+
+				index = MinsetIndex.Load(indexFile);
+				Assert.AreEqual(4, index.BlockCount);
+				added = minset.RunIncremental(index, samples, traces);
+				CollectionAssert.AreEqual(new[] { sample4 }, added);
+				CollectionAssert.AreEqual(new[] { "sample1.bin", "sample2.bin", "sample4.bin" }, index.Samples);
+				Assert.AreEqual(5, index.BlockCount);
+				Assert.True(index.HasSeen(sample3));
+
+				added = minset.RunIncremental(index, samples, traces);
+				Assert.AreEqual(0, added.Length);
+
+				// Rebuilding from an empty index considers every sample
+				index = new MinsetIndex();
+				added = minset.RunIncremental(index, samples, traces);
+				CollectionAssert.AreEqual(new[] { sample2, sample4, sample1, sample3 }, added);
+				Assert.AreEqual(6, index.BlockCount);
+			}
+		}
+
 		[Test]
 		public void TestEfficiency()
 		{
@@ -88,6 +209,147 @@ namespace Peach.Core.Test
 			}
 		}
 
+		/// <summary>
+		/// Stands in for pin.  The first word of the sample is how long
+		/// to wait before writing the trace, or 'hang' to never finish.
+		/// </summary>
+		const string FakePin = @"
+read delay rest < ""$5""
+echo $$ > ""$2.pid""
+if [ ""$delay"" = hang ]; then exec sleep 30; fi
+sleep $delay
+echo ""0x0000000000000001 $4"" > ""$2.out""
+";
+
+		class TraceRun
+		{
+			public string Executable;
+			public string Arguments = "%s";
+			public string Pin;
+			public string Traces;
+			public string[] Samples;
+			public List<string> Events = new List<string>();
+			public string[] TraceFiles;
+
+			public TraceRun(string dir, params string[] samples)
+			{
+				Executable = Path.Combine(dir, "target");
+				Pin = Path.Combine(dir, "pin.sh");
+				Traces = Path.Combine(dir, "traces");
+				Samples = samples.Select((s, i) => Path.Combine(dir, "sample{0}.bin".Fmt(i + 1))).ToArray();
+
+				File.WriteAllText(Executable, "target");
+				File.WriteAllText(Pin, FakePin);
+				Directory.CreateDirectory(Traces);
+
+				for (var i = 0; i < samples.Length; ++i)
+					File.WriteAllText(Samples[i], samples[i]);
+			}
+
+			public void Run(TimeSpan? timeout = null)
+			{
+				var cov = new Coverage(new ProcessStartInfo("/bin/sh", Pin), Executable, Arguments, Pin);
+				var minset = new Minset { Jobs = Samples.Length, TraceTimeout = timeout };
+
+				Events.Clear();
+
+				minset.TraceStarting += (s, f, i, n) => Events.Add("Starting " + Path.GetFileName(f));
+				minset.TraceCompleted += (s, f, i, n) => Events.Add("Completed " + Path.GetFileName(f));
+				minset.TraceSkipped += (s, f, i, n) => Events.Add("Skipped " + Path.GetFileName(f));
+				minset.TraceFailed += (s, f, i, n) => Events.Add("Failed " + Path.GetFileName(f));
+
+				TraceFiles = minset.RunTraces(cov, Traces, Samples);
+			}
+
+			public string[] Expect(params string[] states)
+			{
+				return states.SelectMany((s, i) => new[] { "Starting sample{0}.bin".Fmt(i + 1), "{0} sample{1}.bin".Fmt(s, i + 1) }).ToArray();
+			}
+		}
+
+		[Test]
+		[Platform(Exclude = "Win")]
+		public void TestRunTracesOrder()
+		{
+			using (var tmpDir = new TempDirectory())
+			{
+				// Later samples finish first
+				var run = new TraceRun(tmpDir.Path, "1", "0.5", "0");
+
+				run.Run();
+
+				Assert.AreEqual(run.Expect("Completed", "Completed", "Completed"), run.Events);
+				Assert.AreEqual(run.Samples.Select(s => Path.Combine(run.Traces, Path.GetFileName(s) + ".trace")), run.TraceFiles);
+
+				foreach (var trace in run.TraceFiles)
+					Assert.AreEqual("0x0000000000000001 " + run.Executable + "\n", File.ReadAllText(trace));
+			}
+		}
+
+		[Test]
+		[Platform(Exclude = "Win")]
+		public void TestRunTracesUpToDate()
+		{
+			using (var tmpDir = new TempDirectory())
+			{
+				var run = new TraceRun(tmpDir.Path, "0", "0", "0");
+
+				run.Run();
+				Assert.AreEqual(run.Expect("Completed", "Completed", "Completed"), run.Events);
+
+				run.Run();
+				Assert.AreEqual(run.Expect("Skipped", "Skipped", "Skipped"), run.Events);
+				Assert.AreEqual(3, run.TraceFiles.Length);
+
+				// Only the changed sample is traced again
+				File.WriteAllText(run.Samples[1], "0 changed");
+				run.Run();
+				Assert.AreEqual(run.Expect("Skipped", "Completed", "Skipped"), run.Events);
+
+				// Every sample is traced again when anything else changes
+				run.Arguments = "-x %s";
+				run.Run();
+				Assert.AreEqual(run.Expect("Completed", "Completed", "Completed"), run.Events);
+
+				File.WriteAllText(run.Executable, "rebuilt target");
+				run.Run();
+				Assert.AreEqual(run.Expect("Completed", "Completed", "Completed"), run.Events);
+
+				File.AppendAllText(run.Pin, "\n# updated\n");
+				run.Run();
+				Assert.AreEqual(run.Expect("Completed", "Completed", "Completed"), run.Events);
+
+				run.Run();
+				Assert.AreEqual(run.Expect("Skipped", "Skipped", "Skipped"), run.Events);
+			}
+		}
+
+		[Test]
+		[Platform(Exclude = "Win")]
+		public void TestRunTracesTimeout()
+		{
+			using (var tmpDir = new TempDirectory())
+			{
+				var run = new TraceRun(tmpDir.Path, "0", "hang");
+				var stale = Path.Combine(run.Traces, "sample2.bin.trace");
+
+				// Leave a trace from an older sample behind
+				File.WriteAllText(stale, "0x0000000000000002 /lib/libstale.so\n");
+				File.WriteAllText(stale + ".sha1", "stale");
+
+				var sw = Stopwatch.StartNew();
+
+				run.Run(TimeSpan.FromSeconds(1));
+
+				Assert.Less(sw.Elapsed, TimeSpan.FromSeconds(20));
+				Assert.AreEqual(run.Expect("Completed", "Failed"), run.Events);
+				Assert.AreEqual(new[] { Path.Combine(run.Traces, "sample1.bin.trace") }, run.TraceFiles);
+
+				Assert.False(File.Exists(stale), "The stale trace should be deleted");
+				Assert.False(File.Exists(stale + ".sha1"), "The stale hash should be deleted");
+			}
+		}
+
 		string[] MakeTraceLines(int index, int max, int unique)
 		{
 			var lines = new List<string>();
@@ -108,5 +370,12 @@ namespace Peach.Core.Test
 			File.WriteAllLines(path, lines);
 			return path;
 		}
+
+		string MakeBinaryTraceFile(string dir, string name, params TraceModule[] modules)
+		{
+			var path = Path.Combine(dir, name);
+			TraceFile.Write(path, modules);
+			return path;
+		}
 	}
 }
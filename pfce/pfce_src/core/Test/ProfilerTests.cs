@@ -0,0 +1,132 @@
+using System;
+using System.IO;
+using System.Linq;
+using System.Threading;
+using NUnit.Framework;
+
+namespace Peach.Core.Test
+{
+	[TestFixture]
+	[Peach]
+	[Quick]
+	public class ProfilerTests
+	{
+		[SetUp]
+		public void SetUp()
+		{
+			Profiler.Reset();
+			Profiler.Enabled = true;
+		}
+
+		[TearDown]
+		public void TearDown()
+		{
+			Profiler.Enabled = false;
+			Profiler.Reset();
+		}
+
+		[Test]
+		public void TestNested()
+		{
+			for (var i = 0; i < 2; ++i)
+			{
+				using (Profiler.Measure(ProfileKind.Generate, "DM.Block"))
+				{
+					using (Profiler.Measure(ProfileKind.Fixup, "DM.Block.CRC"))
+						Thread.Sleep(10);
+				}
+			}
+
+			var entries = Profiler.Snapshot();
+			Assert.AreEqual(2, entries.Count);
+
+			var block = entries.Single(e => e.Kind == ProfileKind.Generate);
+			var fixup = entries.Single(e => e.Kind == ProfileKind.Fixup);
+
+			Assert.AreEqual("DM.Block", block.Name);
+			Assert.AreEqual(2, block.Count);
+			Assert.AreEqual("DM.Block.CRC", fixup.Name);
+			Assert.AreEqual(2, fixup.Count);
+
+			// The fixup is hottest, and its time is not counted
+			// towards the self time of the block
+			Assert.AreEqual(fixup, entries[0]);
+			Assert.GreaterOrEqual(block.TotalTime, fixup.TotalTime);
+			Assert.Less(block.SelfTime, fixup.SelfTime);
+			Assert.AreEqual(fixup.TotalTime, fixup.SelfTime);
+
+			var folded = new StringWriter();
+			Profiler.WriteFolded(folded);
+
+			var lines = folded.ToString().Split(new[] { '\n', '\r' }, StringSplitOptions.RemoveEmptyEntries);
+			var stack = lines.Single(l => l.StartsWith("Generate:DM.Block;Fixup:DM.Block.CRC "));
+			Assert.GreaterOrEqual(long.Parse(stack.Split(' ')[1]), 20000);
+		}
+
+		[Test]
+		public void TestDisabled()
+		{
+			Profiler.Enabled = false;
+
+			using (Profiler.Measure(ProfileKind.Mutator, "DataElementRemove"))
+			{
+			}
+
+			Assert.AreEqual(0, Profiler.Snapshot().Count);
+		}
+
+		[Test]
+		public void TestLazyName()
+		{
+			var calls = 0;
+
+			Profiler.Enabled = false;
+
+			using (Profiler.Measure(ProfileKind.Transformer, "Base64", n => { ++calls; return n; }))
+			{
+			}
+
+			Assert.AreEqual(0, calls);
+
+			Profiler.Enabled = true;
+
+			using (Profiler.Measure(ProfileKind.Transformer, "Base64", n => { ++calls; return n; }))
+			{
+			}
+
+			Assert.AreEqual(1, calls);
+			Assert.AreEqual("Base64", Profiler.Snapshot().Single().Name);
+		}
+
+		[Test]
+		public void TestExitedThreads()
+		{
+			var before = Profiler.ProfileCount;
+
+			for (var i = 0; i < 5; ++i)
+			{
+				var th = new Thread(() =>
+				{
+					using (Profiler.Measure(ProfileKind.Crack, "DM.Block"))
+					{
+					}
+				});
+
+				th.Start();
+				th.Join();
+			}
+
+			// What the threads measured is kept, but their
+			// profiles are folded into one
+			var entry = Profiler.Snapshot().Single();
+			Assert.AreEqual("DM.Block", entry.Name);
+			Assert.AreEqual(5, entry.Count);
+
+			Assert.LessOrEqual(Profiler.ProfileCount, before + 1);
+
+			Profiler.Reset();
+
+			Assert.AreEqual(0, Profiler.Snapshot().Count);
+		}
+	}
+}
@@ -108,5 +108,71 @@ namespace Peach.Core.Test
 
 			Assert.AreEqual(0xB00000001B692 | 0x100000000000000, ret);
 		}
+
+		[Test]
+		[TestCase("size*8", 40)]
+		[TestCase("(size + 1) * 8", 48)]
+		[TestCase("-size / 2", -3)]
+		[TestCase("-size // 2", -3)]
+		[TestCase("-size % 3", 1)]
+		[TestCase("size % -3", -1)]
+		[TestCase("0x10 - size", 11)]
+		public void TestArithmetic(string expr, int expected)
+		{
+			Assert.NotNull(ArithmeticExpression.Get(expr));
+
+			var python = new PythonScripting();
+
+			var ret = python.Eval(expr, new Dictionary<string, object>
+			{
+				{ "size", 5 }
+			});
+
+			Assert.AreEqual(expected, ret);
+			Assert.That(ret, Is.InstanceOf<int>());
+		}
+
+		[Test]
+		public void TestArithmeticOverflow()
+		{
+			var python = new PythonScripting();
+
+			var ret = python.Eval("size * 2", new Dictionary<string, object>
+			{
+				{ "size", int.MaxValue }
+			});
+
+			Assert.AreEqual((ulong)int.MaxValue * 2, ret);
+			Assert.That(ret, Is.InstanceOf<ulong>());
+		}
+
+		[Test]
+		public void TestArithmeticFallback()
+		{
+			Assert.Null(ArithmeticExpression.Get("size ** 2"));
+			Assert.Null(ArithmeticExpression.Get("len(size)"));
+			Assert.Null(ArithmeticExpression.Get("010 + size"));
+
+			var python = new PythonScripting();
+
+			var ret = python.Eval("size * 2", new Dictionary<string, object>
+			{
+				{ "size", "ab" }
+			});
+
+			Assert.AreEqual("abab", ret);
+		}
+
+		[Test]
+		public void TestArithmeticDivideByZero()
+		{
+			var python = new PythonScripting();
+
+			Assert.Throws<SoftException>(() =>
+				python.Eval("size / 0", new Dictionary<string, object>
+				{
+					{ "size", 5 }
+				}));
+		}
 	}
 }
\ No newline at end of file
@@ -0,0 +1,99 @@
+//
+// Copyright (c) Peach Fuzzer, LLC
+//
+
+using System;
+using System.Collections.Generic;
+using System.IO;
+using NLog;
+using Logger = NLog.Logger;
+using SocketHttpListener.Net;
+
+namespace Peach.Pro.Core.Agent.Channels.Rest
+{
+	/// <summary>
+	/// Runs a list of requests in a single round trip.
+	/// </summary>
+	/// <remarks>
+	/// Requests are dispatched in order through the same routes as
+	/// requests made directly to the listener.  Processing stops after
+	/// the first request that fails and the response contains the
+	/// result of every request that was run.
+	/// </remarks>
+	internal class BatchHandler : IDisposable
+	{
+		private static readonly Logger Logger = LogManager.GetCurrentClassLogger();
+
+		private readonly RouteHandler _routes;
+
+		public BatchHandler(RouteHandler routes)
+		{
+			_routes = routes;
+			_routes.Add(Server.BatchPath, "POST", OnBatch);
+		}
+
+		public void Dispose()
+		{
+			_routes.Remove(Server.BatchPath);
+		}
+
+		private RouteResponse OnBatch(RouteRequest req)
+		{
+			var batch = req.FromJson<BatchRequest>();
+			if (batch == null)
+				return RouteResponse.BadRequest();
+
+			var ret = new BatchResponse { Responses = new List<BatchResponse.Item>() };
+
+			foreach (var item in batch.Requests ?? new List<BatchRequest.Item>())
+			{
+				var resp = Dispatch(req, item);
+
+				Logger.Trace("<<< [{0}] {1} {2}", item.Id, (int)resp.StatusCode, resp.StatusCode);
+
+				ret.Responses.Add(new BatchResponse.Item
+				{
+					Id = item.Id,
+					Status = (int)resp.StatusCode,
+					ContentType = resp.Content != null ? resp.ContentType : null,
+					Content = ReadContent(resp),
+				});
+
+				if ((int)resp.StatusCode >= 400)
+					break;
+			}
+
+			return RouteResponse.AsJson(ret);
+		}
+
+		private RouteResponse Dispatch(RouteRequest req, BatchRequest.Item item)
+		{
+			if (string.IsNullOrEmpty(item.Method) || string.IsNullOrEmpty(item.Path))
+				return RouteResponse.BadRequest();
+
+			var sub = new RouteRequest(req.Url, item.Method, item.Path, item.Content);
+
+			Logger.Trace(">>> [{0}] {1} {2}", item.Id, sub.HttpMethod, sub.Url.PathAndQuery);
+
+			// Nested batches and the log websocket can't be batched
+			if (sub.Url.AbsolutePath == Server.BatchPath || sub.Url.AbsolutePath == Server.LogPath)
+				return RouteResponse.BadRequest();
+
+			return _routes.Dispatch(sub);
+		}
+
+		private static byte[] ReadContent(RouteResponse resp)
+		{
+			if (resp.Content == null)
+				return null;
+
+			// Like RouteResponse.Complete(), return the content
+			// starting at the position it was given to us at.
+			using (var ms = new MemoryStream())
+			{
+				resp.Content.CopyTo(ms);
+				return ms.ToArray();
+			}
+		}
+	}
+}
@@ -4,11 +4,11 @@
 
 using System;
 using System.Collections.Generic;
-using System.Diagnostics;
 using System.IO;
 using System.Linq;
 using System.Net;
 using System.Net.Sockets;
+using System.Web;
 using NLog;
 using Peach.Core;
 using Peach.Core.Agent;
@@ -85,7 +85,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 					IsIterationAfterFault = isIterationAfterFault
 				};
 
-				Guard("Open", () => Send("PUT", "/open", req));
+				Guard("Open", () => Enqueue("PUT", "/open", req));
 
 				InputStream.Position = 0;
 				InputStream.SetLength(0);
@@ -93,7 +93,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 
 			public void Close()
 			{
-				Guard("Close", () => Send("PUT", "/close", null));
+				Guard("Close", () => Enqueue("PUT", "/close", null));
 			}
 
 			public void Accept()
@@ -154,9 +154,8 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 			{
 				Guard("Output", () =>
 				{
-					var uri = new Uri(_publisherUri, _publisherUri.PathAndQuery + "/output");
 					var request = RouteResponse.AsStream(data);
-					_client.Execute("PUT", uri, request, SendStream, resp => resp.Consume());
+					_client.Enqueue("PUT", MakeUri("/output"), request, null);
 				});
 			}
 
@@ -164,17 +163,33 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 			{
 				Guard("Input", () =>
 				{
-					var resp = Send<BoolResponse>("PUT", "/input", null);
-					if (resp.Value)
+					var reset = false;
+
+					// When pipelining, the input request is sent to the agent
+					// in the same batch as the first read of the input data.
+					_client.Enqueue("PUT", MakeUri("/input"), null, strm =>
 					{
-						InputStream.Position = 0;
-						InputStream.SetLength(0);
-					}
+						var resp = strm.FromJson<BoolResponse>();
+						reset = resp != null && resp.Value;
+					});
+
+					if (reset)
+						ResetInput();
 
 					// Read all input bytes starting at offset 'Length'
 					// so we don't re-download bytes we have already gotten.
 
-					ReadInputData("?offset={0}".Fmt(InputStream.Length));
+					var offset = InputStream.Length;
+
+					ReadInputData("?offset={0}".Fmt(offset));
+
+					// If the input was pipelined and the publisher was reset,
+					// the data we just read started at the wrong offset.
+					if (reset && offset > 0)
+					{
+						ResetInput();
+						ReadInputData("?offset=0");
+					}
 				});
 			}
 
@@ -189,23 +204,35 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				}
 			}
 
+			private Uri MakeUri(string path)
+			{
+				return new Uri(_publisherUri, _publisherUri.PathAndQuery + path);
+			}
+
 			private void Send(string method, string path, object request)
 			{
-				var uri = new Uri(_publisherUri, _publisherUri.PathAndQuery + path);
-				_client.Execute(method, uri, request, SendJson, resp => resp.Consume());
+				_client.Execute(method, MakeUri(path), AsJson(request), strm => strm.Consume());
 			}
 
 			private T Send<T>(string method, string path, object request)
 			{
-				var uri = new Uri(_publisherUri, _publisherUri.PathAndQuery + path);
-				return _client.Execute(method, uri, request, SendJson, req => req.FromJson<T>());
+				return _client.Execute(method, MakeUri(path), AsJson(request), strm => strm.FromJson<T>());
 			}
 
-			private void ReadInputData(string query)
+			private void Enqueue(string method, string path, object request)
 			{
-				var uri = new Uri(_publisherUri, _publisherUri.PathAndQuery + "/data" + query);
+				_client.Enqueue(method, MakeUri(path), AsJson(request), null);
+			}
+
+			private void ResetInput()
+			{
+				InputStream.Position = 0;
+				InputStream.SetLength(0);
+			}
 
-				_client.Execute("GET", uri, (object)null, null, resp =>
+			private void ReadInputData(string query)
+			{
+				_client.Execute("GET", MakeUri("/data" + query), null, strm =>
 				{
 					var pos = InputStream.Position;
 
@@ -213,11 +240,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 					{
 						InputStream.Seek(0, SeekOrigin.End);
 
-						using (var strm = resp.GetResponseStream())
-						{
-							if (strm != null)
-								strm.CopyTo(InputStream);
-						}
+						strm.CopyTo(InputStream);
 					}
 					finally
 					{
@@ -274,9 +297,19 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 
 		#endregion
 
+		class PendingRequest
+		{
+			public string Method { get; set; }
+			public Uri Uri { get; set; }
+			public string ContentType { get; set; }
+			public byte[] Content { get; set; }
+			public Action<Stream> OnResponse { get; set; }
+		}
+
 		private static readonly Logger Logger = LogManager.GetCurrentClassLogger();
 
 		private readonly List<PublisherProxy> _publishers;
+		private readonly List<PendingRequest> _pending;
 		private readonly CookieContainer _cookies;
 		private readonly LogSink _sink;
 
@@ -285,11 +318,14 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 		private ConnectResponse _connectResp;
 		private Uri _agentUri;
 		private bool _offline;
+		private bool _pipeline;
+		private bool _batching;
 
 		public Client(string name, string uri, string password)
 			: base(name, uri, password)
 		{
 			_publishers = new List<PublisherProxy>();
+			_pending = new List<PendingRequest>();
 			_cookies = new CookieContainer();
 			_sink = new LogSink(Name);
 		}
@@ -300,6 +336,11 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 			{
 				_baseUrl = new Uri(Url);
 
+				// Pipelining is enabled with 'tcp://host:port/?pipeline=true'
+				var pipeline = HttpUtility.ParseQueryString(_baseUrl.Query)["pipeline"];
+				if (pipeline != null && !bool.TryParse(pipeline, out _pipeline))
+					throw new PeachException("An invalid value for pipeline was specified.  The value '{0}' is not a valid boolean.".Fmt(pipeline));
+
 				if (_baseUrl.IsDefaultPort)
 				{
 					_baseUrl = new Uri("{0}://{1}:{2}".Fmt(
@@ -323,6 +364,8 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 			};
 
 			ReconnectAgent(null);
+
+			_batching = _pipeline && ProbeBatch();
 		}
 
 		public override void StartMonitor(string monName, string cls, Dictionary<string, string> args)
@@ -415,6 +458,35 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 		{
 			if (_connectResp.Messages.Contains("IterationFinished"))
 				Send("PUT", "/IterationFinished", null);
+			else
+				Flush();
+		}
+
+		/// <summary>
+		/// Send any queued requests to the agent.
+		/// </summary>
+		public override void Flush()
+		{
+			if (_pending.Count == 0)
+				return;
+
+			var last = _pending[_pending.Count - 1];
+
+			_pending.RemoveAt(_pending.Count - 1);
+
+			var request = last.Content == null ? null : new RouteResponse
+			{
+				ContentType = last.ContentType,
+				Content = new MemoryStream(last.Content),
+			};
+
+			Execute(last.Method, last.Uri, request, strm =>
+			{
+				if (last.OnResponse != null)
+					last.OnResponse(strm);
+
+				return strm.Consume();
+			});
 		}
 
 		public override bool DetectedFault()
@@ -490,17 +562,13 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 
 			var uri = new Uri(_baseUrl, data.Url);
 
-			return Execute("GET", uri, (object)null, null, resp =>
+			return Execute("GET", uri, null, strm =>
 			{
-				using (var strm = resp.GetResponseStream())
-				{
-					var ms = new MemoryStream();
+				var ms = new MemoryStream();
 
-					if (strm != null)
-						strm.CopyTo(ms);
+				strm.CopyTo(ms);
 
-					return ms;
-				}
+				return ms;
 			});
 		}
 
@@ -513,6 +581,9 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 
 			_offline = false;
 
+			// Any queued requests are for the previous connection
+			_pending.Clear();
+
 			try
 			{
 				// Send the initial POST to the base url
@@ -548,26 +619,18 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 		private void Send(string method, string path, object request)
 		{
 			var uri = new Uri(_agentUri, _agentUri.PathAndQuery + path);
-			Execute(method, uri, request, SendJson, resp => resp.Consume());
+			Execute(method, uri, AsJson(request), strm => strm.Consume());
 		}
 
 		private T Send<T>(string method, string path, object request)
 		{
 			var uri = new Uri(_agentUri, _agentUri.PathAndQuery + path);
-			return Execute(method, uri, request, SendJson, req => req.FromJson<T>());
+			return Execute(method, uri, AsJson(request), strm => strm.FromJson<T>());
 		}
 
-		private static void SendJson(HttpWebRequest req, object obj)
+		private static RouteResponse AsJson(object obj)
 		{
-			if (req.Method == "GET")
-			{
-				Debug.Assert(obj == null);
-				return;
-			}
-
-			var json = RouteResponse.AsJson(obj);
-
-			SendStream(req, json);
+			return obj == null ? null : RouteResponse.AsJson(obj);
 		}
 
 		private static void SendStream(HttpWebRequest req, RouteResponse obj)
@@ -583,26 +646,126 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				obj.Content.CopyTo(strm);
 		}
 
-		private TOut Execute<TOut,TIn>(string method,
+		private static byte[] ToByteArray(RouteResponse obj)
+		{
+			if (obj == null)
+				return null;
+
+			obj.Content.Seek(0, SeekOrigin.Begin);
+
+			using (var ms = new MemoryStream())
+			{
+				obj.Content.CopyTo(ms);
+				return ms.ToArray();
+			}
+		}
+
+		/// <summary>
+		/// Queue a request whose response is not needed right away.
+		/// When pipelining, the request is sent to the agent as part of
+		/// the batch that is made by the next call to Execute() or Flush().
+		/// The engine flushes every agent at the end of each action, so
+		/// requests are never held past the action that made them.
+		/// Otherwise, the request is sent immediately.
+		/// </summary>
+		private void Enqueue(string method, Uri uri, RouteResponse request, Action<Stream> onResponse)
+		{
+			if (!_batching)
+			{
+				Execute(method, uri, request, strm =>
+				{
+					if (onResponse != null)
+						onResponse(strm);
+
+					return strm.Consume();
+				});
+
+				return;
+			}
+
+			if (_offline)
+			{
+				Logger.Debug("Agent server '{0}' is offline", uri);
+				Logger.Debug("Ignoring command '{0} {1}'", method, uri.PathAndQuery);
+				return;
+			}
+
+			// Requests queued by other agents were made first
+			FlushOthers();
+
+			Logger.Trace("Queueing {0} {1}", method, uri);
+
+			// Copy the content now since the caller is free
+			// to change it once we return.
+			_pending.Add(new PendingRequest
+			{
+				Method = method,
+				Uri = uri,
+				ContentType = request != null ? request.ContentType : null,
+				Content = ToByteArray(request),
+				OnResponse = onResponse,
+			});
+		}
+
+		private void FlushOthers()
+		{
+			if (FlushOtherAgents != null)
+				FlushOtherAgents();
+		}
+
+		private bool ProbeBatch()
+		{
+			var uri = new Uri(_baseUrl, Server.BatchPath);
+			var req = RouteResponse.AsJson(new BatchRequest { Requests = new List<BatchRequest.Item>() });
+
+			try
+			{
+				ExecuteInner("POST", uri, req, strm => strm.Consume(), true);
+
+				Logger.Debug("Pipelining requests to remote agent {0}", _baseUrl);
+
+				return true;
+			}
+			catch (WebException ex)
+			{
+				if (ex.Response != null)
+				{
+					using (var resp = (HttpWebResponse)ex.Response)
+						resp.Consume();
+				}
+
+				Logger.Info("Remote agent {0} does not support pipelining, requests will be sent individually.", _baseUrl);
+
+				return false;
+			}
+		}
+
+		private TOut Execute<TOut>(string method,
 			Uri uri,
-			TIn request,
-			Action<HttpWebRequest, TIn> encode,
-			Func<HttpWebResponse, TOut> decode)
+			RouteResponse request,
+			Func<Stream, TOut> decode)
 		{
 			if (_offline)
 			{
 				Logger.Debug("Agent server '{0}' is offline", uri);
 				Logger.Debug("Ignoring command '{0} {1}'", method, uri.PathAndQuery);
+				_pending.Clear();
 				return default(TOut);
 			}
 
+			// Requests queued by other agents must reach them first
+			FlushOthers();
+
 			try
 			{
-				return ExecuteInner(method, uri, request, encode, decode);
+				if (_pending.Count > 0)
+					return ExecuteBatch(method, uri, request, decode);
+
+				return ExecuteInner(method, uri, request, decode, true);
 			}
 			catch (WebException ex)
 			{
-				if (ex.Status != WebExceptionStatus.ProtocolError)
+				if (ex.Status != WebExceptionStatus.ProtocolError || ex.Response == null)
 				{
 					Logger.Debug(ex.Message);
 
@@ -634,26 +797,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 						throw;
 					}
 
-					var error = resp.FromJson<ExceptionResponse>();
-
-					// 503 means try again later
-					if (resp.StatusCode == HttpStatusCode.ServiceUnavailable)
-					{
-						if (error.Fault != null)
-						{
-							error.Fault.AgentName = Name;
-							throw new FaultException(error.Fault, ex);
-						}
-
-						Logger.Trace(error.Message);
-						Logger.Trace("Server Stack Trace:\n{0}", error.StackTrace);
-						throw new SoftException(error.Message, ex);
-					}
-
-					// 500 is hard fail
-					Logger.Trace(error.Message);
-					Logger.Trace("Server Stack Trace:\n{0}", error.StackTrace);
-					throw new PeachException(error.Message, ex);
+					throw MakeError(resp.StatusCode, resp.FromJson<ExceptionResponse>(), ex);
 				}
 			}
 			catch (Exception ex)
@@ -665,13 +809,110 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 			}
 		}
 
-		private TOut ExecuteInner<TOut, TIn>(string method,
+		private Exception MakeError(HttpStatusCode code, ExceptionResponse error, Exception inner)
+		{
+			Logger.Trace(error.Message);
+			Logger.Trace("Server Stack Trace:\n{0}", error.StackTrace);
+
+			// 503 means try again later
+			if (code == HttpStatusCode.ServiceUnavailable)
+			{
+				if (error.Fault != null)
+				{
+					error.Fault.AgentName = Name;
+					return new FaultException(error.Fault, inner);
+				}
+
+				return new SoftException(error.Message, inner);
+			}
+
+			// 500 is hard fail
+			return new PeachException(error.Message, inner);
+		}
+
+		/// <summary>
+		/// Send all queued requests followed by the specified request
+		/// to the agent in a single round trip.
+		/// </summary>
+		private TOut ExecuteBatch<TOut>(string method,
+			Uri uri,
+			RouteResponse request,
+			Func<Stream, TOut> decode)
+		{
+			var ret = default(TOut);
+			var pending = _pending.ToList();
+
+			_pending.Clear();
+
+			pending.Add(new PendingRequest
+			{
+				Method = method,
+				Uri = uri,
+				Content = ToByteArray(request),
+				OnResponse = strm => ret = decode(strm),
+			});
+
+			var batch = new BatchRequest
+			{
+				Requests = pending.Select((p, i) => new BatchRequest.Item
+				{
+					Id = i,
+					Method = p.Method,
+					Path = p.Uri.PathAndQuery,
+					Content = p.Content,
+				}).ToList()
+			};
+
+			// Never retry a batch, the agent could have already
+			// run some of the requests before the connection failed
+			var resp = ExecuteInner("POST", new Uri(_baseUrl, Server.BatchPath), RouteResponse.AsJson(batch), strm => strm.FromJson<BatchResponse>(), false);
+
+			for (var i = 0; i < pending.Count; ++i)
+			{
+				var item = resp.Responses.ElementAtOrDefault(i);
+				var req = pending[i];
+
+				if (item == null || item.Id != i)
+					throw new WebException("Missing response for '{0} {1}' from batch request.".Fmt(req.Method, req.Uri.PathAndQuery), WebExceptionStatus.ReceiveFailure);
+
+				var code = (HttpStatusCode)item.Status;
+
+				Logger.Trace("<<< [{0}] {1} {2}", i, item.Status, code);
+
+				using (var strm = new MemoryStream(item.Content ?? new byte[0]))
+				{
+					if (item.Status < 400)
+					{
+						if (req.OnResponse != null)
+							req.OnResponse(strm);
+
+						continue;
+					}
+
+					if (code != HttpStatusCode.InternalServerError &&
+						code != HttpStatusCode.ServiceUnavailable)
+					{
+						// Mark offline to trigger a future reconnect
+						_offline = true;
+
+						throw new WebException("The remote server returned an error: ({0}) {1} for '{2} {3}'.".Fmt(
+							item.Status, code, req.Method, req.Uri.PathAndQuery));
+					}
+
+					throw MakeError(code, strm.FromJson<ExceptionResponse>(), null);
+				}
+			}
+
+			return ret;
+		}
+
+		private TOut ExecuteInner<TOut>(string method,
 			Uri uri,
-			TIn request,
-			Action<HttpWebRequest, TIn> encode,
-			Func<HttpWebResponse, TOut> decode)
+			RouteResponse request,
+			Func<Stream, TOut> decode,
+			bool retry)
 		{
-			var retryCount = 10;
+			var retryCount = retry ? 10 : 0;
 
 			while (true)
 			{
@@ -692,16 +933,19 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 
 					req.Method = method;
 
-					if (Equals(request, default(TIn)))
+					if (request == null)
 						req.ContentLength = 0;
 					else
-						encode(req, request);
+						SendStream(req, request);
 
 					using (var resp = (HttpWebResponse)req.GetResponse())
 					{
 						Logger.Trace("<<< {0} {1}", (int)resp.StatusCode, resp.StatusDescription);
 
-						return decode(resp);
+						using (var strm = resp.GetResponseStream() ?? Stream.Null)
+						{
+							return decode(strm);
+						}
 					}
 				}
 				catch (WebException ex)
@@ -12,7 +12,6 @@ using System.Reflection;
 using Newtonsoft.Json;
 using Peach.Core;
 using Peach.Core.IO;
-using HttpListenerRequest = SocketHttpListener.Net.HttpListenerRequest;
 
 namespace Peach.Pro.Core.Agent.Channels.Rest
 {
@@ -57,7 +56,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 			ResetReusesImpl(req);
 		}
 
-		public static T FromJson<T>(this HttpListenerRequest req)
+		public static T FromJson<T>(this RouteRequest req)
 		{
 			using (var sr = new StreamReader(req.InputStream, req.ContentEncoding))
 			{
@@ -86,6 +85,15 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 			}
 		}
 
+		public static T FromJson<T>(this Stream strm)
+		{
+			// Leave the stream open so the caller can consume any remaining bytes
+			using (var sr = new StreamReader(strm, System.Text.Encoding.UTF8, true, 1024, true))
+			{
+				return JsonDecode<T>(sr);
+			}
+		}
+
 		public static T JsonDecode<T>(this TextReader stream)
 		{
 			{
@@ -112,6 +120,13 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 			return null;
 		}
 
+		public static object Consume(this Stream strm)
+		{
+			strm.CopyTo(Stream.Null);
+
+			return null;
+		}
+
 		/// <summary>
 		/// Try and get a integer value from the query string.
 		/// Fails if the value for the key is not a number or negative.
@@ -80,7 +80,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 		{
 			Logger.Trace(">>> {0} {1}", ctx.Request.HttpMethod, ctx.Request.RawUrl);
 
-			var response = Routes.Dispatch(ctx.Request);
+			var response = Routes.Dispatch(new RouteRequest(ctx.Request));
 
 			try
 			{
@@ -48,7 +48,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 			_routes.Remove(Server.LogPath);
 		}
 
-		private RouteResponse OnSubscribe(HttpListenerRequest req)
+		private RouteResponse OnSubscribe(RouteRequest req)
 		{
 			// a normal HTTP GET will be used to probe that this service is available
 			if (!req.IsWebSocketRequest)
@@ -206,4 +206,46 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 	internal class CallResponse : VariantMessage
 	{
 	}
+
+	internal class BatchRequest
+	{
+		public class Item
+		{
+			[JsonProperty("id")]
+			public int Id { get; set; }
+
+			[JsonProperty("method")]
+			public string Method { get; set; }
+
+			[JsonProperty("path")]
+			public string Path { get; set; }
+
+			[JsonProperty("content")]
+			public byte[] Content { get; set; }
+		}
+
+		[JsonProperty("requests")]
+		public List<Item> Requests { get; set; }
+	}
+
+	internal class BatchResponse
+	{
+		public class Item
+		{
+			[JsonProperty("id")]
+			public int Id { get; set; }
+
+			[JsonProperty("status")]
+			public int Status { get; set; }
+
+			[JsonProperty("contentType")]
+			public string ContentType { get; set; }
+
+			[JsonProperty("content")]
+			public byte[] Content { get; set; }
+		}
+
+		[JsonProperty("responses")]
+		public List<Item> Responses { get; set; }
+	}
 }
@@ -11,7 +11,6 @@ using Peach.Core;
 using Peach.Core.Agent;
 using Peach.Core.Agent.Channels;
 using Logger = NLog.Logger;
-using HttpListenerRequest = SocketHttpListener.Net.HttpListenerRequest;
 using SocketHttpListener.Net;
 
 namespace Peach.Pro.Core.Agent.Channels.Rest
@@ -38,7 +37,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 			}
 		}
 
-		private RouteResponse OnAgentConnect(HttpListenerRequest req)
+		private RouteResponse OnAgentConnect(RouteRequest req)
 		{
 			var ctx = new Context(this, req.FromJson<ConnectRequest>());
 
@@ -173,7 +172,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				_monitors.Add(mon);
 			}
 
-			private RouteResponse OnSessionStarting(HttpListenerRequest req)
+			private RouteResponse OnSessionStarting(RouteRequest req)
 			{
 				foreach (var mon in _monitors)
 				{
@@ -183,7 +182,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.Success();
 			}
 
-			private RouteResponse OnSessionFinished(HttpListenerRequest req)
+			private RouteResponse OnSessionFinished(RouteRequest req)
 			{
 				foreach (var mon in _monitors.Reverse())
 				{
@@ -202,7 +201,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.Success();
 			}
 
-			private RouteResponse OnStartMonitor(HttpListenerRequest req)
+			private RouteResponse OnStartMonitor(RouteRequest req)
 			{
 				var mon = req.FromJson<MonitorRequest>();
 
@@ -217,7 +216,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.AsJson(resp, HttpStatusCode.Created);
 			}
 
-			private RouteResponse OnIterationStarting(HttpListenerRequest req)
+			private RouteResponse OnIterationStarting(RouteRequest req)
 			{
 				FlushCachedMonitorData();
 
@@ -236,7 +235,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.Success();
 			}
 
-			private RouteResponse OnIterationFinished(HttpListenerRequest req)
+			private RouteResponse OnIterationFinished(RouteRequest req)
 			{
 				foreach (var mon in _monitors.Reverse())
 				{
@@ -246,7 +245,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.Success();
 			}
 
-			private RouteResponse OnMessage(HttpListenerRequest req)
+			private RouteResponse OnMessage(RouteRequest req)
 			{
 				var msg = req.Url.Segments[req.Url.Segments.Length - 1];
 
@@ -258,7 +257,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.Success();
 			}
 
-			private RouteResponse DetectedFault(HttpListenerRequest req)
+			private RouteResponse DetectedFault(RouteRequest req)
 			{
 				var ret = new BoolResponse { Value = false };
 
@@ -270,7 +269,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.AsJson(ret);
 			}
 
-			private RouteResponse GetMonitorData(HttpListenerRequest req)
+			private RouteResponse GetMonitorData(RouteRequest req)
 			{
 				var ret = new FaultResponse { Faults = new List<FaultResponse.Record>() };
 
@@ -316,7 +315,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.AsJson(ret);
 			}
 
-			private RouteResponse OnAgentDisconnect(HttpListenerRequest req)
+			private RouteResponse OnAgentDisconnect(RouteRequest req)
 			{
 				Dispose();
 
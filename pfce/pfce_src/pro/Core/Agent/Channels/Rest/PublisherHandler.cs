@@ -8,7 +8,6 @@ using System.Linq;
 using Peach.Core;
 using Peach.Core.Agent.Channels;
 using Peach.Core.IO;
-using HttpListenerRequest = SocketHttpListener.Net.HttpListenerRequest;
 using SocketHttpListener.Net;
 
 namespace Peach.Pro.Core.Agent.Channels.Rest
@@ -69,14 +68,14 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				_handler._contexts.Remove(this);
 			}
 
-			private RouteResponse OnDelete(HttpListenerRequest req)
+			private RouteResponse OnDelete(RouteRequest req)
 			{
 				Dispose();
 
 				return RouteResponse.Success();
 			}
 
-			private RouteResponse OnOpen(HttpListenerRequest req)
+			private RouteResponse OnOpen(RouteRequest req)
 			{
 				var args = req.FromJson<PublisherOpenRequest>();
 
@@ -89,21 +88,21 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.Success();
 			}
 
-			private RouteResponse OnClose(HttpListenerRequest req)
+			private RouteResponse OnClose(RouteRequest req)
 			{
 				_publisher.close();
 
 				return RouteResponse.Success();
 			}
 
-			private RouteResponse OnAccept(HttpListenerRequest req)
+			private RouteResponse OnAccept(RouteRequest req)
 			{
 				_publisher.accept();
 
 				return RouteResponse.Success();
 			}
 
-			private RouteResponse OnOutput(HttpListenerRequest req)
+			private RouteResponse OnOutput(RouteRequest req)
 			{
 				using (var strm = req.InputStream)
 				{
@@ -124,7 +123,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.Success();
 			}
 
-			private RouteResponse OnInput(HttpListenerRequest req)
+			private RouteResponse OnInput(RouteRequest req)
 			{
 				_publisher.input();
 
@@ -133,7 +132,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.AsJson(resp);
 			}
 
-			private RouteResponse OnCall(HttpListenerRequest req)
+			private RouteResponse OnCall(RouteRequest req)
 			{
 				var json = req.FromJson<CallRequest>();
 
@@ -157,7 +156,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.AsJson(resp);
 			}
 
-			private RouteResponse OnSetProperty(HttpListenerRequest req)
+			private RouteResponse OnSetProperty(RouteRequest req)
 			{
 				var args = req.FromJson<SetPropertyRequest>();
 				var value = args.ToVariant();
@@ -167,7 +166,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.Success();
 			}
 
-			private RouteResponse OnGetProperty(HttpListenerRequest req)
+			private RouteResponse OnGetProperty(RouteRequest req)
 			{
 				var property = req.QueryString["name"];
 				if (string.IsNullOrEmpty(property))
@@ -179,7 +178,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				return RouteResponse.AsJson(resp);
 			}
 
-			private RouteResponse OnWantBytes(HttpListenerRequest req)
+			private RouteResponse OnWantBytes(RouteRequest req)
 			{
 				// These can acquire a lock, so cache the length
 				var len = _publisher.Length;
@@ -243,7 +242,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 			}
 		}
 
-		private RouteResponse OnCreatePublisher(HttpListenerRequest req)
+		private RouteResponse OnCreatePublisher(RouteRequest req)
 		{
 			var ctx = new Context(this, req.FromJson<PublisherRequest>());
 
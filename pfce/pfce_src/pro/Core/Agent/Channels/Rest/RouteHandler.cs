@@ -5,7 +5,6 @@
 using System;
 using System.Collections.Generic;
 using System.Diagnostics;
-using SocketHttpListener.Net;
 
 namespace Peach.Pro.Core.Agent.Channels.Rest
 {
@@ -20,7 +19,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 
 		private readonly Dictionary<string, Route> _routes = new Dictionary<string, Route>();
 
-		public delegate RouteResponse RequestHandler(HttpListenerRequest req);
+		public delegate RouteResponse RequestHandler(RouteRequest req);
 
 		public void Add(string prefix, string method, RequestHandler handler)
 		{
@@ -45,7 +44,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				throw new KeyNotFoundException();
 		}
 
-		public RouteResponse Dispatch(HttpListenerRequest req)
+		public RouteResponse Dispatch(RouteRequest req)
 		{
 			Route route;
 
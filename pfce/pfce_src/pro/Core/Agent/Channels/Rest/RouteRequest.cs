@@ -0,0 +1,67 @@
+//
+// Copyright (c) Peach Fuzzer, LLC
+//
+
+using System;
+using System.Collections.Specialized;
+using System.IO;
+using System.Text;
+using System.Web;
+using HttpListenerRequest = SocketHttpListener.Net.HttpListenerRequest;
+
+namespace Peach.Pro.Core.Agent.Channels.Rest
+{
+	/// <summary>
+	/// Request passed to route handlers.
+	/// </summary>
+	/// <remarks>
+	/// Requests are either received directly by the listener or
+	/// are unpacked from the body of a batch request.
+	/// </remarks>
+	internal class RouteRequest
+	{
+		public string HttpMethod { get; private set; }
+
+		public Uri Url { get; private set; }
+
+		public NameValueCollection QueryString { get; private set; }
+
+		public Stream InputStream { get; private set; }
+
+		public Encoding ContentEncoding { get; private set; }
+
+		public bool IsWebSocketRequest { get; private set; }
+
+		/// <summary>
+		/// Wrap a request that was received by the listener.
+		/// </summary>
+		/// <param name="req">The listener request.</param>
+		public RouteRequest(HttpListenerRequest req)
+		{
+			HttpMethod = req.HttpMethod;
+			Url = req.Url;
+			QueryString = req.QueryString;
+			InputStream = req.InputStream;
+			ContentEncoding = req.ContentEncoding;
+			IsWebSocketRequest = req.IsWebSocketRequest;
+		}
+
+		/// <summary>
+		/// Make a request that is relative to the url of another request.
+		/// Used to dispatch the individual requests contained in a batch.
+		/// </summary>
+		/// <param name="baseUrl">The url of the batch request.</param>
+		/// <param name="method">The HTTP method.</param>
+		/// <param name="pathAndQuery">The path and query string.</param>
+		/// <param name="content">The request body, or null.</param>
+		public RouteRequest(Uri baseUrl, string method, string pathAndQuery, byte[] content)
+		{
+			HttpMethod = method;
+			Url = new Uri(baseUrl, pathAndQuery);
+			QueryString = HttpUtility.ParseQueryString(Url.Query);
+			InputStream = new MemoryStream(content ?? new byte[0]);
+			ContentEncoding = Encoding.UTF8;
+			IsWebSocketRequest = false;
+		}
+	}
+}
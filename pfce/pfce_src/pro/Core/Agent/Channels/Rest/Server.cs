@@ -18,6 +18,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 		internal const string MonitorPath = "/pa/agent";
 		internal const string FilePath = "/pa/file";
 		internal const string LogPath = "/pa/log";
+		internal const string BatchPath = "/pa/batch";
 
 		public const ushort DefaultPort = 9001;
 
@@ -146,6 +147,7 @@ namespace Peach.Pro.Core.Agent.Channels.Rest
 				using (new LogHandler(_listener.Routes))
 				using (new MonitorHandler(_listener.Routes))
 				using (new PublisherHandler(_listener.Routes))
+				using (new BatchHandler(_listener.Routes))
 				{
 					if (Started != null)
 						Started(this, EventArgs.Empty);
@@ -38,35 +38,30 @@ namespace Peach.Pro.Core
 			if (count > list.Count)
 				count = list.Count;
 
-			var max = list.Max;
-			var ret = new List<T>();
-			var conversions = new SortedList<long, Func<long, long>>();
+			var ret = new T[count];
+			var chosen = new List<WeightedList<T>.BoundedItem>();
 
-			for (int i = 0; i < count; ++i)
+			try
 			{
-				var rand = rng.Next(max);
-
-				foreach (var c in conversions)
-					rand = c.Value(rand);
-
-				var item = list.UpperBound(rand);
-				var weight = item.UpperBound - item.LowerBound;
-
-				conversions.Add(item.UpperBound, (c) => {
-					if (c >= item.LowerBound)
-						return c + weight;
-					else
-						return c;
-				});
+				for (int i = 0; i < count; ++i)
+				{
+					var item = list.UpperBound(rng.Next(list.Max));
 
-				System.Diagnostics.Debug.Assert(!ret.Contains(item.Item));
-				System.Diagnostics.Debug.Assert(max >= weight);
+					// Chosen items get no weight while sampling so
+					// they can't be picked again
+					list.SetWeight(item.Index, 0);
+					chosen.Add(item);
 
-				ret.Add(item.Item);
-				max -= weight;
+					ret[i] = item.Item;
+				}
+			}
+			finally
+			{
+				foreach (var item in chosen)
+					list.SetWeight(item.Index, item.UpperBound - item.LowerBound);
 			}
 
-			return ret.ToArray();
+			return ret;
 		}
 
 		public static IEnumerable<TSource> DistinctBy<TSource, TKey>
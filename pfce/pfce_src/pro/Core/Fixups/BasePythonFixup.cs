@@ -12,6 +12,12 @@ namespace Peach.Pro.Core.Fixups
 			__init__(parent, args);
 		}
 
+		public override bool IsDeterministic
+		{
+			// Python fixups can return anything
+			get { return false; }
+		}
+
 		protected virtual void __init__(DataElement parent, Dictionary<string, Variant> args)
 		{
 		}
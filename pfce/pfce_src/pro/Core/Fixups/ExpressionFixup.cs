@@ -30,6 +30,12 @@ namespace Peach.Pro.Core.Fixups
 				throw new PeachException("Error, ExpressionFixup requires an 'expression' argument!");
 		}
 
+		public override bool IsDeterministic
+		{
+			// The expression can return anything
+			get { return false; }
+		}
+
 		protected override Variant fixupImpl()
 		{
 			var from = elements["ref"];
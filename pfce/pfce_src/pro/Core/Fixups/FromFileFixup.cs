@@ -48,6 +48,12 @@ namespace Peach.Pro.Core.Fixups
 			return new BitStream(Convert.FromBase64String(b64data));
 		}
 
+		public override bool IsDeterministic
+		{
+			// The file can change between iterations
+			get { return false; }
+		}
+
 		protected override Variant fixupImpl()
 		{
 			if (!System.IO.File.Exists(Filename))
@@ -54,6 +54,12 @@ namespace Peach.Pro.Core.Fixups
 			}
 		}
 
+		public override bool IsDeterministic
+		{
+			// The script can return anything
+			get { return false; }
+		}
+
 		protected override Variant fixupImpl()
 		{
 			if (_pythonFixup == null)
@@ -97,6 +97,7 @@ namespace Peach.Pro.Core.Loggers
 		ILicense _license;
 		IJobLicense _jobLicense;
 		ulong _counter;
+		uint _workerIterations;
 
 		enum Category { Faults, Reproducing, NonReproducible }
 
@@ -221,6 +222,7 @@ namespace Peach.Pro.Core.Loggers
 			ConfigureDebugLogging(job.DebugLogPath, context.config);
 
 			_cache = new AsyncDbCache(job);
+			_workerIterations = 0;
 
 			using (var db = new NodeDatabase())
 			{
@@ -288,6 +290,8 @@ namespace Peach.Pro.Core.Loggers
 			{
 				Logger.Trace("Engine_TestFinished> Update JobDatabase");
 
+				AddWorkerIterations(context);
+
 				_cache.TestFinished();
 
 				job = _cache.Job;
@@ -409,10 +413,24 @@ namespace Peach.Pro.Core.Loggers
 				!context.controlIteration &&
 				!context.controlRecordingIteration)
 			{
+				AddWorkerIterations(context);
+
 				_cache.IterationFinished();
 			}
 		}
 
+		/// <summary>
+		/// Worker engines don't have loggers, so add the
+		/// iterations they finished to the job.
+		/// </summary>
+		private void AddWorkerIterations(RunContext context)
+		{
+			var count = context.WorkerIterations;
+
+			_cache.Job.IterationCount += count - _workerIterations;
+			_workerIterations = count;
+		}
+
 		protected override void StateStarting(RunContext context, State state)
 		{
 			_states.Add(new Fault.State
@@ -0,0 +1,180 @@
+using System;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.IO;
+using System.Linq;
+using Newtonsoft.Json;
+using NLog;
+using Peach.Core;
+using Peach.Pro.Core.Storage;
+using Peach.Pro.Core.WebServices.Models;
+using Logger = Peach.Core.Logger;
+
+namespace Peach.Pro.Core.Loggers
+{
+	/// <summary>
+	/// Enables the profiler for the duration of a job and periodically
+	/// writes where the time is spent to the job's log folder.
+	/// </summary>
+	/// <remarks>
+	/// Two files are written, profile.json with the totals of every element,
+	/// fixup, transformer and mutator and profile.folded with the self time of
+	/// every measured stack, suitable for generating a flame graph.
+	/// </remarks>
+	[Logger("Profile")]
+	[Parameter("Path", typeof(string), "Log folder, used when the job has no log folder", "")]
+	[Parameter("Interval", typeof(uint), "Seconds between writing the profile", "30")]
+	public class ProfileLogger : Logger
+	{
+		private static readonly NLog.Logger Logger = LogManager.GetCurrentClassLogger();
+
+		readonly Stopwatch _sinceWrite = new Stopwatch();
+		string _profilePath;
+		string _foldedPath;
+
+		/// <summary>
+		/// The user configured base path for all the logs
+		/// </summary>
+		public string BasePath { get; set; }
+
+		/// <summary>
+		/// How often the profile is written while the job runs
+		/// </summary>
+		public TimeSpan Interval { get; set; }
+
+		public ProfileLogger()
+		{
+			BasePath = Configuration.LogRoot;
+			Interval = TimeSpan.FromSeconds(30);
+		}
+
+		public ProfileLogger(Dictionary<string, Variant> args)
+			: this()
+		{
+			Variant path;
+			if (args.TryGetValue("Path", out path))
+				BasePath = Path.GetFullPath((string)path);
+
+			Variant interval;
+			if (args.TryGetValue("Interval", out interval))
+				Interval = TimeSpan.FromSeconds((uint)interval);
+		}
+
+		protected override void Engine_TestStarting(RunContext context)
+		{
+			_profilePath = null;
+			_foldedPath = null;
+
+			Profiler.Reset();
+			Profiler.Enabled = true;
+
+			_sinceWrite.Restart();
+		}
+
+		protected override void Engine_IterationFinished(RunContext context, uint currentIteration)
+		{
+			if (_sinceWrite.Elapsed < Interval)
+				return;
+
+			WriteProfile(context);
+
+			_sinceWrite.Restart();
+		}
+
+		protected override void Engine_TestFinished(RunContext context)
+		{
+			Profiler.Enabled = false;
+
+			WriteProfile(context);
+
+			_sinceWrite.Stop();
+		}
+
+		/// <summary>
+		/// Read the profile written for a job.
+		/// </summary>
+		/// <param name="path">Path to profile.json</param>
+		/// <returns>The profile or an empty list if none has been written</returns>
+		public static List<ProfileMetric> ReadProfile(string path)
+		{
+			if (path != null)
+			{
+				try
+				{
+					using (var reader = File.OpenText(path))
+					{
+						return (List<ProfileMetric>)JsonSerializer.CreateDefault()
+							.Deserialize(reader, typeof(List<ProfileMetric>));
+					}
+				}
+				catch (DirectoryNotFoundException)
+				{
+				}
+				catch (FileNotFoundException)
+				{
+				}
+			}
+
+			return new List<ProfileMetric>();
+		}
+
+		private void WriteProfile(RunContext context)
+		{
+			try
+			{
+				if (_profilePath == null)
+					ResolvePaths(context);
+
+				var metrics = Profiler.Snapshot().Select(e => new ProfileMetric(e)).ToList();
+
+				Replace(_profilePath, writer => writer.Write(JsonConvert.SerializeObject(metrics, Formatting.Indented)));
+				Replace(_foldedPath, Profiler.WriteFolded);
+			}
+			catch (Exception ex)
+			{
+				// The profile is diagnostic, never fail the job because of it
+				Logger.Debug("Failed to write profile. {0}", ex.Message);
+			}
+		}
+
+		private void ResolvePaths(RunContext context)
+		{
+			Job job;
+			using (var db = new NodeDatabase())
+			{
+				job = db.GetJob(context.config.id);
+			}
+
+			if (job == null || job.LogPath == null)
+			{
+				job = new Job(context.config)
+				{
+					LogPath = GetLogPath(context, Path.GetFullPath(BasePath))
+				};
+			}
+
+			if (!Directory.Exists(job.LogPath))
+				Directory.CreateDirectory(job.LogPath);
+
+			_profilePath = job.ProfilePath;
+			_foldedPath = job.ProfileFoldedPath;
+		}
+
+		private static void Replace(string path, Action<TextWriter> write)
+		{
+			// Write to a temporary file first so readers
+			// never see a partially written profile
+			var tmp = path + ".tmp";
+
+			using (var writer = File.CreateText(tmp))
+			{
+				write(writer);
+			}
+
+			if (File.Exists(path))
+				File.Delete(path);
+
+			File.Move(tmp, path);
+		}
+	}
+}
@@ -294,7 +294,9 @@ namespace Peach.Pro.Core.MutationStrategies
 				{
 					Debug.Assert(mutations.Length == 1);
 					stateModelMutation = Random.WeightedChoice(m.Mutators);
-					stateModelMutation.randomMutation(stateModel);
+
+					using (Profiler.Measure(ProfileKind.Mutator, stateModelMutation.Name))
+						stateModelMutation.randomMutation(stateModel);
 				}
 			}
 		}
@@ -265,7 +265,9 @@ namespace Peach.Pro.Core.MutationStrategies
 				Context.OnDataMutating(data, dataElement, mutator);
 				logger.Debug("ApplyMutation: Fuzzing: {0}", fullName);
 				logger.Debug("ApplyMutation: Mutator: {0}", mutator.Name);
-				mutator.sequentialMutation(dataElement);
+
+				using (Profiler.Measure(ProfileKind.Mutator, mutator.Name))
+					mutator.sequentialMutation(dataElement);
 			}
 		}
 
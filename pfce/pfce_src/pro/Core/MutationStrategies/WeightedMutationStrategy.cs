@@ -257,7 +257,9 @@ namespace Peach.Pro.Core.MutationStrategies
 					Context.OnDataMutating(data, elem, mutator);
 					logger.Debug("Action_Starting: Fuzzing: {0}", item.ElementName);
 					logger.Debug("Action_Starting: Mutator: {0}", mutator.Name);
-					mutator.randomMutation(elem);
+
+					using (Profiler.Measure(ProfileKind.Mutator, mutator.Name))
+						mutator.randomMutation(elem);
 
 					RecordMutation(instanceName, item.ElementName, mutator.Name);
 
@@ -1,7 +1,6 @@
 using System;
 using System.Collections.Generic;
 using System.Diagnostics;
-using System.Linq;
 using Peach.Core;
 
 namespace Peach.Pro.Core.Mutators.Utility
@@ -18,7 +17,19 @@ namespace Peach.Pro.Core.Mutators.Utility
 		[DebuggerBrowsable(DebuggerBrowsableState.RootHidden)]
 		public KeyValuePair<long, T>[] Items
 		{
-			get { return obj.items.ToArray(); }
+			get
+			{
+				var ret = new KeyValuePair<long, T>[obj.Count];
+				var sum = 0L;
+
+				for (var i = 0; i < ret.Length; ++i)
+				{
+					sum += obj.weights[i];
+					ret[i] = new KeyValuePair<long, T>(sum, obj.items[i]);
+				}
+
+				return ret;
+			}
 		}
 	}
 
@@ -32,14 +43,24 @@ namespace Peach.Pro.Core.Mutators.Utility
 	/// All users of this container must ensure that the SelectionWeight
 	/// does not change once the element is added to the container.
 	/// If the SelectionWeight is changed, the change will not be reflected
-	/// in the sum total weights.
+	/// in the sum total weights.  Use TransformWeight or SetWeight to change
+	/// the weights of items already in the container.
+	///
+	/// The cumulative weights are kept in a Fenwick tree, so finding the
+	/// item for a weight and changing the weight of a single item are
+	/// both O(log n).
 	/// </remarks>
 	/// <typeparam name="T"></typeparam>
 	[DebuggerDisplay("Count = {Count}, Max = {Max}")]
 	[DebuggerTypeProxy(typeof(WeightedListDebugView<>))]
 	public class WeightedList<T> : ICollection<T>, IWeighted where T : IWeighted
 	{
-		internal SortedList<long, T> items = new SortedList<long, T>();
+		internal List<T> items = new List<T>();
+		internal List<long> weights = new List<long>();
+
+		// 1-based Fenwick tree of weights, tree[0] is unused
+		List<long> tree = new List<long> { 0 };
+		long max;
 
 		/// <summary>
 		/// Represents a bounded item.
@@ -48,6 +69,7 @@ namespace Peach.Pro.Core.Mutators.Utility
 		{
 			public long LowerBound { get; set; }
 			public long UpperBound { get; set; }
+			public int Index { get; set; }
 			public T Item { get; set; }
 		}
 
@@ -58,7 +80,7 @@ namespace Peach.Pro.Core.Mutators.Utility
 		{
 			get
 			{
-				return Count == 0 ? 0 : items.Keys[Count - 1];
+				return max;
 			}
 		}
 
@@ -89,27 +111,29 @@ namespace Peach.Pro.Core.Mutators.Utility
 			if (value < 0 || value >= Max)
 				throw new ArgumentOutOfRangeException("value");
 
-			var keys = items.Keys;
-			var low = 0;
-			var high = keys.Count - 1;
+			// Descend the tree to find the last position whose
+			// cumulative weight is less than or equal to value
+			var pos = 0;
+			var remain = value;
 
-			while (low < high)
+			for (var step = HighestBit(Count); step > 0; step >>= 1)
 			{
-				var idx = (low + high) / 2;
-				if (keys[idx] <= value)
-					low = idx + 1;
-				else
-					high = idx - 1;
+				var next = pos + step;
+				if (next <= Count && tree[next] <= remain)
+				{
+					pos = next;
+					remain -= tree[next];
+				}
 			}
 
-			if (keys[low] <= value)
-				++low;
+			var lower = value - remain;
 
 			return new BoundedItem
 			{
-				LowerBound = low > 0 ? items.Keys[low - 1] : 0,
-				UpperBound = items.Keys[low],
-				Item = items.Values[low]
+				LowerBound = lower,
+				UpperBound = lower + weights[pos],
+				Index = pos,
+				Item = items[pos]
 			};
 		}
 
@@ -122,10 +146,46 @@ namespace Peach.Pro.Core.Mutators.Utility
 		{
 			get
 			{
-				return items.Values[index];
+				return items[index];
 			}
 		}
 
+		/// <summary>
+		/// Returns the weight the element at the specified index is selected with.
+		/// </summary>
+		/// <param name="index">Index of the element.</param>
+		/// <returns>Weight of the element.</returns>
+		public long GetWeight(int index)
+		{
+			return weights[index];
+		}
+
+		/// <summary>
+		/// Change the weight the element at the specified index is selected with.
+		/// </summary>
+		/// <remarks>
+		/// An element with a weight of zero is never selected.
+		/// </remarks>
+		/// <param name="index">Index of the element.</param>
+		/// <param name="weight">The new weight.</param>
+		/// <returns>The previous weight of the element.</returns>
+		public long SetWeight(int index, long weight)
+		{
+			if (weight < 0)
+				throw new ArgumentOutOfRangeException("weight");
+
+			var old = weights[index];
+			var delta = weight - old;
+
+			weights[index] = weight;
+			max += delta;
+
+			for (var i = index + 1; i <= Count; i += i & -i)
+				tree[i] += delta;
+
+			return old;
+		}
+
 		/// <summary>
 		/// Add a collection of IWeighted elements to the collection.
 		/// </summary>
@@ -154,40 +214,86 @@ namespace Peach.Pro.Core.Mutators.Utility
 		/// <returns>The updated selection weight for the container.</returns>
 		public int TransformWeight(Func<int, int> how)
 		{
-			var weight = 0;
-			var newItems = new SortedList<long, T>();
+			for (var i = 0; i < items.Count; ++i)
+				weights[i] = items[i].TransformWeight(how);
+
+			Rebuild();
+
+			return how(SelectionWeight);
+		}
+
+		long Prefix(int count)
+		{
+			var sum = 0L;
+
+			for (var i = count; i > 0; i -= i & -i)
+				sum += tree[i];
+
+			return sum;
+		}
+
+		void Rebuild()
+		{
+			tree.Clear();
+			tree.Add(0);
+			tree.AddRange(weights);
+
+			max = 0;
 
-			foreach (var kv in items)
+			for (var i = 1; i < tree.Count; ++i)
 			{
-				weight += kv.Value.TransformWeight(how);
-				newItems.Add(weight, kv.Value);
+				max += weights[i - 1];
+
+				var parent = i + (i & -i);
+				if (parent < tree.Count)
+					tree[parent] += tree[i];
 			}
+		}
 
-			items = newItems;
+		static int HighestBit(int value)
+		{
+			var ret = 0;
 
-			return how(SelectionWeight);
+			while (value != 0)
+			{
+				ret = value;
+				value &= value - 1;
+			}
+
+			return ret;
 		}
 
 		#region ICollection<T>
 
 		public void Add(T item)
 		{
-			items.Add(Max + item.SelectionWeight, item);
+			long weight = item.SelectionWeight;
+
+			items.Add(item);
+			weights.Add(weight);
+
+			// The new node covers the items from (i - lowbit(i), i]
+			var i = items.Count;
+			tree.Add(weight + Prefix(i - 1) - Prefix(i - (i & -i)));
+
+			max += weight;
 		}
 
 		public void Clear()
 		{
 			items.Clear();
+			weights.Clear();
+			Rebuild();
 		}
 
 		public bool Contains(T item)
 		{
-			return items.ContainsValue(item);
+			return items.Contains(item);
 		}
 
 		public void CopyTo(T[] array, int arrayIndex)
 		{
-			items.Values.CopyTo(array, arrayIndex);
+			items.CopyTo(array, arrayIndex);
 		}
 
 		public int Count
@@ -202,17 +308,19 @@ namespace Peach.Pro.Core.Mutators.Utility
 
 		public bool Remove(T item)
 		{
-			var idx = items.IndexOfValue(item);
+			var idx = items.IndexOf(item);
 			if (idx < 0)
 				return false;
 
 			items.RemoveAt(idx);
+			weights.RemoveAt(idx);
+			Rebuild();
 			return true;
 		}
 
 		public IEnumerator<T> GetEnumerator()
 		{
-			return items.Values.GetEnumerator();
+			return items.GetEnumerator();
 		}
 
 		System.Collections.IEnumerator System.Collections.IEnumerable.GetEnumerator()
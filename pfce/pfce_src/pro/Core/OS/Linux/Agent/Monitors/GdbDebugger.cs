@@ -32,6 +32,7 @@ namespace Peach.Pro.OS.Linux.Agent.Monitors
 	[Parameter("WaitForExitTimeout", typeof(int), "Wait for exit timeout value in milliseconds (-1 is infinite)", "10000")]
 	[Parameter("HandleSignals", typeof(string), "Signals to consider faults. Space separated list of signals/exceptions to handle as faults.", "SIGSEGV SIGFPE SIGABRT SIGILL SIGPIPE SIGBUS SIGSYS SIGXCPU SIGXFSZ EXC_BAD_ACCESS EXC_BAD_INSTRUCTION EXC_ARITHMETIC SIGSTOP")]
 	[Parameter("Script", typeof(string), "Script file used to drive GDB and perform crash analysis.", "")]
+	[Parameter("Persistent", typeof(bool), "Keep GDB running for the whole session and only restart the inferior", "false")]
 	public class GdbDebugger : Monitor
 	{
 		static NLog.Logger logger = LogManager.GetCurrentClassLogger();
@@ -80,6 +81,65 @@ printf ""starting inferior: '{{executable}} {{arguments}}'\n""
 
 run
 log_if_crash
+quit
+";
+
+		// Used when Persistent is true. GDB stays alive for the whole session
+		// and waits for a command in {{gdbCtl}}.  The 'run' command restarts
+		// the inferior and {{gdbDone}} is written once it has exited and any
+		// crash has been logged.  The 'quit' command exits GDB.
+		static readonly string template_persistent = @"
+
+handle all nostop noprint
+handle {{handleSignals}} stop print
+
+file {{executable}}
+set args {{arguments}} > {{gdbTempDir}}/stdout.log 2> {{gdbTempDir}}/stderr.log
+set confirm off
+source {{exploitableScript}}
+
+python
+import os, tempfile, time
+
+def peach_write(path, value):
+    h,tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    os.close(h)
+    with open(tmp, 'w') as f:
+        f.write(value)
+    os.rename(tmp, path)
+
+peach_want_pid = [False]
+
+def on_start(evt):
+    if peach_want_pid[0]:
+        peach_want_pid[0] = False
+        peach_write('{{gdbPid}}', str(gdb.inferiors()[0].pid))
+gdb.events.cont.connect(on_start)
+
+def peach_run():
+    peach_want_pid[0] = True
+    try:
+        gdb.execute('run')
+        gdb.execute('log_if_crash')
+    except gdb.error as e:
+        print('error running inferior: ' + str(e))
+    peach_want_pid[0] = False
+    if gdb.inferiors()[0].pid != 0:
+        gdb.execute('kill')
+
+while True:
+    while not os.path.exists('{{gdbCtl}}'):
+        time.sleep(0.005)
+    with open('{{gdbCtl}}') as f:
+        cmd = f.read().strip()
+    os.remove('{{gdbCtl}}')
+    if cmd != 'run':
+        break
+    print(""starting inferior: '{{executable}} {{arguments}}'"")
+    peach_run()
+    peach_write('{{gdbDone}}', 'done')
+end
+
 quit
 ";
 
@@ -93,6 +153,8 @@ quit
 		protected string _gdbCmd = null;
 		protected string _gdbPid = null;
 		protected string _gdbLog = null;
+		protected string _gdbCtl = null;
+		protected string _gdbDone = null;
 		protected string _template = null;
 
 		protected Regex reHash = new Regex(@"^Hash: (\w+)\.(\w+)$", RegexOptions.Multiline);
@@ -112,6 +174,7 @@ quit
 		public int WaitForExitTimeout { get; set; }
 		public string HandleSignals { get; set; }
 		public string Script { get; set; }
+		public bool Persistent { get; set; }
 
 		public GdbDebugger(string name)
 			: base(name)
@@ -135,6 +198,10 @@ quit
 					throw new SoftException(string.Format("Error, Script file not found for Gdb monitor: {0}", Script));
 				}
 			}
+			else if (Persistent)
+			{
+				_template = template_log_if_crash + template_persistent;
+			}
 
 			_exploitable = FindExploitable();
 		}
@@ -162,8 +229,62 @@ quit
 			throw new PeachException("Error, Gdb could not find '" + target + "' in search path.");
 		}
 
+		/// <summary>
+		/// True if the inferior is still running under gdb.
+		/// </summary>
+		protected bool IsTargetRunning
+		{
+			get
+			{
+				if (!Persistent)
+					return _gdb.IsRunning;
+
+				return _gdb.IsRunning && File.Exists(_gdbPid) && !File.Exists(_gdbDone);
+			}
+		}
+
+		/// <summary>
+		/// Wait for the persistent gdb session to finish running the inferior.
+		/// Returns false if gdb did not report back within the timeout.
+		/// </summary>
+		protected bool WaitForDone(int timeout)
+		{
+			var sw = System.Diagnostics.Stopwatch.StartNew();
+
+			while (_gdb.IsRunning && !File.Exists(_gdbDone))
+			{
+				if (timeout >= 0 && sw.ElapsedMilliseconds >= timeout)
+					return false;
+
+				Thread.Sleep(10);
+			}
+
+			return true;
+		}
+
+		/// <summary>
+		/// Send a command to the persistent gdb session.
+		/// </summary>
+		protected void SendCommand(string cmd)
+		{
+			var tmp = _gdbCtl + ".tmp";
+
+			File.WriteAllText(tmp, cmd);
+
+			if (File.Exists(_gdbCtl))
+				File.Delete(_gdbCtl);
+
+			File.Move(tmp, _gdbCtl);
+		}
+
 		protected virtual void _Start()
 		{
+			if (Persistent)
+			{
+				_StartPersistent();
+				return;
+			}
+
 			if (File.Exists(_gdbPid))
 				File.Delete(_gdbPid);
 
@@ -200,13 +321,88 @@ quit
 			OnInternalEvent(EventArgs.Empty);
 		}
 
+		private void _StartPersistent()
+		{
+			if (File.Exists(_gdbPid))
+				File.Delete(_gdbPid);
+
+			if (File.Exists(_gdbDone))
+				File.Delete(_gdbDone);
+
+			if (File.Exists(_gdbLog))
+				File.Delete(_gdbLog);
+
+			if (!_gdb.IsRunning)
+			{
+				// The inferior's output is redirected to the logs by the
+				// gdb script, so don't let gdb's own output overwrite them.
+				try
+				{
+					_gdb.Start(GdbPath, "-batch -n -x {0}".Fmt(_gdbCmd), null, null);
+				}
+				catch (Exception ex)
+				{
+					throw new PeachException("Could not start debugger '{0}'. {1}.".Fmt(GdbPath, ex.Message), ex);
+				}
+			}
+
+			SendCommand("run");
+
+			// Wait for pid file to exist, open it up and read it
+			while (!File.Exists(_gdbPid) && !File.Exists(_gdbDone) && _gdb.IsRunning)
+				Thread.Sleep(10);
+
+			if (!File.Exists(_gdbPid))
+				throw new PeachException("GDB was unable to start '{0}'.".Fmt(Executable));
+
+			try
+			{
+				var pid = Convert.ToInt32(File.ReadAllText(_gdbPid));
+				_inferior.Attach(pid);
+			}
+			catch (ArgumentException)
+			{
+				// inferior ran to completion
+			}
+
+			// Notify event handler the process started
+			OnInternalEvent(EventArgs.Empty);
+		}
+
 		protected virtual void _Stop()
 		{
+			if (Persistent)
+			{
+				_StopPersistent();
+				return;
+			}
+
 			_inferior.Shutdown();
 			_gdb.WaitForIdle(WaitForExitTimeout);
 			_inferior.Dispose();
 		}
 
+		private void _StopPersistent()
+		{
+			// If a crash is being logged, let gdb finish before
+			// killing the inferior out from under it.
+			if (File.Exists(_gdbLog))
+				WaitForDone(WaitForExitTimeout);
+
+			// Only the inferior is stopped, gdb is kept around
+			// to run the next one.
+			if (IsTargetRunning)
+				_inferior.Stop(0);
+
+			_inferior.Dispose();
+
+			if (!WaitForDone(WaitForExitTimeout))
+			{
+				logger.Debug("GDB did not finish running the inferior, restarting debugger");
+				_gdb.Stop(WaitForExitTimeout);
+			}
+		}
+
 		protected virtual MonitorData MakeFault(string type, string reason)
 		{
 			var ret = new MonitorData
@@ -236,18 +432,18 @@ quit
 			_messageExit = false;
 			_secondStart = true;
 
-			if ((RestartAfterFault && args.LastWasFault) || RestartOnEachTest || !_gdb.IsRunning)
+			if ((RestartAfterFault && args.LastWasFault) || RestartOnEachTest || !IsTargetRunning)
 				_Stop();
 			else if (firstStart)
 				return;
 
-			if (!_gdb.IsRunning && StartOnCall == null)
+			if (!IsTargetRunning && StartOnCall == null)
 				_Start();
 		}
 
 		public override bool DetectedFault()
 		{
-			if (!_messageExit && FaultOnEarlyExit && !_gdb.IsRunning)
+			if (!_messageExit && FaultOnEarlyExit && !IsTargetRunning)
 			{
 				_Stop(); // Stop 1st so stdout/stderr logs are closed
 				_fault = MakeFault("ExitedEarly", "Process exited early.");
@@ -258,7 +454,11 @@ quit
 					_inferior.WaitForIdle(WaitForExitTimeout);
 				else
 					_inferior.WaitForExit(WaitForExitTimeout);
-				_gdb.Stop(WaitForExitTimeout);
+
+				if (Persistent)
+					_Stop();
+				else
+					_gdb.Stop(WaitForExitTimeout);
 			}
 			else if (RestartOnEachTest)
 			{
@@ -339,6 +539,8 @@ quit
 			_gdbCmd = Path.Combine(_tmpDir.Path, "gdb.cmd");
 			_gdbPid = Path.Combine(_tmpDir.Path, "gdb.pid");
 			_gdbLog = Path.Combine(_tmpDir.Path, "gdb.log");
+			_gdbCtl = Path.Combine(_tmpDir.Path, "gdb.ctl");
+			_gdbDone = Path.Combine(_tmpDir.Path, "gdb.done");
 
 			var locals = new Dictionary<string, object>();
 
@@ -346,6 +548,8 @@ quit
 			locals["gdbLog"] = _gdbLog;
 			locals["gdbPid"] = _gdbPid;
 			locals["gdbCmd"] = _gdbCmd;
+			locals["gdbCtl"] = _gdbCtl;
+			locals["gdbDone"] = _gdbDone;
 			locals["exploitableScript"] = _exploitable;
 
 			PopulateTemplateParameters(locals);
@@ -364,6 +568,13 @@ quit
 		public override void SessionFinished()
 		{
 			_Stop();
+
+			if (Persistent && _gdb.IsRunning)
+			{
+				SendCommand("quit");
+				_gdb.WaitForExit(WaitForExitTimeout);
+			}
+
 			_tmpDir.Dispose();
 		}
 
@@ -382,7 +593,9 @@ quit
 			{
 				_messageExit = true;
 
-				if (!_gdb.WaitForExit(WaitForExitTimeout))
+				var exited = Persistent ? WaitForDone(WaitForExitTimeout) : _gdb.WaitForExit(WaitForExitTimeout);
+
+				if (!exited)
 					_fault = MakeFault("FailedToExit", "Process did not exit in " + WaitForExitTimeout + "ms.");
 			}
 		}
@@ -90,6 +90,7 @@ sys.path.append(os.path.dirname(abspath))
 
 import lib.classifier as classifier
 import lib.arch as arch
+from lib.gdb_wrapper.x86 import query_cache
 
 def check_version():
     '''
@@ -108,7 +109,7 @@ def gdb_ver():
     '''
     Gets the GDB version number as a string.
     '''
-    gdbstr = gdb.execute("show version", False, True).splitlines()[0]
+    gdbstr = query_cache.execute("show version").splitlines()[0]
     version = _re_gdb_version.search(gdbstr)
     if version is None:
         warnings.warn("Error while parsing gdb version string: {}".format(gdbstr))
@@ -167,7 +168,7 @@ class ExploitableCommand(gdb.Command):
             return
 
         try:
-            disas = gdb.execute("disas $pc", False, True).splitlines()
+            disas = query_cache.execute("disas $pc").splitlines()
         except RuntimeError as e:
             warnings.warn(str(e))
             return
@@ -199,6 +200,9 @@ class ExploitableCommand(gdb.Command):
         op.add_argument("-a", "--asan-log", type=argparse.FileType(),
             help="Symbolize and analyze AddressSanitizer output (assumes "
             "executable is loaded) (WARNING: untested).")
+        op.add_argument("-r", "--all-rules", action="store_true",
+            help="evaluate every rule rather than stopping once the top "
+            "classification is known, so all matching rules are reported")
         try:
             args = op.parse_args(gdb.string_to_argv(argstr))
         except NiceArgParserExit:
@@ -207,7 +211,7 @@ class ExploitableCommand(gdb.Command):
         import logging
         try:
             target = arch.getTarget(args.asan_log)
-            c = classifier.Classifier().getClassification(target)
+            c = classifier.Classifier(args.all_rules).getClassification(target)
         except Exception as e:
             logging.exception(e)
             raise e
@@ -226,6 +230,7 @@ class ExploitableCommand(gdb.Command):
             print("Stack trace:")
             print(str(target.backtrace()))
             print("Faulting frame: {}".format(target.faulting_frame()))
+            print(query_cache.stats())
 
         if args.machine:
             gdb.write(Classifier.getMachineString(c))
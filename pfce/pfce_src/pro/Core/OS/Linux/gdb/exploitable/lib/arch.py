@@ -41,7 +41,7 @@ except ImportError as e:
 from lib.gdb_wrapper.arm import ArmTarget
 from lib.gdb_wrapper.qnx import QnxTarget
 from lib.gdb_wrapper.asan import ASanTarget
-from lib.gdb_wrapper.x86 import Target, x86Target
+from lib.gdb_wrapper.x86 import Target, x86Target, query_cache
 
 from lib.analyzers.x86 import Analyzer
 from lib.analyzers.asan import ASanAnalyzer
@@ -75,24 +75,23 @@ def getTarget(asan_log_file=None):
     ''' 
 
     # Get OS info.  TODO: verify this works on older versions of GDB (7.2)
-    osabi = Target._re_gdb_osabi.search(str(gdb.execute("show osabi", False, 
-        True))).group(1)
-    arch = Target._re_gdb_arch.search(str(gdb.execute("show architecture", False, True))).group(1)
+    osabi = Target._re_gdb_osabi.search(str(query_cache.execute("show osabi"))).group(1)
+    arch = Target._re_gdb_arch.search(str(query_cache.execute("show architecture"))).group(1)
 
     # Instantiate a target based on the params and OS info
     # ASAN + i386 + *
     if asan_log_file and arch.startswith("i386"):
-        target = ASanTarget(asan_log_file.read())
+        target = ASanTarget(asan_log_file)
         target.analyzer = ASanAnalyzer(target)
         return target
     # ASAN + ARM + QNX
     elif asan_log_file and arch.lower()[:3] == "arm" and osabi == "QNX Neutrino":
-        target = QnxASanTarget(asan_log_file.read())
+        target = QnxASanTarget(asan_log_file)
         target.analyzer = ASanAnalyzer(target)
         return target
     # ASAN + ARM + *
     elif asan_log_file and arch.lower()[:3] == "arm":
-        target = ArmASanTarget(asan_log_file.read())
+        target = ArmASanTarget(asan_log_file)
         target.analyzer = ArmASanAnalyzer(target)
         return target
     # * + ARM + QNX
@@ -51,7 +51,6 @@ A collection of objects used to classify GDB Inferiors (Targets).
 
 import copy
 import warnings, traceback
-from functools import partial
 
 import lib.rules as rules
 from lib.tools import AttrDict
@@ -201,13 +200,77 @@ class Classification(AttrDict):
         result.append("")
         return "\n".join(result)
 
+class RulePlan(object):
+    '''
+    The rules specified in rules.py, compiled once into Tags and ordered for
+    evaluation. Notable attributes include:
+
+    rules - a list of AttrDicts (match_function, cost, tag) in ranking order
+    order - the same rules ordered from cheapest to most expensive to
+        evaluate, ties broken by ranking
+    '''
+
+    # Relative cost of each analyzer method: 0 only looks at the signal,
+    # 1 disassembles the current instruction, 2 reads the process mappings
+    # and 3 walks the backtrace. Unlisted methods are assumed to walk the
+    # backtrace.
+    _costs = dict(
+        isUseAfterFree=0, isMalformedInstructionSignal=0,
+        isFloatingPointException=0, isBenignSignal=0, isAbortSignal=0,
+        isAccessViolationSignal=0, isUncategorizedSignal=0,
+        isReturnAv=1, isSegFaultOnPcNotNearNull=1, isBranchAvNotNearNull=1,
+        isDestAvNotNearNull=1, isSegFaultOnPcNearNull=1, isBranchAvNearNull=1,
+        isBlockMove=1, isDestAvNearNull=1, isSourceAvNearNull=1,
+        isSourceAvNotNearNull=1,
+        isErrorWhileExecutingFromStack=2, isStackOverflow=2,
+        isStackBufferOverflow=3, isPossibleStackCorruption=3, isHeapError=3)
+
+    def __init__(self, rule_list):
+        self.source = rule_list
+        self.rules = []
+        num_rules = sum(len(rl) for (_, rl) in rule_list)
+        ranking = 1
+        for cat, user_rule_list in rule_list:
+            for user_rule in user_rule_list:
+                tag_data = copy.deepcopy(user_rule)
+                del tag_data["match_function"]
+                tag_data["ranking"] = (ranking, num_rules)
+                tag_data["category"] = cat
+                self.rules.append(AttrDict(
+                    match_function=user_rule["match_function"],
+                    cost=self._costs.get(user_rule["match_function"], 3),
+                    tag=Tag(tag_data)))
+                ranking += 1
+
+        self.order = sorted(self.rules, key=lambda r: (r.cost, r.tag.ranking[0]))
+
 class Classifier(object):
     '''
     A Classifier used for classifying the state of a Target (a Linux GDB
     Inferior).
+
+    By default, classification stops as soon as no remaining rule can
+    outrank the best match, so only the top Tag is reported. Pass
+    all_rules=True to evaluate every rule and report all matching Tags.
     '''
     _major_hash_depth = 5
 
+    # The RulePlan is shared by every Classifier in this GDB session
+    _plan = None
+
+    def __init__(self, all_rules=False):
+        self.all_rules = all_rules
+
+    @classmethod
+    def getPlan(cls):
+        '''
+        Returns the RulePlan for the rules in rules.py, compiling it on
+        first use.
+        '''
+        if cls._plan is None or cls._plan.source is not rules.rules:
+            cls._plan = RulePlan(rules.rules)
+        return cls._plan
+
     def getRules(self, target):
         '''
         Organizes the nested list of rules (dicts) for classification
@@ -215,38 +278,34 @@ class Classifier(object):
         The rules specified in rules.py are organized into AttrDicts ("rules").
         Each rule is composed of a tag and a match_function.
         '''
-
-        processed_rules = []
-        num_rules = sum(len(rl) for (_, rl) in rules.rules)
-        ranking = 1
-        for cat, user_rule_list in rules.rules:
-            for user_rule in user_rule_list:
-                match_function = partial(getattr(target.analyzer, user_rule["match_function"])) 
-                tag_data = copy.deepcopy(user_rule)
-                del tag_data["match_function"]
-                tag_data["ranking"] = (ranking, num_rules)
-                tag_data["category"] = cat
-                rule = AttrDict(matches=match_function, tag=Tag(tag_data))
-                processed_rules.append(rule)
-                ranking += 1
-
-        return processed_rules
+        return [AttrDict(matches=getattr(target.analyzer, r.match_function), tag=r.tag)
+                for r in self.getPlan().rules]
 
     def getClassification(self, target):
         '''
         Returns the Classification of target, which is a Classification of the
         exploitability of a Linux GDB Inferior.
         '''
+        plan = self.getPlan()
         c = Classification(target)
-        for rule in self.getRules(target):
+        best = None
+        for rule in plan.rules if self.all_rules else plan.order:
+            # A rule ranked below the best match can't change the result
+            if not self.all_rules and best and rule.tag.ranking[0] > best.ranking[0]:
+                continue
             try:
-                match = rule.matches()
+                match = getattr(target.analyzer, rule.match_function)()
                 if match:
-                    c += rule.tag
+                    if self.all_rules:
+                        c += rule.tag
+                    else:
+                        best = rule.tag
             except Exception as e:
                 warnings.warn("Error while analyzing rule {}: {}\n{}".format(
                     rule.tag, e, traceback.format_exc()))
 
+        if best:
+            c += best
+
         c.hash = target.hash()
         return c
-
@@ -68,10 +68,63 @@ except ImportError as e:
 
 import os
 import re
+import tempfile
 
 from lib.tools import AttrDict, memoized
 
-from lib.gdb_wrapper.x86 import Backtrace, Frame, Target, ProcMaps
+from lib.gdb_wrapper.elf import read_elf_sects
+from lib.gdb_wrapper.x86 import Backtrace, Frame, GdbWrapperError, Target, ProcMaps
+
+_sym_marker = "@@asan-info-symbol@@"
+_line_marker = "@@asan-info-line@@"
+
+def symbolize(addrs):
+    '''
+    Returns a dict mapping each address in addrs to the output of GDB's
+    "info symbol" and "info line" commands for that address.
+
+    Every address is resolved by sourcing a single generated GDB script,
+    so a report with hundreds of frames costs one round trip to GDB rather
+    than two per frame. Repeated addresses (common in recursive stacks)
+    are only resolved once. If the script stops early, the remaining
+    addresses are resolved one at a time.
+    '''
+    addrs = sorted(set(addrs))
+    result = {}
+    if not addrs:
+        return result
+
+    fd, path = tempfile.mkstemp(suffix=".gdb")
+    try:
+        with os.fdopen(fd, "w") as f:
+            for addr in addrs:
+                f.write("echo {}\\n\n".format(_sym_marker))
+                f.write("info symbol {:#x}\n".format(addr))
+                f.write("echo {}\\n\n".format(_line_marker))
+                f.write("info line *{:#x}\n".format(addr))
+        try:
+            output = gdb.execute("source {}".format(path), False, True)
+        except gdb.error:
+            output = ""
+    finally:
+        os.remove(path)
+
+    # Split the output back up by the markers echoed before each command
+    chunks = []
+    for line in output.splitlines(True):
+        stripped = line.strip()
+        if stripped in (_sym_marker, _line_marker):
+            chunks.append([])
+        elif chunks:
+            chunks[-1].append(line)
+
+    for i, addr in enumerate(addrs):
+        if 2 * i + 1 < len(chunks):
+            result[addr] = ("".join(chunks[2 * i]), "".join(chunks[2 * i + 1]))
+        else:
+            result[addr] = (gdb.execute("info symbol {:#x}".format(addr), False, True),
+                            gdb.execute("info line *{:#x}".format(addr), False, True))
+    return result
 
 class ASanFrame(Frame):
     '''
@@ -249,38 +302,56 @@ class ASanTarget(Target):
                      "initialization-order-fiasco", "stack-buffer-underflow", "heap-use-after-free", "SEGV"]
 
     def __init__(self, asan_output):
+        '''
+        asan_output is either the AddressSanitizer log as a string or a
+        seekable file containing it. Files are read line by line in two
+        passes (one to collect frames, one to write the symbolized log) so
+        large logs are never held in memory.
+        '''
         self.__memo__ = {"isPossibleStackCorruption()": False,
                          "isStackCorruption()": False,
                          "isStackOverflow()": False,
                          "si_signo()": 11}
         if not asan_output:
             raise GdbWrapperError("no ASan data to analyze")
+        if not hasattr(asan_output, "read"):
+            asan_output = asan_output.splitlines(True)
 
-        # symbolize asan_message
-        self.asan_stack = []
-        out = []
-        last = 0
-        all_frames = []
+        # collect frames and ASAN's analysis
+        all_frames = {}
+        fault = None
+        pending = None
         maps = self.procmaps()
-        for m in self._re_asan_bt.finditer(asan_output):
+        for lineno, line in enumerate(self._lines(asan_output)):
+            # the fault description may continue onto the next line
+            if pending is not None:
+                fault = self._re_asan_fault.search(pending + line) or \
+                    self._re_asan_fault.search(pending)
+                pending = None
+            if fault is None and "AddressSanitizer" in line:
+                pending = line
+            m = self._re_asan_bt.search(line)
+            if m is None:
+                continue
             frame, addr, img, offset = m.group("frame", "addr", "img", "offset")
-            frame = int(frame)
             addr = int(addr, 16) #+ 1
+            offset = int(offset, 16)
             if img:
                 maps.add_file(img, addr - offset)
-            out.append(asan_output[last:m.end("all")])
-            all_frames.append((frame, addr, offset, img, len(out)))
-            out.append(None)
-            last = m.end()
+            all_frames[lineno] = (int(frame), addr, offset, img, m.end("all"))
+        if pending is not None:
+            fault = self._re_asan_fault.search(pending)
         if not all_frames:
             raise GdbWrapperError("No frames found in address sanitizer log")
 
-        out.append(asan_output[last:])
+        # symbolize asan_message
+        self.asan_stack = []
+        symbols = symbolize(addr for (_, addr, _, _, _) in all_frames.values())
         frame = -1
-        for num, addr, offset, img, outpos in all_frames:
+        for lineno in sorted(all_frames):
+            num, addr, offset, img, _ = all_frames[lineno]
             region = maps.findByAddr(addr)
-            symbol = gdb.execute("info symbol {:#x}".format(addr), False, True)
-            symline = gdb.execute("info line *{:#x}".format(addr), False, True)
+            symbol, symline = symbols[addr]
             if symline and symline.startswith("Line"):
                 symline = "\n\t{}".format(self._re_symline_trim.sub("", symline))
             else:
@@ -310,12 +381,19 @@ class ASanTarget(Target):
                                                 name=sym))
             else:
                 frame = None
-            out[outpos] = "{}){}".format(ASanFrame.create(self, addr, sym, off).terse(), symline)
-        asan_output = "".join(out)
-        gdb.write(asan_output)
+            all_frames[lineno] += ("{}){}".format(ASanFrame.create(self, addr, sym, off).terse(), symline),)
+
+        # write the symbolized log
+        for lineno, line in enumerate(self._lines(asan_output)):
+            if lineno in all_frames:
+                end, text = all_frames[lineno][4:]
+                line = line[:end] + text + line[len(line.rstrip("\r\n")):]
+            gdb.write(line)
         gdb.flush()
-        # parse ASAN's analysis
-        m = self._re_asan_fault.search(asan_output)
+
+        m = fault
+        if m is None:
+            raise GdbWrapperError("No error found in address sanitizer log")
         self.__memo__["si_addr()"] = int(m.group("fault"), 16)
         self.asan_reason = m.group("desc")
         if self.asan_reason == "double-free":
@@ -330,6 +408,16 @@ class ASanTarget(Target):
             if self.asan_reason != "SEGV":
                 self.asan_operation = m.group("operation")
 
+    @staticmethod
+    def _lines(asan_output):
+        '''
+        Returns an iterator over the lines of asan_output, rewinding it
+        first if it is a file.
+        '''
+        if hasattr(asan_output, "seek"):
+            asan_output.seek(0)
+        return iter(asan_output)
+
     @memoized
     def current_instruction(self):
         img, addr = getattr(self, "asan_pc_img", (None, self.pc()))
@@ -90,6 +90,74 @@ class GdbWrapperError(RuntimeError):
     '''
     pass
 
+class QueryCache(object):
+    '''
+    A cache of GDB query results that is shared by every Target, Analyzer
+    and rule. Results are only valid for the current stop of the Inferior,
+    so the cache is cleared whenever GDB reports that the Inferior stopped,
+    continued or exited, that memory, registers or the loaded objfiles
+    changed, or before GDB shows a prompt (the user may select another
+    frame). Code that changes the state of GDB in other ways (such as
+    loading a core file) must call invalidate().
+
+    Errors raised by GDB are cached as well, so failing queries (such as
+    symbol lookups in stripped frames) are not repeated either.
+
+    hits - number of queries answered from the cache
+    misses - number of queries that were sent to GDB
+    '''
+    def __init__(self):
+        self._results = {}
+        self.hits = 0
+        self.misses = 0
+        for name in ("stop", "cont", "exited", "new_objfile", "clear_objfiles",
+                     "memory_changed", "register_changed", "before_prompt"):
+            registry = getattr(gdb.events, name, None)
+            if registry is not None:
+                registry.connect(self._on_event)
+
+    def _on_event(self, *args):
+        self.invalidate()
+
+    def invalidate(self):
+        '''
+        Discards every cached result
+        '''
+        self._results.clear()
+
+    def _query(self, key, func, *args):
+        try:
+            ok, res = self._results[key]
+            self.hits += 1
+        except KeyError:
+            self.misses += 1
+            try:
+                ok, res = True, func(*args)
+            except gdb.error as e:
+                ok, res = False, e
+            self._results[key] = (ok, res)
+        if not ok:
+            raise res
+        return res
+
+    def execute(self, cmd):
+        '''
+        Returns the output of GDB command cmd as a string
+        '''
+        return self._query(("execute", cmd), gdb.execute, cmd, False, True)
+
+    def eval_uint(self, expr):
+        '''
+        Returns expr evaluated by GDB as an unsigned integer (see gdb_uint)
+        '''
+        return self._query(("eval_uint", expr),
+                           lambda e: gdb_uint(gdb.parse_and_eval(e)), expr)
+
+    def stats(self):
+        return "Query cache: {} hits, {} misses".format(self.hits, self.misses)
+
+query_cache = QueryCache()
+
 class ProcMaps(list):
     '''
     A list of process address mappings. This object should only be instantiated
@@ -107,7 +175,7 @@ class ProcMaps(list):
         it, and appends it to self
         '''
         self._common_init()
-        mapstr = str(gdb.execute("info proc map", False, True))
+        mapstr = str(query_cache.execute("info proc map"))
         header_pos = mapstr.find("Start Addr")
         if header_pos == -1:
             raise GdbWrapperError("Unable to parse \"info proc map\" string")
@@ -314,7 +382,7 @@ class Operand(object):
             # Some GDBs (GDB 7.2 Fedora vs. Ubuntu/Debian) don't compare
             # signed and unsigned integer types consistently. gdb_uint
             # is a workaround
-            return gdb_uint(gdb.parse_and_eval(self.expr))
+            return query_cache.eval_uint(self.expr)
 
     def __str__(self):
         return self.gdbstr
@@ -514,14 +582,14 @@ class Target(object):
     @staticmethod
     def sym_addr(sym):
         try:
-            return gdb_uint(gdb.parse_and_eval(str(sym)))
+            return query_cache.eval_uint(str(sym))
         except gdb.error:
             return None
 
     @memoized
     def current_instruction(self):
         try:
-            gdbstr = gdb.execute("x/i 0x%x" % self.pc(), False, True).splitlines()[0]
+            gdbstr = query_cache.execute("x/i 0x%x" % self.pc()).splitlines()[0]
             return self._getInstruction(gdbstr)
         except RuntimeError:
             return None
@@ -531,11 +599,11 @@ class Target(object):
 
     @memoized
     def pc(self):
-        return gdb_uint(gdb.parse_and_eval("$pc"))
+        return query_cache.eval_uint("$pc")
 
     @memoized
     def stack_pointer(self):
-        return gdb_uint(gdb.parse_and_eval("$sp"))
+        return query_cache.eval_uint("$sp")
 
     @memoized
     def pid(self):
@@ -544,7 +612,7 @@ class Target(object):
     @memoized
     def pointer_size(self):
         return int(self._re_gdb_addr_bit.search(
-                       gdb.execute("maint print architecture", False, True)).group(1)) / 8
+                       query_cache.execute("maint print architecture")).group(1)) / 8
 
     @memoized
     def si_signo(self):
@@ -560,8 +628,7 @@ class Target(object):
     @memoized
     def si_addr(self):
         str(gdb.parse_and_eval("$_siginfo._sifields._sigfault.si_addr"))
-        return gdb_uint(gdb.parse_and_eval(
-            "$_siginfo._sifields._sigfault.si_addr"))
+        return query_cache.eval_uint("$_siginfo._sifields._sigfault.si_addr")
 
 class x86Target(Target):
     '''
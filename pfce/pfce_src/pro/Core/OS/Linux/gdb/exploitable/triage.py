@@ -0,0 +1,266 @@
+'''
+Batch crash triage of core files using the 'exploitable' classifier.
+
+Core files are split into batches and handed to a pool of worker GDB
+processes. Each worker loads its batch of cores one at a time, classifies
+them with lib.classifier.Classifier and records the results. Once every
+batch has been processed, a single report is written in JSON or CSV.
+
+example usage:
+  $ python triage.py -o report.json /path/to/LogFolder
+  $ python triage.py -e ./target -f csv -o report.csv a.core b.core
+
+If no executable is given, it is read from the 'EXE:' line of the
+.info file written next to each core by the LinuxCoreFile monitor.
+
+This script is also the worker: when sourced by GDB it reads its batch
+from the file named by the PEACH_TRIAGE_JOBS environment variable and
+appends one JSON result per line to PEACH_TRIAGE_RESULTS.
+'''
+import json
+import os
+import sys
+
+_jobs_env = "PEACH_TRIAGE_JOBS"
+_results_env = "PEACH_TRIAGE_RESULTS"
+_all_rules_env = "PEACH_TRIAGE_ALL_RULES"
+
+_fields = ["core", "executable", "major_hash", "minor_hash", "category",
+           "short_description", "description", "explanation", "other_tags",
+           "signal", "backtrace", "error"]
+
+def _quote(path):
+    '''
+    Quotes path so it can be passed as an argument to a GDB command.
+    '''
+    return '"{}"'.format(path.replace("\\", "\\\\").replace('"', '\\"'))
+
+def _result(core, executable, **kwargs):
+    result = dict((k, None) for k in _fields)
+    result.update(core=core, executable=executable, **kwargs)
+    return result
+
+def triage_core(gdb, arch, classifier, query_cache, job):
+    '''
+    Loads a single core file into GDB and returns a dict describing its
+    Classification by classifier (a lib.classifier.Classifier).
+    '''
+    core, exe = job["core"], job["executable"]
+
+    # Start every core from a clean slate
+    gdb.execute("core-file", False, True)
+    gdb.execute("file", False, True)
+
+    try:
+        if exe:
+            gdb.execute("file {}".format(_quote(exe)), False, True)
+        gdb.execute("core-file {}".format(_quote(core)), False, True)
+
+        # Loading a core is not a stop event, so drop results from the last one
+        query_cache.invalidate()
+
+        target = arch.getTarget()
+        c = classifier.getClassification(target)
+
+        try:
+            signal = str(target.si_signo())
+        except Exception:
+            signal = None
+
+        tags = c.tags
+        return _result(core, exe,
+            major_hash=c.hash.major,
+            minor_hash=c.hash.minor,
+            category=c.get("category"),
+            short_description=str(tags[0]) if tags else None,
+            description=c.get("desc"),
+            explanation=c.get("explanation"),
+            other_tags=[str(t) for t in tags[1:]],
+            signal=signal,
+            backtrace=[str(f) for f in target.backtrace()])
+    except Exception as e:
+        return _result(core, exe, error=str(e))
+
+def worker_main():
+    '''
+    Entry point when sourced by GDB.
+    '''
+    import gdb
+
+    # Same workaround for sourced paths containing "~" as exploitable.py
+    abspath = os.path.abspath(__file__)
+    pos = abspath.find("/~/")
+    if pos != -1:
+        abspath = abspath[pos+1:]
+    abspath = os.path.expanduser(abspath)
+    sys.path.append(os.path.dirname(abspath))
+
+    import lib.classifier as classifier
+    import lib.arch as arch
+    from lib.gdb_wrapper.x86 import query_cache
+
+    gdb.execute("set confirm off", False, True)
+    gdb.execute("set pagination off", False, True)
+
+    with open(os.environ[_jobs_env]) as f:
+        jobs = json.load(f)
+
+    cls = classifier.Classifier(bool(os.environ.get(_all_rules_env)))
+
+    # Results are flushed per core so they survive GDB crashing on a
+    # later core in the batch
+    with open(os.environ[_results_env], "a") as out:
+        for job in jobs:
+            out.write(json.dumps(triage_core(gdb, arch, cls, query_cache, job)) + "\n")
+            out.flush()
+
+def find_cores(paths):
+    '''
+    Expands paths into a sorted list of core files. Directories are
+    searched recursively for files ending in '.core' or named 'core*'.
+    '''
+    cores = set()
+    for path in paths:
+        if os.path.isfile(path):
+            cores.add(os.path.abspath(path))
+            continue
+        for root, _, files in os.walk(path):
+            for name in files:
+                if name.endswith(".core") or name.startswith("core"):
+                    cores.add(os.path.abspath(os.path.join(root, name)))
+    return sorted(cores)
+
+def find_executable(core):
+    '''
+    Returns the executable recorded in the LinuxCoreFile .info file for
+    core, or None if there isn't one.
+    '''
+    info = os.path.splitext(core)[0] + ".info"
+    try:
+        with open(info) as f:
+            for line in f:
+                if line.startswith("EXE:"):
+                    return line[4:].strip() or None
+    except (IOError, OSError):
+        pass
+    return None
+
+def run_batch(gdb_path, batch, all_rules=False):
+    '''
+    Runs a single worker GDB over batch and returns its results. Any core
+    the worker did not report on is returned as an error.
+    '''
+    import subprocess
+    import tempfile
+
+    fd, jobs_file = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(batch, f)
+    fd, results_file = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+
+    env = dict(os.environ)
+    env[_jobs_env] = jobs_file
+    env[_results_env] = results_file
+    if all_rules:
+        env[_all_rules_env] = "1"
+
+    try:
+        with open(os.devnull, "w") as devnull:
+            subprocess.call([gdb_path, "-batch", "-n", "-x", os.path.abspath(__file__)],
+                            env=env, stdout=devnull, stderr=devnull)
+        results = []
+        with open(results_file) as f:
+            for line in f:
+                try:
+                    results.append(json.loads(line))
+                except ValueError:
+                    break
+    except OSError as e:
+        results = []
+        error = "Unable to run '{}': {}".format(gdb_path, e)
+    else:
+        error = "GDB exited before the core was analyzed"
+    finally:
+        os.remove(jobs_file)
+        os.remove(results_file)
+
+    done = set(r["core"] for r in results)
+    results.extend(_result(j["core"], j["executable"], error=error)
+                   for j in batch if j["core"] not in done)
+    return results
+
+def write_report(results, out, fmt):
+    if fmt == "json":
+        json.dump(results, out, indent=2, sort_keys=True)
+        out.write("\n")
+        return
+
+    import csv
+    writer = csv.DictWriter(out, fieldnames=_fields)
+    writer.writeheader()
+    for r in results:
+        row = dict(r)
+        row["other_tags"] = "; ".join(r["other_tags"] or [])
+        row["backtrace"] = "\n".join(r["backtrace"] or [])
+        writer.writerow(row)
+
+def main(argv=None):
+    import argparse
+    import multiprocessing
+    from multiprocessing.pool import ThreadPool
+
+    op = argparse.ArgumentParser(description="Classify many core files with 'exploitable'.")
+    op.add_argument("paths", nargs="+", metavar="PATH",
+        help="core file, or directory to search for core files")
+    op.add_argument("-e", "--executable",
+        help="executable that produced the cores (default: read from .info files)")
+    op.add_argument("-j", "--jobs", type=int, default=multiprocessing.cpu_count(),
+        help="number of worker GDB processes (default: %(default)s)")
+    op.add_argument("-b", "--batch-size", type=int, default=16,
+        help="cores loaded by each worker GDB process (default: %(default)s)")
+    op.add_argument("-f", "--format", choices=("json", "csv"), default="json",
+        help="report format (default: %(default)s)")
+    op.add_argument("-o", "--output", help="report file (default: stdout)")
+    op.add_argument("-r", "--all-rules", action="store_true",
+        help="evaluate every rule so other_tags lists all matching rules")
+    op.add_argument("--gdb", default="gdb", help="path to gdb (default: %(default)s)")
+    args = op.parse_args(argv)
+
+    jobs = [dict(core=c, executable=args.executable or find_executable(c))
+            for c in find_cores(args.paths)]
+    if not jobs:
+        op.error("no core files found")
+
+    size = max(args.batch_size, 1)
+    batches = [jobs[i:i+size] for i in range(0, len(jobs), size)]
+
+    results = []
+    pool = ThreadPool(max(min(args.jobs, len(batches)), 1))
+    try:
+        for batch_results in pool.imap_unordered(lambda b: run_batch(args.gdb, b, args.all_rules), batches):
+            results.extend(batch_results)
+            sys.stderr.write("\rTriaged {}/{} cores".format(len(results), len(jobs)))
+    finally:
+        pool.close()
+        pool.join()
+    sys.stderr.write("\n")
+
+    results.sort(key=lambda r: r["core"])
+
+    if args.output:
+        with open(args.output, "w") as out:
+            write_report(results, out, args.format)
+    else:
+        write_report(results, sys.stdout, args.format)
+
+    errors = sum(1 for r in results if r["error"])
+    return 1 if errors == len(results) else 0
+
+try:
+    import gdb
+except ImportError:
+    if __name__ == "__main__":
+        sys.exit(main())
+else:
+    worker_main()
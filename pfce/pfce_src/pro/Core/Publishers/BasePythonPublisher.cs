@@ -1,10 +1,26 @@
 using System.Collections.Generic;
+using System.IO;
 using Peach.Core;
+using Peach.Core.IO;
 
 namespace Peach.Pro.Core.Publishers
 {
+	/// <summary>
+	/// Base class for publishers implemented in python.
+	/// </summary>
+	/// <remarks>
+	/// Crossing between IronPython and the CLR is expensive, so rather than
+	/// reading and writing data one byte at a time, python publishers should
+	/// override OnOutputBytes, OnInputBytes and OnWantBytes.  These methods
+	/// exchange the entire payload as a single byte[] which can be converted
+	/// to a python byte string with a single call to bytes().
+	/// </remarks>
 	public abstract class BasePythonPublisher : Publisher
 	{
+		private static readonly byte[] Empty = new byte[0];
+
+		private MemoryStream _buffer = new MemoryStream(Empty, false);
+
 		protected BasePythonPublisher(Dictionary<string, Variant> args)
 			: base(args)
 		{
@@ -14,5 +30,137 @@ namespace Peach.Pro.Core.Publishers
 		protected virtual void __init__()
 		{
 		}
+
+		#region Bulk Interface
+
+		/// <summary>
+		/// Send data.
+		/// </summary>
+		/// <remarks>
+		/// Called by OnOutput with the entire contents of the data to send.
+		/// </remarks>
+		/// <param name="data">Data to send/write</param>
+		protected virtual void OnOutputBytes(byte[] data)
+		{
+			throw new PeachException("Error, action 'output' not supported by publisher");
+		}
+
+		/// <summary>
+		/// Read data.
+		/// </summary>
+		/// <remarks>
+		/// Called by OnInput. The returned data replaces the contents of
+		/// the input buffer used for cracking.
+		/// </remarks>
+		/// <returns>Data that was received or null if nothing was received</returns>
+		protected virtual byte[] OnInputBytes()
+		{
+			throw new PeachException("Error, action 'input' not supported by publisher");
+		}
+
+		/// <summary>
+		/// Read additional data.
+		/// </summary>
+		/// <remarks>
+		/// Called by WantBytes when the cracker needs more data than is
+		/// currently available in the input buffer. The returned data is
+		/// appended to the input buffer.
+		/// </remarks>
+		/// <param name="count">The requested byte count</param>
+		/// <returns>Data that was received or null if nothing was received</returns>
+		protected virtual byte[] OnWantBytes(long count)
+		{
+			return null;
+		}
+
+		/// <summary>
+		/// Replaces the contents of the input buffer.
+		/// </summary>
+		/// <param name="data">New contents of the input buffer</param>
+		protected void SetInputBuffer(byte[] data)
+		{
+			_buffer = new MemoryStream(data ?? Empty, false);
+		}
+
+		/// <summary>
+		/// Appends to the contents of the input buffer without changing
+		/// the current read position.
+		/// </summary>
+		/// <param name="data">Data to append</param>
+		protected void AppendInputBuffer(byte[] data)
+		{
+			if (data == null || data.Length == 0)
+				return;
+
+			var pos = _buffer.Position;
+			var buf = new MemoryStream((int)_buffer.Length + data.Length);
+
+			_buffer.Position = 0;
+			_buffer.CopyTo(buf);
+			buf.Write(data, 0, data.Length);
+			buf.Position = pos;
+
+			_buffer = buf;
+		}
+
+		#endregion
+
+		#region Publisher Overrides
+
+		protected override void OnOutput(BitwiseStream data)
+		{
+			OnOutputBytes(data.ToByteArray());
+		}
+
+		protected override void OnInput()
+		{
+			SetInputBuffer(null);
+			SetInputBuffer(OnInputBytes());
+		}
+
+		public override void WantBytes(long count)
+		{
+			if (count <= _buffer.Length - _buffer.Position)
+				return;
+
+			AppendInputBuffer(OnWantBytes(count));
+		}
+
+		#endregion
+
+		#region Read Stream
+
+		public override bool CanRead
+		{
+			get { return _buffer.CanRead; }
+		}
+
+		public override bool CanSeek
+		{
+			get { return _buffer.CanSeek; }
+		}
+
+		public override long Length
+		{
+			get { return _buffer.Length; }
+		}
+
+		public override long Position
+		{
+			get { return _buffer.Position; }
+			set { _buffer.Position = value; }
+		}
+
+		public override long Seek(long offset, SeekOrigin origin)
+		{
+			return _buffer.Seek(offset, origin);
+		}
+
+		public override int Read(byte[] buffer, int offset, int count)
+		{
+			return _buffer.Read(buffer, offset, count);
+		}
+
+		#endregion
 	}
 }
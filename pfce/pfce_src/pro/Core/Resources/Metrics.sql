@@ -224,57 +224,244 @@ FROM FaultMetric x
 GROUP BY x.[Hour];
 -- FaultTimeline <<<
 
+-- Rollups >>>
+-- The rollup tables keep running totals of the Mutation and FaultMetric
+-- tables so the mutator, element and dataset metrics don't have to
+-- aggregate every mutation each time they are queried.
+--
+-- Mutations are only ever inserted or have their IterationCount updated,
+-- never replaced, so the triggers below see every added iteration once.
+
+DROP TRIGGER IF EXISTS TriggerMutationInsert;
+CREATE TRIGGER TriggerMutationInsert AFTER INSERT ON Mutation
+BEGIN
+	INSERT OR IGNORE INTO MutatorRollup (
+		MutatorId, ElementCount, IterationCount, BucketCount, FaultCount
+	)
+	SELECT NEW.MutatorId, 0, 0, 0, 0
+	WHERE NEW.Kind = 0;
+
+	UPDATE MutatorRollup
+	SET
+		ElementCount = ElementCount + NOT EXISTS (
+			SELECT 1
+			FROM Mutation AS x
+			WHERE
+				x.StateId = NEW.StateId AND
+				x.ActionId = NEW.ActionId AND
+				x.ParameterId = NEW.ParameterId AND
+				x.ElementId = NEW.ElementId AND
+				x.MutatorId = NEW.MutatorId AND
+				x.Kind = 0 AND
+				x.Id <> NEW.Id
+		),
+		IterationCount = IterationCount + NEW.IterationCount
+	WHERE
+		MutatorId = NEW.MutatorId AND
+		NEW.Kind = 0;
+
+	INSERT OR IGNORE INTO ElementRollup (
+		StateId, ActionId, ParameterId, ElementId, Kind,
+		IterationCount, BucketCount, FaultCount
+	) VALUES (
+		NEW.StateId, NEW.ActionId, NEW.ParameterId, NEW.ElementId, NEW.Kind,
+		0, 0, 0
+	);
+
+	UPDATE ElementRollup
+	SET IterationCount = IterationCount + NEW.IterationCount
+	WHERE
+		StateId = NEW.StateId AND
+		ActionId = NEW.ActionId AND
+		ParameterId = NEW.ParameterId AND
+		ElementId = NEW.ElementId AND
+		Kind = NEW.Kind;
+
+	INSERT OR IGNORE INTO DatasetRollup (
+		StateId, ActionId, ParameterId, DatasetId, Kind,
+		IterationCount, BucketCount, FaultCount
+	) VALUES (
+		NEW.StateId, NEW.ActionId, NEW.ParameterId, NEW.DatasetId, NEW.Kind,
+		0, 0, 0
+	);
+
+	UPDATE DatasetRollup
+	SET IterationCount = IterationCount + NEW.IterationCount
+	WHERE
+		StateId = NEW.StateId AND
+		ActionId = NEW.ActionId AND
+		ParameterId = NEW.ParameterId AND
+		DatasetId = NEW.DatasetId AND
+		Kind = NEW.Kind;
+END;
+
+DROP TRIGGER IF EXISTS TriggerMutationUpdate;
+CREATE TRIGGER TriggerMutationUpdate AFTER UPDATE OF IterationCount ON Mutation
+BEGIN
+	UPDATE MutatorRollup
+	SET IterationCount = IterationCount + NEW.IterationCount - OLD.IterationCount
+	WHERE
+		MutatorId = NEW.MutatorId AND
+		NEW.Kind = 0;
+
+	UPDATE ElementRollup
+	SET IterationCount = IterationCount + NEW.IterationCount - OLD.IterationCount
+	WHERE
+		StateId = NEW.StateId AND
+		ActionId = NEW.ActionId AND
+		ParameterId = NEW.ParameterId AND
+		ElementId = NEW.ElementId AND
+		Kind = NEW.Kind;
+
+	UPDATE DatasetRollup
+	SET IterationCount = IterationCount + NEW.IterationCount - OLD.IterationCount
+	WHERE
+		StateId = NEW.StateId AND
+		ActionId = NEW.ActionId AND
+		ParameterId = NEW.ParameterId AND
+		DatasetId = NEW.DatasetId AND
+		Kind = NEW.Kind;
+END;
+
+-- A fault is counted once per iteration and a bucket once per major hash,
+-- so only the first matching FaultMetric row adds to the totals.
+DROP TRIGGER IF EXISTS TriggerFaultMetricInsert;
+CREATE TRIGGER TriggerFaultMetricInsert AFTER INSERT ON FaultMetric
+BEGIN
+	INSERT OR IGNORE INTO MutatorRollup (
+		MutatorId, ElementCount, IterationCount, BucketCount, FaultCount
+	)
+	SELECT NEW.MutatorId, 0, 0, 0, 0
+	WHERE NEW.Kind = 0;
+
+	UPDATE MutatorRollup
+	SET
+		BucketCount = BucketCount + NOT EXISTS (
+			SELECT 1
+			FROM FaultMetric AS x
+			WHERE
+				x.MajorHash = NEW.MajorHash AND
+				x.MutatorId = NEW.MutatorId AND
+				x.Kind = 0 AND
+				x.Id <> NEW.Id
+		),
+		FaultCount = FaultCount + NOT EXISTS (
+			SELECT 1
+			FROM FaultMetric AS x
+			WHERE
+				x.Iteration = NEW.Iteration AND
+				x.MutatorId = NEW.MutatorId AND
+				x.Kind = 0 AND
+				x.Id <> NEW.Id
+		)
+	WHERE
+		MutatorId = NEW.MutatorId AND
+		NEW.Kind = 0;
+
+	INSERT OR IGNORE INTO ElementRollup (
+		StateId, ActionId, ParameterId, ElementId, Kind,
+		IterationCount, BucketCount, FaultCount
+	) VALUES (
+		NEW.StateId, NEW.ActionId, NEW.ParameterId, NEW.ElementId, NEW.Kind,
+		0, 0, 0
+	);
+
+	UPDATE ElementRollup
+	SET
+		BucketCount = BucketCount + NOT EXISTS (
+			SELECT 1
+			FROM FaultMetric AS x
+			WHERE
+				x.MajorHash = NEW.MajorHash AND
+				x.StateId = NEW.StateId AND
+				x.ActionId = NEW.ActionId AND
+				x.ParameterId = NEW.ParameterId AND
+				x.ElementId = NEW.ElementId AND
+				x.Kind = NEW.Kind AND
+				x.Id <> NEW.Id
+		),
+		FaultCount = FaultCount + NOT EXISTS (
+			SELECT 1
+			FROM FaultMetric AS x
+			WHERE
+				x.Iteration = NEW.Iteration AND
+				x.StateId = NEW.StateId AND
+				x.ActionId = NEW.ActionId AND
+				x.ParameterId = NEW.ParameterId AND
+				x.ElementId = NEW.ElementId AND
+				x.Kind = NEW.Kind AND
+				x.Id <> NEW.Id
+		)
+	WHERE
+		StateId = NEW.StateId AND
+		ActionId = NEW.ActionId AND
+		ParameterId = NEW.ParameterId AND
+		ElementId = NEW.ElementId AND
+		Kind = NEW.Kind;
+
+	INSERT OR IGNORE INTO DatasetRollup (
+		StateId, ActionId, ParameterId, DatasetId, Kind,
+		IterationCount, BucketCount, FaultCount
+	) VALUES (
+		NEW.StateId, NEW.ActionId, NEW.ParameterId, NEW.DatasetId, NEW.Kind,
+		0, 0, 0
+	);
+
+	UPDATE DatasetRollup
+	SET
+		BucketCount = BucketCount + NOT EXISTS (
+			SELECT 1
+			FROM FaultMetric AS x
+			WHERE
+				x.MajorHash = NEW.MajorHash AND
+				x.StateId = NEW.StateId AND
+				x.ActionId = NEW.ActionId AND
+				x.ParameterId = NEW.ParameterId AND
+				x.DatasetId = NEW.DatasetId AND
+				x.Kind = NEW.Kind AND
+				x.Id <> NEW.Id
+		),
+		FaultCount = FaultCount + NOT EXISTS (
+			SELECT 1
+			FROM FaultMetric AS x
+			WHERE
+				x.Iteration = NEW.Iteration AND
+				x.StateId = NEW.StateId AND
+				x.ActionId = NEW.ActionId AND
+				x.ParameterId = NEW.ParameterId AND
+				x.DatasetId = NEW.DatasetId AND
+				x.Kind = NEW.Kind AND
+				x.Id <> NEW.Id
+		)
+	WHERE
+		StateId = NEW.StateId AND
+		ActionId = NEW.ActionId AND
+		ParameterId = NEW.ParameterId AND
+		DatasetId = NEW.DatasetId AND
+		Kind = NEW.Kind;
+END;
+
+-- Rollups <<<
+
 -- Mutators >>>
+-- Views that were replaced by the rollup tables
 DROP VIEW IF EXISTS ViewDistinctElements;
-CREATE VIEW ViewDistinctElements AS
-SELECT DISTINCT
-	MutatorId,
-	StateId,
-	ActionId,
-	ParameterId,
-	ElementId
-FROM Mutation
-WHERE Kind = 0;
-
 DROP VIEW IF EXISTS ViewMutatorsByElement;
-CREATE VIEW ViewMutatorsByElement AS
-SELECT 
-	MutatorId,
-	COUNT(*) AS ElementCount
-FROM ViewDistinctElements
-GROUP BY MutatorId;
-
 DROP VIEW IF EXISTS ViewMutatorsByIteration;
-CREATE VIEW ViewMutatorsByIteration AS
-SELECT 
-	vme.MutatorId,
-	vme.ElementCount,
-	SUM(x.IterationCount) AS IterationCount
-FROM ViewMutatorsByElement AS vme
-JOIN Mutation AS x ON vme.MutatorId = x.MutatorId AND x.Kind = 0
-GROUP BY x.MutatorId;
-
 DROP VIEW IF EXISTS ViewMutatorsByFault;
-CREATE VIEW ViewMutatorsByFault AS
-SELECT 
-	x.MutatorId,
-	COUNT(DISTINCT(x.MajorHash)) AS BucketCount,
-	COUNT(DISTINCT(x.Iteration)) AS FaultCount
-FROM FaultMetric AS x
-WHERE x.Kind = 0
-GROUP BY x.MutatorId;
-	
+
 DROP VIEW IF EXISTS ViewMutators;
 CREATE VIEW ViewMutators AS
 SELECT
 	n.Name AS Mutator,
-	vmi.ElementCount,
-	vmi.IterationCount,
-	vmf.BucketCount,
-	vmf.FaultCount
-FROM ViewMutatorsByIteration AS vmi
-LEFT JOIN ViewMutatorsByFault AS vmf ON vmi.MutatorId = vmf.MutatorId
-JOIN NamedItem AS n ON vmi.MutatorId = n.Id
+	r.ElementCount,
+	r.IterationCount,
+	r.BucketCount,
+	r.FaultCount
+FROM MutatorRollup AS r
+JOIN NamedItem AS n ON r.MutatorId = n.Id
+WHERE
+	r.ElementCount > 0
 ORDER BY
 	BucketCount DESC,
 	FaultCount DESC,
@@ -285,47 +472,14 @@ ORDER BY
 -- Mutators <<<
 
 -- Elements >>>
+-- Views that were replaced by the rollup tables
 DROP VIEW IF EXISTS ViewElementsByIteration;
-CREATE VIEW ViewElementsByIteration AS
-SELECT
-	x.StateId,
-	x.Actionid,
-	x.ParameterId,
-	x.ElementId,
-	x.Kind,
-	SUM(x.IterationCount) AS IterationCount
-FROM Mutation AS x
-GROUP BY 
-	x.StateId,
-	x.ActionId,
-	x.ParameterId,
-	x.ElementId,
-	x.Kind
-;
-
 DROP VIEW IF EXISTS ViewElementsByFault;
-CREATE VIEW ViewElementsByFault AS
-SELECT
-	x.StateId,
-	x.ActionId,
-	x.ParameterId,
-	x.ElementId,
-	x.Kind,
-	COUNT(DISTINCT(x.Iteration)) AS FaultCount,
-	COUNT(DISTINCT(x.MajorHash)) AS BucketCount
-FROM FaultMetric AS x
-GROUP BY
-	x.StateId,
-	x.ActionId,
-	x.ParameterId,
-	x.ElementId,
-	x.Kind
-;
 
 DROP VIEW IF EXISTS ViewElements;
 CREATE VIEW ViewElements AS
 SELECT 
-	CASE WHEN vei.Kind = 0 THEN
+	CASE WHEN r.Kind = 0 THEN
 		sn.Name || '_' || s.RunCount
 	ELSE
 		sn.Name
@@ -337,22 +491,18 @@ SELECT
 	ELSE
 		e.Name
 	END AS [Element],
-	vei.IterationCount,
-	vef.BucketCount,
-	vef.FaultCount,
-	vei.Kind
-FROM ViewElementsByIteration AS vei
-LEFT JOIN ViewElementsByFault AS vef ON
-	vei.ElementId   = vef.ElementId AND 
-	vei.StateId     = vef.StateId AND 
-	vei.ActionId    = vef.ActionId AND 
-	vei.ParameterId = vef.ParameterId AND
-	vei.Kind        = vef.Kind
-JOIN [State]   AS s  ON s.Id  = vei.StateId
+	r.IterationCount,
+	r.BucketCount,
+	r.FaultCount,
+	r.Kind
+FROM ElementRollup AS r
+JOIN [State]   AS s  ON s.Id  = r.StateId
 JOIN NamedItem AS sn ON sn.Id = s.NameId
-JOIN NamedItem AS e  ON e.Id  = vei.ElementId
-JOIN NamedItem AS a  ON a.Id  = vei.ActionId
-JOIN NamedItem AS p  ON p.Id  = vei.ParameterId
+JOIN NamedItem AS e  ON e.Id  = r.ElementId
+JOIN NamedItem AS a  ON a.Id  = r.ActionId
+JOIN NamedItem AS p  ON p.Id  = r.ParameterId
+WHERE
+	r.IterationCount > 0
 ORDER BY
 	BucketCount DESC,
 	FaultCount DESC,
@@ -366,48 +516,15 @@ ORDER BY
 
 
 -- Datasets >>>
+-- Views that were replaced by the rollup tables
 DROP VIEW IF EXISTS ViewDatasetsByIteration;
-CREATE VIEW ViewDatasetsByIteration AS
-SELECT
-	x.StateId,
-	x.ActionId,
-	x.ParameterId,
-	x.DatasetId,
-	x.Kind,
-	SUM(x.IterationCount) AS IterationCount
-FROM Mutation AS x
-GROUP BY 
-	x.StateId,
-	x.ActionId,
-	x.ParameterId,
-	x.DatasetId,
-	x.Kind
-;
-
 DROP VIEW IF EXISTS ViewDatasetsByFault;
-CREATE VIEW ViewDatasetsByFault AS
-SELECT
-	x.StateId,
-	x.ActionId,
-	x.ParameterId,
-	x.DatasetId,
-	x.Kind,
-	COUNT(DISTINCT(x.MajorHash)) as BucketCount,
-	COUNT(DISTINCT(x.Iteration)) as FaultCount
-FROM FaultMetric AS x
-GROUP BY 
-	x.StateId,
-	x.ActionId,
-	x.ParameterId,
-	x.DatasetId,
-	x.Kind
-;
 
 DROP VIEW IF EXISTS ViewDatasets;
 CREATE VIEW ViewDatasets AS
 SELECT
-	vdi.Kind AS Kind,
-	CASE WHEN vdi.Kind = 0 THEN
+	r.Kind AS Kind,
+	CASE WHEN r.Kind = 0 THEN
 		CASE WHEN length(p.Name) > 0 THEN
 			sn.Name || '.' || a.Name || '.' || p.Name || '/' || d.Name
 		ELSE
@@ -431,28 +548,23 @@ SELECT
 			END
 		END
 	END AS Dataset,
-	SUM(vdi.IterationCount) as IterationCount,
-	SUM(vdf.BucketCount) as BucketCount,
-	SUM(vdf.FaultCount) as FaultCount
-FROM ViewDatasetsByIteration AS vdi
-LEFT JOIN ViewDatasetsByFault as vdf ON 
-	vdi.StateId = vdf.StateId AND
-	vdi.ActionId = vdf.ActionId AND
-	vdi.ParameterId = vdf.ParameterId AND
-	vdi.DatasetId = vdf.DatasetId AND
-	vdi.Kind = vdf.Kind
-JOIN [State] AS s ON vdi.StateId = s.Id
+	SUM(r.IterationCount) as IterationCount,
+	SUM(r.BucketCount) as BucketCount,
+	SUM(r.FaultCount) as FaultCount
+FROM DatasetRollup AS r
+JOIN [State] AS s ON r.StateId = s.Id
 JOIN NamedItem AS sn ON s.NameId = sn.Id
-JOIN NamedItem AS a ON vdi.ActionId = a.Id
-JOIN NamedItem AS p ON vdi.ParameterId = p.Id
-JOIN NamedItem AS d ON vdi.DatasetId = d.Id
+JOIN NamedItem AS a ON r.ActionId = a.Id
+JOIN NamedItem AS p ON r.ParameterId = p.Id
+JOIN NamedItem AS d ON r.DatasetId = d.Id
 WHERE
-	length(d.name) > 0
+	length(d.name) > 0 AND
+	r.IterationCount > 0
 GROUP BY
 	s.NameId,
-	vdi.ActionId,
-	vdi.ParameterId,
-	vdi.DatasetId
+	r.ActionId,
+	r.ParameterId,
+	r.DatasetId
 ORDER BY
 	BucketCount DESC,
 	FaultCount DESC,
@@ -140,6 +140,12 @@ namespace Peach.Pro.Core.Runtime
 				"Provide a range of test #'s to be run.",
 				v => ParseRange("range", v)
 			);
+			options.Add(
+				"parallel=",
+				"Run the M'th of N machines fuzzing the same job. " +
+				"All machines must use the same --seed.",
+				v => ParseParallel("parallel", v)
+			);
 			options.Add(
 				"duration=",
 				"How long to run the fuzzer for.",
@@ -156,6 +162,18 @@ namespace Peach.Pro.Core.Runtime
 				"Sets the seed used by the random number generator.",
 				(uint v) => _config.randomSeed = v
 			);
+			options.Add(
+				"workers=",
+				"Number of engines to fuzz with in this process. " +
+				"Each engine runs its own copy of the publishers and agents.",
+				(uint v) => _config.workers = v
+			);
+			options.Add(
+				"profile",
+				"Record the time spent generating, fixing up, transforming, " +
+				"cracking and mutating each element to the job's log folder.",
+				v => _config.profile = true
+			);
 			// Defined values & .config files
 			options.Add(
 				"D|define=",
@@ -176,6 +194,13 @@ namespace Peach.Pro.Core.Runtime
 				"Publishers and their associated parameters.",
 				var => _cmd = ShowEnvironment
 			);
+			options.Add(
+				"merge=",
+				"Merge the metrics and faults of the job databases given as " +
+				"arguments into the job database DB. " +
+				"Used to combine the results of a job run with --parallel.",
+				v => _cmd = args => MergeJobs(v, args)
+			);
 
 			// web ui
 			options.Add(
@@ -364,17 +389,7 @@ namespace Peach.Pro.Core.Runtime
 			if (!dom.tests.TryGetValue(_config.runName, out test))
 				throw new PeachException("Unable to locate test named '{0}'.".Fmt(_config.runName));
 
-			if (pitConfig != null && pitConfig.Weights != null)
-			{
-				foreach (var item in pitConfig.Weights)
-				{
-					test.weights.Add(new SelectWeight
-					{
-						Name = item.Id,
-						Weight = (ElementWeight)item.Weight
-					});
-				}
-			}
+			ApplyWeights(test, pitConfig);
 
 			// Add the JobLogger as necessary
 			var jobLogger = test.loggers.OfType<JobLogger>().SingleOrDefault();
@@ -384,6 +399,9 @@ namespace Peach.Pro.Core.Runtime
 				test.loggers.Insert(0, jobLogger);
 			}
 
+			if (_config.profile && !test.loggers.OfType<ProfileLogger>().Any())
+				test.loggers.Add(new ProfileLogger());
+
 			var configName = pitConfig != null ? pitConfig.Name : _config.pitFile;
 			var jobLicense = _license.NewJob(_config.pitFile, configName, _config.id.ToString());
 			jobLogger.Initialize(_config, _license, jobLicense);
@@ -413,6 +431,45 @@ namespace Peach.Pro.Core.Runtime
 			}
 		}
 
+		private static void ApplyWeights(Test test, PitConfig pitConfig)
+		{
+			if (pitConfig == null || pitConfig.Weights == null)
+				return;
+
+			foreach (var item in pitConfig.Weights)
+			{
+				test.weights.Add(new SelectWeight
+				{
+					Name = item.Id,
+					Weight = (ElementWeight)item.Weight
+				});
+			}
+		}
+
+		/// <summary>
+		/// Parse another copy of the pit for each additional worker engine.
+		/// The defines are parsed again so ##WorkerId## is unique to the worker.
+		/// </summary>
+		private Peach.Core.Dom.Dom CreateWorkerDom(string pitPath, PitConfig pitConfig, uint workerId)
+		{
+			var defs = ParseDefines(pitPath + ".config", pitConfig, workerId);
+
+			var parserArgs = new Dictionary<string, object>();
+			parserArgs[PitParser.DEFINED_VALUES] = defs;
+
+			var parser = new ProPitParser(_license, _pitLibraryPath, pitPath);
+			var dom = parser.asParser(parserArgs, pitPath);
+
+			if (pitConfig != null)
+				PitInjector.InjectAgents(pitConfig, defs, dom);
+
+			Test test;
+			if (dom.tests.TryGetValue(_config.runName, out test))
+				ApplyWeights(test, pitConfig);
+
+			return dom;
+		}
+
 		/// <summary>
 		/// Run a command line analyzer of the specified name
 		/// </summary>
@@ -525,6 +582,9 @@ namespace Peach.Pro.Core.Runtime
 					if (pitConfig != null)
 						PitInjector.InjectAgents(pitConfig, defs, dom);
 
+					if (_config.workers > 1)
+						_config.createDom = workerId => CreateWorkerDom(pitPath, pitConfig, workerId);
+
 					RunEngine(dom, pitConfig);
 				}
 			}
@@ -540,8 +600,11 @@ namespace Peach.Pro.Core.Runtime
 		/// Combines define files and define arguments into a single list
 		/// Command line arguments override any .config file's defines
 		/// </summary>
+		/// <param name="xmlConfig">The pit's .config file</param>
+		/// <param name="pitConfig">The pit configuration from the web application, if any</param>
+		/// <param name="workerId">The engine the defines are for, 0 for the primary engine</param>
 		/// <returns></returns>
-		protected virtual IEnumerable<KeyValuePair<string, string>> ParseDefines(string xmlConfig, PitConfig pitConfig)
+		protected virtual IEnumerable<KeyValuePair<string, string>> ParseDefines(string xmlConfig, PitConfig pitConfig, uint workerId = 0)
 		{
 			// Parse pit.xml.config to poopulate system defines and add
 			// -D command line overrides.
@@ -562,11 +625,30 @@ namespace Peach.Pro.Core.Runtime
 				defs.Children.AddRange(cfg.Children);
 			}
 
+			// Added last so every engine gets its own value, which pits use
+			// to give each engine its own files, pipes and ports
+			defs.SystemDefines.Add(new PitDefines.SystemDefine
+			{
+				Key = "WorkerId",
+				Name = "Worker Id",
+				Description = "Number of the engine running the test, 0 for the first engine",
+				Value = workerId.ToString()
+			});
+
 			var ret = defs.Evaluate();
 
 			if (pitConfig != null)
+			{
 				PitInjector.InjectDefines(pitConfig, defs, ret);
 
+				// Values from the pit configuration are added after evaluating
+				for (var i = 0; i < ret.Count; ++i)
+				{
+					if (ret[i].Value != null)
+						ret[i] = new KeyValuePair<string, string>(ret[i].Key, ret[i].Value.Replace("##WorkerId##", workerId.ToString()));
+				}
+			}
+
 			return ret;
 		}
 
@@ -761,6 +843,36 @@ AGREE TO BE BOUND BY THE TERMS ABOVE.
 			_config.range = true;
 		}
 
+		protected void ParseParallel(string arg, string v)
+		{
+			var parts = v.Split(',');
+			if (parts.Length != 2)
+				throw new PeachException("Invalid parallel value: " + v);
+
+			try
+			{
+				_config.parallelNum = Convert.ToUInt32(parts[0]);
+			}
+			catch (Exception ex)
+			{
+				throw new PeachException("Invalid parallel machine number: " + parts[0], ex);
+			}
+
+			try
+			{
+				_config.parallelTotal = Convert.ToUInt32(parts[1]);
+			}
+			catch (Exception ex)
+			{
+				throw new PeachException("Invalid parallel machine count: " + parts[1], ex);
+			}
+
+			if (_config.parallelNum == 0 || _config.parallelNum > _config.parallelTotal)
+				throw new PeachException("Invalid parallel value: " + v);
+
+			_config.parallel = true;
+		}
+
 		protected void AddNewDefine(string arg)
 		{
 			var parts = arg.Split('=');
@@ -836,6 +948,32 @@ AGREE TO BE BOUND BY THE TERMS ABOVE.
 			return 0;
 		}
 
+		static int MergeJobs(string path, List<string> args)
+		{
+			if (args.Count == 0)
+				throw new SyntaxException("At least one job database to merge is required.");
+
+			using (var db = new JobDatabase(path))
+			{
+				db.Migrate();
+
+				foreach (var item in args)
+				{
+					if (!File.Exists(item))
+						throw new PeachException("Error, job database '{0}' does not exist.".Fmt(item));
+
+					using (var src = new JobDatabase(item))
+						src.Migrate();
+
+					Console.WriteLine("Merging '{0}' into '{1}'", item, path);
+
+					db.Merge(item);
+				}
+			}
+
+			return 0;
+		}
+
 		#endregion
 
 		protected static void Console_CancelKeyPress(object sender, ConsoleCancelEventArgs e)
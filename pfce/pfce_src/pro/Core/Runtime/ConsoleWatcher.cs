@@ -11,6 +11,7 @@ namespace Peach.Pro.Core.Runtime
 	{
 		private readonly Stopwatch timer = new Stopwatch();
 		private uint startIteration;
+		private uint finished;
 		private bool reproducing;
 
 		protected override void Engine_ReproFault(RunContext context, uint currentIteration, StateModel stateModel, Fault[] faultData)
@@ -59,6 +60,8 @@ namespace Peach.Pro.Core.Runtime
 
 		protected override void Engine_IterationFinished(RunContext context, uint currentIteration)
 		{
+			if (!context.controlIteration && !context.reproducingFault)
+				++finished;
 		}
 
 		protected override void Engine_IterationStarting(RunContext context, uint currentIteration, uint? totalIterations)
@@ -83,7 +86,8 @@ namespace Peach.Pro.Core.Runtime
 			{
 				strTotal = totalIterations.ToString();
 
-				var done = currentIteration - startIteration;
+				// Include the iterations run by any worker engines
+				var done = finished + context.WorkerIterations;
 				var total = totalIterations.Value - startIteration + 1;
 				var elapsed = timer.ElapsedMilliseconds;
 				TimeSpan remain;
@@ -20,6 +20,7 @@ namespace Peach.Pro.Core.Runtime
 		uint _currentIteration;
 		uint _totalIterations;
 		uint _iterationCount = 1;
+		uint _finished;
 		readonly List<Fault> _faults = new List<Fault>();
 		readonly Dictionary<string, int> _majorFaultCount = new Dictionary<string, int>();
 		DateTime _started = DateTime.Now;
@@ -92,6 +93,9 @@ namespace Peach.Pro.Core.Runtime
 		protected override void Engine_IterationFinished(RunContext context, uint currentIteration)
 		{
 			_iterationCount++;
+
+			if (!context.controlIteration && !context.reproducingFault)
+				_finished++;
 		}
 
 		protected override void Engine_IterationStarting(RunContext context, uint currentIteration, uint? totalIterations)
@@ -108,7 +112,8 @@ namespace Peach.Pro.Core.Runtime
 
 			if (totalIterations != null && totalIterations < uint.MaxValue)
 			{
-				var done = currentIteration - startIteration;
+				// Include the iterations run by any worker engines
+				var done = _finished + context.WorkerIterations;
 				var total = totalIterations.Value - startIteration + 1;
 				var elapsed = timer.ElapsedMilliseconds;
 				TimeSpan remain;
@@ -359,7 +364,8 @@ namespace Peach.Pro.Core.Runtime
 			Console.SetCursorPosition(38, 4);
 			DisplayStaticText("Speed: ");
 			var sec = runSpan.Ticks/TimeSpan.TicksPerSecond;
-			var speed = (sec == 0) ? 0 : (_iterationCount*3600)/sec;
+			var count = _iterationCount + (_context != null ? _context.WorkerIterations : 0);
+			var speed = (sec == 0) ? 0 : (count*3600)/sec;
 			Console.Write(speed);
 			Console.Write("/hr     ");
 		}
@@ -22,6 +22,15 @@ def register_event(kind, func):
 	funcs.append(func)
 	__request_funcs[__current_route] = funcs
 
+def lazy_body(func):
+	"""
+	Decorator for request functions that want the body as a Body
+	instead of a copy of all the bytes.  Without it, functions get
+	the same bytes object they always have.
+	"""
+	func.lazy_body = True
+	return func
+
 class Uri(object):
 	def __init__(self, uri):
 		self._peach_uri = uri
@@ -192,13 +201,92 @@ class HeaderDict(dict):
 	def update(self):
 		raise NotImplementedError
 
+class Body(object):
+	"""
+	Lazy view of a request body, passed to functions decorated with lazy_body.
+
+	The underlying byte[] is only copied into a python bytes object the
+	first time the whole body is needed.  Use len(), slicing or chunks()
+	to look at large bodies without copying all of it, and tobytes() to
+	get the bytes object other functions receive.
+	"""
+
+	def __init__(self, data):
+		self._data = data
+		self._bytes = None
+
+	def __len__(self):
+		return self._data.Length
+
+	def __nonzero__(self):
+		return self._data.Length > 0
+
+	__bool__ = __nonzero__
+
+	def __repr__(self):
+		return repr(self.tobytes())
+
+	def __str__(self):
+		return str(self.tobytes())
+
+	def __bytes__(self):
+		return self.tobytes()
+
+	def __getitem__(self, key):
+		if self._bytes is None and isinstance(key, slice):
+			return bytes(self._data[key])
+		return self.tobytes()[key]
+
+	def __iter__(self):
+		return iter(self.tobytes())
+
+	def __contains__(self, item):
+		return item in self.tobytes()
+
+	def __eq__(self, other):
+		if isinstance(other, Body):
+			other = other.tobytes()
+		return self.tobytes() == other
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def __hash__(self):
+		return hash(self.tobytes())
+
+	def __add__(self, other):
+		return self.tobytes() + other
+
+	def __radd__(self, other):
+		return other + self.tobytes()
+
+	def __getattr__(self, name):
+		if name.startswith('_'):
+			raise AttributeError(name)
+
+		# Any other bytes method works on the materialized body
+		return getattr(self.tobytes(), name)
+
+	def tobytes(self):
+		if self._bytes is None:
+			self._bytes = bytes(self._data)
+		return self._bytes
+
+	def chunks(self, size=65536):
+		for i in xrange(0, self._data.Length, size):
+			yield bytes(self._data[i:i + size])
+
 class Request(object):
 	def __init__(self, peach_req):
 		self._peach_req = peach_req
+		self._uri = None
+		self._headers = None
 
 	@property
 	def uri(self):
-		return Uri(self._peach_req.RequestUri)
+		if self._uri is None:
+			self._uri = Uri(self._peach_req.RequestUri)
+		return self._uri
 
 	@property
 	def method(self):
@@ -242,7 +330,9 @@ class Request(object):
 
 	@property
 	def headers(self):
-		return HeaderDict(self._peach_req)
+		if self._headers is None:
+			self._headers = HeaderDict(self._peach_req)
+		return self._headers
 
 def __set_current_route(route):
 	global __current_route;
@@ -254,14 +344,22 @@ def __get_request_funcs():
 
 def __on_request(route, context, req, body):
 	global __request_funcs;
-	funcs = __request_funcs.get(route, [])
+	funcs = __request_funcs.get(route)
+
+	if not funcs:
+		return
 
 	r = Request(req)
 
 	if body:
-		body = bytes(body)
+		# Every function shares one copy of the bytes, which is
+		# only made if a function without lazy_body is registered
+		body = Body(body)
 
 	for func in funcs:
-		func(context, r, body)
+		if body and not getattr(func, 'lazy_body', False):
+			func(context, r, body.tobytes())
+		else:
+			func(context, r, body)
 
 
@@ -12,6 +12,17 @@ using Monitor = System.Threading.Monitor;
 
 namespace Peach.Pro.Core.Storage
 {
+	/// <summary>
+	/// Writes job metrics to the job database on a background thread.
+	/// </summary>
+	/// <remarks>
+	/// Metrics of consecutive iterations are coalesced into a single batch
+	/// that is written in one transaction every FlushInterval milliseconds,
+	/// or sooner when it holds FlushIterations iterations.  Mutation counts
+	/// are aggregated in the batch so each flush upserts every distinct
+	/// mutation once.  The background thread keeps a single connection to
+	/// the job database open for the duration of the job.
+	/// </remarks>
 	internal class AsyncDbCache
 	{
 		class NameCache
@@ -46,7 +57,46 @@ namespace Peach.Pro.Core.Storage
 			}
 		}
 
+		/// <summary>
+		/// Metrics of the iterations that have finished since the last flush.
+		/// </summary>
+		class Batch
+		{
+			public readonly Stopwatch Age = Stopwatch.StartNew();
+			public readonly List<NamedItem> Names = new List<NamedItem>();
+			public readonly Dictionary<Tuple<long, long>, State> States = new Dictionary<Tuple<long, long>, State>();
+			public readonly Dictionary<Tuple<NameKind, long, long, long, long, long, long>, Mutation> Mutations =
+				new Dictionary<Tuple<NameKind, long, long, long, long, long, long>, Mutation>();
+			public int Iterations;
+			public Job Job;
+
+			public void Add(Job job, IEnumerable<NamedItem> names, Dictionary<Tuple<long, long>, State> states, List<Mutation> mutations)
+			{
+				Job = job;
+				Iterations++;
+
+				Names.AddRange(names);
+
+				// States hold their running total, so the latest one wins
+				foreach (var kv in states)
+					States[kv.Key] = kv.Value;
+
+				foreach (var m in mutations)
+				{
+					var key = Tuple.Create(m.Kind, m.StateId, m.ActionId, m.ParameterId, m.ElementId, m.MutatorId, m.DatasetId);
+
+					Mutation existing;
+					if (Mutations.TryGetValue(key, out existing))
+						existing.IterationCount += m.IterationCount;
+					else
+						Mutations.Add(key, m);
+				}
+			}
+		}
+
 		const int HeartBeatInterval = 1000;
+		const int FlushInterval = 250;
+		const int FlushIterations = 1000;
 
 		static readonly NLog.Logger Logger = LogManager.GetCurrentClassLogger();
 		readonly NameCache _nameCache;
@@ -55,6 +105,14 @@ namespace Peach.Pro.Core.Storage
 		readonly Task<Job> _task;
 		readonly LinkedList<Func<Stopwatch, Job>> _queue = new LinkedList<Func<Stopwatch, Job>>();
 		readonly SemaphoreSlim _queueSemaphore = new SemaphoreSlim(10);
+		readonly string _dbPath;
+
+		// Only used by the background task
+		JobDatabase _db;
+
+		// The batch at the end of the queue that finished iterations are added to
+		LinkedListNode<Func<Stopwatch, Job>> _batchNode;
+		Batch _batch;
 
 		Dictionary<Tuple<long, long>, State> _pendingStates;
 		List<Mutation> _mutations;
@@ -68,8 +126,9 @@ namespace Peach.Pro.Core.Storage
 		{
 			_status = job.Status;
 			Job = job;
+			_dbPath = job.DatabasePath;
 
-			using (var db = new JobDatabase(job.DatabasePath))
+			using (var db = new JobDatabase(_dbPath))
 			{
 				_nameCache = new NameCache(db);
 				_stateCache = db.LoadTable<State>().ToDictionary(x =>
@@ -89,25 +148,41 @@ namespace Peach.Pro.Core.Storage
 			var job = (Job)obj;
 			var sw = Stopwatch.StartNew();
 
-			while (true)
+			try
 			{
-				var func = GetNext(sw, job);
-				if (func == null)
-					continue;
+				while (true)
+				{
+					var func = GetNext(sw, job);
+					if (func == null)
+						continue;
 
-				var ret = func(sw);
-				if (ret == null)
-					return job;
+					var ret = func(sw);
+					if (ret == null)
+						return job;
 
-				job = ret;
+					job = ret;
 
-				lock (job)
+					lock (job)
+					{
+						Monitor.Pulse(job);
+					}
+				}
+			}
+			finally
+			{
+				if (_db != null)
 				{
-					Monitor.Pulse(job);
+					_db.Dispose();
+					_db = null;
 				}
 			}
 		}
 
+		private JobDatabase Db
+		{
+			get { return _db ?? (_db = new JobDatabase(_dbPath)); }
+		}
+
 		private Func<Stopwatch, Job> GetNext(Stopwatch sw, Job job)
 		{
 			lock (_queue)
@@ -119,6 +194,21 @@ namespace Peach.Pro.Core.Storage
 					return null;
 				}
 
+				if (_queue.Count == 0)
+					return null;
+
+				// Give the engine a chance to add more iterations to
+				// the batch unless something else is waiting behind it
+				if (_queue.First == _batchNode && _queue.Count == 1)
+				{
+					var remain = FlushInterval - _batch.Age.ElapsedMilliseconds;
+					if (remain > 0 && _batch.Iterations < FlushIterations)
+					{
+						Monitor.Wait(_queue, (int)remain);
+						return null;
+					}
+				}
+
 				_queueSemaphore.Release();
 				var ret = _queue.First();
 				_queue.RemoveFirst();
@@ -151,7 +241,7 @@ namespace Peach.Pro.Core.Storage
 			}
 		}
 
-		private void EnqueueBack(Func<Stopwatch, Job> func)
+		private LinkedListNode<Func<Stopwatch, Job>> EnqueueBack(Func<Stopwatch, Job> func)
 		{
 			do
 			{
@@ -161,9 +251,51 @@ namespace Peach.Pro.Core.Storage
 
 			lock (_queue)
 			{
-				_queue.AddLast(func);
+				var node = _queue.AddLast(func);
 				_maxQueueDepth = Math.Max(_maxQueueDepth, _queue.Count);
 				Monitor.Pulse(_queue);
+				return node;
+			}
+		}
+
+		private void EnqueueIteration(Job copy, IEnumerable<NamedItem> names, Dictionary<Tuple<long, long>, State> states, List<Mutation> mutations)
+		{
+			lock (_queue)
+			{
+				// Once the background task has taken the batch, or something
+				// has been queued after it, a new batch has to be started
+				if (_batchNode != null && _queue.Last == _batchNode)
+				{
+					_batch.Add(copy, names, states, mutations);
+
+					if (_batch.Iterations >= FlushIterations)
+						Monitor.Pulse(_queue);
+
+					return;
+				}
+			}
+
+			var batch = new Batch();
+			batch.Add(copy, names, states, mutations);
+
+			var node = EnqueueBack(sw =>
+			{
+				Db.Transaction(() =>
+				{
+					Db.InsertNames(batch.Names);
+					Db.UpsertStates(batch.States.Values);
+					Db.UpsertMutations(batch.Mutations.Values);
+				});
+				DoUpdateRunningJob(sw, batch.Job);
+				return batch.Job;
+			});
+
+			lock (_queue)
+			{
+				// If the background task has already taken the node
+				// it is no longer in the queue and won't be added to
+				_batchNode = node;
+				_batch = batch;
 			}
 		}
 
@@ -263,6 +395,7 @@ namespace Peach.Pro.Core.Storage
 				ElementId = _nameCache.Add(element),
 				MutatorId = _nameCache.Add(mutator),
 				DatasetId = _nameCache.Add(dataset),
+				IterationCount = 1,
 			};
 
 			_mutations.Add(mutation);
@@ -282,20 +415,7 @@ namespace Peach.Pro.Core.Storage
 			foreach (var kv in _pendingStates)
 				_stateCache[kv.Key] = kv.Value;
 
-			EnqueueBack(sw =>
-			{
-				using (var db = new JobDatabase(copy.DatabasePath))
-				{
-					db.Transaction(() =>
-					{
-						db.InsertNames(names);
-						db.UpsertStates(states.Values);
-						db.UpsertMutations(mutations);
-					});
-				}
-				DoUpdateRunningJob(sw, copy);
-				return copy;
-			});
+			EnqueueIteration(copy, names, states, mutations);
 		}
 
 		public void OnFault(FaultDetail detail)
@@ -341,20 +461,17 @@ namespace Peach.Pro.Core.Storage
 			{
 				EnqueueBack(sw =>
 				{
-					using (var db = new JobDatabase(copy.DatabasePath))
+					Db.Transaction(() =>
 					{
-						db.Transaction(() =>
+						Db.InsertNames(names);
+						Db.InsertFault(detail);
+						Db.InsertFaultMetrics(faults.Select(f =>
 						{
-							db.InsertNames(names);
-							db.InsertFault(detail);
-							db.InsertFaultMetrics(faults.Select(f =>
-							{
-								// Inserting the fault detail will set the id
-								f.FaultDetailId = detail.Id;
-								return f;
-							}));
-						});
-					}
+							// Inserting the fault detail will set the id
+							f.FaultDetailId = detail.Id;
+							return f;
+						}));
+					});
 					DoUpdateRunningJob(sw, copy);
 					return copy;
 				});
@@ -21,6 +21,19 @@ namespace Peach.Pro.Core.Storage
 			typeof(State),
 			typeof(Mutation),
 			typeof(FaultMetric),
+			typeof(MergedJob),
+
+			// rollups
+			typeof(MutatorRollup),
+			typeof(ElementRollup),
+			typeof(DatasetRollup),
+		};
+
+		static readonly IEnumerable<Type> RollupSchema = new[]
+		{
+			typeof(MutatorRollup),
+			typeof(ElementRollup),
+			typeof(DatasetRollup),
 		};
 
 		static readonly string[] StaticScripts =
@@ -51,6 +64,12 @@ namespace Peach.Pro.Core.Storage
 					() => { Connection.Execute(Sql.JobMigrateV2); },
 					() => { Connection.Execute(Sql.JobMigrateV3); },
 					() => { Connection.Execute(Sql.JobMigrateV4); },
+					() =>
+					{
+						SqliteInitializer.InitializeDatabase(Connection, RollupSchema, null);
+						Connection.Execute(Sql.JobMigrateV5);
+					},
+					() => { SqliteInitializer.InitializeDatabase(Connection, new[] { typeof(MergedJob) }, null); },
 				};
 			}
 		}
@@ -75,6 +94,9 @@ namespace Peach.Pro.Core.Storage
 			Connection.Execute(Sql.UpsertState, states);
 		}
 
+		/// <summary>
+		/// Add the IterationCount of each mutation to its stored count.
+		/// </summary>
 		public void UpsertMutations(IEnumerable<Mutation> mutations)
 		{
 			Connection.Execute(Sql.UpsertMutation, mutations);
@@ -96,6 +118,43 @@ namespace Peach.Pro.Core.Storage
 			Connection.Execute(Sql.InsertFaultFile, fault.Files);
 		}
 
+		/// <summary>
+		/// Add the metrics and faults of another job database to this one.
+		/// </summary>
+		/// <remarks>
+		/// Used to combine the results of a job that was split across
+		/// machines with --parallel.  Fault files are not copied, so the
+		/// merged faults still refer to the files of the original job.
+		/// Each database can only be merged once.
+		/// </remarks>
+		/// <param name="path">Path to the job database to merge.</param>
+		public void Merge(string path)
+		{
+			var fullPath = System.IO.Path.GetFullPath(path);
+
+			if (fullPath == System.IO.Path.GetFullPath(Path))
+				throw new PeachException("Error, can't merge job database '{0}' into itself.".Fmt(path));
+
+			if (Connection.ExecuteScalar<long>(Sql.SelectMergedJob, new { Path = fullPath }) > 0)
+				throw new PeachException("Error, job database '{0}' has already been merged.".Fmt(path));
+
+			// Databases can't be attached inside a transaction
+			Connection.Execute(Sql.AttachMergeSource, new { Path = fullPath });
+
+			try
+			{
+				Transaction(() =>
+				{
+					Connection.Execute(Sql.MergeJob);
+					Connection.Execute(Sql.InsertMergedJob, new { Path = fullPath, Timestamp = DateTime.Now });
+				});
+			}
+			finally
+			{
+				Connection.Execute(Sql.DetachMergeSource);
+			}
+		}
+
 		public FaultDetail GetFaultById(long id, NameKind kind, bool loadFiles = true)
 		{
 			FaultDetail fault;
@@ -88,6 +88,21 @@ namespace Peach.Pro.Core.Storage
 		public NameKind Kind { get; set; }
 	}
 
+	/// <summary>
+	/// One row per job database merged into this one.
+	/// </summary>
+	public class MergedJob
+	{
+		[Key]
+		public long Id { get; set; }
+
+		[Required]
+		[Index("UX_MergedJob", IsUnique = true)]
+		public string Path { get; set; }
+
+		public DateTime Timestamp { get; set; }
+	}
+
 	/// <summary>
 	/// One row per fault.
 	/// </summary>
@@ -136,4 +151,71 @@ namespace Peach.Pro.Core.Storage
 		[Index("IX_Mutation_Kind")]
 		public NameKind Kind { get; set; }
 	}
+
+	/// <summary>
+	/// Running totals per mutator of machine mutations and faults.
+	/// Maintained by the triggers in Metrics.sql.
+	/// </summary>
+	public class MutatorRollup
+	{
+		[Key]
+		public long MutatorId { get; set; }
+
+		public long ElementCount { get; set; }
+		public long IterationCount { get; set; }
+		public long BucketCount { get; set; }
+		public long FaultCount { get; set; }
+	}
+
+	/// <summary>
+	/// Running totals per element of mutations and faults.
+	/// Maintained by the triggers in Metrics.sql.
+	/// </summary>
+	public class ElementRollup
+	{
+		[Key]
+		public long StateId { get; set; }
+
+		[Key]
+		public long ActionId { get; set; }
+
+		[Key]
+		public long ParameterId { get; set; }
+
+		[Key]
+		public long ElementId { get; set; }
+
+		[Key]
+		public NameKind Kind { get; set; }
+
+		public long IterationCount { get; set; }
+		public long BucketCount { get; set; }
+		public long FaultCount { get; set; }
+	}
+
+	/// <summary>
+	/// Running totals per dataset of mutations and faults.
+	/// Maintained by the triggers in Metrics.sql.
+	/// </summary>
+	public class DatasetRollup
+	{
+		[Key]
+		public long StateId { get; set; }
+
+		[Key]
+		public long ActionId { get; set; }
+
+		[Key]
+		public long ParameterId { get; set; }
+
+		[Key]
+		public long DatasetId { get; set; }
+
+		[Key]
+		public NameKind Kind { get; set; }
+
+		public long IterationCount { get; set; }
+		public long BucketCount { get; set; }
+		public long FaultCount { get; set; }
+	}
 }
@@ -236,8 +236,22 @@ WHERE
 	Id = @Id
 ;";
 		
+		// Existing rows are updated in place rather than replaced
+		// so the rollup triggers only see the added iterations.
 		public const string UpsertMutation = @"
-INSERT OR REPLACE INTO Mutation (
+UPDATE Mutation
+SET IterationCount = IterationCount + @IterationCount
+WHERE
+	StateId = @StateId AND
+	ActionId = @ActionId AND
+	ParameterId = @ParameterId AND
+	ElementId = @ElementId AND
+	MutatorId = @MutatorId AND
+	DatasetId = @DatasetId AND
+	Kind = @Kind
+;
+
+INSERT OR IGNORE INTO Mutation (
 	StateId,
 	ActionId,
 	ParameterId,
@@ -254,18 +268,7 @@ INSERT OR REPLACE INTO Mutation (
 	@MutatorId,
 	@DatasetId,
 	@Kind,
-	COALESCE((
-		SELECT IterationCount + 1
-		FROM Mutation
-		WHERE
-			StateId = @StateId AND
-			ActionId = @ActionId AND
-			ParameterId = @ParameterId AND
-			ElementId = @ElementId AND
-			MutatorId = @MutatorId AND
-			DatasetId = @DatasetId AND
-			Kind = @Kind
-	), 1)
+	@IterationCount
 );";
 
 		public const string UpsertState = @"
@@ -412,6 +415,236 @@ INSERT INTO NamedItem (
 UPDATE State 
 SET Count = @Count 
 WHERE Id = @Id;
+";
+
+		public const string AttachMergeSource = @"
+ATTACH DATABASE @Path AS src;
+";
+
+		public const string DetachMergeSource = @"
+DROP TABLE IF EXISTS temp.MergeName;
+DROP TABLE IF EXISTS temp.MergeState;
+DROP TABLE IF EXISTS temp.MergeMutation;
+DROP TABLE IF EXISTS temp.MergeOffset;
+DETACH DATABASE src;
+";
+
+		// Names and states are matched by value since every job
+		// assigns its own ids.  Counts are summed and faults are
+		// appended with their ids moved past the existing ones.
+		public const string MergeJob = @"
+INSERT INTO NamedItem (Name, Field)
+SELECT s.Name, s.Field
+FROM src.NamedItem s
+WHERE NOT EXISTS (
+	SELECT 1 FROM NamedItem n WHERE n.Name = s.Name
+)
+ORDER BY s.Id;
+
+CREATE TEMP TABLE MergeName AS
+SELECT s.Id AS SrcId, MIN(n.Id) AS DstId
+FROM src.NamedItem s
+JOIN NamedItem n ON n.Name = s.Name
+GROUP BY s.Id;
+
+INSERT INTO State (NameId, RunCount, Count)
+SELECT m.DstId, s.RunCount, 0
+FROM src.State s
+JOIN MergeName m ON m.SrcId = s.NameId
+WHERE NOT EXISTS (
+	SELECT 1 FROM State d WHERE d.NameId = m.DstId AND d.RunCount = s.RunCount
+)
+ORDER BY s.Id;
+
+CREATE TEMP TABLE MergeState AS
+SELECT s.Id AS SrcId, d.Id AS DstId, s.Count AS Count
+FROM src.State s
+JOIN MergeName m ON m.SrcId = s.NameId
+JOIN State d ON d.NameId = m.DstId AND d.RunCount = s.RunCount;
+
+UPDATE State
+SET Count = Count + (SELECT ms.Count FROM MergeState ms WHERE ms.DstId = State.Id)
+WHERE Id IN (SELECT DstId FROM MergeState);
+
+CREATE TEMP TABLE MergeMutation AS
+SELECT
+	st.DstId AS StateId,
+	a.DstId AS ActionId,
+	p.DstId AS ParameterId,
+	e.DstId AS ElementId,
+	mu.DstId AS MutatorId,
+	d.DstId AS DatasetId,
+	s.Kind AS Kind,
+	SUM(s.IterationCount) AS IterationCount
+FROM src.Mutation s
+JOIN MergeState st ON st.SrcId = s.StateId
+JOIN MergeName a ON a.SrcId = s.ActionId
+JOIN MergeName p ON p.SrcId = s.ParameterId
+JOIN MergeName e ON e.SrcId = s.ElementId
+JOIN MergeName mu ON mu.SrcId = s.MutatorId
+JOIN MergeName d ON d.SrcId = s.DatasetId
+GROUP BY 1, 2, 3, 4, 5, 6, 7;
+
+UPDATE Mutation
+SET IterationCount = IterationCount + (
+	SELECT mm.IterationCount
+	FROM MergeMutation mm
+	WHERE
+		mm.StateId = Mutation.StateId AND
+		mm.ActionId = Mutation.ActionId AND
+		mm.ParameterId = Mutation.ParameterId AND
+		mm.ElementId = Mutation.ElementId AND
+		mm.MutatorId = Mutation.MutatorId AND
+		mm.DatasetId = Mutation.DatasetId AND
+		mm.Kind = Mutation.Kind
+)
+WHERE EXISTS (
+	SELECT 1
+	FROM MergeMutation mm
+	WHERE
+		mm.StateId = Mutation.StateId AND
+		mm.ActionId = Mutation.ActionId AND
+		mm.ParameterId = Mutation.ParameterId AND
+		mm.ElementId = Mutation.ElementId AND
+		mm.MutatorId = Mutation.MutatorId AND
+		mm.DatasetId = Mutation.DatasetId AND
+		mm.Kind = Mutation.Kind
+);
+
+INSERT OR IGNORE INTO Mutation (
+	StateId,
+	ActionId,
+	ParameterId,
+	ElementId,
+	MutatorId,
+	DatasetId,
+	Kind,
+	IterationCount
+)
+SELECT
+	StateId,
+	ActionId,
+	ParameterId,
+	ElementId,
+	MutatorId,
+	DatasetId,
+	Kind,
+	IterationCount
+FROM MergeMutation;
+
+CREATE TEMP TABLE MergeOffset AS
+SELECT
+	(SELECT COALESCE(MAX(Id), 0) FROM FaultDetail) AS FaultDetail,
+	(SELECT COALESCE(MAX(Id), 0) FROM FaultFile) AS FaultFile;
+
+INSERT INTO FaultDetail (
+	Id,
+	Reproducible,
+	Iteration,
+	TimeStamp,
+	Source,
+	Exploitability,
+	MajorHash,
+	MinorHash,
+	Title,
+	Description,
+	Seed,
+	IterationStart,
+	IterationStop,
+	Flags,
+	FaultPath
+)
+SELECT
+	s.Id + o.FaultDetail,
+	s.Reproducible,
+	s.Iteration,
+	s.TimeStamp,
+	s.Source,
+	s.Exploitability,
+	s.MajorHash,
+	s.MinorHash,
+	s.Title,
+	s.Description,
+	s.Seed,
+	s.IterationStart,
+	s.IterationStop,
+	s.Flags,
+	s.FaultPath
+FROM src.FaultDetail s, MergeOffset o;
+
+INSERT INTO FaultFile (
+	Id,
+	FaultDetailId,
+	Name,
+	FullName,
+	Initial,
+	Type,
+	AgentName,
+	MonitorName,
+	MonitorClass,
+	Size
+)
+SELECT
+	s.Id + o.FaultFile,
+	s.FaultDetailId + o.FaultDetail,
+	s.Name,
+	s.FullName,
+	s.Initial,
+	s.Type,
+	s.AgentName,
+	s.MonitorName,
+	s.MonitorClass,
+	s.Size
+FROM src.FaultFile s, MergeOffset o;
+
+INSERT INTO FaultMetric (
+	Iteration,
+	MajorHash,
+	MinorHash,
+	Timestamp,
+	Hour,
+	StateId,
+	ActionId,
+	ParameterId,
+	ElementId,
+	MutatorId,
+	DatasetId,
+	FaultDetailId,
+	Kind
+)
+SELECT
+	s.Iteration,
+	s.MajorHash,
+	s.MinorHash,
+	s.Timestamp,
+	s.Hour,
+	st.DstId,
+	a.DstId,
+	p.DstId,
+	e.DstId,
+	mu.DstId,
+	d.DstId,
+	s.FaultDetailId + o.FaultDetail,
+	s.Kind
+FROM src.FaultMetric s
+JOIN MergeState st ON st.SrcId = s.StateId
+JOIN MergeName a ON a.SrcId = s.ActionId
+JOIN MergeName p ON p.SrcId = s.ParameterId
+JOIN MergeName e ON e.SrcId = s.ElementId
+JOIN MergeName mu ON mu.SrcId = s.MutatorId
+JOIN MergeName d ON d.SrcId = s.DatasetId
+CROSS JOIN MergeOffset o;
+";
+
+		public const string SelectMergedJob = @"
+SELECT COUNT(*)
+FROM MergedJob
+WHERE Path = @Path;
+";
+
+		public const string InsertMergedJob = @"
+INSERT INTO MergedJob (Path, Timestamp)
+VALUES (@Path, @Timestamp);
 ";
 
 		public const string SelectBucketCount = @"
@@ -481,6 +714,158 @@ ADD COLUMN
 ;
 ";
 
+		// The rollup tables are created by the migration, this
+		// fills them in from the existing metrics.  The triggers
+		// that keep them up to date are created afterwards by
+		// Metrics.sql so nothing is counted twice.
+		public const string JobMigrateV5 = @"
+INSERT INTO MutatorRollup (
+	MutatorId,
+	ElementCount,
+	IterationCount,
+	BucketCount,
+	FaultCount
+)
+SELECT
+	x.MutatorId,
+	0,
+	SUM(x.IterationCount),
+	0,
+	0
+FROM (
+	SELECT MutatorId, IterationCount FROM Mutation WHERE Kind = 0
+	UNION ALL
+	SELECT MutatorId, 0 FROM FaultMetric WHERE Kind = 0
+) AS x
+GROUP BY x.MutatorId;
+
+UPDATE MutatorRollup
+SET
+	ElementCount = (
+		SELECT COUNT(DISTINCT(x.StateId || '.' || x.ActionId || '.' || x.ParameterId || '.' || x.ElementId))
+		FROM Mutation AS x
+		WHERE x.MutatorId = MutatorRollup.MutatorId AND x.Kind = 0
+	),
+	BucketCount = (
+		SELECT COUNT(DISTINCT(f.MajorHash))
+		FROM FaultMetric AS f
+		WHERE f.MutatorId = MutatorRollup.MutatorId AND f.Kind = 0
+	),
+	FaultCount = (
+		SELECT COUNT(DISTINCT(f.Iteration))
+		FROM FaultMetric AS f
+		WHERE f.MutatorId = MutatorRollup.MutatorId AND f.Kind = 0
+	);
+
+INSERT INTO ElementRollup (
+	StateId,
+	ActionId,
+	ParameterId,
+	ElementId,
+	Kind,
+	IterationCount,
+	BucketCount,
+	FaultCount
+)
+SELECT
+	x.StateId,
+	x.ActionId,
+	x.ParameterId,
+	x.ElementId,
+	x.Kind,
+	SUM(x.IterationCount),
+	0,
+	0
+FROM (
+	SELECT StateId, ActionId, ParameterId, ElementId, Kind, IterationCount FROM Mutation
+	UNION ALL
+	SELECT StateId, ActionId, ParameterId, ElementId, Kind, 0 FROM FaultMetric
+) AS x
+GROUP BY
+	x.StateId,
+	x.ActionId,
+	x.ParameterId,
+	x.ElementId,
+	x.Kind;
+
+UPDATE ElementRollup
+SET
+	BucketCount = (
+		SELECT COUNT(DISTINCT(f.MajorHash))
+		FROM FaultMetric AS f
+		WHERE
+			f.StateId = ElementRollup.StateId AND
+			f.ActionId = ElementRollup.ActionId AND
+			f.ParameterId = ElementRollup.ParameterId AND
+			f.ElementId = ElementRollup.ElementId AND
+			f.Kind = ElementRollup.Kind
+	),
+	FaultCount = (
+		SELECT COUNT(DISTINCT(f.Iteration))
+		FROM FaultMetric AS f
+		WHERE
+			f.StateId = ElementRollup.StateId AND
+			f.ActionId = ElementRollup.ActionId AND
+			f.ParameterId = ElementRollup.ParameterId AND
+			f.ElementId = ElementRollup.ElementId AND
+			f.Kind = ElementRollup.Kind
+	);
+
+INSERT INTO DatasetRollup (
+	StateId,
+	ActionId,
+	ParameterId,
+	DatasetId,
+	Kind,
+	IterationCount,
+	BucketCount,
+	FaultCount
+)
+SELECT
+	x.StateId,
+	x.ActionId,
+	x.ParameterId,
+	x.DatasetId,
+	x.Kind,
+	SUM(x.IterationCount),
+	0,
+	0
+FROM (
+	SELECT StateId, ActionId, ParameterId, DatasetId, Kind, IterationCount FROM Mutation
+	UNION ALL
+	SELECT StateId, ActionId, ParameterId, DatasetId, Kind, 0 FROM FaultMetric
+) AS x
+GROUP BY
+	x.StateId,
+	x.ActionId,
+	x.ParameterId,
+	x.DatasetId,
+	x.Kind;
+
+UPDATE DatasetRollup
+SET
+	BucketCount = (
+		SELECT COUNT(DISTINCT(f.MajorHash))
+		FROM FaultMetric AS f
+		WHERE
+			f.StateId = DatasetRollup.StateId AND
+			f.ActionId = DatasetRollup.ActionId AND
+			f.ParameterId = DatasetRollup.ParameterId AND
+			f.DatasetId = DatasetRollup.DatasetId AND
+			f.Kind = DatasetRollup.Kind
+	),
+	FaultCount = (
+		SELECT COUNT(DISTINCT(f.Iteration))
+		FROM FaultMetric AS f
+		WHERE
+			f.StateId = DatasetRollup.StateId AND
+			f.ActionId = DatasetRollup.ActionId AND
+			f.ParameterId = DatasetRollup.ParameterId AND
+			f.DatasetId = DatasetRollup.DatasetId AND
+			f.Kind = DatasetRollup.Kind
+	);
+";
+
 		public const string NodeMigrateV1 = @"
 PRAGMA foreign_keys=OFF;
 
@@ -12,6 +12,12 @@ namespace Peach.Pro.Core.Transformers
 			__init__(parent, args);
 		}
 
+		public override bool IsDeterministic
+		{
+			// Python transformers can return anything
+			get { return false; }
+		}
+
 		protected virtual void __init__(DataElement parent, Dictionary<string, Variant> args)
 		{
 		}
@@ -129,6 +129,11 @@ namespace Peach.Pro.Core.WebServices.Models
 		/// The URL of field metrics.
 		/// </summary>
 		public string Fields { get; set; }
+
+		/// <summary>
+		/// The URL of profiler metrics.
+		/// </summary>
+		public string Profile { get; set; }
 	}
 
 	[Serializable]
@@ -299,6 +304,30 @@ namespace Peach.Pro.Core.WebServices.Models
 			}
 		}
 
+		[NotMapped]
+		[JsonIgnore]
+		public string ProfilePath
+		{
+			get
+			{
+				if (LogPath == null)
+					return null;
+				return Path.Combine(LogPath, "profile.json");
+			}
+		}
+
+		[NotMapped]
+		[JsonIgnore]
+		public string ProfileFoldedPath
+		{
+			get
+			{
+				if (LogPath == null)
+					return null;
+				return Path.Combine(LogPath, "profile.folded");
+			}
+		}
+
 		/// <summary>
 		/// The human readable name for the job
 		/// </summary>
@@ -1,6 +1,7 @@
 ﻿using System;
 using System.Linq;
 using Newtonsoft.Json;
+using Peach.Core;
 using Peach.Pro.Core.Storage;
 
 namespace Peach.Pro.Core.WebServices.Models
@@ -237,6 +238,33 @@ namespace Peach.Pro.Core.WebServices.Models
 		}
 	}
 
+	public class ProfileMetric
+	{
+		public string Kind { get; set; }
+		public string Name { get; set; }
+		public long Count { get; set; }
+
+		/// <summary>
+		/// Microseconds spent including everything measured inside of the entry.
+		/// </summary>
+		public long TotalTime { get; set; }
+
+		/// <summary>
+		/// Microseconds spent excluding everything measured inside of the entry.
+		/// </summary>
+		public long SelfTime { get; set; }
+
+		public ProfileMetric() { }
+		public ProfileMetric(ProfileEntry entry)
+		{
+			Kind = entry.Kind.ToString();
+			Name = entry.Name;
+			Count = entry.Count;
+			TotalTime = entry.TotalTime.Ticks / (TimeSpan.TicksPerMillisecond / 1000);
+			SelfTime = entry.SelfTime.Ticks / (TimeSpan.TicksPerMillisecond / 1000);
+		}
+	}
+
 	[Table("ViewBucketDetails")]
 	public class BucketDetail : FaultDetail
 	{
@@ -0,0 +1,24 @@
+#
+# Copyright (c) Peach Fuzzer, LLC
+#
+# Framework for writing Peach agents in python.
+#
+# Requires python 3.7 or newer and has no external dependencies.
+#
+
+from .agent import AgentServer, SoftException, DEFAULT_PORT
+from .monitor import Monitor, MonitorData, Fault, IterationStartingArgs
+from .publisher import Publisher
+
+__all__ = [
+	"AgentServer",
+	"SoftException",
+	"DEFAULT_PORT",
+	"Monitor",
+	"MonitorData",
+	"Fault",
+	"IterationStartingArgs",
+	"Publisher",
+]
+
+# end
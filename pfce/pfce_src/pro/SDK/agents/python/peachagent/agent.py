@@ -0,0 +1,675 @@
+#
+# Copyright (c) Peach Fuzzer, LLC
+#
+# Python implementation of the Peach REST agent protocol.
+#
+# Speaks the same routes as Peach.Pro.Core.Agent.Channels.Rest.Server
+# so pits can use it with <Agent location="tcp://host:port" />.
+# In addition, a batch route allows a client to send any number of
+# requests in a single round trip.
+#
+
+import asyncio
+import base64
+import concurrent.futures
+import datetime
+import functools
+import inspect
+import json
+import logging
+import traceback
+import uuid
+
+from .httpserver import HttpServer, Router, Request, Response, WebSocketResponse
+from .monitor import IterationStartingArgs
+
+logger = logging.getLogger(__name__)
+
+PUBLISHER_PATH = "/pa/publisher"
+MONITOR_PATH = "/pa/agent"
+FILE_PATH = "/pa/file"
+LOG_PATH = "/pa/log"
+BATCH_PATH = "/pa/batch"
+
+DEFAULT_PORT = 9001
+
+NLOG_LEVELS = {
+	"trace": 5,
+	"debug": logging.DEBUG,
+	"info": logging.INFO,
+	"warn": logging.WARNING,
+	"error": logging.ERROR,
+	"fatal": logging.CRITICAL,
+	"off": logging.CRITICAL + 1,
+}
+
+
+class SoftException(Exception):
+	'''
+	Raise to indicate a recoverable error.
+	Reported to Peach with HTTP status 503.
+	'''
+	pass
+
+
+def error_response(ex):
+	'''
+	Any unhandled exception is a hard failure (500).
+	A SoftException means try again later (503).
+	'''
+	code = 503 if isinstance(ex, SoftException) else 500
+
+	resp = {
+		"message": str(ex) or type(ex).__name__,
+		"stackTrace": "".join(traceback.format_exception(type(ex), ex, ex.__traceback__)),
+		"fault": None,
+	}
+
+	return Response.as_json(resp, code)
+
+
+def to_variant(value):
+	'''Convert a python value to a variant message.'''
+	if value is None:
+		return None
+	if isinstance(value, (bytes, bytearray)):
+		return {"type": "bytes", "value": base64.b64encode(value).decode("ascii")}
+	if isinstance(value, (bool, int)):
+		return {"type": "integer", "value": str(int(value))}
+	if isinstance(value, float):
+		return {"type": "double", "value": repr(value)}
+	if isinstance(value, str):
+		return {"type": "string", "value": value}
+	raise TypeError("Unable to convert python type '%s' to a variant." % type(value).__name__)
+
+
+def from_variant(msg):
+	'''Convert a variant message to a python value.'''
+	if msg is None:
+		return None
+	kind = msg.get("type")
+	value = msg.get("value")
+	if kind == "bytes":
+		return base64.b64decode(value)
+	if kind == "integer":
+		return int(value)
+	if kind == "double":
+		return float(value)
+	if kind == "bool":
+		return value.lower() == "true"
+	if kind == "string":
+		return value
+	raise TypeError("Unable to convert variant type '%s' to a python value." % kind)
+
+
+class MonitorContext(object):
+	'''Monitors started by a single connected Peach agent client.'''
+
+	def __init__(self, agent):
+		self._agent = agent
+		self._routes = agent.routes
+		self._monitors = []
+		self._classes = {}
+		self._calls = set()
+		self._data = []
+
+		self.url = MONITOR_PATH + "/" + str(uuid.uuid4())
+		self.messages = []
+
+		self._routes.add(self.url, "DELETE", self.on_agent_disconnect)
+		self._routes.add(self.url, "POST", self.on_start_monitor)
+
+	async def connect(self, req):
+		monitors = (req or {}).get("monitors") or []
+		if not monitors:
+			return
+
+		try:
+			for item in monitors:
+				await self._add_monitor(item)
+
+			await self.on_session_starting(None)
+		except Exception:
+			await self.dispose()
+			raise
+
+	async def dispose(self):
+		self._flush_cached_monitor_data()
+
+		for mon in reversed(self._monitors):
+			try:
+				await self._agent.call(mon.stop_monitor)
+			except Exception as ex:
+				logger.debug("Ignoring stop exception on monitor '%s'. %s", mon.name, ex)
+
+		del self._monitors[:]
+		self._classes.clear()
+
+		for msg in self.messages:
+			self._routes.remove(self.url + "/" + msg)
+
+		self._routes.remove(self.url)
+
+		self._agent.contexts.remove(self)
+
+	async def _add_monitor(self, item):
+		name = item.get("name") or "Monitor%d" % len(self._monitors)
+		args = item.get("args") or {}
+		mon = await self._agent.create(self._agent.monitors, "monitor", item.get("class"), name, args)
+		self._classes[id(mon)] = item.get("class")
+
+		if not self._monitors:
+			# If this is the first monitor, add the common messages
+			self._add_message("SessionStarting", "PUT", self.on_session_starting)
+			self._add_message("SessionFinished", "PUT", self.on_session_finished)
+			self._add_message("IterationStarting", "PUT", self.on_iteration_starting)
+			self._add_message("IterationFinished", "PUT", self.on_iteration_finished)
+			self._add_message("DetectedFault", "GET", self.on_detected_fault)
+			self._add_message("GetMonitorData", "GET", self.on_get_monitor_data)
+
+		# Add any OnCall messages specific to this monitor
+		for key, value in args.items():
+			if key.endswith("OnCall") and value not in self._calls:
+				self._calls.add(value)
+				self._add_message("Message/" + value, "PUT", self.on_message)
+
+		self._monitors.append(mon)
+
+	def _add_message(self, msg, method, handler):
+		self.messages.append(msg)
+		self._routes.add(self.url + "/" + msg, method, handler)
+
+	def _connect_response(self, code):
+		return Response.as_json({"url": self.url, "messages": self.messages}, code)
+
+	async def on_start_monitor(self, req):
+		await self._add_monitor(req.json())
+		return self._connect_response(201)
+
+	async def on_agent_disconnect(self, req):
+		await self.dispose()
+		return Response.success()
+
+	async def on_session_starting(self, req):
+		for mon in self._monitors:
+			await self._agent.call(mon.session_starting)
+		return Response.success()
+
+	async def on_session_finished(self, req):
+		for mon in reversed(self._monitors):
+			try:
+				await self._agent.call(mon.session_finished)
+			except Exception as ex:
+				logger.debug("Ignoring session finished exception on monitor '%s'. %s", mon.name, ex)
+		return Response.success()
+
+	async def on_iteration_starting(self, req):
+		self._flush_cached_monitor_data()
+
+		body = req.json() or {}
+		args = IterationStartingArgs(
+			body.get("isReproduction", False),
+			body.get("lastWasFault", False))
+
+		for mon in self._monitors:
+			await self._agent.call(mon.iteration_starting, args)
+
+		return Response.success()
+
+	async def on_iteration_finished(self, req):
+		for mon in reversed(self._monitors):
+			await self._agent.call(mon.iteration_finished)
+		return Response.success()
+
+	async def on_message(self, req):
+		msg = req.segments[-1]
+		for mon in self._monitors:
+			await self._agent.call(mon.message, msg)
+		return Response.success()
+
+	async def on_detected_fault(self, req):
+		value = False
+		for mon in self._monitors:
+			value |= bool(await self._agent.call(mon.detected_fault))
+		return Response.as_json({"value": value})
+
+	async def on_get_monitor_data(self, req):
+		faults = []
+
+		for mon in self._monitors:
+			data = await self._agent.call(mon.get_monitor_data)
+			if data is None:
+				continue
+
+			record = {
+				"monitorName": mon.name,
+				"detectionSource": self._classes[id(mon)],
+				"title": data.title,
+				"fault": None,
+				"data": [],
+			}
+
+			for key, value in data.data.items():
+				record["data"].append({
+					"key": key,
+					"size": len(value),
+					"url": self._cache_monitor_data(value),
+				})
+
+			if data.fault is not None:
+				record["fault"] = {
+					"description": data.fault.description,
+					"majorHash": data.fault.major_hash,
+					"minorHash": data.fault.minor_hash,
+					"risk": data.fault.risk,
+					"mustStop": data.fault.must_stop,
+				}
+
+			faults.append(record)
+
+		return Response.as_json({"faults": faults})
+
+	def _flush_cached_monitor_data(self):
+		for url in self._data:
+			self._routes.remove(url)
+		del self._data[:]
+
+	def _cache_monitor_data(self, value):
+		url = FILE_PATH + "/" + str(uuid.uuid4())
+		self._data.append(url)
+		self._routes.add(url, "GET", lambda req: Response.as_bytes(value))
+		return url
+
+
+class PublisherContext(object):
+	'''A publisher created by a connected Peach agent client.'''
+
+	ACTIONS = ["open", "close", "accept", "output", "input", "call", "property", "data"]
+
+	def __init__(self, agent, publisher, cls):
+		self._agent = agent
+		self._routes = agent.routes
+		self._publisher = publisher
+		self._cls = cls
+		self._buffer = bytearray()
+
+		self.url = PUBLISHER_PATH + "/" + str(uuid.uuid4())
+
+		self._routes.add(self.url, "DELETE", self.on_delete)
+		self._routes.add(self.url + "/open", "PUT", self.on_open)
+		self._routes.add(self.url + "/close", "PUT", self.on_close)
+		self._routes.add(self.url + "/accept", "PUT", self.on_accept)
+		self._routes.add(self.url + "/output", "PUT", self.on_output)
+		self._routes.add(self.url + "/input", "PUT", self.on_input)
+		self._routes.add(self.url + "/call", "PUT", self.on_call)
+		self._routes.add(self.url + "/property", "PUT", self.on_set_property)
+		self._routes.add(self.url + "/property", "GET", self.on_get_property)
+		self._routes.add(self.url + "/data", "GET", self.on_want_bytes)
+
+	async def dispose(self):
+		try:
+			await self._agent.call(self._publisher.close)
+			await self._agent.call(self._publisher.stop)
+		finally:
+			self._routes.remove(self.url)
+			for action in self.ACTIONS:
+				self._routes.remove(self.url + "/" + action)
+
+			self._agent.contexts.remove(self)
+
+	async def _call(self, action, fn, *args):
+		try:
+			return await self._agent.call(fn, *args)
+		except NotImplementedError:
+			raise Exception("The %s publisher does not support %s actions when run on remote agents." % (self._cls, action))
+
+	async def on_delete(self, req):
+		await self.dispose()
+		return Response.success()
+
+	async def on_open(self, req):
+		args = req.json() or {}
+		pub = self._publisher
+		pub.iteration = args.get("iteration", 0)
+		pub.is_control_iteration = args.get("isControlIteration", False)
+		pub.is_control_recording_iteration = args.get("isControlRecordingIteration", False)
+		pub.is_iteration_after_fault = args.get("isIterationAfterFault", False)
+		await self._call("open", pub.open)
+		return Response.success()
+
+	async def on_close(self, req):
+		await self._call("close", self._publisher.close)
+		return Response.success()
+
+	async def on_accept(self, req):
+		await self._call("accept", self._publisher.accept)
+		return Response.success()
+
+	async def on_output(self, req):
+		await self._call("output", self._publisher.output, req.body)
+		return Response.success()
+
+	async def on_input(self, req):
+		self._buffer = bytearray()
+		data = await self._call("input", self._publisher.input)
+		if data:
+			self._buffer.extend(data)
+
+		# The input buffer was replaced, tell the client to discard what it has
+		return Response.as_json({"value": True})
+
+	async def on_call(self, req):
+		body = req.json() or {}
+		args = [(a.get("name"), base64.b64decode(a.get("value") or "")) for a in body.get("args") or []]
+		ret = await self._call("call", self._publisher.call, body.get("method"), args)
+		return Response.as_json(to_variant(ret))
+
+	async def on_set_property(self, req):
+		body = req.json() or {}
+		await self._call("setProperty", self._publisher.set_property, body.get("name"), from_variant(body))
+		return Response.success()
+
+	async def on_get_property(self, req):
+		name = req.query.get("name")
+		if not name:
+			return Response.bad_request()
+		value = await self._call("getProperty", self._publisher.get_property, name)
+		return Response.as_json(to_variant(value))
+
+	async def on_want_bytes(self, req):
+		length = len(self._buffer)
+
+		try:
+			offset = int(req.query.get("offset", 0))
+			count = int(req.query.get("count", length - offset))
+		except ValueError:
+			return Response.bad_request()
+
+		if offset < 0 or ("count" in req.query and count < 0):
+			return Response.bad_request()
+
+		needed = count - length + offset
+
+		if needed > 0:
+			data = await self._call("input", self._publisher.want_bytes, needed)
+			if data:
+				self._buffer.extend(data)
+
+		if offset >= len(self._buffer):
+			return Response.success()
+
+		return Response.as_bytes(self._buffer[offset:])
+
+
+class LogSubscriber(object):
+	'''
+	A client listening to the /pa/log websocket.
+	Log records are sent as json serialized NLog LogEventInfo objects.
+	'''
+
+	FLUSH = object()
+
+	def __init__(self, level):
+		self.level = level
+		self.queue = asyncio.Queue()
+		self._counter = 0
+
+	async def run(self, ws):
+		writer = asyncio.ensure_future(self._write(ws))
+		try:
+			while True:
+				msg = await ws.recv()
+				if msg is None:
+					break
+				# The only message clients send is a request to flush
+				self.queue.put_nowait(self.FLUSH)
+		finally:
+			self.queue.put_nowait(None)
+			await writer
+
+	async def _write(self, ws):
+		while True:
+			item = await self.queue.get()
+			if item is None:
+				break
+
+			if item is self.FLUSH:
+				event = {
+					"Level": "Off",
+					"LoggerName": "$LogResponse",
+					"Message": "Flushed",
+					"Properties": {"ID": -1},
+				}
+			else:
+				event = {
+					"Level": LogForwarder.level_name(item.levelno),
+					"LoggerName": item.name,
+					"Message": item.getMessage(),
+					"TimeStamp": item.created_iso,
+					"Properties": {"ID": self._counter},
+				}
+				self._counter += 1
+
+			try:
+				await ws.send_text(json.dumps(event))
+			except ConnectionError:
+				break
+
+
+class LogForwarder(logging.Handler):
+	'''Forwards python log records to all /pa/log subscribers.'''
+
+	def __init__(self, loop):
+		super(LogForwarder, self).__init__()
+		self._loop = loop
+		self.subscribers = []
+
+	@staticmethod
+	def level_name(levelno):
+		if levelno >= logging.CRITICAL:
+			return "Fatal"
+		if levelno >= logging.ERROR:
+			return "Error"
+		if levelno >= logging.WARNING:
+			return "Warn"
+		if levelno >= logging.INFO:
+			return "Info"
+		if levelno >= logging.DEBUG:
+			return "Debug"
+		return "Trace"
+
+	def emit(self, record):
+		# Don't forward our own messages, logging the
+		# websocket traffic would cause an infinite loop
+		if record.name.startswith("peachagent"):
+			return
+
+		record.created_iso = datetime.datetime.fromtimestamp(record.created).isoformat()
+
+		for sub in list(self.subscribers):
+			if record.levelno >= sub.level:
+				self._loop.call_soon_threadsafe(sub.queue.put_nowait, record)
+
+
+class AgentServer(object):
+	'''
+	Python Peach agent.
+
+	Register the monitor and publisher classes the agent provides and call
+	run().  Pits reference the registered names in the class attribute of
+	<Monitor> and <Publisher class="Remote"> elements.
+
+		agent = AgentServer(port=9001)
+		agent.register_monitor(MyMonitor)
+		agent.register_publisher(MyPublisher, "MyPublisher")
+		agent.run()
+
+	All requests are processed one at a time in the order they are received.
+	Regular (non-coroutine) monitor and publisher methods are run on a single
+	worker thread so they can block without stalling the event loop.
+	'''
+
+	def __init__(self, host="0.0.0.0", port=DEFAULT_PORT):
+		self.monitors = {}
+		self.publishers = {}
+		self.contexts = []
+		self.routes = Router(error_response)
+
+		self._server = HttpServer(self._dispatch, host, port)
+		self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+		self._lock = None
+		self._forwarder = None
+
+		self.routes.add(MONITOR_PATH, "POST", self.on_agent_connect)
+		self.routes.add(PUBLISHER_PATH, "POST", self.on_create_publisher)
+		self.routes.add(LOG_PATH, "GET", self.on_log_subscribe)
+		self.routes.add(BATCH_PATH, "POST", self.on_batch)
+
+	@property
+	def port(self):
+		return self._server.port
+
+	def register_monitor(self, cls, name=None):
+		self.monitors[name or cls.__name__] = cls
+
+	def register_publisher(self, cls, name=None):
+		self.publishers[name or cls.__name__] = cls
+
+	async def call(self, fn, *args):
+		'''Invoke a monitor or publisher method.'''
+		if inspect.iscoroutinefunction(fn):
+			return await fn(*args)
+
+		loop = asyncio.get_event_loop()
+		return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+	async def create(self, registry, kind, cls, name, args):
+		impl = registry.get(cls)
+		if impl is None:
+			raise Exception("Error, unable to locate %s '%s'." % (kind, cls))
+		return await self.call(impl, name, args)
+
+	async def start(self):
+		self._lock = asyncio.Lock()
+		self._forwarder = LogForwarder(asyncio.get_event_loop())
+		logging.getLogger().addHandler(self._forwarder)
+
+		await self._server.start()
+
+		logger.info("Listening for connections on port %d", self._server.port)
+
+	async def serve_forever(self):
+		try:
+			await self._server.serve_forever()
+		finally:
+			await self.close()
+
+	async def close(self):
+		self._server.close()
+
+		for ctx in list(self.contexts):
+			try:
+				await ctx.dispose()
+			except Exception as ex:
+				logger.debug("Ignoring exception closing '%s'. %s", ctx.url, ex)
+
+		if self._forwarder is not None:
+			logging.getLogger().removeHandler(self._forwarder)
+			self._forwarder = None
+
+	def run(self):
+		'''Run the agent until interrupted with Ctrl-C.'''
+
+		async def main():
+			await self.start()
+			await self.serve_forever()
+
+		try:
+			asyncio.run(main())
+		except KeyboardInterrupt:
+			pass
+
+	async def _dispatch(self, req):
+		# Log subscriptions are long lived so don't block other requests
+		if req.path == LOG_PATH:
+			return await self.routes.dispatch(req)
+
+		async with self._lock:
+			return await self.routes.dispatch(req)
+
+	async def on_agent_connect(self, req):
+		ctx = MonitorContext(self)
+		self.contexts.append(ctx)
+
+		await ctx.connect(req.json())
+
+		return Response.as_json({"url": ctx.url, "messages": ctx.messages}, 201)
+
+	async def on_create_publisher(self, req):
+		body = req.json() or {}
+		cls = body.get("class")
+		pub = await self.create(self.publishers, "publisher", cls, body.get("name"), body.get("args") or {})
+		await self.call(pub.start)
+
+		ctx = PublisherContext(self, pub, cls)
+		self.contexts.append(ctx)
+
+		return Response.as_json({"url": ctx.url}, 201)
+
+	async def on_log_subscribe(self, req):
+		# a normal HTTP GET will be used to probe that this service is available
+		if not req.is_websocket:
+			return Response.success()
+
+		level = NLOG_LEVELS.get(req.query.get("level", "Info").lower(), logging.INFO)
+		sub = LogSubscriber(level)
+
+		async def handler(ws):
+			self._forwarder.subscribers.append(sub)
+			try:
+				await sub.run(ws)
+			finally:
+				self._forwarder.subscribers.remove(sub)
+
+		return WebSocketResponse(handler, "log")
+
+	async def on_batch(self, req):
+		'''
+		Run a list of requests in a single round trip.
+
+		{ "requests": [ { "id": 1, "method": "PUT", "path": "/pa/agent/.../IterationStarting", "content": "<base64>" }, ... ] }
+
+		Requests are run in order and processing stops after the first
+		request that fails.  The response contains the status, content type
+		and base64 encoded content of every request that was run.
+
+		{ "responses": [ { "id": 1, "status": 200, "contentType": null, "content": null }, ... ] }
+		'''
+		body = req.json() or {}
+		responses = []
+
+		for item in body.get("requests") or []:
+			content = item.get("content")
+			sub = Request(
+				item.get("method", "GET"),
+				item.get("path", ""),
+				body=base64.b64decode(content) if content else b"")
+
+			if sub.path == BATCH_PATH or sub.path == LOG_PATH:
+				resp = Response.bad_request()
+			else:
+				resp = await self.routes.dispatch(sub)
+
+			responses.append({
+				"id": item.get("id"),
+				"status": resp.status,
+				"contentType": resp.content_type,
+				"content": base64.b64encode(resp.body).decode("ascii") if resp.body else None,
+			})
+
+			if resp.status >= 400:
+				break
+
+		return Response.as_json({"responses": responses})
+
+# end
@@ -0,0 +1,379 @@
+#
+# Copyright (c) Peach Fuzzer, LLC
+#
+# Minimal asyncio HTTP/1.1 server used by the python agent.
+#
+# Connections are kept alive between requests and WebSocket upgrades
+# are supported so a single event loop can service the entire Peach
+# REST agent protocol, including the remote logging channel.
+#
+
+import asyncio
+import base64
+import hashlib
+import inspect
+import json
+import logging
+import struct
+
+from urllib.parse import urlsplit, parse_qsl
+
+logger = logging.getLogger(__name__)
+
+STATUS_TEXT = {
+	101: "Switching Protocols",
+	200: "OK",
+	201: "Created",
+	400: "Bad Request",
+	404: "Not Found",
+	405: "Method Not Allowed",
+	500: "Internal Server Error",
+	503: "Service Unavailable",
+}
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+MAX_HEADER_COUNT = 100
+
+
+class Request(object):
+	'''A parsed HTTP request.'''
+
+	def __init__(self, method, target, headers=None, body=b"", version="HTTP/1.1"):
+		url = urlsplit(target)
+		self.method = method
+		self.version = version
+		self.target = target
+		self.path = url.path
+		self.query = dict(parse_qsl(url.query, keep_blank_values=True))
+		self.headers = headers or {}
+		self.body = body
+
+	@property
+	def segments(self):
+		return self.path.split("/")
+
+	@property
+	def is_websocket(self):
+		return "websocket" in self.headers.get("upgrade", "").lower()
+
+	def json(self):
+		if not self.body:
+			return None
+		return json.loads(self.body.decode("utf-8"))
+
+
+class Response(object):
+	'''Object returned by route handlers.'''
+
+	def __init__(self, status=200, body=None, content_type=None):
+		self.status = status
+		self.body = body
+		self.content_type = content_type
+
+	@classmethod
+	def success(cls):
+		return cls(200)
+
+	@classmethod
+	def not_found(cls):
+		return cls(404)
+
+	@classmethod
+	def bad_request(cls):
+		return cls(400)
+
+	@classmethod
+	def not_allowed(cls):
+		return cls(405)
+
+	@classmethod
+	def as_json(cls, obj, status=200):
+		body = json.dumps(obj).encode("utf-8")
+		return cls(status, body, "application/json;charset=utf-8")
+
+	@classmethod
+	def as_bytes(cls, data, status=200):
+		return cls(status, bytes(data), "application/octet-stream")
+
+
+class WebSocketResponse(Response):
+	'''
+	Response that upgrades the connection to a WebSocket.
+	Once the handshake completes, handler(websocket) is awaited
+	and owns the connection until it returns.
+	'''
+
+	def __init__(self, handler, protocol=None):
+		super(WebSocketResponse, self).__init__(101)
+		self.handler = handler
+		self.protocol = protocol
+
+
+class WebSocket(object):
+	'''Server side of a WebSocket connection (RFC 6455).'''
+
+	OP_CONT = 0x0
+	OP_TEXT = 0x1
+	OP_BINARY = 0x2
+	OP_CLOSE = 0x8
+	OP_PING = 0x9
+	OP_PONG = 0xA
+
+	def __init__(self, reader, writer):
+		self._reader = reader
+		self._writer = writer
+		self._lock = asyncio.Lock()
+		self.closed = False
+
+	async def recv(self):
+		'''
+		Returns the next text or binary message or None
+		when the connection is closed.
+		'''
+		message = b""
+		while True:
+			try:
+				head = await self._reader.readexactly(2)
+			except (asyncio.IncompleteReadError, ConnectionError):
+				self.closed = True
+				return None
+
+			fin = head[0] & 0x80
+			opcode = head[0] & 0x0F
+			masked = head[1] & 0x80
+			length = head[1] & 0x7F
+
+			if length == 126:
+				length = struct.unpack("!H", await self._reader.readexactly(2))[0]
+			elif length == 127:
+				length = struct.unpack("!Q", await self._reader.readexactly(8))[0]
+
+			mask = await self._reader.readexactly(4) if masked else None
+			payload = await self._reader.readexactly(length)
+
+			if mask:
+				payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+			if opcode == self.OP_CLOSE:
+				await self.close()
+				return None
+
+			if opcode == self.OP_PING:
+				await self._send(self.OP_PONG, payload)
+				continue
+
+			if opcode == self.OP_PONG:
+				continue
+
+			message += payload
+
+			if fin:
+				return message
+
+	async def send_text(self, text):
+		await self._send(self.OP_TEXT, text.encode("utf-8"))
+
+	async def close(self):
+		if self.closed:
+			return
+		self.closed = True
+		try:
+			await self._send(self.OP_CLOSE, b"", force=True)
+		except ConnectionError:
+			pass
+
+	async def _send(self, opcode, payload, force=False):
+		if self.closed and not force:
+			return
+
+		length = len(payload)
+		if length < 126:
+			head = struct.pack("!BB", 0x80 | opcode, length)
+		elif length < 0x10000:
+			head = struct.pack("!BBH", 0x80 | opcode, 126, length)
+		else:
+			head = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+
+		async with self._lock:
+			self._writer.write(head + payload)
+			await self._writer.drain()
+
+
+class Router(object):
+	'''Dispatches requests to handlers by exact path and HTTP method.'''
+
+	def __init__(self, on_error):
+		self._routes = {}
+		self._on_error = on_error
+
+	def add(self, path, method, handler):
+		handlers = self._routes.setdefault(path, {})
+		if method in handlers:
+			raise KeyError("Route '%s %s' already exists." % (method, path))
+		handlers[method] = handler
+
+	def remove(self, path):
+		del self._routes[path]
+
+	async def dispatch(self, req):
+		handlers = self._routes.get(req.path)
+		if handlers is None:
+			return Response.not_found()
+
+		handler = handlers.get(req.method)
+		if handler is None:
+			return Response.not_allowed()
+
+		try:
+			ret = handler(req)
+			if inspect.isawaitable(ret):
+				ret = await ret
+			return ret
+		except Exception as ex:
+			return self._on_error(ex)
+
+
+class HttpServer(object):
+	'''
+	Persistent connection HTTP/1.1 server.
+	Every request is passed to dispatch(request) which
+	must be a coroutine returning a Response.
+	'''
+
+	def __init__(self, dispatch, host, port):
+		self._dispatch = dispatch
+		self._host = host
+		self._port = port
+		self._server = None
+
+	@property
+	def port(self):
+		if self._server is None:
+			return self._port
+		return self._server.sockets[0].getsockname()[1]
+
+	async def start(self):
+		self._server = await asyncio.start_server(self._on_connection, self._host, self._port)
+
+	async def serve_forever(self):
+		async with self._server:
+			await self._server.serve_forever()
+
+	def close(self):
+		if self._server is not None:
+			self._server.close()
+
+	async def _on_connection(self, reader, writer):
+		peer = writer.get_extra_info("peername")
+		logger.debug("Connection from %s", peer)
+
+		try:
+			while True:
+				req = await self._read_request(reader, writer)
+				if req is None:
+					break
+
+				logger.debug(">>> %s %s", req.method, req.target)
+
+				resp = await self._dispatch(req)
+
+				logger.debug("<<< %d %s", resp.status, STATUS_TEXT.get(resp.status, ""))
+
+				if isinstance(resp, WebSocketResponse):
+					await self._upgrade(req, resp, reader, writer)
+					break
+
+				keep_alive = self._keep_alive(req)
+				await self._write_response(writer, resp, keep_alive)
+
+				if not keep_alive:
+					break
+		except (asyncio.IncompleteReadError, ConnectionError) as ex:
+			logger.debug("Connection from %s lost. %s", peer, ex)
+		except ValueError as ex:
+			logger.debug("Malformed request from %s. %s", peer, ex)
+		finally:
+			writer.close()
+
+	@staticmethod
+	def _keep_alive(req):
+		conn = req.headers.get("connection", "").lower()
+		if req.version == "HTTP/1.0":
+			return conn == "keep-alive"
+		return conn != "close"
+
+	@staticmethod
+	async def _read_request(reader, writer):
+		line = await reader.readline()
+		if not line:
+			return None
+
+		parts = line.decode("latin-1").strip().split(" ")
+		if len(parts) != 3:
+			raise ValueError("Invalid request line '%s'" % line)
+
+		method, target, version = parts
+
+		headers = {}
+		while True:
+			line = await reader.readline()
+			if line in (b"\r\n", b"\n", b""):
+				break
+			if len(headers) > MAX_HEADER_COUNT:
+				raise ValueError("Too many headers")
+			key, _, value = line.decode("latin-1").partition(":")
+			headers[key.strip().lower()] = value.strip()
+
+		if headers.get("expect", "").lower() == "100-continue":
+			writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+			await writer.drain()
+
+		if headers.get("transfer-encoding", "").lower() == "chunked":
+			body = b""
+			while True:
+				size = int((await reader.readline()).split(b";")[0], 16)
+				if size == 0:
+					await reader.readline()
+					break
+				body += await reader.readexactly(size)
+				await reader.readline()
+		else:
+			body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+		return Request(method, target, headers, body, version)
+
+	@staticmethod
+	async def _write_response(writer, resp, keep_alive):
+		body = resp.body or b""
+		lines = [
+			"HTTP/1.1 %d %s" % (resp.status, STATUS_TEXT.get(resp.status, "")),
+			"Content-Length: %d" % len(body),
+			"Connection: %s" % ("keep-alive" if keep_alive else "close"),
+		]
+		if resp.content_type:
+			lines.append("Content-Type: %s" % resp.content_type)
+
+		writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+		await writer.drain()
+
+	@staticmethod
+	async def _upgrade(req, resp, reader, writer):
+		key = req.headers.get("sec-websocket-key", "")
+		accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest())
+
+		lines = [
+			"HTTP/1.1 101 Switching Protocols",
+			"Upgrade: websocket",
+			"Connection: Upgrade",
+			"Sec-WebSocket-Accept: %s" % accept.decode("ascii"),
+		]
+		if resp.protocol:
+			lines.append("Sec-WebSocket-Protocol: %s" % resp.protocol)
+
+		writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+		await writer.drain()
+
+		await resp.handler(WebSocket(reader, writer))
+
+# end
@@ -0,0 +1,86 @@
+#
+# Copyright (c) Peach Fuzzer, LLC
+#
+# Base class for monitors hosted by the python agent.
+#
+
+
+class IterationStartingArgs(object):
+	'''Arguments passed to Monitor.iteration_starting()'''
+
+	def __init__(self, is_reproduction=False, last_was_fault=False):
+		self.is_reproduction = is_reproduction
+		self.last_was_fault = last_was_fault
+
+
+class Fault(object):
+	'''Fault details returned as part of MonitorData'''
+
+	def __init__(self, description=None, major_hash=None, minor_hash=None, risk=None, must_stop=False):
+		self.description = description
+		self.major_hash = major_hash
+		self.minor_hash = minor_hash
+		self.risk = risk
+		self.must_stop = must_stop
+
+
+class MonitorData(object):
+	'''
+	Data returned by Monitor.get_monitor_data().
+
+	If fault is None the data is collected as additional information
+	for a fault detected by another monitor.  The values in data must
+	be bytes and are downloaded by Peach when the fault is recorded.
+	'''
+
+	def __init__(self, title, fault=None, data=None):
+		self.title = title
+		self.fault = fault
+		self.data = data or {}
+
+
+class Monitor(object):
+	'''
+	Base class for monitors hosted by the python agent.
+
+	Override the methods needed by the monitor.  Methods can either be
+	regular functions or coroutines.  Regular functions are run one at a
+	time on a single worker thread so they are allowed to block without
+	stalling the agent's event loop.
+
+	The name and args are what was configured in the pit:
+
+		<Monitor name="..." class="...">
+			<Param name="..." value="..." />
+		</Monitor>
+	'''
+
+	def __init__(self, name, args):
+		self.name = name
+		self.args = args
+
+	def session_starting(self):
+		pass
+
+	def session_finished(self):
+		pass
+
+	def iteration_starting(self, args):
+		pass
+
+	def iteration_finished(self):
+		pass
+
+	def detected_fault(self):
+		return False
+
+	def get_monitor_data(self):
+		return None
+
+	def message(self, msg):
+		pass
+
+	def stop_monitor(self):
+		pass
+
+# end
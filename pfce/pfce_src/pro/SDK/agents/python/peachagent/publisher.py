@@ -0,0 +1,73 @@
+#
+# Copyright (c) Peach Fuzzer, LLC
+#
+# Base class for publishers hosted by the python agent.
+#
+
+
+class Publisher(object):
+	'''
+	Base class for publishers hosted by the python agent.
+
+	Data is always exchanged as whole payloads.  output() receives
+	all of the bytes for an output action in a single call.  input()
+	returns everything that was received and want_bytes() returns any
+	additional data that is needed to finish cracking the input.
+	The agent buffers the received data and serves it to Peach
+	without calling back into the publisher.
+
+	Like monitors, methods can either be regular functions or coroutines.
+	Actions that are not overridden are reported to Peach as not supported.
+	'''
+
+	def __init__(self, name, args):
+		self.name = name
+		self.args = args
+		self.iteration = 0
+		self.is_control_iteration = False
+		self.is_control_recording_iteration = False
+		self.is_iteration_after_fault = False
+
+	def start(self):
+		pass
+
+	def stop(self):
+		pass
+
+	def open(self):
+		pass
+
+	def close(self):
+		pass
+
+	def accept(self):
+		raise NotImplementedError()
+
+	def output(self, data):
+		raise NotImplementedError()
+
+	def input(self):
+		'''Returns the bytes that were received or None.'''
+		raise NotImplementedError()
+
+	def want_bytes(self, count):
+		'''
+		Called when count more bytes are needed than have been received.
+		Returns the additional bytes that were received or None.
+		'''
+		return None
+
+	def call(self, method, args):
+		'''
+		Perform a call action. The args are a list of (name, bytes) tuples.
+		Return bytes, str, int, float or None.
+		'''
+		raise NotImplementedError()
+
+	def set_property(self, name, value):
+		raise NotImplementedError()
+
+	def get_property(self, name):
+		raise NotImplementedError()
+
+# end
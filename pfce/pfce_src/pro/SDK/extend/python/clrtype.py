@@ -13,14 +13,20 @@
 #
 #####################################################################################
 
-__all__ = ["ClrClass", "ClrInterface", "accepts", "returns", "attribute", "propagate_attributes"]
+__all__ = ["ClrClass", "ClrInterface", "ClrTypeCache", "accepts", "returns", "attribute", "propagate_attributes"]
 
+import sys
 import clr
 clr.AddReference("Microsoft.Dynamic")
 clr.AddReference("Microsoft.Scripting")
 clr.AddReference("IronPython")
 import System
-from System import Char, Void, Boolean, Array, Type, AppDomain
+from System import Char, Void, Boolean, Array, Type, AppDomain, Environment, PlatformID, Guid, Object
+from System.IO import Path, File, Directory, MemoryStream
+from System.Text import Encoding
+from System.Security.Cryptography import SHA1
+from System.Threading import Monitor
+from System.Reflection import Assembly
 from System.Reflection import FieldAttributes, MethodAttributes, PropertyAttributes, ParameterAttributes
 from System.Reflection import CallingConventions, TypeAttributes, AssemblyName
 from System.Reflection.Emit import OpCodes, CustomAttributeBuilder, AssemblyBuilderAccess
@@ -281,9 +287,8 @@ class ClrClass(ClrInterface):
     retains its Python attributes, like being able to add or remove methods.    
     """
 
-    # Holds the FieldInfo for a static CLR field which points to a 
-    # Microsoft.Scripting.Runtime.DynamicOperations corresponding to the current ScriptEngine
-    dynamic_operations_field = None
+    # Holds the Microsoft.Scripting.Runtime.DynamicOperations corresponding to the current ScriptEngine
+    dynamic_operations = None
 
     def emit_fields(self, typebld):
         if hasattr(self, "_clrfields"):
@@ -302,28 +307,24 @@ class ClrClass(ClrInterface):
                 setattr(self, fldname, ReflectedField(fldinfo))
             
     @staticmethod
-    def get_dynamic_operations_field():
-        if ClrClass.dynamic_operations_field: 
-            return ClrClass.dynamic_operations_field
-        python_context = clr.GetCurrentRuntime().GetLanguage(PythonContext)
-        dynamic_operations = DynamicOperations(python_context)
-        
-        typegen = Snippets.Shared.DefineType(
-            "DynamicOperationsHolder" + str(hash(python_context)), 
-            object, 
-            True, 
-            False)
-        typebld = typegen.TypeBuilder
-        typebld.DefineField(
+    def get_dynamic_operations():
+        if ClrClass.dynamic_operations is None:
+            python_context = clr.GetCurrentRuntime().GetLanguage(PythonContext)
+            ClrClass.dynamic_operations = DynamicOperations(python_context)
+        return ClrClass.dynamic_operations
+
+    def emit_dynamic_operations_field(self, typebld):
+        # Every generated type holds its own reference to DynamicOperations so
+        # that it does not depend on any other dynamic type. This allows
+        # ClrTypeCache to save the type to disk.
+        self.dynamic_operations_field = typebld.DefineField(
             "DynamicOperations",
             DynamicOperations,
             FieldAttributes.Public | FieldAttributes.Static)
-        new_type = typebld.CreateType()
-        ClrClass.dynamic_operations_field = new_type.GetField("DynamicOperations")
-        
-        ClrClass.dynamic_operations_field.SetValue(None, dynamic_operations)
-        
-        return ClrClass.dynamic_operations_field
+
+    def set_dynamic_operations_field(self, new_type):
+        fldinfo = new_type.GetField("DynamicOperations")
+        fldinfo.SetValue(None, ClrClass.get_dynamic_operations())
         
     def emit_typed_stub_to_python_method(self, typebld, function_info):
         function = function_info.function
@@ -392,19 +393,19 @@ class ClrClass(ClrInterface):
         
         has_return_value = True
         if function_info.prop_name_if_prop_get:
-            ilgen.Emit(OpCodes.Ldsfld, ClrClass.get_dynamic_operations_field())
+            ilgen.Emit(OpCodes.Ldsfld, self.dynamic_operations_field)
             ilgen.Emit(OpCodes.Ldarg, 0)
             ilgen.Emit(OpCodes.Ldstr, function_info.prop_name_if_prop_get)
             ilgen.Emit(OpCodes.Callvirt, get_member)
         elif function_info.prop_name_if_prop_set:
-            ilgen.Emit(OpCodes.Ldsfld, ClrClass.get_dynamic_operations_field())
+            ilgen.Emit(OpCodes.Ldsfld, self.dynamic_operations_field)
             ilgen.Emit(OpCodes.Ldarg, 0)
             ilgen.Emit(OpCodes.Ldstr, function_info.prop_name_if_prop_set)
             ilgen.Emit(OpCodes.Ldarg, 1)
             ilgen.Emit(OpCodes.Callvirt, set_member)
             has_return_value = False
         else:
-            ilgen.Emit(OpCodes.Ldsfld, ClrClass.get_dynamic_operations_field())
+            ilgen.Emit(OpCodes.Ldsfld, self.dynamic_operations_field)
             if function_info.is_static:
                 raise NotImplementedError("need to load Python class object from a CLR static field")
                 # ilgen.Emit(OpCodes.Ldsfld, class_object)
@@ -421,7 +422,7 @@ class ClrClass(ClrInterface):
             else:
                 ret_val = ilgen.DeclareLocal(object)
                 ilgen.Emit(OpCodes.Stloc, ret_val)
-                ilgen.Emit(OpCodes.Ldsfld, ClrClass.get_dynamic_operations_field())
+                ilgen.Emit(OpCodes.Ldsfld, self.dynamic_operations_field)
                 ilgen.Emit(OpCodes.Ldloc, ret_val)
                 ilgen.Emit(OpCodes.Ldtoken, clr.GetClrType(function.return_type))
                 ilgen.Emit(OpCodes.Call, get_type_from_handle)
@@ -512,11 +513,13 @@ class ClrClass(ClrInterface):
     
     def emit_members(self, typebld):
         self.emit_fields(typebld)
+        self.emit_dynamic_operations_field(typebld)
         self.add_wrapper_ctors(self.baseType, typebld)
         super(ClrClass, self).emit_members(typebld)
         
     def map_members(self, new_type):
         self.map_fields(new_type)
+        self.set_dynamic_operations_field(new_type)
         self.map_pinvoke_methods(new_type)
         self.set_python_type_field(new_type)
         super(ClrClass, self).map_members(new_type)
@@ -531,14 +534,315 @@ class ClrClass(ClrInterface):
         if not "__metaclass__" in self.__dict__:
             return super(ClrClass, self).__clrtype__()
 
+        cache = ClrTypeCache.create(self)
+        if cache:
+            # Make the precompiled python type available before it is needed
+            cache.load_base_type()
+
         # Create a simple Python type first. 
         self.baseType = super(ClrType, self).__clrtype__()
+
+        if cache:
+            new_type = cache.load_type()
+            if new_type:
+                self.map_members(new_type)
+                return new_type
+
+            typebld = cache.define_type()
+            if typebld:
+                new_type = self.create_type(typebld)
+                cache.save()
+                return new_type
+
         # We will now subtype it to create a customized class with the 
         # CLR attributes as defined by the user
         typegen = Snippets.Shared.DefineType(self.get_clr_type_name(), self.baseType, True, False)
         typebld = typegen.TypeBuilder
         return self.create_type(typebld)
 
+class ClrTypeCache(object):
+    """
+    Persists the CLR types generated by ClrClass to disk so that later loads
+    of the same module skip reflection-emit.
+
+    Each ClrClass is saved in its own assembly keyed by a hash of the python
+    source file, this file, and the versions of the Peach.Core, Peach.Pro and
+    IronPython assemblies. The python type that the ClrClass derives from is
+    precompiled with clr.CompileSubclassTypes into a second assembly that is
+    shared by all classes with the same bases.
+
+    The cache is stored in the directory named by the PEACH_CLRTYPE_CACHE
+    environment variable, defaulting to 'Peach/clrtype' in the user's local
+    application data folder. Set PEACH_CLRTYPE_CACHE to 'off' to disable the
+    cache.
+
+    Anyone who can write to the cache can run code inside of Peach, so
+    assemblies are only loaded when both the directory and the file are
+    owned by the current user and, on unix, can not be written by anyone else.
+
+    Assemblies are written to a temporary directory inside of the cache and
+    then moved into place, so a cached assembly is never partially written.
+    """
+
+    format_version = "1"
+    # clr.CompileSubclassTypes only saves to the current directory
+    compile_lock = Object()
+    reference_assemblies = ["Peach.Core", "Peach.Pro", "IronPython", "Microsoft.Scripting"]
+
+    def __init__(self, cls, directory, type_key, base_key):
+        self.cls = cls
+        self.directory = directory
+        self.type_name = "PeachClrType_" + type_key
+        self.base_name = "PeachClrTypeBase_" + base_key
+        self.assembly_builder = None
+        self.temp_directory = None
+
+    @staticmethod
+    def get_directory():
+        directory = Environment.GetEnvironmentVariable("PEACH_CLRTYPE_CACHE")
+        if directory and directory.lower() == "off":
+            return None
+        if not directory:
+            directory = Path.Combine(
+                Environment.GetFolderPath(Environment.SpecialFolder.LocalApplicationData),
+                "Peach",
+                "clrtype")
+        return directory
+
+    @staticmethod
+    def is_unix():
+        return Environment.OSVersion.Platform in (PlatformID.Unix, PlatformID.MacOSX)
+
+    @staticmethod
+    def create_directory(directory):
+        """
+        Creates the cache directory so that only the current user can access it.
+        """
+        if Directory.Exists(directory):
+            return
+        Directory.CreateDirectory(directory)
+        if ClrTypeCache.is_unix():
+            clr.AddReference("Mono.Posix")
+            from Mono.Unix.Native import Syscall, FilePermissions
+            Syscall.chmod(directory, FilePermissions.S_IRWXU)
+
+    @staticmethod
+    def is_trusted(path):
+        """
+        Returns True if path is owned by the current user and,
+        on unix, is not writable by the group or others.
+        """
+        try:
+            if ClrTypeCache.is_unix():
+                clr.AddReference("Mono.Posix")
+                from Mono.Unix import UnixFileSystemInfo, FileAccessPermissions
+                from Mono.Unix.Native import Syscall
+                info = UnixFileSystemInfo.GetFileSystemEntry(path)
+                if info.IsSymbolicLink or info.OwnerUserId != Syscall.getuid():
+                    return False
+                shared = FileAccessPermissions.GroupWrite | FileAccessPermissions.OtherWrite
+                return (info.FileAccessPermissions & shared) == 0
+            else:
+                from System.Security.Principal import SecurityIdentifier, WindowsIdentity
+                if Directory.Exists(path):
+                    acl = Directory.GetAccessControl(path)
+                else:
+                    acl = File.GetAccessControl(path)
+                return acl.GetOwner(SecurityIdentifier) == WindowsIdentity.GetCurrent().User
+        except Exception:
+            return False
+
+    @staticmethod
+    def find_assembly(name):
+        for asm in AppDomain.CurrentDomain.GetAssemblies():
+            if asm.GetName().Name == name:
+                return asm
+        return None
+
+    @staticmethod
+    def hash(*parts):
+        data = MemoryStream()
+        for part in parts:
+            if isinstance(part, str):
+                part = Encoding.UTF8.GetBytes(part)
+            data.Write(part, 0, part.Length)
+            data.WriteByte(0)
+        digest = SHA1.Create().ComputeHash(data.ToArray())
+        return "".join(["%02x" % b for b in digest])[:32]
+
+    @staticmethod
+    def get_plugin_attribute():
+        attr = Type.GetType("Peach.Core.PluginAssemblyAttribute, Peach.Core")
+        if attr:
+            return CustomAttributeBuilder(attr.GetConstructor(Type.EmptyTypes), ())
+        return None
+
+    @staticmethod
+    def is_persistable(cls):
+        """
+        Types can only be saved if they do not reference any other
+        dynamically generated type, such as other ClrClass or ClrInterface types.
+        """
+        for base in cls.__bases__:
+            if hasattr(base, "__metaclass__") and issubclass(base.__metaclass__, ClrType):
+                return False
+        types = []
+        for function_info in cls.get_typed_methods():
+            types.extend(function_info.function.arg_types)
+            types.append(function_info.function.return_type)
+        if hasattr(cls, "_clrfields"):
+            types.extend(cls._clrfields.values())
+        for t in types:
+            if hasattr(t, "__metaclass__") and issubclass(t.__metaclass__, ClrType):
+                return False
+            if clr.GetClrType(t).Assembly.IsDynamic:
+                return False
+        return True
+
+    @staticmethod
+    def create(cls):
+        """
+        Returns a ClrTypeCache for the ClrClass cls or None if the type
+        can not be cached.
+        """
+        directory = ClrTypeCache.get_directory()
+        if not directory:
+            return None
+
+        module = sys.modules.get(cls.__module__)
+        source = getattr(module, "__file__", None)
+        if not source or not File.Exists(source):
+            return None
+
+        if not ClrTypeCache.get_plugin_attribute() or not ClrTypeCache.is_persistable(cls):
+            return None
+
+        versions = []
+        for name in ClrTypeCache.reference_assemblies:
+            asm = ClrTypeCache.find_assembly(name)
+            if asm:
+                versions.append("%s=%s/%s" % (name, asm.GetName().Version, asm.ManifestModule.ModuleVersionId))
+
+        bases = [clr.GetClrType(b).AssemblyQualifiedName for b in cls.__bases__]
+
+        try:
+            ClrTypeCache.create_directory(directory)
+            if not ClrTypeCache.is_trusted(directory):
+                return None
+            base_key = ClrTypeCache.hash(ClrTypeCache.format_version, *(bases + versions))
+            type_key = ClrTypeCache.hash(
+                ClrTypeCache.format_version,
+                cls.get_clr_type_name(),
+                File.ReadAllBytes(source),
+                File.ReadAllBytes(__file__),
+                *(bases + versions))
+        except Exception:
+            return None
+
+        return ClrTypeCache(cls, directory, type_key, base_key)
+
+    def get_path(self, name):
+        return Path.Combine(self.directory, name + ".dll")
+
+    def load_assembly(self, name):
+        path = self.get_path(name)
+        if not File.Exists(path):
+            return None
+        if not ClrTypeCache.is_trusted(path):
+            # Never load an assembly someone else could have written
+            return None
+        try:
+            asm = Assembly.LoadFrom(path)
+            clr.AddReference(asm)
+            return asm
+        except Exception:
+            # Corrupt or partially written, regenerate it
+            try: File.Delete(path)
+            except Exception: pass
+            return None
+
+    def get_temp_directory(self, name):
+        return Path.Combine(self.directory, "%s.%s.tmp" % (name, Guid.NewGuid().ToString("N")))
+
+    def save_assembly(self, name, temp, write):
+        """
+        Calls write() to save the assembly name to the directory temp and
+        moves it over the cached assembly. Returns False if it could not be saved.
+        """
+        path = self.get_path(name)
+        try:
+            Directory.CreateDirectory(temp)
+            write()
+            saved = Path.Combine(temp, name + ".dll")
+            if File.Exists(path):
+                File.Replace(saved, path, None)
+            else:
+                File.Move(saved, path)
+            return True
+        except Exception:
+            return False
+        finally:
+            try: Directory.Delete(temp, True)
+            except Exception: pass
+
+    def load_base_type(self):
+        """
+        Loads the precompiled python base type, compiling it first if needed.
+        Once loaded, IronPython uses it instead of emitting a new type.
+        """
+        if not File.Exists(self.get_path(self.base_name)):
+            bases = self.cls.__bases__
+            temp = self.get_temp_directory(self.base_name)
+            def compile():
+                # IronPython always saves to the current directory, so only
+                # change it for this call and never from two threads at once.
+                Monitor.Enter(ClrTypeCache.compile_lock)
+                cwd = Environment.CurrentDirectory
+                try:
+                    Environment.CurrentDirectory = temp
+                    clr.CompileSubclassTypes(self.base_name, bases if len(bases) > 1 else bases[0])
+                finally:
+                    Environment.CurrentDirectory = cwd
+                    Monitor.Exit(ClrTypeCache.compile_lock)
+            if not self.save_assembly(self.base_name, temp, compile):
+                return
+        self.load_assembly(self.base_name)
+
+    def load_type(self):
+        asm = self.load_assembly(self.type_name)
+        if not asm:
+            return None
+        try:
+            new_type = asm.GetType(self.cls.get_clr_type_name(), True)
+        except Exception:
+            return None
+        if new_type.BaseType != self.cls.baseType:
+            return None
+        return new_type
+
+    def define_type(self):
+        # If the python base type could not be precompiled,
+        # the new type can not be saved.
+        if self.cls.baseType.Assembly.IsDynamic:
+            return None
+        self.temp_directory = self.get_temp_directory(self.type_name)
+        self.assembly_builder = AppDomain.CurrentDomain.DefineDynamicAssembly(
+            AssemblyName(self.type_name),
+            AssemblyBuilderAccess.RunAndSave,
+            self.temp_directory)
+        # Peach.Core.ClassLoader only looks for plugins in assemblies with this attribute
+        self.assembly_builder.SetCustomAttribute(ClrTypeCache.get_plugin_attribute())
+        module_builder = self.assembly_builder.DefineDynamicModule(self.type_name, self.type_name + ".dll")
+        return module_builder.DefineType(self.cls.get_clr_type_name(), TypeAttributes.Public, self.cls.baseType)
+
+    def save(self):
+        # If saving fails, the type has already been created and is
+        # usable, it will just be generated again next time.
+        self.save_assembly(
+            self.type_name,
+            self.temp_directory,
+            lambda: self.assembly_builder.Save(self.type_name + ".dll"))
+
 def make_cab(attrib_type, *args, **kwds):
     clrtype = clr.GetClrType(attrib_type)
     argtypes = tuple(map(lambda x:clr.GetClrType(type(x)), args))
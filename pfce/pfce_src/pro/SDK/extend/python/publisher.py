@@ -76,17 +76,25 @@ class PythonPublisher(BasePythonPublisher):
 		print '>>>  Param2: %s' % self.param2
 		pass
 
-	@clrtype.accepts(BitwiseStream)
+	@clrtype.accepts(System.Array[System.Byte])
 	@clrtype.returns()
-	def OnOutput(self, data):
+	def OnOutputBytes(self, data):
 		'''Output data as a json string'''
 
-		out = ""
-		for i in range(data.Length):
-			out += chr(data.ReadByte())
+		# Convert the entire byte[] to a python byte string in one call
+		# instead of reading the stream one byte at a time.
+		out = bytes(data)
 
 		print json.dumps(out)
 
+	@clrtype.accepts()
+	@clrtype.returns(System.Array[System.Byte])
+	def OnInputBytes(self):
+		'''Return the data received by an input action'''
+
+		# Convert a python byte string back into a byte[] in one call
+		return System.Array[System.Byte](b'Hello from Python')
+
 # end
 
 
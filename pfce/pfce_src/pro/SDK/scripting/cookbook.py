@@ -48,3 +48,20 @@ stream.Read(byteArray, 0, len(byteArray))
 
 # Convert our byte[] to a python byte string
 byteStr = bytes(byteArray)
+
+
+##############################################################
+## Example of reading all data from a BitwiseStream in one call
+
+import clr
+clr.AddReference("Peach.Core")
+
+from Peach.Core.IO import BitwiseStream
+
+# Read the entire stream into a byte[] without changing the
+# stream position. Avoid calling stream.ReadByte() in a loop,
+# every call crosses the IronPython/.NET boundary.
+byteArray = stream.ToByteArray()
+
+# Convert our byte[] to a python byte string
+byteStr = bytes(byteArray)
@@ -15,7 +15,6 @@ using Peach.Core.Agent;
 using Peach.Core.Agent.Channels;
 using Peach.Pro.Core.Agent.Channels.Rest;
 using Logger = NLog.Logger;
-using HttpListenerRequest = SocketHttpListener.Net.HttpListenerRequest;
 using SocketHttpListener.Net;
 
 namespace Peach.Pro.Test.Core.Agent.Http
@@ -69,7 +68,7 @@ namespace Peach.Pro.Test.Core.Agent.Http
 		{
 		}
 
-		private RouteResponse OnHandler(HttpListenerRequest req)
+		private RouteResponse OnHandler(RouteRequest req)
 		{
 			_restCalls.Add(req.Url.PathAndQuery);
 
@@ -83,7 +82,7 @@ namespace Peach.Pro.Test.Core.Agent.Http
 			return RouteResponse.AsJson(resp, HttpStatusCode.OK);
 		}
 
-		private RouteResponse OnWantBytesHandler(HttpListenerRequest req)
+		private RouteResponse OnWantBytesHandler(RouteRequest req)
 		{
 			string data;
 
@@ -106,7 +105,7 @@ namespace Peach.Pro.Test.Core.Agent.Http
 
 			return RouteResponse.AsJson(resp, HttpStatusCode.OK);
 		}
-		private RouteResponse OnHandlerFalse(HttpListenerRequest req)
+		private RouteResponse OnHandlerFalse(RouteRequest req)
 		{
 			_restCalls.Add(req.Url.PathAndQuery);
 
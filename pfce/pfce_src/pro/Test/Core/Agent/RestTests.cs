@@ -7,6 +7,7 @@ using System.Net.Sockets;
 using System.Text;
 using System.Text.RegularExpressions;
 using System.Threading;
+using Newtonsoft.Json;
 using NUnit.Framework;
 using Peach.Core;
 using Peach.Core.Agent;
@@ -564,6 +565,387 @@ namespace Peach.Pro.Test.Core.Agent
 			}
 		}
 
+		[Test]
+		public void PipelinedOutput()
+		{
+			// When pipelining, publisher actions that don't return data
+			// are sent to the agent with the next request that does.
+
+			StartServer();
+
+			var tmp = Path.GetTempFileName();
+
+			try
+			{
+				var cli = new Client(null, _uri + "?pipeline=true", null);
+
+				cli.AgentConnect();
+				cli.StartMonitor("mon", "Null", new Dictionary<string, string>());
+				cli.SessionStarting();
+
+				var pub = cli.CreatePublisher("pub", "File", new Dictionary<string, string>
+				{
+					{ "FileName", tmp },
+				});
+
+				try
+				{
+					cli.IterationStarting(new IterationStartingArgs());
+
+					pub.Open(100, false, false, false);
+					pub.Output(new BitStream(Encoding.ASCII.GetBytes("Hello")));
+					pub.Output(new BitStream(Encoding.ASCII.GetBytes("World")));
+					pub.Close();
+
+					Assert.AreEqual("", File.ReadAllText(tmp));
+
+					cli.IterationFinished();
+
+					Assert.AreEqual("HelloWorld", File.ReadAllText(tmp));
+					Assert.False(cli.DetectedFault());
+				}
+				finally
+				{
+					pub.Dispose();
+				}
+
+				cli.SessionFinished();
+				cli.AgentDisconnect();
+			}
+			finally
+			{
+				File.Delete(tmp);
+			}
+		}
+
+		[Test]
+		public void PipelinedActions()
+		{
+			// Requests deferred by an action are sent to the agent
+			// before the next action runs.
+
+			StartServer();
+
+			var tmp = Path.GetTempFileName();
+
+			try
+			{
+				var xml = @"
+<Peach>
+	<DataModel name='DM'>
+		<String value='Hello' />
+	</DataModel>
+
+	<StateModel name='SM' initialState='Initial'>
+		<State name='Initial'>
+			<Action name='out' type='output'>
+				<DataModel ref='DM' />
+			</Action>
+			<Action name='close' type='close' />
+		</State>
+	</StateModel>
+
+	<Agent name='Remote' location='{0}?pipeline=true'/>
+
+	<Test name='Default'>
+		<Agent ref='Remote' />
+		<StateModel ref='SM' />
+		<Publisher class='Remote'>
+			<Param name='Agent' value='Remote' />
+			<Param name='Class' value='File'/>
+			<Param name='FileName' value='{1}' />
+		</Publisher>
+	</Test>
+</Peach>
+".Fmt(_uri, tmp);
+
+				var dom = DataModelCollector.ParsePit(xml);
+				var cfg = new RunConfiguration { singleIteration = true };
+				var e = new Engine(null);
+				var contents = new List<string>();
+
+				e.TestStarting += ctx =>
+				{
+					ctx.ActionFinished += (c, a) =>
+					{
+						if (a.Name == "close")
+							contents.Add(File.ReadAllText(tmp));
+					};
+				};
+
+				e.startFuzzing(dom, cfg);
+
+				Assert.AreEqual(new[] { "Hello" }, contents);
+			}
+			finally
+			{
+				File.Delete(tmp);
+			}
+		}
+
+		[Test]
+		public void PipelinedMultipleAgents()
+		{
+			// Requests queued for one agent are sent before
+			// any request to another agent is queued or sent.
+
+			StartServer();
+
+			var tmp1 = Path.GetTempFileName();
+			var tmp2 = Path.GetTempFileName();
+
+			try
+			{
+				var cli1 = new Client("cli1", _uri + "?pipeline=true", null);
+				var cli2 = new Client("cli2", _uri + "?pipeline=true", null);
+
+				cli1.FlushOtherAgents = cli2.Flush;
+				cli2.FlushOtherAgents = cli1.Flush;
+
+				cli1.AgentConnect();
+				cli2.AgentConnect();
+
+				var pub1 = cli1.CreatePublisher("pub", "File", new Dictionary<string, string>
+				{
+					{ "FileName", tmp1 },
+				});
+
+				var pub2 = cli2.CreatePublisher("pub", "File", new Dictionary<string, string>
+				{
+					{ "FileName", tmp2 },
+				});
+
+				try
+				{
+					pub1.Open(100, false, false, false);
+					pub1.Output(new BitStream(Encoding.ASCII.GetBytes("Hello")));
+					pub1.Close();
+
+					Assert.AreEqual("", File.ReadAllText(tmp1));
+
+					pub2.Open(100, false, false, false);
+
+					Assert.AreEqual("Hello", File.ReadAllText(tmp1));
+
+					pub2.Output(new BitStream(Encoding.ASCII.GetBytes("World")));
+					pub2.Close();
+
+					Assert.AreEqual("", File.ReadAllText(tmp2));
+
+					pub1.Open(101, false, false, false);
+
+					Assert.AreEqual("World", File.ReadAllText(tmp2));
+
+					pub1.Close();
+				}
+				finally
+				{
+					pub1.Dispose();
+					pub2.Dispose();
+				}
+
+				cli1.AgentDisconnect();
+				cli2.AgentDisconnect();
+			}
+			finally
+			{
+				File.Delete(tmp1);
+				File.Delete(tmp2);
+			}
+		}
+
+		[Test]
+		public void PipelinedInput()
+		{
+			Func<Stream, string> asStr = strm => Encoding.ASCII.GetString(((MemoryStream)strm).ToArray());
+
+			StartServer();
+
+			var tmp = Path.GetTempFileName();
+
+			try
+			{
+				File.WriteAllText(tmp, "Hello World");
+
+				var cli = new Client(null, _uri + "?pipeline=true", null);
+
+				cli.AgentConnect();
+
+				var pub = cli.CreatePublisher("pub", "File", new Dictionary<string, string>
+				{
+					{ "FileName", tmp },
+					{ "Overwrite", "false" },
+				});
+
+				try
+				{
+					pub.Open(100, false, false, false);
+					pub.Input();
+
+					Assert.AreEqual(11, pub.InputStream.Length);
+					Assert.AreEqual(0, pub.InputStream.Position);
+					Assert.AreEqual("Hello World", asStr(pub.InputStream));
+
+					pub.Close();
+
+					// Reopening resets the remote publisher, so the
+					// input must start over at the beginning
+					pub.Open(101, false, false, false);
+					pub.Input();
+
+					Assert.AreEqual(11, pub.InputStream.Length);
+					Assert.AreEqual("Hello World", asStr(pub.InputStream));
+
+					pub.Close();
+				}
+				finally
+				{
+					pub.Dispose();
+				}
+
+				cli.AgentDisconnect();
+			}
+			finally
+			{
+				File.Delete(tmp);
+			}
+		}
+
+		[Test]
+		public void PipelinedError()
+		{
+			// Errors from queued requests are raised by the
+			// request that sends them to the agent.
+
+			StartServer();
+
+			var tmp = Path.GetTempFileName();
+
+			try
+			{
+				var cli = new Client(null, _uri + "?pipeline=true", null);
+
+				cli.AgentConnect();
+				cli.StartMonitor("mon", "Null", new Dictionary<string, string>());
+
+				var pub = cli.CreatePublisher("pub", "Zip", new Dictionary<string, string>
+				{
+					{ "FileName", tmp },
+				});
+
+				try
+				{
+					pub.Open(100, false, false, false);
+					pub.Output(new BitStream(Encoding.ASCII.GetBytes("Hello")));
+					pub.Close();
+
+					var ex = Assert.Throws<PeachException>(cli.IterationFinished);
+
+					Assert.AreEqual("The Zip publisher does not support output actions when run on remote agents.", ex.Message);
+				}
+				finally
+				{
+					pub.Dispose();
+				}
+
+				cli.AgentDisconnect();
+			}
+			finally
+			{
+				File.Delete(tmp);
+			}
+		}
+
+		[Test]
+		public void Batch()
+		{
+			StartServer();
+
+			var baseUri = new Uri("http://127.0.0.1:{0}".Fmt(_uri.Port));
+
+			Func<object, BatchResponse> post = obj =>
+			{
+				using (var wc = new WebClient())
+				{
+					wc.Headers[HttpRequestHeader.ContentType] = "application/json";
+
+					var json = wc.UploadString(new Uri(baseUri, "/pa/batch"), JsonConvert.SerializeObject(obj));
+
+					return JsonConvert.DeserializeObject<BatchResponse>(json);
+				}
+			};
+
+			var connect = new ConnectRequest
+			{
+				Monitors = new List<MonitorRequest>
+				{
+					new MonitorRequest { Name = "mon", Class = "Null", Args = new Dictionary<string, string>() }
+				}
+			};
+
+			var resp = post(new BatchRequest
+			{
+				Requests = new List<BatchRequest.Item>
+				{
+					new BatchRequest.Item
+					{
+						Id = 1,
+						Method = "POST",
+						Path = "/pa/agent",
+						Content = Encoding.UTF8.GetBytes(JsonConvert.SerializeObject(connect))
+					},
+				}
+			});
+
+			Assert.AreEqual(1, resp.Responses.Count);
+			Assert.AreEqual(1, resp.Responses[0].Id);
+			Assert.AreEqual(201, resp.Responses[0].Status);
+
+			var url = JsonConvert.DeserializeObject<ConnectResponse>(Encoding.UTF8.GetString(resp.Responses[0].Content)).Url;
+
+			// Processing stops after the first error
+			resp = post(new BatchRequest
+			{
+				Requests = new List<BatchRequest.Item>
+				{
+					new BatchRequest.Item { Id = 1, Method = "PUT", Path = url + "/IterationFinished" },
+					new BatchRequest.Item { Id = 2, Method = "GET", Path = url + "/DetectedFault" },
+					new BatchRequest.Item { Id = 3, Method = "GET", Path = url + "/Missing" },
+					new BatchRequest.Item { Id = 4, Method = "DELETE", Path = url },
+				}
+			});
+
+			Assert.AreEqual(3, resp.Responses.Count);
+			Assert.AreEqual(200, resp.Responses[0].Status);
+			Assert.Null(resp.Responses[0].Content);
+			Assert.AreEqual(200, resp.Responses[1].Status);
+			Assert.AreEqual("{\"value\":false}", Encoding.UTF8.GetString(resp.Responses[1].Content));
+			Assert.AreEqual(404, resp.Responses[2].Status);
+
+			resp = post(new BatchRequest
+			{
+				Requests = new List<BatchRequest.Item>
+				{
+					new BatchRequest.Item { Id = 1, Method = "POST", Path = "/pa/batch" },
+					new BatchRequest.Item { Id = 2, Method = "DELETE", Path = url },
+				}
+			});
+
+			Assert.AreEqual(1, resp.Responses.Count);
+			Assert.AreEqual(400, resp.Responses[0].Status);
+
+			resp = post(new BatchRequest
+			{
+				Requests = new List<BatchRequest.Item>
+				{
+					new BatchRequest.Item { Id = 1, Method = "DELETE", Path = url },
+				}
+			});
+
+			Assert.AreEqual(1, resp.Responses.Count);
+			Assert.AreEqual(200, resp.Responses[0].Status);
+		}
+
 		[Test]
 		public void Call()
 		{
@@ -0,0 +1,153 @@
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using NUnit.Framework;
+using Peach.Core;
+using Peach.Core.Test;
+using Peach.Pro.Core.Runtime;
+using Peach.Pro.Core.Storage;
+using Peach.Pro.Core.WebServices.Models;
+using Peach.Pro.Test.Core.Storage;
+
+namespace Peach.Pro.Test.Core
+{
+	[TestFixture]
+	[Quick]
+	[Peach]
+	class ConsoleProgramTests
+	{
+		class TestProgram : ConsoleProgram
+		{
+			public RunConfiguration Config { get { return _config; } }
+			public List<string> Extra { get; private set; }
+			public Exception Error { get; private set; }
+
+			protected override bool VerifyCompatibility()
+			{
+				return true;
+			}
+
+			protected override void ConfigureLogging()
+			{
+			}
+
+			protected override int ReportError(List<string> args, bool showUsage, Exception ex)
+			{
+				Error = ex;
+				return 2;
+			}
+
+			protected override int OnRun(List<string> args)
+			{
+				Extra = args;
+				return 0;
+			}
+		}
+
+		TempDirectory _tmp;
+
+		[SetUp]
+		public void SetUp()
+		{
+			_tmp = new TempDirectory();
+		}
+
+		[TearDown]
+		public void TearDown()
+		{
+			_tmp.Dispose();
+		}
+
+		[Test]
+		public void TestParallel()
+		{
+			var program = new TestProgram();
+
+			Assert.AreEqual(0, program.Run(new[] { "--parallel=2,3", "--seed=100", "pit.xml" }));
+			Assert.Null(program.Error);
+
+			Assert.True(program.Config.parallel);
+			Assert.AreEqual(2u, program.Config.parallelNum);
+			Assert.AreEqual(3u, program.Config.parallelTotal);
+			Assert.AreEqual(100u, program.Config.randomSeed);
+			Assert.AreEqual(new[] { "pit.xml" }, program.Extra);
+		}
+
+		[Test]
+		public void TestParallelInvalid()
+		{
+			foreach (var arg in new[] { "2", "1,2,3", "0,3", "4,3", "a,3", "1,b" })
+			{
+				var program = new TestProgram();
+
+				Assert.AreNotEqual(0, program.Run(new[] { "--parallel=" + arg, "pit.xml" }), arg);
+				Assert.NotNull(program.Error, arg);
+				Assert.That(program.Error.Message, Is.StringContaining("parallel"), arg);
+				Assert.Null(program.Extra, arg);
+			}
+		}
+
+		private string MakeNode(string name)
+		{
+			var job = new Job { LogPath = Path.Combine(_tmp.Path, name) };
+
+			Directory.CreateDirectory(job.LogPath);
+
+			MetricsTests.MakeSampleCache(DateTime.Now, job);
+
+			return job.DatabasePath;
+		}
+
+		private static int CountFaults(string path)
+		{
+			using (var db = new JobDatabase(path))
+			{
+				return db.LoadTable<FaultDetail>().Count();
+			}
+		}
+
+		[Test]
+		public void TestMerge()
+		{
+			var node1 = MakeNode("node1");
+			var node2 = MakeNode("node2");
+			var merged = Path.Combine(_tmp.Path, "merged.db");
+			var faults = CountFaults(node1);
+
+			var program = new TestProgram();
+
+			Assert.AreEqual(0, program.Run(new[] { "--merge=" + merged, node1, node2 }));
+			Assert.Null(program.Error);
+
+			// Merging is a command, it doesn't run a job
+			Assert.Null(program.Extra);
+
+			Assert.AreEqual(faults * 2, CountFaults(merged));
+
+			// Merging the same node again is an error
+			program = new TestProgram();
+
+			Assert.AreNotEqual(0, program.Run(new[] { "--merge=" + merged, node1 }));
+			Assert.That(program.Error.Message, Is.StringContaining("has already been merged"));
+
+			Assert.AreEqual(faults * 2, CountFaults(merged));
+		}
+
+		[Test]
+		public void TestMergeInvalid()
+		{
+			var merged = Path.Combine(_tmp.Path, "merged.db");
+
+			var program = new TestProgram();
+
+			Assert.AreNotEqual(0, program.Run(new[] { "--merge=" + merged }));
+			Assert.That(program.Error.Message, Is.StringContaining("At least one job database"));
+
+			program = new TestProgram();
+
+			Assert.AreNotEqual(0, program.Run(new[] { "--merge=" + merged, Path.Combine(_tmp.Path, "missing.db") }));
+			Assert.That(program.Error.Message, Is.StringContaining("does not exist"));
+		}
+	}
+}
@@ -1,11 +1,15 @@
 ﻿
 
+using System;
+using System.Collections.Generic;
 using System.IO;
+using NLog;
 using NUnit.Framework;
 using Peach.Core;
 using Peach.Core.Analyzers;
 using Peach.Core.Cracker;
 using Peach.Core.Dom;
+using Peach.Core.IO;
 using Peach.Core.Test;
 
 namespace Peach.Pro.Test.Core.CrackingTests
@@ -144,6 +148,216 @@ namespace Peach.Pro.Test.Core.CrackingTests
 			Assert.AreEqual("HelloWorld\xff", asStr);
 		}
 
+		[Test]
+		public void CrackBlobNoRetain()
+		{
+			const string xml = @"
+<Peach>
+	<DataModel name='DM'>
+		<Number name='Len' size='8'>
+			<Relation type='size' of='Data'/>
+		</Number>
+		<Blob name='Data' retain='false'/>
+		<Blob name='Trailer' length='2'/>
+	</DataModel>
+</Peach>";
+
+			var dom = DataModelCollector.ParsePit(xml);
+			var data = Bits.Fmt("{0}", new byte[] { 5, 1, 2, 3, 4, 5, 0xff, 0xfe });
+
+			var cracker = new DataCracker { Streaming = true };
+			cracker.CrackData(dom.dataModels[0], data);
+
+			Assert.AreEqual(8, data.Position);
+			Assert.AreEqual(new byte[0], dom.dataModels[0][1].DefaultValue.BitsToArray());
+			Assert.AreEqual(new byte[] { 0xff, 0xfe }, dom.dataModels[0][2].DefaultValue.BitsToArray());
+			Assert.AreEqual(48, cracker.GetElementPos(dom.dataModels[0][1]).end);
+		}
+
+		/// <summary>
+		/// Generates a length prefixed payload followed by a trailer,
+		/// only producing data when the cracker asks for it.
+		/// </summary>
+		class WindowPublisher : Publisher
+		{
+			static readonly NLog.Logger ClassLogger = LogManager.GetCurrentClassLogger();
+
+			readonly long _payload;
+			readonly long _total;
+			long _position;
+			long _received;
+			long _released;
+
+			/// <summary>
+			/// The most data that was buffered at once.
+			/// </summary>
+			public long MaxBuffered { get; private set; }
+
+			/// <summary>
+			/// Position all prior data has been released from.
+			/// </summary>
+			public long Released { get { return _released; } }
+
+			public WindowPublisher(long payload, long total)
+				: base(new Dictionary<string, Variant>())
+			{
+				_payload = payload;
+				_total = total;
+			}
+
+			protected override NLog.Logger Logger
+			{
+				get { return ClassLogger; }
+			}
+
+			byte ByteAt(long position)
+			{
+				if (position < 4)
+					return (byte)(_payload >> (int)(position * 8));
+
+				if (position == 4)
+					return 0x01;
+
+				if (position < _payload + 4)
+					return (byte)position;
+
+				return position == _payload + 4 ? (byte)0xff : (byte)0xfe;
+			}
+
+			public override void WantBytes(long count)
+			{
+				_received = Math.Min(_total, Math.Max(_received, _position + count));
+
+				MaxBuffered = Math.Max(MaxBuffered, _received - _released);
+			}
+
+			public override void Release(long position)
+			{
+				Assert.LessOrEqual(position, _received);
+
+				_released = Math.Max(_released, position);
+			}
+
+			public override bool CanRead
+			{
+				get { return true; }
+			}
+
+			public override bool CanSeek
+			{
+				get { return true; }
+			}
+
+			public override long Length
+			{
+				get { return _received; }
+			}
+
+			public override long Position
+			{
+				get { return _position; }
+				set { _position = value; }
+			}
+
+			public override int Read(byte[] buffer, int offset, int count)
+			{
+				Assert.GreaterOrEqual(_position, _released, "Read data that was released");
+
+				var len = (int)Math.Max(0, Math.Min(count, _received - _position));
+
+				for (var i = 0; i < len; ++i)
+					buffer[offset + i] = ByteAt(_position++);
+
+				return len;
+			}
+
+			public override long Seek(long offset, SeekOrigin origin)
+			{
+				switch (origin)
+				{
+					case SeekOrigin.Begin:
+						_position = offset;
+						break;
+					case SeekOrigin.Current:
+						_position += offset;
+						break;
+					case SeekOrigin.End:
+						_position = _received + offset;
+						break;
+				}
+
+				return _position;
+			}
+		}
+
+		const string WindowXml = @"
+<Peach>
+	<DataModel name='DM'>
+		<Number name='Len' size='32'>
+			<Relation type='size' of='Payload'/>
+		</Number>
+		<Block name='Payload'>
+			<Number name='Type' size='8'/>
+			<Blob name='Data' retain='false'/>
+		</Block>
+		<Blob name='Trailer' length='2'/>
+	</DataModel>
+</Peach>";
+
+		[Test]
+		public void CrackSizedBlockStreaming()
+		{
+			// Payload is a 1 byte type followed by 4MB of data
+			const long payload = 0x400001;
+
+			var dom = DataModelCollector.ParsePit(WindowXml);
+			var pub = new WindowPublisher(payload, payload + 6);
+
+			var cracker = new DataCracker { Streaming = true };
+			cracker.CrackData(dom.dataModels[0], new BitStream(pub));
+
+			var model = dom.dataModels[0];
+
+			Assert.AreEqual((int)payload, (int)model[0].DefaultValue);
+			Assert.AreEqual(1, (int)((Block)model[1])[0].DefaultValue);
+			Assert.AreEqual(new byte[] { 0xff, 0xfe }, model[2].DefaultValue.BitsToArray());
+
+			// The data in the payload is released as it is cracked
+			// so the publisher never buffers all of it
+			Assert.Less(pub.MaxBuffered, 0x20000);
+			Assert.Greater(pub.Released, payload);
+		}
+
+		[Test]
+		public void CrackSizedBlockStreamingShort()
+		{
+			const long payload = 0x400001;
+
+			var dom = DataModelCollector.ParsePit(WindowXml);
+			var pub = new WindowPublisher(payload, payload / 2);
+
+			var cracker = new DataCracker { Streaming = true };
+
+			Assert.Throws<CrackingFailure>(() => cracker.CrackData(dom.dataModels[0], new BitStream(pub)));
+
+			Assert.Less(pub.MaxBuffered, 0x20000);
+		}
+
+		[Test]
+		public void BlobNoRetainToken()
+		{
+			const string xml = @"
+<Peach>
+	<DataModel name='DM'>
+		<Blob name='Data' length='1' value='a' token='true' retain='false'/>
+	</DataModel>
+</Peach>";
+
+			var ex = Assert.Throws<PeachException>(() => DataModelCollector.ParsePit(xml));
+
+			Assert.AreEqual("Error, Blob 'DM.Data' can not be a token when retain is false.", ex.Message);
+		}
+
 		[Test]
 		public void BlobBadFields()
 		{
@@ -319,5 +319,58 @@ namespace Peach.Pro.Test.Core.CrackingTests
 			Assert.AreEqual("40,80", place["TheDataModel.str"]);
 
 		}
+
+		[Test]
+		public void CrackWithPlan()
+		{
+			string xml = @"
+<Peach>
+	<DataModel name='TheDataModel'>
+		<String name='str' />
+		<Block name='trailer'>
+			<Number name='num1' size='16' />
+			<Block name='inner'>
+				<Number name='num2' size='8' />
+				<Blob name='blob' length='2' />
+			</Block>
+		</Block>
+		<Block name='tokens'>
+			<String name='tok' value='!' token='true' />
+		</Block>
+	</DataModel>
+</Peach>";
+
+			PitParser parser = new PitParser();
+			Peach.Core.Dom.Dom dom = parser.asParser(null, new MemoryStream(ASCIIEncoding.ASCII.GetBytes(xml)));
+
+			var dm = dom.dataModels[0];
+			new DataCracker().OptimizeDataModel(dm);
+
+			long size;
+			Assert.True(dm.CrackPlan.TryGetFixedSize(dm.find("trailer"), out size));
+			Assert.AreEqual(40, size);
+			Assert.True(dm.CrackPlan.TryGetFixedSize(dm.find("inner"), out size));
+			Assert.AreEqual(24, size);
+			Assert.False(dm.CrackPlan.TryGetFixedSize(dm.find("str"), out size));
+			Assert.False(dm.CrackPlan.TryGetFixedSize(dm.find("tokens"), out size));
+
+			// Clones share the plan until their structure changes
+			var copy = (DataModel)dm.Clone();
+			Assert.AreSame(dm.CrackPlan, copy.CrackPlan);
+
+			var data = Bits.Fmt("{0}{1:L16}{2:L8}{3}{4}", "Hello", 1, 2, new byte[] { 3, 4 }, "!");
+
+			new DataCracker().CrackData(copy, data);
+
+			Assert.AreEqual("Hello", (string)copy.find("str").DefaultValue);
+			Assert.AreEqual(1, (int)copy.find("num1").DefaultValue);
+			Assert.AreEqual(2, (int)copy.find("num2").DefaultValue);
+			Assert.AreEqual(new byte[] { 3, 4 }, copy.find("blob").DefaultValue.BitsToArray());
+			Assert.AreEqual(data.LengthBits, data.PositionBits);
+
+			copy.Remove(copy.find("tokens"));
+			Assert.Null(copy.CrackPlan);
+			Assert.NotNull(dm.CrackPlan);
+		}
 	}
 }
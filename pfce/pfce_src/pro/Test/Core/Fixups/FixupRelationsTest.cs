@@ -1,5 +1,6 @@
 using System;
 using System.IO;
+using System.Linq;
 using NUnit.Framework;
 using Peach.Core;
 using Peach.Core.Analyzers;
@@ -176,6 +177,129 @@ namespace Peach.Pro.Test.Core.Fixups
 			Assert.AreEqual(final2, dm2);
 		}
 
+		[Test]
+		public void TestEvaluateDependencies()
+		{
+			// Verify relations and fixups that reference the data model
+			// they are in are ordered fixup first, are each evaluated
+			// once and are only evaluated again when an input changes.
+
+			string xml = @"
+<Peach>
+	<DataModel name='TheDataModel'>
+		<Block>
+			<Number name='CRC' size='32' signed='false'>
+				<Fixup class='Crc32Fixup'>
+					<Param name='ref' value='TheDataModel' />
+				</Fixup>
+			</Number>
+		</Block>
+		<Number name='len' size='32' signed='false'>
+			<Relation type='size' of='TheDataModel' />
+		</Number>
+		<String name='Data' value='Hello' />
+	</DataModel>
+</Peach>";
+
+			var dom = ParsePit(xml);
+			var dm = dom.dataModels[0];
+
+			Assert.AreEqual(new[] { "CRC", "len" }, dm.Dependencies.Order.Select(e => e.Name).ToArray());
+
+			Func<string, byte[]> final = str =>
+			{
+				var data = Bits.Fmt("{0:L32}{1:L32}{2}", 0, 8 + str.Length, str);
+
+				var crc = new CRCTool();
+				crc.Init(CRCTool.CRCCode.CRC32);
+				data.Seek(0, SeekOrigin.Begin);
+				data.WriteBits(Endian.Little.GetBits((uint)crc.crctablefast(data.ToArray()), 32), 32);
+
+				return data.ToArray();
+			};
+
+			// Generating in document order also runs the checksum and the
+			// size once.  Evaluating the size first would run the checksum
+			// twice, once with a placeholder for the size.
+			Assert.AreEqual(final("Hello"), dm.Value.ToArray());
+			Assert.AreEqual(1, dm.FixupEvaluations);
+			Assert.AreEqual(1, dm.RelationEvaluations);
+
+			Assert.NotNull(dm.find("CRC").InternalValue);
+			Assert.NotNull(dm.find("len").InternalValue);
+			Assert.AreEqual(final("Hello"), dm.Value.ToArray());
+
+			Assert.AreEqual(1, dm.FixupEvaluations);
+			Assert.AreEqual(1, dm.RelationEvaluations);
+
+			dm.ResetEvaluationCounts();
+			dm.find("Data").DefaultValue = new Variant("HelloHello");
+
+			Assert.AreEqual(final("HelloHello"), dm.Value.ToArray());
+			Assert.AreEqual(1, dm.FixupEvaluations);
+			Assert.AreEqual(1, dm.RelationEvaluations);
+		}
+
+		[Test]
+		public void TestEvaluateNestedDependencies()
+		{
+			// Verify a checksum over a block that contains another block
+			// with its own size and checksum is only evaluated once.
+
+			string xml = @"
+<Peach>
+	<DataModel name='TheDataModel'>
+		<Block name='Outer'>
+			<Number name='OuterLen' size='32' signed='false'>
+				<Relation type='size' of='Outer' />
+			</Number>
+			<Number name='OuterCRC' size='32' signed='false'>
+				<Fixup class='Crc32Fixup'>
+					<Param name='ref' value='Outer' />
+				</Fixup>
+			</Number>
+			<Block name='Inner'>
+				<Number name='InnerLen' size='32' signed='false'>
+					<Relation type='size' of='Inner' />
+				</Number>
+				<Number name='InnerCRC' size='32' signed='false'>
+					<Fixup class='Crc32Fixup'>
+						<Param name='ref' value='Inner' />
+					</Fixup>
+				</Number>
+				<String name='Data' value='Hello' />
+			</Block>
+		</Block>
+	</DataModel>
+</Peach>";
+
+			var dom = ParsePit(xml);
+			var dm = dom.dataModels[0];
+
+			Assert.AreEqual(
+				new[] { "OuterCRC", "InnerCRC", "InnerLen", "OuterLen" },
+				dm.Dependencies.Order.Select(e => e.Name).ToArray());
+
+			Func<byte[], uint> crc = buf =>
+			{
+				var tool = new CRCTool();
+				tool.Init(CRCTool.CRCCode.CRC32);
+				return (uint)tool.crctablefast(buf);
+			};
+
+			var inner = crc(Bits.Fmt("{0:L32}{1:L32}{2}", 13, 0, "Hello").ToArray());
+			var outer = crc(Bits.Fmt("{0:L32}{1:L32}{2:L32}{3:L32}{4}", 21, 0, 13, inner, "Hello").ToArray());
+			var expected = Bits.Fmt("{0:L32}{1:L32}{2:L32}{3:L32}{4}", 21, outer, 13, inner, "Hello").ToArray();
+
+			Assert.AreEqual(expected, dm.Value.ToArray());
+
+			// Generating in document order runs the outer checksum twice,
+			// the first time while the inner checksum is a placeholder,
+			// for a total of 4 fixup evaluations.
+			Assert.AreEqual(3, dm.FixupEvaluations);
+			Assert.AreEqual(2, dm.RelationEvaluations);
+		}
+
 		[Test]
 		public void TestFixupSiblingBefore()
 		{
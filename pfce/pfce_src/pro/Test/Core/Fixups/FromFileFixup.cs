@@ -1,4 +1,5 @@
 ﻿using System;
+using System.Collections.Generic;
 using System.IO;
 using System.Linq;
 using NUnit.Framework;
@@ -150,6 +151,100 @@ TGKxZ+RZEU/rDN6CjHKIsPLfOcq5
 
 		}
 
+		string _tempFile;
+		List<string> _contents;
+
+		protected override void Engine_IterationStarting(RunContext context, uint currentIteration, uint? totalIterations)
+		{
+			if (_tempFile == null)
+				return;
+
+			var text = "Iteration {0}".Fmt(_contents.Count);
+			File.WriteAllText(_tempFile, text);
+			_contents.Add(text);
+		}
+
+		[Test]
+		public void ReadEveryIteration()
+		{
+			// Neither the Pure nor the File model is mutated, so they are
+			// reused between iterations unless they contain a fixup whose
+			// value can change when nothing in the model did.
+
+			const string xml = @"
+<Peach>
+	<DataModel name='Fuzzed'>
+		<String value='Hello World'/>
+	</DataModel>
+
+	<DataModel name='File' mutable='false'>
+		<Blob name='Data' mutable='false'>
+			<Fixup class='FromFile'>
+				<Param name='Filename' value='{0}'/>
+			</Fixup>
+		</Blob>
+	</DataModel>
+
+	<DataModel name='Pure' mutable='false'>
+		<Blob name='Data' mutable='false' value='Hello'/>
+	</DataModel>
+
+	<StateModel name='TheState' initialState='Initial'>
+		<State name='Initial'>
+			<Action type='output'>
+				<DataModel ref='Fuzzed'/>
+			</Action>
+			<Action type='output'>
+				<DataModel ref='File'/>
+			</Action>
+			<Action type='output'>
+				<DataModel ref='Pure'/>
+			</Action>
+		</State>
+	</StateModel>
+
+	<Test name='Default'>
+		<StateModel ref='TheState'/>
+		<Publisher class='Null'/>
+	</Test>
+</Peach>";
+
+			_tempFile = Path.GetTempFileName();
+			_contents = new List<string>();
+
+			try
+			{
+				var dom = ParsePit(xml.Fmt(_tempFile));
+				var config = new RunConfiguration
+				{
+					range = true,
+					rangeStart = 1,
+					rangeStop = 5,
+				};
+
+				new Engine(this).startFuzzing(dom, config);
+
+				var files = dataModels.Where((m, i) => i % 3 == 1).ToList();
+				var pure = dataModels.Where((m, i) => i % 3 == 2).ToList();
+
+				Assert.AreEqual(_contents.Count, files.Count);
+				Assert.Greater(files.Count, 2);
+
+				for (var i = 0; i < files.Count; ++i)
+					Assert.AreEqual(_contents[i], Encoding.ASCII.GetString(values[i * 3 + 1].ToArray()));
+
+				// The file model is cloned every iteration,
+				// the pure model is reused once it has been cloned
+				Assert.AreNotSame(files[files.Count - 2], files[files.Count - 1]);
+				Assert.AreSame(pure[pure.Count - 2], pure[pure.Count - 1]);
+			}
+			finally
+			{
+				File.Delete(_tempFile);
+				_tempFile = null;
+			}
+		}
+
 		[Test]
 		public void VerifyNoExceptionOnLoad()
 		{
@@ -0,0 +1,123 @@
+using System.IO;
+using System.Linq;
+using NUnit.Framework;
+using Peach.Core;
+using Peach.Core.Test;
+using Peach.Pro.Core.Loggers;
+
+namespace Peach.Pro.Test.Core.Loggers
+{
+	[TestFixture]
+	[Quick]
+	[Peach]
+	class ProfileLoggerTests
+	{
+		TempDirectory _tmpDir;
+
+		[SetUp]
+		public void SetUp()
+		{
+			_tmpDir = new TempDirectory();
+
+			Configuration.LogRoot = _tmpDir.Path;
+		}
+
+		[TearDown]
+		public void TearDown()
+		{
+			Profiler.Enabled = false;
+			Profiler.Reset();
+
+			_tmpDir.Dispose();
+		}
+
+		const string xml = @"
+<Peach>
+	<DataModel name='DM'>
+		<String name='str' value='Hello World' />
+	</DataModel>
+
+	<StateModel name='SM' initialState='Initial'>
+		<State name='Initial'>
+			<Action type='output'>
+				<DataModel ref='DM' />
+			</Action>
+		</State>
+	</StateModel>
+
+	<Test name='Default'>
+		<StateModel ref='SM' />
+		<Publisher class='Null' />
+		<Logger class='Profile'>
+			<Param name='Interval' value='{0}' />
+		</Logger>
+	</Test>
+</Peach>";
+
+		private string FindFile(string name)
+		{
+			return Directory.GetFiles(_tmpDir.Path, name, SearchOption.AllDirectories).SingleOrDefault();
+		}
+
+		private void Run(string interval, Engine.IterationStartingEventHandler onIteration = null)
+		{
+			var dom = DataModelCollector.ParsePit(xml.Fmt(interval));
+			var cfg = new RunConfiguration
+			{
+				range = true,
+				rangeStart = 1,
+				rangeStop = 5,
+				pitFile = "ProfileLoggerTests",
+			};
+
+			var e = new Engine(null);
+
+			if (onIteration != null)
+				e.IterationStarting += onIteration;
+
+			e.startFuzzing(dom, cfg);
+		}
+
+		[Test]
+		public void TestWritesProfile()
+		{
+			Run("30");
+
+			// The profiler is only enabled while the job runs
+			Assert.False(Profiler.Enabled);
+
+			var profile = FindFile("profile.json");
+			Assert.NotNull(profile, "profile.json should be written");
+			Assert.NotNull(FindFile("profile.folded"), "profile.folded should be written");
+
+			var metrics = ProfileLogger.ReadProfile(profile);
+			var str = metrics.SingleOrDefault(m => m.Kind == "Generate" && m.Name == "DM.str");
+
+			Assert.NotNull(str, "Generating DM.str should be measured");
+			Assert.Greater(str.Count, 0);
+			Assert.GreaterOrEqual(str.TotalTime, str.SelfTime);
+		}
+
+		[Test]
+		public void TestInterval()
+		{
+			string written = null;
+
+			// With no interval the profile is written after every iteration
+			Run("0", (ctx, it, total) =>
+			{
+				if (it == 3 && written == null)
+					written = FindFile("profile.json");
+			});
+
+			Assert.NotNull(written, "profile.json should be written while the job runs");
+		}
+
+		[Test]
+		public void TestReadMissing()
+		{
+			CollectionAssert.IsEmpty(ProfileLogger.ReadProfile(null));
+			CollectionAssert.IsEmpty(ProfileLogger.ReadProfile(Path.Combine(_tmpDir.Path, "missing", "profile.json")));
+		}
+	}
+}
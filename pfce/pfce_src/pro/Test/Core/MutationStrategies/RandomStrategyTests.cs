@@ -1,6 +1,7 @@
 ﻿using System;
 using System.Collections.Generic;
 using System.IO;
+using System.Linq;
 using NUnit.Framework;
 using Peach.Core;
 using Peach.Core.Analyzers;
@@ -1237,6 +1238,106 @@ namespace Peach.Pro.Test.Core.MutationStrategies
 
 			Assert.False(count.ContainsKey("off"), "off shouldn't be mutated");
 		}
+
+		const string ParallelXml = @"
+<Peach>
+	<DataModel name='DM'>
+		<Number name='num' size='32' value='100'/>
+		<String name='str' value='Hello World'/>
+	</DataModel>
+
+	<StateModel name='SM' initialState='Initial'>
+		<State name='Initial'>
+			<Action type='output'>
+				<DataModel ref='DM'/>
+			</Action>
+		</State>
+	</StateModel>
+
+	<Test name='Default'>
+		<StateModel ref='SM'/>
+		<Publisher class='Null'/>
+		<Strategy class='Random'>
+			<Param name='SwitchCount' value='5'/>
+		</Strategy>
+	</Test>
+</Peach>
+";
+
+		private static List<Tuple<uint, byte[]>> RunParallel(RunConfiguration cfg)
+		{
+			var ret = new List<Tuple<uint, byte[]>>();
+			var e = new Engine(null);
+
+			e.TestStarting += ctx =>
+			{
+				ctx.ActionFinished += (c, action) =>
+				{
+					if (!c.controlIteration)
+						ret.Add(Tuple.Create(c.currentIteration, action.allData.First().dataModel.Value.ToArray()));
+				};
+			};
+
+			e.startFuzzing(ParsePit(ParallelXml), cfg);
+
+			return ret;
+		}
+
+		[Test]
+		public void TestParallel()
+		{
+			// Each machine fuzzes its own slice of the test cases a single
+			// machine would run with the same seed, so any fault found on
+			// one of them can be reproduced with --seed and --range.
+
+			var expected = RunParallel(new RunConfiguration
+			{
+				range = true,
+				rangeStart = 1,
+				rangeStop = 30,
+				randomSeed = 12345
+			});
+
+			var actual = new List<Tuple<uint, byte[]>>();
+
+			for (uint i = 1; i <= 3; ++i)
+			{
+				var node = RunParallel(new RunConfiguration
+				{
+					range = true,
+					rangeStart = 1,
+					rangeStop = 30,
+					randomSeed = 12345,
+					parallel = true,
+					parallelNum = i,
+					parallelTotal = 3
+				});
+
+				Assert.AreEqual(Enumerable.Range((int)(i - 1) * 10 + 1, 10), node.Select(x => (int)x.Item1));
+
+				actual.AddRange(node);
+			}
+
+			Assert.AreEqual(30, expected.Count);
+			Assert.AreEqual(expected.Select(x => x.Item1), actual.Select(x => x.Item1));
+
+			for (var i = 0; i < expected.Count; ++i)
+				Assert.AreEqual(expected[i].Item2, actual[i].Item2, "Iteration {0}".Fmt(expected[i].Item1));
+		}
+
+		[Test]
+		public void TestParallelNeedsSeed()
+		{
+			var cfg = new RunConfiguration
+			{
+				parallel = true,
+				parallelNum = 1,
+				parallelTotal = 2
+			};
+
+			var ex = Assert.Throws<PeachException>(() => RunParallel(cfg));
+			Assert.That(ex.Message, Is.StringContaining("same seed"));
+		}
 	}
 }
 
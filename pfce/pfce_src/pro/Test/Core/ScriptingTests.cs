@@ -1,6 +1,7 @@
 using System;
 using System.Collections.Generic;
 using System.IO;
+using System.Text;
 using NUnit.Framework;
 using Peach.Core;
 using Peach.Core.Test;
@@ -35,5 +36,45 @@ webproxy.register_event(webproxy.EVENT_ACTION, on_request)
 				p.ImportModule("mymodule");
 			}
 		}
+
+		[Test]
+		public void TestWebProxyBody()
+		{
+			const string script = @"
+from peach import webproxy
+
+seen = []
+
+def on_request(context, req, body):
+	seen.append(('plain', type(body) is bytes, body == b'Hello World'))
+
+@webproxy.lazy_body
+def on_request_lazy(context, req, body):
+	seen.append(('lazy', len(body), body[0:5] == b'Hello'))
+
+webproxy.__set_current_route('/route')
+webproxy.register_event(webproxy.EVENT_ACTION, on_request)
+webproxy.register_event(webproxy.EVENT_ACTION, on_request_lazy)
+";
+
+			using (var d = new TempDirectory())
+			{
+				var p = new PythonScripting();
+				p.AddSearchPath(Configuration.ScriptsPath);
+
+				File.WriteAllText(Path.Combine(d.Path, "mymodule.py"), script);
+				p.AddSearchPath(d.Path);
+				p.ImportModule("mymodule");
+
+				var scope = new Dictionary<string, object>
+				{
+					{ "data", Encoding.ASCII.GetBytes("Hello World") }
+				};
+
+				p.Exec("import mymodule\nfrom peach import webproxy\nwebproxy.__on_request('/route', None, None, data)", scope);
+
+				Assert.AreEqual("[('plain', True, True), ('lazy', 11, True)]", p.Eval("repr(mymodule.seen)", scope, false));
+			}
+		}
 	}
 }
@@ -1,4 +1,5 @@
-﻿using NUnit.Framework;
+﻿using System.Linq;
+using NUnit.Framework;
 using Peach.Core;
 using Peach.Pro.Core.Storage;
 using Peach.Core.Test;
@@ -95,5 +96,41 @@ namespace Peach.Pro.Test.Core.Storage
 			cache.IterationFinished();
 			cache.TestFinished();
 		}
+
+		[Test]
+		public void TestAggregateMutations()
+		{
+			var job = new Job { LogPath = _tmp.Path };
+			var cache = new AsyncDbCache(job);
+
+			for (var i = 0; i < 2500; ++i)
+			{
+				cache.IterationStarting(JobMode.Fuzzing);
+				cache.StateStarting("S1", "", 1);
+				cache.ActionStarting("A1", "");
+				cache.DataMutating(NameKind.Machine, "P1", "E1", "M1", "D1");
+				cache.DataMutating(NameKind.Machine, "P1", "E1", "M1", "D1");
+				cache.DataMutating(NameKind.Machine, "P1", "E2", "M2", "D1");
+				cache.IterationFinished();
+			}
+
+			cache.TestFinished();
+
+			Assert.AreEqual(2500, cache.Job.IterationCount);
+
+			using (var db = new JobDatabase(job.DatabasePath))
+			{
+				var mutations = db.LoadTable<Mutation>().OrderBy(m => m.ElementId).ToList();
+
+				Assert.AreEqual(2, mutations.Count);
+				Assert.AreEqual(5000, mutations[0].IterationCount);
+				Assert.AreEqual(2500, mutations[1].IterationCount);
+
+				// Machine and human names are separate states
+				var states = db.LoadTable<State>().ToList();
+				Assert.AreEqual(2, states.Count);
+				Assert.True(states.All(s => s.Count == 2500));
+			}
+		}
 	}
 }
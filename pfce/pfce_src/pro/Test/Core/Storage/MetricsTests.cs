@@ -1,6 +1,10 @@
 ﻿using System;
 using System.Collections.Generic;
+using System.Data.SQLite;
 using System.Globalization;
+using System.IO;
+using System.Linq;
+using Dapper;
 using NUnit.Framework;
 using Peach.Core;
 using Peach.Pro.Core.Storage;
@@ -422,6 +426,141 @@ namespace Peach.Pro.Test.Core.Storage
 			}
 		}
 
+		[Test]
+		public void TestMigrateRollups()
+		{
+			List<MutatorMetric> mutators;
+			List<ElementMetric> elements;
+			List<DatasetMetric> datasets;
+
+			using (var db = new JobDatabase(_job.DatabasePath))
+			{
+				mutators = db.LoadTable<MutatorMetric>().ToList();
+				elements = db.LoadTable<ElementMetric>().ToList();
+				datasets = db.LoadTable<DatasetMetric>().ToList();
+			}
+
+			// Make the database look like it was written before the rollups existed
+			using (var cnn = new SQLiteConnection("Data Source=" + _job.DatabasePath))
+			{
+				cnn.Open();
+				cnn.Execute(@"
+DROP TRIGGER TriggerMutationInsert;
+DROP TRIGGER TriggerMutationUpdate;
+DROP TRIGGER TriggerFaultMetricInsert;
+DROP TABLE MutatorRollup;
+DROP TABLE ElementRollup;
+DROP TABLE DatasetRollup;
+DROP TABLE MergedJob;
+PRAGMA user_version = 4;
+");
+			}
+
+			using (var db = new JobDatabase(_job.DatabasePath))
+			{
+				db.Migrate();
+
+				DatabaseTests.AssertResult(db.LoadTable<MutatorMetric>(), mutators);
+				DatabaseTests.AssertResult(db.LoadTable<ElementMetric>(), elements);
+				DatabaseTests.AssertResult(db.LoadTable<DatasetMetric>(), datasets);
+			}
+		}
+
+		[Test]
+		public void TestMerge()
+		{
+			var node1 = new Job { LogPath = Path.Combine(_tmp.Path, "node1") };
+			var node2 = new Job { LogPath = Path.Combine(_tmp.Path, "node2") };
+
+			Directory.CreateDirectory(node1.LogPath);
+			Directory.CreateDirectory(node2.LogPath);
+
+			MakeSampleCache(_now, node1);
+			MakeSampleCache(_now, node2);
+
+			List<StateMetric> states;
+			List<IterationMetric> iterations;
+			List<MutatorMetric> mutators;
+			List<FaultDetail> faults;
+
+			using (var db = new JobDatabase(_job.DatabasePath))
+			{
+				states = db.LoadTableKind<StateMetric>(NameKind.Machine).OrderBy(x => x.State).ToList();
+				iterations = db.LoadTableKind<IterationMetric>(NameKind.Machine).ToList();
+				mutators = db.LoadTable<MutatorMetric>().OrderBy(x => x.Mutator).ToList();
+				faults = db.LoadTable<FaultDetail>().ToList();
+			}
+
+			var path = Path.Combine(_tmp.Path, "merged.db");
+
+			using (var db = new JobDatabase(path))
+			{
+				db.Merge(node1.DatabasePath);
+				db.Merge(node2.DatabasePath);
+
+				Action verify = () =>
+				{
+					DatabaseTests.AssertResult(
+						db.LoadTableKind<StateMetric>(NameKind.Machine).OrderBy(x => x.State),
+						states.Select(x => new StateMetric(x.State, x.ExecutionCount * 2)));
+
+					var actual = db.LoadTableKind<IterationMetric>(NameKind.Machine).ToList();
+
+					Assert.AreEqual(iterations.Count, actual.Count);
+
+					foreach (var item in iterations)
+					{
+						var merged = actual.Single(x =>
+							x.State == item.State &&
+							x.Action == item.Action &&
+							x.Parameter == item.Parameter &&
+							x.Element == item.Element &&
+							x.Mutator == item.Mutator &&
+							x.Dataset == item.Dataset);
+
+						Assert.AreEqual(item.IterationCount * 2, merged.IterationCount);
+					}
+
+					// The rollups must match the merged mutations
+					var mergedMutators = db.LoadTable<MutatorMetric>().OrderBy(x => x.Mutator).ToList();
+
+					Assert.AreEqual(mutators.Select(x => x.Mutator), mergedMutators.Select(x => x.Mutator));
+					Assert.AreEqual(mutators.Select(x => x.ElementCount), mergedMutators.Select(x => x.ElementCount));
+					Assert.AreEqual(mutators.Select(x => x.IterationCount * 2), mergedMutators.Select(x => x.IterationCount));
+
+					// Faults from both nodes are kept with new ids
+					var mergedFaults = db.LoadTable<FaultDetail>().ToList();
+
+					Assert.AreEqual(faults.Count * 2, mergedFaults.Count);
+					Assert.AreEqual(mergedFaults.Count, mergedFaults.Select(x => x.Id).Distinct().Count());
+					Assert.AreEqual(
+						faults.Concat(faults).Select(x => x.Iteration).OrderBy(x => x),
+						mergedFaults.Select(x => x.Iteration).OrderBy(x => x));
+				};
+
+				verify();
+
+				// The same node can't be merged twice, however its path is written
+				var ex = Assert.Throws<PeachException>(() => db.Merge(node1.DatabasePath));
+				Assert.That(ex.Message, Is.StringContaining("has already been merged"));
+
+				Assert.Throws<PeachException>(() => db.Merge(Path.Combine(node2.LogPath, ".", "job.db")));
+
+				ex = Assert.Throws<PeachException>(() => db.Merge(path));
+				Assert.That(ex.Message, Is.StringContaining("into itself"));
+
+				verify();
+			}
+
+			// Merges are remembered after the database is reopened
+			using (var db = new JobDatabase(path))
+			{
+				db.Migrate();
+
+				Assert.Throws<PeachException>(() => db.Merge(node2.DatabasePath));
+			}
+		}
+
 		[Test]
 		public void TestQueryFaultTimeline()
 		{
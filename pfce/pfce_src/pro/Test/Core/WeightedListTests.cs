@@ -158,5 +158,46 @@ namespace Peach.Pro.Test.Core
 			Assert.AreEqual("3", samples[2].Name);
 			Assert.AreEqual("4", samples[3].Name);
 		}
+
+		[Test]
+		public void TestSetWeight()
+		{
+			var lst = new WeightedList<Item>();
+
+			lst.Add(new Item("1", 1));
+			lst.Add(new Item("2", 10));
+			lst.Add(new Item("3", 100));
+
+			Assert.AreEqual(10, lst.SetWeight(1, 0));
+			Assert.AreEqual(101, lst.Max);
+
+			var item = lst.UpperBound(1);
+			Assert.AreEqual("3", item.Item.Name);
+			Assert.AreEqual(2, item.Index);
+			Assert.AreEqual(1, item.LowerBound);
+			Assert.AreEqual(101, item.UpperBound);
+
+			Assert.AreEqual(0, lst.SetWeight(1, 5));
+			Assert.AreEqual(106, lst.Max);
+			Assert.AreEqual("2", lst.UpperBound(5).Item.Name);
+
+			// Sampling leaves the weights unchanged
+			var samples = new Random(0).WeightedSample(lst, 3);
+			Assert.AreEqual(3, samples.Select(s => s.Name).Distinct().Count());
+			Assert.AreEqual(106, lst.Max);
+			Assert.AreEqual(5, lst.GetWeight(1));
+		}
+
+		[Test]
+		public void TestRemove()
+		{
+			var items = new[] { new Item("1", 1), new Item("2", 10), new Item("3", 100) };
+			var lst = new WeightedList<Item>(items);
+
+			Assert.True(lst.Remove(items[1]));
+			Assert.AreEqual(101, lst.Max);
+			Assert.AreEqual("1", lst.UpperBound(0).Item.Name);
+			Assert.AreEqual("3", lst.UpperBound(1).Item.Name);
+		}
 	}
 }
@@ -0,0 +1,210 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Threading;
+using NLog;
+using NUnit.Framework;
+using Peach.Core;
+using Peach.Core.IO;
+using Peach.Core.Test;
+
+namespace Peach.Pro.Test.Core
+{
+	[TestFixture]
+	[Peach]
+	[Quick]
+	class WorkerTests
+	{
+		[Publisher("WorkerTest")]
+		[Parameter("Worker", typeof(uint), "Engine running the publisher")]
+		class WorkerTestPublisher : Publisher
+		{
+			static readonly NLog.Logger logger = LogManager.GetCurrentClassLogger();
+			protected override NLog.Logger Logger { get { return logger; } }
+
+			/// <summary>
+			/// Set once a worker runs a test case, so the primary engine
+			/// doesn't take every range before the workers have started.
+			/// </summary>
+			public static ManualResetEvent WorkerStarted;
+
+			/// <summary>
+			/// The engine and iteration of every test case that is not
+			/// a control iteration.
+			/// </summary>
+			public static List<Tuple<uint, uint>> Runs;
+
+			public uint Worker { get; set; }
+
+			public WorkerTestPublisher(Dictionary<string, Variant> args)
+				: base(args)
+			{
+			}
+
+			protected override void OnOutput(BitwiseStream data)
+			{
+				if (IsControlIteration)
+					return;
+
+				lock (Runs)
+					Runs.Add(Tuple.Create(Worker, Iteration));
+
+				if (Worker == 0)
+				{
+					WorkerStarted.WaitOne(TimeSpan.FromSeconds(10));
+					return;
+				}
+
+				WorkerStarted.Set();
+
+				// Only fault on workers so the faults never reproduce
+				if (Iteration % 50 == 0)
+				{
+					throw new FaultException(new FaultSummary
+					{
+						Title = "Worker Fault",
+						Description = "Worker {0}".Fmt(Worker),
+						MajorHash = "",
+						MinorHash = "",
+						Exploitablity = "Unknown"
+					});
+				}
+			}
+		}
+
+		const string Template = @"
+<Peach>
+	<DataModel name='DM'>
+		<String name='str' value='Hello World'/>
+	</DataModel>
+
+	<StateModel name='SM' initialState='Initial'>
+		<State name='Initial'>
+			<Action type='output'>
+				<DataModel ref='DM'/>
+			</Action>
+		</State>
+	</StateModel>
+
+	<Test name='Default' targetLifetime='{0}'>
+		<StateModel ref='SM'/>
+		<Publisher class='WorkerTest'>
+			<Param name='Worker' value='##WorkerId##'/>
+		</Publisher>
+		<Strategy class='Random'/>
+	</Test>
+</Peach>";
+
+		readonly List<uint> _reproFaults = new List<uint>();
+		readonly List<uint> _reproFailed = new List<uint>();
+		readonly List<uint> _reproRuns = new List<uint>();
+		readonly List<string> _descriptions = new List<string>();
+		int _faults;
+		Engine _engine;
+
+		[SetUp]
+		public void SetUp()
+		{
+			WorkerTestPublisher.WorkerStarted = new ManualResetEvent(false);
+			WorkerTestPublisher.Runs = new List<Tuple<uint, uint>>();
+
+			_reproFaults.Clear();
+			_reproFailed.Clear();
+			_reproRuns.Clear();
+			_descriptions.Clear();
+			_faults = 0;
+		}
+
+		[TearDown]
+		public void TearDown()
+		{
+			WorkerTestPublisher.WorkerStarted.Dispose();
+			WorkerTestPublisher.WorkerStarted = null;
+			WorkerTestPublisher.Runs = null;
+		}
+
+		private void Run(string lifetime)
+		{
+			var xml = Template.Fmt(lifetime);
+
+			var config = new RunConfiguration
+			{
+				range = true,
+				rangeStart = 1,
+				rangeStop = 500,
+				workers = 3,
+				createDom = id => DataModelCollector.ParsePit(xml.Replace("##WorkerId##", id.ToString()))
+			};
+
+			_engine = new Engine(null);
+
+			_engine.IterationStarting += (ctx, it, total) =>
+			{
+				if (ctx.reproducingFault && !ctx.controlIteration)
+					_reproRuns.Add(it);
+			};
+			_engine.ReproFault += (ctx, it, sm, faults) =>
+			{
+				_reproFaults.Add(it);
+				_descriptions.Add(faults[0].description);
+			};
+			_engine.ReproFailed += (ctx, it) => _reproFailed.Add(it);
+			_engine.Fault += (ctx, it, sm, faults) => ++_faults;
+
+			_engine.startFuzzing(config.createDom(0), config);
+		}
+
+		private void Verify()
+		{
+			var runs = WorkerTestPublisher.Runs;
+			var workerRuns = runs.Where(r => r.Item1 != 0).ToList();
+			var workerIterations = workerRuns.Select(r => r.Item2).ToList();
+
+			Assert.Greater(workerRuns.Count, 0, "Workers should run some test cases");
+			Assert.AreEqual(workerRuns.Count, _engine.WorkerIterations);
+
+			// Every test case is run once by one of the engines
+			Assert.AreEqual(workerIterations.Count, workerIterations.Distinct().Count());
+			Assert.AreEqual(
+				Enumerable.Range(1, 500).Select(i => (uint)i).ToArray(),
+				runs.Select(r => r.Item2).Distinct().OrderBy(i => i).ToArray());
+
+			// Faults found by workers are logged by the primary engine
+			// with the worker's fault data even though they don't reproduce
+			var expected = workerRuns.Where(r => r.Item2 % 50 == 0).OrderBy(r => r.Item2).ToList();
+
+			Assert.Greater(expected.Count, 0, "Workers should find some faults");
+			Assert.AreEqual(expected.Select(r => r.Item2).ToArray(), _reproFaults.OrderBy(i => i).ToArray());
+			Assert.AreEqual(expected.Select(r => r.Item2).ToArray(), _reproFailed.OrderBy(i => i).ToArray());
+			Assert.AreEqual(0, _faults);
+
+			var descriptions = _reproFaults.Zip(_descriptions, (it, desc) => new { it, desc }).ToDictionary(x => x.it, x => x.desc);
+
+			foreach (var item in expected)
+				Assert.AreEqual("Worker {0}".Fmt(item.Item1), descriptions[item.Item2]);
+
+			// Reproducing never runs test cases the worker that found the fault didn't run
+			CollectionAssert.IsSubsetOf(_reproRuns, workerIterations);
+		}
+
+		[Test]
+		public void TestIterationLifetime()
+		{
+			Run("iteration");
+			Verify();
+
+			// Faults are only replayed once for the iteration lifetime
+			Assert.AreEqual(_reproFaults.OrderBy(i => i).ToArray(), _reproRuns.OrderBy(i => i).ToArray());
+		}
+
+		[Test]
+		public void TestSessionLifetime()
+		{
+			Run("session");
+			Verify();
+
+			// Searches back through the test cases the worker ran before the fault
+			Assert.Greater(_reproRuns.Count, _reproFaults.Count);
+		}
+	}
+}
@@ -4,6 +4,7 @@ using System.Diagnostics;
 using System.Threading;
 using NUnit.Framework;
 using Peach.Core;
+using Peach.Core.Agent;
 using Peach.Core.Test;
 using Peach.Pro.OS.Linux.Agent.Monitors;
 using System.IO;
@@ -288,6 +289,65 @@ namespace Peach.Pro.Test.OS.Linux.Agent.Monitors
 			Assert.AreEqual(0, faults.Length);
 		}
 
+		[Test]
+		public void TestPersistent()
+		{
+			var starts = 0;
+
+			var runner = new MonitorRunner("Gdb", new Dictionary<string, string> {
+				{ "Executable", CrashableServer },
+				{ "Arguments", "127.0.0.1 0 1" },
+				{ "Persistent", "true" },
+			}) {
+				StartMonitor = (m, args) =>
+				{
+					m.InternalEvent += (s, e) => ++starts;
+					m.StartMonitor(args);
+				},
+				Message = m => Thread.Sleep(2000)
+			};
+
+			// The inferior exits on its own each iteration
+			// so it should be restarted under the same gdb
+			var faults = runner.Run(3);
+
+			Assert.AreEqual(0, faults.Length);
+			Assert.AreEqual(3, starts);
+		}
+
+		[Test]
+		public void TestPersistentFault()
+		{
+			var self = Path.Combine(Utilities.ExecutionDirectory, "Peach.exe");
+
+			var args = new Dictionary<string, string>() {
+				{ "Executable", CrashingFileConsumer },
+				{ "Arguments", self },
+				{ "RestartOnEachTest", "true" },
+				{ "Persistent", "true" },
+			};
+
+			var m = new GdbDebugger(null);
+			m.StartMonitor(args);
+			m.SessionStarting();
+
+			for (var i = 0; i < 2; ++i)
+			{
+				m.IterationStarting(new IterationStartingArgs());
+				Thread.Sleep(5000);
+				m.IterationFinished();
+				Assert.IsTrue(m.DetectedFault(), "Should have detected fault");
+				var fault = m.GetMonitorData();
+				Assert.NotNull(fault, "Should have a fault");
+				Assert.AreEqual(3, fault.Data.Count);
+				Assert.Greater(fault.Data["StackTrace.txt"].Length, 0);
+				StringAssert.Contains("PossibleStackCorruption", fault.Fault.Description);
+			}
+
+			m.SessionFinished();
+			m.StopMonitor();
+		}
+
 		private static TcpClient Connect(int port, int timeout)
 		{
 			var tcp = (TcpClient)null;
@@ -1,8 +1,12 @@
 using System;
+using System.Collections.Generic;
 using System.Diagnostics;
 using System.IO;
 using System.Linq;
+using System.Threading;
+using System.Web.Http.Results;
 using Moq;
+using Newtonsoft.Json;
 using NUnit.Framework;
 using Peach.Core;
 using Peach.Core.Test;
@@ -388,6 +392,81 @@ namespace Peach.Pro.Test.WebApi.Controllers
 			Assert.AreEqual(1, jobs.Length);
 		}
 
+		private Job MakeProfiledJob()
+		{
+			var job = new Job(new JobRequest(), "pit1.xml")
+			{
+				LogPath = Path.Combine(Configuration.LogRoot, "pit1"),
+				Status = JobStatus.Stopped
+			};
+
+			Directory.CreateDirectory(job.LogPath);
+
+			using (var db = new NodeDatabase())
+			{
+				db.UpdateJob(job);
+			}
+
+			return job;
+		}
+
+		[Test]
+		public void GetProfile()
+		{
+			var job = MakeProfiledJob();
+			var ctrl = new JobsController(_context, _pitDatabase.Object, _jobMonitor.Object);
+
+			// No profile has been written
+			var empty = ctrl.GetProfileMetric(job.Guid) as OkNegotiatedContentResult<IEnumerable<ProfileMetric>>;
+			Assert.NotNull(empty);
+			CollectionAssert.IsEmpty(empty.Content);
+
+			var metrics = new List<ProfileMetric>
+			{
+				new ProfileMetric { Kind = "Generate", Name = "DM.Block", Count = 10, TotalTime = 500, SelfTime = 100 },
+				new ProfileMetric { Kind = "Fixup", Name = "DM.Block.CRC", Count = 10, TotalTime = 400, SelfTime = 400 },
+				new ProfileMetric { Kind = "Mutator", Name = "StringCaseRandom", Count = 5, TotalTime = 50, SelfTime = 50 },
+			};
+
+			File.WriteAllText(job.ProfilePath, JsonConvert.SerializeObject(metrics));
+
+			var result = ctrl.GetProfileMetric(job.Guid, 2) as OkNegotiatedContentResult<IEnumerable<ProfileMetric>>;
+			Assert.NotNull(result);
+
+			// Hottest first, limited to top
+			var actual = result.Content.ToList();
+			Assert.AreEqual(new[] { "DM.Block.CRC", "DM.Block" }, actual.Select(m => m.Name).ToArray());
+			Assert.AreEqual("Fixup", actual[0].Kind);
+			Assert.AreEqual(10, actual[0].Count);
+			Assert.AreEqual(400, actual[0].SelfTime);
+
+			Assert.IsInstanceOf<NotFoundResult>(ctrl.GetProfileMetric(Guid.NewGuid()));
+		}
+
+		[Test]
+		public void GetProfileFlameGraph()
+		{
+			var job = MakeProfiledJob();
+			var ctrl = new JobsController(_context, _pitDatabase.Object, _jobMonitor.Object);
+
+			// No profile has been written
+			Assert.IsInstanceOf<NotFoundResult>(ctrl.GetProfileFlameGraph(job.Guid));
+
+			const string folded = "Generate:DM.Block;Fixup:DM.Block.CRC 400\nGenerate:DM.Block 100\n";
+
+			File.WriteAllText(job.ProfileFoldedPath, folded);
+
+			var result = ctrl.GetProfileFlameGraph(job.Guid);
+
+			using (var resp = result.ExecuteAsync(CancellationToken.None).Result)
+			{
+				Assert.AreEqual("profile.folded", resp.Content.Headers.ContentDisposition.FileNameStar);
+				Assert.AreEqual(folded, resp.Content.ReadAsStringAsync().Result);
+			}
+
+			Assert.IsInstanceOf<NotFoundResult>(ctrl.GetProfileFlameGraph(Guid.NewGuid()));
+		}
+
 		[Test]
 		[TestCase("true")]
 		[TestCase("false")]
@@ -8,6 +8,7 @@ using System.Web.Http;
 using System.Web.Http.Description;
 using Peach.Core;
 using Peach.Pro.Core;
+using Peach.Pro.Core.Loggers;
 using Peach.Pro.Core.Storage;
 using Peach.Pro.Core.WebServices;
 using Peach.Pro.Core.WebServices.Models;
@@ -399,6 +400,50 @@ namespace Peach.Pro.WebApi2.Controllers
 			return QueryKind<IterationMetric>(id);
 		}
 
+		/// <summary>
+		/// Gets the elements, fixups, transformers and mutators
+		/// the job spent the most time on
+		/// </summary>
+		/// <remarks>
+		/// Only available when the job was run with profiling enabled.
+		/// </remarks>
+		/// <param name="id">Job identifier</param>
+		/// <param name="top">Number of entries to return</param>
+		[Route("{id}/metrics/profile")]
+		[ResponseType(typeof(IEnumerable<ProfileMetric>))]
+		[SwaggerResponse(HttpStatusCode.NotFound, Description = "Specified job does not exist")]
+		public IHttpActionResult GetProfileMetric(Guid id, [FromUri]int top = 20)
+		{
+			return WithJob(id, job =>
+			{
+				var metrics = ProfileLogger.ReadProfile(job.ProfilePath);
+				return Ok(metrics.OrderByDescending(m => m.SelfTime).Take(top));
+			});
+		}
+
+		/// <summary>
+		/// Gets the profile of the job in the folded stack format
+		/// used to generate flame graphs
+		/// </summary>
+		/// <param name="id">Job identifier</param>
+		[Route("{id}/metrics/profile/flamegraph")]
+		[ResultFile(".txt")]
+		[SwaggerResponse(HttpStatusCode.NotFound, Description = "Specified job or profile does not exist")]
+		public IHttpActionResult GetProfileFlameGraph(Guid id)
+		{
+			return WithJob(id, job =>
+			{
+				if (job.ProfileFoldedPath == null)
+					return NotFound();
+
+				var info = new FileInfo(job.ProfileFoldedPath);
+				if (!info.Exists)
+					return NotFound();
+
+				return new FileResult(info);
+			});
+		}
+
 		#endregion
 
 		#region Pause / Continue / Stop / Kill
@@ -485,6 +530,21 @@ namespace Peach.Pro.WebApi2.Controllers
 			}
 		}
 
+		private IHttpActionResult WithJob(Guid id, Func<Job, IHttpActionResult> fn)
+		{
+			Job job;
+
+			using (var db = new NodeDatabase())
+			{
+				job = db.GetJob(id);
+			}
+
+			if (job == null)
+				return NotFound();
+
+			return fn(job);
+		}
+
 		private IHttpActionResult WithActiveJob(Guid id, Func<IHttpActionResult> fn)
 		{
 			var job = _jobMonitor.GetJob();
@@ -561,6 +621,7 @@ namespace Peach.Pro.WebApi2.Controllers
 				Buckets = MakeUrl(id, "metrics", "buckets"),
 				Iterations = MakeUrl(id, "metrics", "iterations"),
 				Fields = MakeUrl(id, "metrics", "fields"),
+				Profile = MakeUrl(id, "metrics", "profile"),
 			};
 
 			// If the job points to a non-existant pit, remove the pitUrl from the job record